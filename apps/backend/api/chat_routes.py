@@ -1,4 +1,7 @@
-from fastapi import APIRouter, HTTPException
+import json
+
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any
 
@@ -11,24 +14,86 @@ class ChatRequest(BaseModel):
     messages: List[Dict[str, str]]
     model: str = None
     temperature: float = 0.7
+    cache: bool = None
 
 @router.post("/chat")
-async def chat_with_provider(request: ChatRequest):
+async def chat_with_provider(request: ChatRequest, http_response: Response):
     """
     Handles a chat request with a specified AI provider.
+
+    The X-Cache response header reports whether the completion cache was hit
+    (HIT), filled (MISS) or not used (BYPASS).
     """
     try:
         client = get_client()
-        response = client.generate_response(
+        response = await client.agenerate_response(
             provider=request.provider,
             messages=request.messages,
             model=request.model,
-            temperature=request.temperature
+            temperature=request.temperature,
+            cache=request.cache
         )
+        http_response.headers["X-Cache"] = response.get('metadata', {}).get('cache', 'BYPASS')
+        if response.get('circuit_open'):
+            raise HTTPException(
+                status_code=503,
+                detail=response['error'],
+                headers={"Retry-After": str(max(1, round(response.get('retry_after', 0))))}
+            )
         if not response.get('success'):
             raise HTTPException(status_code=500, detail=response.get('error', 'Unknown error'))
         return response
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/chat/stream")
+async def stream_chat_with_provider(request: ChatRequest, http_request: Request):
+    """
+    Streams a chat response as server-sent events.
+
+    Each event is a JSON object: 'delta' events carry text as it is generated,
+    and a final 'done' event carries the usage (or an 'error' event on failure).
+    The upstream request is cancelled when the client disconnects.
+    """
+    client = get_client()
+    if not client.get_provider(request.provider):
+        raise HTTPException(status_code=400, detail=f"Provider '{request.provider}' is not supported or configured.")
+    if not client.is_available(request.provider, request.model):
+        breaker = client.breakers.get(request.provider, request.model)
+        raise HTTPException(
+            status_code=503,
+            detail=f"Circuit open for {breaker.name}",
+            headers={"Retry-After": str(max(1, round(breaker.retry_after())))}
+        )
+
+    async def event_source():
+        stream = client.generate_stream(
+            provider=request.provider,
+            messages=request.messages,
+            model=request.model,
+            temperature=request.temperature
+        )
+        try:
+            async for event in stream:
+                if await http_request.is_disconnected():
+                    break
+                yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/providers/status")
+async def get_providers_status():
+    """
+    Reports provider health: circuit breaker states and latency/error statistics.
+    """
+    return get_client().get_provider_status()
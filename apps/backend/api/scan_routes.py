@@ -0,0 +1,114 @@
+import asyncio
+import uuid
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+from ..core.enhanced_rag_system import EnhancedRAGSystem
+
+router = APIRouter()
+
+_rag_system: Optional[EnhancedRAGSystem] = None
+_scan_tasks: Dict[str, asyncio.Task] = {}
+
+def get_rag_system() -> EnhancedRAGSystem:
+    """
+    Gets the shared EnhancedRAGSystem used by the scan endpoints.
+    """
+    global _rag_system
+    if _rag_system is None:
+        _rag_system = EnhancedRAGSystem()
+    return _rag_system
+
+async def close_rag_system() -> None:
+    """
+    Stops running scans (they resume from their last checkpoint) and closes the shared EnhancedRAGSystem.
+    """
+    global _rag_system
+    tasks = list(_scan_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if _rag_system is not None:
+        _rag_system.close()
+        _rag_system = None
+
+def _run_in_background(job_id: str, coro) -> None:
+    """
+    Runs a scan coroutine as a background task, keeping a reference until it finishes.
+    """
+    task = asyncio.create_task(coro)
+    _scan_tasks[job_id] = task
+    task.add_done_callback(lambda _: _scan_tasks.pop(job_id, None))
+
+class ScanRequest(BaseModel):
+    root_path: str
+    include_patterns: Optional[List[str]] = None
+    exclude_patterns: Optional[List[str]] = None
+
+@router.post("/scans")
+async def start_scan(request: ScanRequest):
+    """
+    Starts a checkpointed deep scan in the background.
+    """
+    job_id = uuid.uuid4().hex
+    rag = get_rag_system()
+    _run_in_background(job_id, rag.scan_directory_deep(
+        request.root_path,
+        request.include_patterns,
+        request.exclude_patterns,
+        job_id=job_id
+    ))
+    return {"success": True, "job_id": job_id}
+
+@router.get("/scans")
+async def list_scans(limit: int = 50):
+    """
+    Lists recent scan jobs.
+    """
+    return {"success": True, "scans": get_rag_system().checkpoints.list_jobs(limit)}
+
+@router.get("/scans/{job_id}")
+async def get_scan(job_id: str):
+    """
+    Gets the status and progress of a scan job.
+    """
+    status = get_rag_system().get_scan_status(job_id)
+    if not status:
+        raise HTTPException(status_code=404, detail=f"Scan job not found: {job_id}")
+    return {"success": True, "scan": status}
+
+@router.post("/scans/{job_id}/pause")
+async def pause_scan(job_id: str):
+    """
+    Pauses a running scan after its current batch.
+    """
+    if not get_rag_system().pause_scan(job_id):
+        raise HTTPException(status_code=409, detail="Scan job is not running")
+    return {"success": True, "job_id": job_id}
+
+@router.post("/scans/{job_id}/cancel")
+async def cancel_scan(job_id: str):
+    """
+    Cancels a scan job.
+    """
+    if not get_rag_system().cancel_scan(job_id):
+        raise HTTPException(status_code=409, detail="Scan job does not exist or has finished")
+    return {"success": True, "job_id": job_id}
+
+@router.post("/scans/{job_id}/resume")
+async def resume_scan(job_id: str):
+    """
+    Resumes a paused or interrupted scan from its last checkpoint in the background.
+    """
+    rag = get_rag_system()
+    job = rag.get_scan_status(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"Scan job not found: {job_id}")
+    # Marks the job active before returning, so a second resume is rejected
+    prepared = rag.prepare_resume(job_id)
+    if 'error' in prepared:
+        raise HTTPException(status_code=409, detail=f"Scan job cannot be resumed: {prepared['error']}")
+    _run_in_background(job_id, rag.resume_scan(job_id))
+    return {"success": True, "job_id": job_id}
@@ -23,6 +23,23 @@ class Settings(BaseModel):
         log_level: Log level for application output.
         mcp_ttl_seconds: Lifetime for pooled MCP connections.
         mcp_pool_max: Maximum size of the MCP connection pool.
+        mcp_refresh_ratio: Fraction of the TTL after which a pooled MCP client is replaced in the background.
+        mcp_replica_idle_seconds: Idle time after which replicas above a server's minimum are retired.
+        mcp_maintenance_interval: Seconds between MCP pool maintenance passes.
+        mcp_prespawn: Start the replicas of servers marked `prespawn` at application startup.
+        mcp_catalog_ttl_seconds: How long the discovered MCP tool catalog is served before rediscovery.
+        mcp_discovery_timeout: Deadline for one server's `tools/list` during discovery.
+        mcp_tool_cache_enabled: Serve repeat calls of idempotent MCP tools from the result cache.
+        mcp_tool_cache_max_entries: Maximum number of cached MCP tool results.
+        mcp_tool_cache_default_ttl: TTL for tools annotated read-only and idempotent without a cache policy.
+        mcp_batch_max_concurrency: Maximum number of tool calls from `/mcp/call_batch` running at once.
+        mcp_batch_call_timeout: Default per-call deadline for `/mcp/call_batch`.
+        mcp_http_max_connections: Maximum number of connections to one MCP HTTP server origin.
+        mcp_http_max_keepalive: Maximum number of idle keep-alive connections to one MCP HTTP server origin.
+        mcp_http_keepalive_expiry: Seconds an idle MCP HTTP connection is kept open.
+        mcp_http2: Negotiate HTTP/2 with MCP HTTP servers (requires the `h2` package).
+        mcp_telemetry_enabled: Record latency, payload and error statistics of MCP tool calls.
+        mcp_telemetry_otel: Trace each MCP tool call as an OpenTelemetry span (requires `opentelemetry-api`).
         host: Hostname/IP the FastAPI server binds to.
         port: Port the FastAPI server listens on.
         reload: Flag to enable auto-reload (usually in development).
@@ -38,6 +55,35 @@ class Settings(BaseModel):
         mistral_api_key: API key for Mistral integrations.
         openrouter_api_key: API key for OpenRouter integrations.
         deepseek_api_key: API key for DeepSeek integrations.
+        openai_base_url: Optional override for the OpenAI-compatible API endpoint.
+        ollama_base_url: Base URL of the Ollama server.
+        openai_max_connections: Connection pool size for async OpenAI requests.
+        ollama_max_connections: Connection pool size for async Ollama requests.
+        ollama_keep_alive: How long Ollama keeps a model loaded after a request.
+        ollama_use_chat_api: Send conversations to Ollama's /api/chat instead of /api/generate.
+        ollama_prewarm_models: Comma-separated Ollama models to load at startup.
+        ai_request_timeout: Timeout in seconds for AI provider HTTP requests.
+        ai_coalesce_requests: Share one upstream call between identical concurrent AI requests.
+        ai_cache_enabled: Cache temperature-0 completions for every call by default.
+        ai_cache_path: SQLite file backing the completion cache.
+        ai_cache_ttl_seconds: Lifetime of cached completions.
+        ai_cache_max_mb: Size budget of the completion cache before LRU eviction.
+        ai_breaker_failure_threshold: Consecutive provider failures that open a circuit.
+        ai_breaker_recovery_seconds: How long an open circuit waits before probing.
+        ai_breaker_half_open_probes: Probe requests allowed while a circuit is half-open.
+        openai_requests_per_minute: Client-side OpenAI request budget (0 disables the limit).
+        openai_tokens_per_minute: Client-side OpenAI token budget (0 disables the limit).
+        google_requests_per_minute: Client-side Google AI request budget (0 disables the limit).
+        google_tokens_per_minute: Client-side Google AI token budget (0 disables the limit).
+        ai_interactive_reserve: Share of each rate budget reserved for interactive calls.
+        ai_simulator_enabled: Register the offline 'simulator' provider.
+        ai_simulator_latency_ms: Mean simulated time to first token.
+        ai_simulator_jitter_ms: Spread of the simulated latency.
+        ai_simulator_distribution: Simulated latency distribution (fixed, uniform, normal, lognormal).
+        ai_simulator_tokens_per_second: Simulated streaming rate.
+        ai_simulator_error_rate: Probability that a simulated request fails.
+        ai_simulator_embedding_dim: Dimension of simulated embeddings.
+        ai_simulator_seed: Seed for reproducible simulated latency and errors.
     """
 
     # Logging
@@ -57,6 +103,91 @@ class Settings(BaseModel):
         description="Maximum number of MCP connections in pool",
     )
 
+    mcp_refresh_ratio: float = Field(
+        default=float(os.getenv("MCP_REFRESH_RATIO", "0.8")),
+        description="Fraction of the TTL after which an MCP client is replaced in the background",
+    )
+
+    mcp_replica_idle_seconds: int = Field(
+        default=int(os.getenv("MCP_REPLICA_IDLE_SECONDS", "60")),
+        description="Idle time after which MCP replicas above the minimum are retired",
+    )
+
+    mcp_maintenance_interval: float = Field(
+        default=float(os.getenv("MCP_MAINTENANCE_INTERVAL", "15")),
+        description="Seconds between MCP pool maintenance passes",
+    )
+
+    mcp_prespawn: bool = Field(
+        default=_env_bool("MCP_PRESPAWN", True),
+        description="Start pre-spawned MCP server replicas at startup",
+    )
+
+    mcp_catalog_ttl_seconds: int = Field(
+        default=int(os.getenv("MCP_CATALOG_TTL_SECONDS", "300")),
+        description="Lifetime of the discovered MCP tool catalog in seconds",
+    )
+
+    mcp_discovery_timeout: float = Field(
+        default=float(os.getenv("MCP_DISCOVERY_TIMEOUT", "10")),
+        description="Deadline for listing one MCP server's tools in seconds",
+    )
+
+    mcp_tool_cache_enabled: bool = Field(
+        default=_env_bool("MCP_TOOL_CACHE_ENABLED", True),
+        description="Cache results of idempotent MCP tools",
+    )
+
+    mcp_tool_cache_max_entries: int = Field(
+        default=int(os.getenv("MCP_TOOL_CACHE_MAX_ENTRIES", "1024")),
+        description="Maximum number of cached MCP tool results",
+    )
+
+    mcp_tool_cache_default_ttl: float = Field(
+        default=float(os.getenv("MCP_TOOL_CACHE_DEFAULT_TTL", "60")),
+        description="TTL in seconds for read-only, idempotent MCP tools without a cache policy",
+    )
+
+    mcp_batch_max_concurrency: int = Field(
+        default=int(os.getenv("MCP_BATCH_MAX_CONCURRENCY", "8")),
+        description="Maximum number of batched MCP tool calls running at once",
+    )
+
+    mcp_batch_call_timeout: float = Field(
+        default=float(os.getenv("MCP_BATCH_CALL_TIMEOUT", "30")),
+        description="Default deadline in seconds for each batched MCP tool call",
+    )
+
+    mcp_http_max_connections: int = Field(
+        default=int(os.getenv("MCP_HTTP_MAX_CONNECTIONS", "100")),
+        description="Maximum connections per MCP HTTP server origin",
+    )
+
+    mcp_http_max_keepalive: int = Field(
+        default=int(os.getenv("MCP_HTTP_MAX_KEEPALIVE", "20")),
+        description="Maximum idle keep-alive connections per MCP HTTP server origin",
+    )
+
+    mcp_http_keepalive_expiry: float = Field(
+        default=float(os.getenv("MCP_HTTP_KEEPALIVE_EXPIRY", "30")),
+        description="Seconds an idle MCP HTTP connection is kept open",
+    )
+
+    mcp_http2: bool = Field(
+        default=_env_bool("MCP_HTTP2", False),
+        description="Negotiate HTTP/2 with MCP HTTP servers",
+    )
+
+    mcp_telemetry_enabled: bool = Field(
+        default=_env_bool("MCP_TELEMETRY_ENABLED", True),
+        description="Record per-server and per-tool MCP call telemetry",
+    )
+
+    mcp_telemetry_otel: bool = Field(
+        default=_env_bool("MCP_TELEMETRY_OTEL", False),
+        description="Trace each MCP tool call as an OpenTelemetry span",
+    )
+
     # Server Settings
     host: str = Field(
         default=os.getenv("API_HOST", os.getenv("HOST", "0.0.0.0")),
@@ -133,6 +264,132 @@ class Settings(BaseModel):
         description="API key for DeepSeek",
     )
 
+    # AI Provider Endpoints & Connection Pools
+    openai_base_url: Optional[str] = Field(
+        default=os.getenv("OPENAI_BASE_URL"),
+        description="Override for the OpenAI-compatible API endpoint",
+    )
+    ollama_base_url: str = Field(
+        default=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
+        description="Base URL of the Ollama server",
+    )
+    openai_max_connections: int = Field(
+        default=int(os.getenv("OPENAI_MAX_CONNECTIONS", "100")),
+        description="Maximum concurrent connections to the OpenAI API",
+    )
+    ollama_max_connections: int = Field(
+        default=int(os.getenv("OLLAMA_MAX_CONNECTIONS", "8")),
+        description="Maximum concurrent connections to the Ollama server",
+    )
+    ollama_keep_alive: str = Field(
+        default=os.getenv("OLLAMA_KEEP_ALIVE", "30m"),
+        description="How long Ollama keeps a model loaded after a request (e.g. '30m', '-1')",
+    )
+    ollama_use_chat_api: bool = Field(
+        default=_env_bool("OLLAMA_USE_CHAT_API", True),
+        description="Send full conversations to /api/chat instead of the last message to /api/generate",
+    )
+    ollama_prewarm_models: str = Field(
+        default=os.getenv("OLLAMA_PREWARM_MODELS", ""),
+        description="Comma-separated Ollama models to load into memory at startup",
+    )
+    ai_request_timeout: float = Field(
+        default=float(os.getenv("AI_REQUEST_TIMEOUT", "60")),
+        description="Timeout in seconds for AI provider requests",
+    )
+    ai_coalesce_requests: bool = Field(
+        default=_env_bool("AI_COALESCE_REQUESTS", True),
+        description="Coalesce identical concurrent AI requests into one upstream call",
+    )
+
+    # AI Completion Cache
+    ai_cache_enabled: bool = Field(
+        default=_env_bool("AI_CACHE_ENABLED", False),
+        description="Cache deterministic (temperature 0) completions by default",
+    )
+    ai_cache_path: str = Field(
+        default=os.getenv("AI_CACHE_PATH", "./ai_completion_cache.db"),
+        description="SQLite file backing the completion cache",
+    )
+    ai_cache_ttl_seconds: int = Field(
+        default=int(os.getenv("AI_CACHE_TTL_SECONDS", "86400")),
+        description="Lifetime of cached completions in seconds",
+    )
+    ai_cache_max_mb: int = Field(
+        default=int(os.getenv("AI_CACHE_MAX_MB", "100")),
+        description="Size budget of the completion cache in megabytes",
+    )
+
+    # AI Provider Circuit Breakers
+    ai_breaker_failure_threshold: int = Field(
+        default=int(os.getenv("AI_BREAKER_FAILURE_THRESHOLD", "5")),
+        description="Consecutive provider failures that open a circuit",
+    )
+    ai_breaker_recovery_seconds: float = Field(
+        default=float(os.getenv("AI_BREAKER_RECOVERY_SECONDS", "30")),
+        description="Seconds an open circuit waits before sending a probe request",
+    )
+    ai_breaker_half_open_probes: int = Field(
+        default=int(os.getenv("AI_BREAKER_HALF_OPEN_PROBES", "1")),
+        description="Probe requests allowed while a circuit is half-open",
+    )
+
+    # AI Provider Rate Limits (client-side scheduling)
+    openai_requests_per_minute: int = Field(
+        default=int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "500")),
+        description="OpenAI requests per minute; 0 disables the limit",
+    )
+    openai_tokens_per_minute: int = Field(
+        default=int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "200000")),
+        description="OpenAI tokens per minute; 0 disables the limit",
+    )
+    google_requests_per_minute: int = Field(
+        default=int(os.getenv("GOOGLE_REQUESTS_PER_MINUTE", "300")),
+        description="Google AI requests per minute; 0 disables the limit",
+    )
+    google_tokens_per_minute: int = Field(
+        default=int(os.getenv("GOOGLE_TOKENS_PER_MINUTE", "1000000")),
+        description="Google AI tokens per minute; 0 disables the limit",
+    )
+    ai_interactive_reserve: float = Field(
+        default=float(os.getenv("AI_INTERACTIVE_RESERVE", "0.2")),
+        description="Share of each rate budget that background calls may not use",
+    )
+
+    # Offline AI Provider Simulator
+    ai_simulator_enabled: bool = Field(
+        default=_env_bool("AI_SIMULATOR_ENABLED", False),
+        description="Register the offline 'simulator' provider for load and latency testing",
+    )
+    ai_simulator_latency_ms: float = Field(
+        default=float(os.getenv("AI_SIMULATOR_LATENCY_MS", "200")),
+        description="Mean simulated time to first token in milliseconds",
+    )
+    ai_simulator_jitter_ms: float = Field(
+        default=float(os.getenv("AI_SIMULATOR_JITTER_MS", "50")),
+        description="Spread of the simulated latency in milliseconds",
+    )
+    ai_simulator_distribution: str = Field(
+        default=os.getenv("AI_SIMULATOR_DISTRIBUTION", "lognormal"),
+        description="Simulated latency distribution: fixed, uniform, normal or lognormal",
+    )
+    ai_simulator_tokens_per_second: float = Field(
+        default=float(os.getenv("AI_SIMULATOR_TOKENS_PER_SECOND", "50")),
+        description="Simulated streaming rate in tokens per second",
+    )
+    ai_simulator_error_rate: float = Field(
+        default=float(os.getenv("AI_SIMULATOR_ERROR_RATE", "0")),
+        description="Probability that a simulated request fails",
+    )
+    ai_simulator_embedding_dim: int = Field(
+        default=int(os.getenv("AI_SIMULATOR_EMBEDDING_DIM", "768")),
+        description="Dimension of simulated embeddings",
+    )
+    ai_simulator_seed: Optional[int] = Field(
+        default=int(os.environ["AI_SIMULATOR_SEED"]) if os.getenv("AI_SIMULATOR_SEED") else None,
+        description="Seed for reproducible simulated latency and errors",
+    )
+
 
 # Global settings instance
 settings = Settings()
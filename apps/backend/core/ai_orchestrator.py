@@ -6,6 +6,7 @@ This service manages multiple AI providers, external integrations, and MCP tools
 
 import asyncio
 import json
+import time
 import uuid
 from datetime import datetime
 from typing import Dict, Any, List, Optional
@@ -21,6 +22,11 @@ except ImportError:
     # This allows the app to still run, albeit with missing functionality.
     get_client = None
 
+try:
+    from utils.provider_health import get_router
+except ImportError:
+    get_router = None
+
 class AIOrchestrator:
     """AI Orchestrator for managing multiple AI providers and integrations"""
 
@@ -40,6 +46,9 @@ class AIOrchestrator:
             self.ai_client = None
             print("Warning: UnifiedAIClient could not be imported. AI functionality will be limited.")
 
+        # Latency-aware routing across providers
+        self.router = get_router() if get_router else None
+
         self.providers = {}
         self.integrations = {}
         self.mcp_tools = {}
@@ -209,20 +218,24 @@ class AIOrchestrator:
                 "max_tokens": max_tokens,
                 "temperature": temperature,
                 "stream": stream,
+                "user_id": user_id,
                 **(config or {})
             }
             if model:
                 kwargs["model"] = model
 
-            # Try providers in their configured order
-            for provider_name in user_providers.keys():
+            # Try providers fastest-expected first
+            for provider_name in self._order_providers(user_providers, kwargs.get("model")):
                 try:
                     # The unified client handles the authentication and provider logic
+                    started = time.monotonic()
                     result = self.ai_client.generate_response(provider_name, messages, **kwargs)
+                    self._record_latency(provider_name, started, result)
                     
                     if result and result.get('success'):
-                        # Track usage
-                        self._track_usage(user_id, provider_name, result.get("metadata", {}).get("usage", {}))
+                        # Track usage (cache hits cost no tokens)
+                        if result.get("metadata", {}).get("cache") != "HIT":
+                            self._track_usage(user_id, provider_name, result.get("metadata", {}).get("usage", {}))
                         
                         # Adapt the unified client's response to the expected format
                         return {
@@ -230,9 +243,11 @@ class AIOrchestrator:
                             "provider": result.get('provider'),
                             "model": result.get('metadata', {}).get('model'),
                             "content": result.get('content'),
-                            "usage": result.get("metadata", {}).get("usage", {})
+                            "usage": result.get("metadata", {}).get("usage", {}),
+                            "cache": result.get("metadata", {}).get("cache", "BYPASS")
                         }
                 except Exception as e:
+                    self._record_latency(provider_name, started)
                     print(f"Provider {provider_name} failed: {str(e)}")
                     continue # Try the next provider
             
@@ -240,6 +255,33 @@ class AIOrchestrator:
 
         except Exception as e:
             return {"success": False, "message": f"Failed to create completion: {str(e)}"}
+
+    def _order_providers(self, user_providers: Dict[str, Any], model: Optional[str] = None) -> List[str]:
+        """Order a user's providers by expected latency, skipping those whose circuit is open.
+
+        Circuits are kept per provider and model, so `model` must be the one the
+        call will use (None for the provider default).
+        """
+        providers = [name for name in user_providers if self.ai_client.is_available(name, model)]
+        return self.router.order(providers) if self.router else providers
+
+    def _record_latency(self, provider_name: str, started: float, result: Optional[Dict[str, Any]] = None):
+        """Feed a call outcome into the provider router (no result means the call raised).
+
+        Results that never reached the provider - cache hits, copies of a
+        coalesced caller's result and circuit-open fast-fails - are skipped, so
+        their near-zero latencies do not skew routing.
+        """
+        if not self.router:
+            return
+        metadata = (result or {}).get('metadata') or {}
+        if metadata.get('cache') == 'HIT' or metadata.get('coalesced') or (result or {}).get('circuit_open'):
+            return
+        self.router.record(provider_name, time.monotonic() - started, bool(result and result.get('success')))
+
+    def get_routing_stats(self) -> Dict[str, Any]:
+        """Get per-provider latency and error statistics used for routing."""
+        return self.router.get_stats() if self.router else {}
     
     def analyze_content(
         self,
@@ -248,7 +290,13 @@ class AIOrchestrator:
         analysis_type: str,
         config: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Analyze content using AI"""
+        """Analyze content using AI.
+
+        Analyses keep their sampling temperature (0.3) and are cached with
+        `force_cache`, so repeating an analysis of the same content returns the
+        first answer instead of a fresh sample. Pass `{"cache": False}` in
+        config to sample again.
+        """
         try:
             # Create analysis prompt based on type
             if analysis_type == "character":
@@ -263,13 +311,13 @@ class AIOrchestrator:
                     "message": f"Unknown analysis type: {analysis_type}"
                 }
             
-            # Use completion to analyze
+            # Use completion to analyze; repeated analyses are served from the cache
             result = self.create_completion(
                 user_id=user_id,
                 prompt=prompt,
                 max_tokens=2000,
                 temperature=0.3,
-                config=config
+                config={"cache": True, "force_cache": True, **(config or {})}
             )
             
             if result["success"]:
@@ -0,0 +1,598 @@
+"""
+🧩 Code Chunker - Structure-Aware Chunking for Source Files.
+
+Splits source code into retrieval units that follow the structure of the code
+instead of a fixed character count.
+
+Features:
+- Python chunking with the `ast` module
+- Brace/indent tokenizer for JS/TS/Go/Rust/Java and other C-like languages
+- Optional tree-sitter parsing when `tree_sitter_languages` is installed
+- Merging of small units and splitting of oversized units to fit a token budget
+"""
+
+import ast
+import logging
+import re
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Any, Tuple
+
+# Optional tree-sitter support
+try:
+    from tree_sitter_languages import get_parser as get_tree_sitter_parser
+    TREE_SITTER_AVAILABLE = True
+except ImportError:
+    TREE_SITTER_AVAILABLE = False
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BRACE_LANGUAGE_EXTENSIONS = {
+    '.js', '.jsx', '.ts', '.tsx', '.go', '.rs', '.java', '.c', '.h', '.cpp',
+    '.hpp', '.cs', '.kt', '.scala', '.swift', '.dart', '.php'
+}
+
+TREE_SITTER_LANGUAGES = {
+    '.js': 'javascript', '.jsx': 'javascript', '.ts': 'typescript', '.tsx': 'tsx',
+    '.go': 'go', '.rs': 'rust', '.java': 'java', '.c': 'c', '.h': 'c',
+    '.cpp': 'cpp', '.hpp': 'cpp', '.cs': 'c_sharp', '.kt': 'kotlin',
+    '.php': 'php'
+}
+
+# Declarations recognised in the header of a brace-delimited unit
+SYMBOL_PATTERNS: List[Tuple[str, re.Pattern]] = [
+    ('class', re.compile(r'\b(?:class|interface|struct|enum|trait|object|record)\s+([A-Za-z_$][\w$]*)')),
+    ('class', re.compile(r'\btype\s+([A-Za-z_]\w*)\s+(?:struct|interface)\b')),
+    ('impl', re.compile(r'\bimpl(?:\s*<[^>]*>)?\s+(?:[\w:<>, ]+\s+for\s+)?([A-Za-z_][\w:]*)')),
+    ('function', re.compile(r'\bfunc\s+(?:\([^)]*\)\s*)?([A-Za-z_]\w*)')),
+    ('function', re.compile(r'\bfn\s+([A-Za-z_]\w*)')),
+    ('function', re.compile(r'\bfunction\s*\*?\s*([A-Za-z_$][\w$]*)')),
+    ('function', re.compile(r'\b(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=\s*(?:async\s+)?(?:function\b|\([^)]*\)\s*(?::[^=]+)?=>|[A-Za-z_$][\w$]*\s*=>)')),
+    ('function', re.compile(r'^\s*(?:(?:public|private|protected|static|final|abstract|async|override|virtual|export|default|synchronized|inline|suspend)\s+)*[\w<>\[\],.?*& ]*?\b([A-Za-z_$][\w$]*)\s*\([^;{]*\)\s*(?:[:\w<>\[\],.?| ]*)?(?:throws\s+[\w., ]+)?\s*\{?\s*$', re.MULTILINE)),
+]
+
+CONTROL_KEYWORDS = {'if', 'for', 'while', 'switch', 'catch', 'return', 'else', 'do', 'try', 'with'}
+
+
+@dataclass
+class CodeChunk:
+    """
+    A structure-aligned chunk of source code.
+
+    Attributes:
+        content (str): The source text of the chunk.
+        start_line (int): The first line of the chunk (1-based).
+        end_line (int): The last line of the chunk (1-based, inclusive).
+        kind (str): The unit kind ('function', 'class', 'method', 'impl', 'module').
+        symbols (List[str]): The names of the symbols defined in the chunk.
+        part (int): The part number when an oversized unit was split (0 if not split).
+    """
+    content: str
+    start_line: int
+    end_line: int
+    kind: str
+    symbols: List[str] = field(default_factory=list)
+    part: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converts the chunk to a dictionary."""
+        return asdict(self)
+
+
+class CodeChunker:
+    """
+    Splits source code into one chunk per function or class.
+
+    Small adjacent units are merged and oversized units are split so that every
+    chunk stays within the token budget. Tokens are estimated from the character
+    count.
+
+    Attributes:
+        max_tokens (int): The maximum estimated tokens per chunk.
+        min_tokens (int): Units smaller than this are merged with their neighbours.
+        chars_per_token (float): The characters-per-token ratio used for estimation.
+        use_tree_sitter (bool): Whether to use tree-sitter for non-Python languages.
+    """
+
+    def __init__(self, max_tokens: int = 400, min_tokens: int = 50,
+                 chars_per_token: float = 4.0, use_tree_sitter: bool = True):
+        """
+        Initializes the CodeChunker.
+
+        Args:
+            max_tokens (int, optional): The maximum estimated tokens per chunk. Defaults to 400.
+            min_tokens (int, optional): The merge threshold in estimated tokens. Defaults to 50.
+            chars_per_token (float, optional): The characters-per-token ratio. Defaults to 4.0.
+            use_tree_sitter (bool, optional): Whether to use tree-sitter when installed. Defaults to True.
+        """
+        self.max_tokens = max_tokens
+        self.min_tokens = min_tokens
+        self.chars_per_token = chars_per_token
+        self.use_tree_sitter = use_tree_sitter and TREE_SITTER_AVAILABLE
+
+    def supports(self, extension: str) -> bool:
+        """
+        Checks whether structure-aware chunking is available for an extension.
+
+        Args:
+            extension (str): The file extension, including the dot.
+
+        Returns:
+            bool: True if the extension is supported.
+        """
+        extension = extension.lower()
+        return extension == '.py' or extension in BRACE_LANGUAGE_EXTENSIONS
+
+    def chunk(self, content: str, extension: str) -> List[CodeChunk]:
+        """
+        Splits source code into structure-aligned chunks.
+
+        Args:
+            content (str): The source code.
+            extension (str): The file extension, including the dot.
+
+        Returns:
+            List[CodeChunk]: The chunks, in source order.
+        """
+        extension = extension.lower()
+        lines = content.splitlines()
+        if not lines:
+            return []
+
+        units = None
+        try:
+            if extension == '.py':
+                units = self._python_units(content, lines)
+            elif self.use_tree_sitter and extension in TREE_SITTER_LANGUAGES:
+                units = self._tree_sitter_units(content, lines, TREE_SITTER_LANGUAGES[extension])
+            if units is None and extension in BRACE_LANGUAGE_EXTENSIONS:
+                units = self._brace_units(lines, 0, len(lines))
+        except Exception as e:
+            logger.warning(f"⚠️ Structure-aware chunking failed for {extension}: {e}")
+            units = None
+
+        if not units:
+            units = [CodeChunk(content=content, start_line=1, end_line=len(lines), kind='module')]
+
+        return self._fit_budget(units, lines)
+
+    def estimate_tokens(self, text: str) -> int:
+        """
+        Estimates the number of tokens in a text.
+
+        Args:
+            text (str): The text.
+
+        Returns:
+            int: The estimated token count.
+        """
+        return int(len(text) / self.chars_per_token) + 1
+
+    # ---------- Python ----------
+
+    def _python_units(self, content: str, lines: List[str]) -> Optional[List[CodeChunk]]:
+        """
+        Extracts top-level units from Python source with `ast`.
+
+        Leading comments and blank lines are attached to the following unit.
+
+        Args:
+            content (str): The source code.
+            lines (List[str]): The source lines.
+
+        Returns:
+            Optional[List[CodeChunk]]: The units, or None if the source does not parse.
+        """
+        try:
+            tree = ast.parse(content)
+        except SyntaxError:
+            return None
+
+        units = []
+        previous_end = 0
+        for node in tree.body:
+            start = min([node.lineno] + [d.lineno for d in getattr(node, 'decorator_list', [])])
+            end = getattr(node, 'end_lineno', None) or start
+            start = min(start, previous_end + 1)
+
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                kind, symbols = 'function', [node.name]
+            elif isinstance(node, ast.ClassDef):
+                kind, symbols = 'class', [node.name] + [
+                    f"{node.name}.{child.name}" for child in node.body
+                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+                ]
+            else:
+                kind, symbols = 'module', []
+
+            unit = self._make_unit(lines, start, end, kind, symbols)
+            if kind == 'class' and self.estimate_tokens(unit.content) > self.max_tokens:
+                units.extend(self._split_python_class(node, lines, start, end))
+            else:
+                units.append(unit)
+            previous_end = end
+
+        if previous_end < len(lines):
+            units.append(self._make_unit(lines, previous_end + 1, len(lines), 'module', []))
+        return units
+
+    def _split_python_class(self, node: ast.ClassDef, lines: List[str],
+                            start: int, end: int) -> List[CodeChunk]:
+        """
+        Splits an oversized Python class into a header chunk and one chunk per method.
+
+        Args:
+            node (ast.ClassDef): The class node.
+            lines (List[str]): The source lines.
+            start (int): The first line of the class unit.
+            end (int): The last line of the class unit.
+
+        Returns:
+            List[CodeChunk]: The class header and method units.
+        """
+        methods = [
+            child for child in node.body
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ]
+        if not methods:
+            return [self._make_unit(lines, start, end, 'class', [node.name])]
+
+        units = []
+        first_method_start = min([methods[0].lineno] + [d.lineno for d in methods[0].decorator_list])
+        if first_method_start > start:
+            units.append(self._make_unit(lines, start, first_method_start - 1, 'class', [node.name]))
+
+        previous_end = first_method_start - 1
+        for method in methods:
+            method_start = min([method.lineno] + [d.lineno for d in method.decorator_list])
+            method_start = min(method_start, previous_end + 1)
+            method_end = method.end_lineno or method_start
+            units.append(self._make_unit(
+                lines, method_start, method_end, 'method', [f"{node.name}.{method.name}"]
+            ))
+            previous_end = method_end
+
+        if previous_end < end:
+            units.append(self._make_unit(lines, previous_end + 1, end, 'class', [node.name]))
+        return units
+
+    # ---------- Brace-delimited languages ----------
+
+    def _brace_units(self, lines: List[str], first: int, last: int, base_depth: int = 0) -> List[CodeChunk]:
+        """
+        Extracts units from brace-delimited source with a lightweight tokenizer.
+
+        A unit ends on the line where the brace depth returns to `base_depth` after
+        having opened a block. Strings and comments are skipped so that braces
+        inside them are ignored. Lines at `base_depth` that open no block (imports,
+        declarations) become 'module' units and are merged later.
+
+        Args:
+            lines (List[str]): The source lines.
+            first (int): The index of the first line to scan (0-based).
+            last (int): The index after the last line to scan.
+            base_depth (int, optional): The depth at which units are delimited. Defaults to 0.
+
+        Returns:
+            List[CodeChunk]: The units.
+        """
+        depths = self._line_depths(lines[first:last], base_depth)
+        units = []
+        unit_start = first
+        opened = False
+
+        for offset, (depth_end, max_depth) in enumerate(depths):
+            index = first + offset
+            if max_depth > base_depth:
+                opened = True
+            if depth_end > base_depth:
+                continue
+
+            unit_lines = lines[unit_start:index + 1]
+            text = '\n'.join(unit_lines)
+            if opened:
+                kind, symbols = self._brace_symbols(text)
+                units.append(CodeChunk(
+                    content=text, start_line=unit_start + 1, end_line=index + 1,
+                    kind=kind, symbols=symbols
+                ))
+                unit_start = index + 1
+                opened = False
+            elif text.strip().endswith((';', ')')) or not text.strip():
+                units.append(CodeChunk(
+                    content=text, start_line=unit_start + 1, end_line=index + 1, kind='module'
+                ))
+                unit_start = index + 1
+
+        if unit_start < last:
+            units.append(CodeChunk(
+                content='\n'.join(lines[unit_start:last]), start_line=unit_start + 1,
+                end_line=last, kind='module'
+            ))
+        return units
+
+    def _line_depths(self, lines: List[str], base_depth: int) -> List[Tuple[int, int]]:
+        """
+        Computes the brace depth at the end of each line and the maximum depth within it.
+
+        Args:
+            lines (List[str]): The source lines.
+            base_depth (int): The depth before the first line.
+
+        Returns:
+            List[Tuple[int, int]]: (depth at end of line, maximum depth on the line) per line.
+        """
+        depth = base_depth
+        in_block_comment = False
+        quote = None
+        result = []
+
+        for line in lines:
+            max_depth = depth
+            i = 0
+            while i < len(line):
+                char = line[i]
+                pair = line[i:i + 2]
+                if in_block_comment:
+                    if pair == '*/':
+                        in_block_comment = False
+                        i += 1
+                elif quote:
+                    if char == '\\':
+                        i += 1
+                    elif char == quote:
+                        quote = None
+                elif pair == '//' or (char == '#' and line.lstrip().startswith('#')):
+                    break
+                elif pair == '/*':
+                    in_block_comment = True
+                    i += 1
+                elif char in ('"', "'", '`'):
+                    quote = char
+                elif char == '{':
+                    depth += 1
+                    max_depth = max(max_depth, depth)
+                elif char == '}':
+                    depth = max(base_depth, depth - 1)
+                i += 1
+            # Only template literals span lines
+            if quote != '`':
+                quote = None
+            result.append((depth, max_depth))
+        return result
+
+    def _brace_symbols(self, text: str) -> Tuple[str, List[str]]:
+        """
+        Determines the kind and symbol names of a brace-delimited unit from its header.
+
+        Args:
+            text (str): The unit text.
+
+        Returns:
+            Tuple[str, List[str]]: The unit kind and symbol names.
+        """
+        header = text.split('{', 1)[0]
+        for kind, pattern in SYMBOL_PATTERNS:
+            match = pattern.search(header)
+            if match and match.group(1) not in CONTROL_KEYWORDS:
+                return kind, [match.group(1)]
+        return 'module', []
+
+    # ---------- tree-sitter ----------
+
+    def _tree_sitter_units(self, content: str, lines: List[str], language: str) -> Optional[List[CodeChunk]]:
+        """
+        Extracts top-level units with tree-sitter.
+
+        Args:
+            content (str): The source code.
+            lines (List[str]): The source lines.
+            language (str): The tree-sitter language name.
+
+        Returns:
+            Optional[List[CodeChunk]]: The units, or None if the language is unavailable.
+        """
+        try:
+            parser = get_tree_sitter_parser(language)
+        except Exception:
+            return None
+
+        tree = parser.parse(content.encode('utf-8'))
+        units = []
+        previous_end = 0
+        for node in tree.root_node.children:
+            start = min(node.start_point[0] + 1, previous_end + 1)
+            end = node.end_point[0] + 1
+            if end <= previous_end:
+                continue
+
+            name_node = node.child_by_field_name('name')
+            if name_node is None:
+                for child in node.children:
+                    name_node = child.child_by_field_name('name')
+                    if name_node is not None:
+                        break
+            symbols = [name_node.text.decode('utf-8')] if name_node is not None else []
+            if 'class' in node.type or 'struct' in node.type or 'interface' in node.type or 'impl' in node.type:
+                kind = 'class'
+            elif 'function' in node.type or 'method' in node.type:
+                kind = 'function'
+            else:
+                kind = 'function' if symbols else 'module'
+
+            units.append(self._make_unit(lines, start, end, kind, symbols))
+            previous_end = end
+
+        if previous_end < len(lines):
+            units.append(self._make_unit(lines, previous_end + 1, len(lines), 'module', []))
+        return units
+
+    # ---------- Budget ----------
+
+    def _fit_budget(self, units: List[CodeChunk], lines: List[str]) -> List[CodeChunk]:
+        """
+        Merges small adjacent units and splits oversized ones.
+
+        Units of a split class are only merged with each other, so no chunk
+        mixes a class's members with the top-level code around it.
+
+        Args:
+            units (List[CodeChunk]): The structural units.
+            lines (List[str]): The source lines.
+
+        Returns:
+            List[CodeChunk]: The chunks within the token budget.
+        """
+        sized = []
+        for unit in units:
+            if not unit.content.strip():
+                continue
+            if self.estimate_tokens(unit.content) <= self.max_tokens:
+                sized.append(unit)
+            else:
+                sized.extend(self._split_unit(unit, lines))
+
+        owners = self._owners(sized)
+        merged: List[CodeChunk] = []
+        merged_owners: List[Optional[str]] = []
+        for unit, owner in zip(sized, owners):
+            if merged and merged_owners[-1] == owner:
+                previous = merged[-1]
+                combined_tokens = self.estimate_tokens(previous.content) + self.estimate_tokens(unit.content)
+                is_small = (
+                    self.estimate_tokens(previous.content) < self.min_tokens
+                    or self.estimate_tokens(unit.content) < self.min_tokens
+                )
+                if is_small and combined_tokens <= self.max_tokens and not previous.part and not unit.part:
+                    merged[-1] = CodeChunk(
+                        content=self._join_lines(lines, previous.start_line, unit.end_line),
+                        start_line=previous.start_line,
+                        end_line=unit.end_line,
+                        kind=previous.kind if previous.kind != 'module' else unit.kind,
+                        symbols=previous.symbols + unit.symbols
+                    )
+                    continue
+            merged.append(unit)
+            merged_owners.append(owner)
+        return merged
+
+    @staticmethod
+    def _owners(units: List[CodeChunk]) -> List[Optional[str]]:
+        """
+        Finds the class that each unit of a split class belongs to.
+
+        Methods belong to the class their symbol is qualified with. The class's
+        header and closing parts belong to it when they border one of its methods,
+        and so do unnamed members (fields, comments) between two of its units.
+
+        Args:
+            units (List[CodeChunk]): The units, in source order.
+
+        Returns:
+            List[Optional[str]]: The owning class of each unit, or None for top-level units.
+        """
+        owners: List[Optional[str]] = [
+            unit.symbols[0].rsplit('.', 1)[0] if unit.kind == 'method' and unit.symbols and '.' in unit.symbols[0]
+            else None
+            for unit in units
+        ]
+
+        def neighbours(index: int) -> List[Optional[str]]:
+            return [owners[i] if 0 <= i < len(owners) else None for i in (index - 1, index + 1)]
+
+        for index, unit in enumerate(units):
+            if unit.kind in ('class', 'impl') and len(unit.symbols) == 1 and unit.symbols[0] in neighbours(index):
+                owners[index] = unit.symbols[0]
+        for index, unit in enumerate(units):
+            before, after = neighbours(index)
+            if not unit.symbols and before is not None and before == after:
+                owners[index] = before
+        return owners
+
+    def _split_unit(self, unit: CodeChunk, lines: List[str]) -> List[CodeChunk]:
+        """
+        Splits an oversized unit.
+
+        Brace-delimited classes are first split at their member boundaries; anything
+        still too large is split into line windows that keep the unit's symbols.
+
+        Args:
+            unit (CodeChunk): The oversized unit.
+            lines (List[str]): The source lines.
+
+        Returns:
+            List[CodeChunk]: The parts.
+        """
+        if unit.kind in ('class', 'impl') and '{' in unit.content:
+            header_end = unit.start_line - 1
+            while header_end < unit.end_line and '{' not in lines[header_end]:
+                header_end += 1
+            members = self._brace_units(lines, header_end + 1, unit.end_line - 1, base_depth=0)
+            members = [m for m in members if m.content.strip()]
+            if len(members) > 1:
+                parts = [self._make_unit(lines, unit.start_line, header_end + 1, unit.kind, unit.symbols[:1])]
+                for member in members:
+                    member.kind = 'method' if member.symbols else member.kind
+                    member.symbols = [f"{unit.symbols[0]}.{s}" for s in member.symbols] if unit.symbols else member.symbols
+                    parts.append(member)
+                parts.append(self._make_unit(lines, unit.end_line, unit.end_line, unit.kind, unit.symbols[:1]))
+                result = []
+                for part in parts:
+                    if self.estimate_tokens(part.content) > self.max_tokens:
+                        result.extend(self._split_lines(part, lines))
+                    else:
+                        result.append(part)
+                return result
+
+        return self._split_lines(unit, lines)
+
+    def _split_lines(self, unit: CodeChunk, lines: List[str]) -> List[CodeChunk]:
+        """
+        Splits a unit into line windows within the token budget.
+
+        Args:
+            unit (CodeChunk): The unit to split.
+            lines (List[str]): The source lines.
+
+        Returns:
+            List[CodeChunk]: The parts, numbered from 1.
+        """
+        max_chars = int(self.max_tokens * self.chars_per_token)
+        parts = []
+        start = unit.start_line
+        size = 0
+        for line_number in range(unit.start_line, unit.end_line + 1):
+            line_size = len(lines[line_number - 1]) + 1
+            if size and size + line_size > max_chars:
+                parts.append((start, line_number - 1))
+                start, size = line_number, 0
+            size += line_size
+        parts.append((start, unit.end_line))
+
+        return [
+            CodeChunk(
+                content=self._join_lines(lines, part_start, part_end),
+                start_line=part_start,
+                end_line=part_end,
+                kind=unit.kind,
+                symbols=list(unit.symbols),
+                part=index
+            )
+            for index, (part_start, part_end) in enumerate(parts, 1)
+        ]
+
+    def _make_unit(self, lines: List[str], start: int, end: int, kind: str, symbols: List[str]) -> CodeChunk:
+        """Creates a unit from a 1-based inclusive line range."""
+        return CodeChunk(
+            content=self._join_lines(lines, start, end),
+            start_line=start,
+            end_line=end,
+            kind=kind,
+            symbols=symbols
+        )
+
+    @staticmethod
+    def _join_lines(lines: List[str], start: int, end: int) -> str:
+        """Joins a 1-based inclusive line range."""
+        return '\n'.join(lines[start - 1:end])
@@ -19,7 +19,7 @@ import hashlib
 import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union, Tuple, Set
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
 import numpy as np
 import sqlite3
@@ -32,6 +32,10 @@ import mimetypes
 import magic
 import re
 import os
+import uuid
+import zlib
+
+from .code_chunker import CodeChunker
 
 # Document Processing Imports
 try:
@@ -66,10 +70,66 @@ try:
 except ImportError:
     AST_AVAILABLE = False
 
+# Cache Compression Imports
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Codec markers prepended to compressed cache values
+CACHE_CODEC_RAW = b'\x00'
+CACHE_CODEC_ZLIB = b'\x01'
+CACHE_CODEC_ZSTD = b'\x02'
+
+def encode_cache_value(data: bytes, threshold: int = 1024) -> bytes:
+    """
+    Encodes a cache value, compressing it when it exceeds a size threshold.
+
+    zstd is used when available, otherwise zlib. The first byte of the result
+    identifies the codec so that `decode_cache_value` can reverse it.
+
+    Args:
+        data (bytes): The serialized value.
+        threshold (int, optional): The minimum size in bytes before compression is applied. Defaults to 1024.
+
+    Returns:
+        bytes: The encoded value.
+    """
+    if len(data) < threshold:
+        return CACHE_CODEC_RAW + data
+    if ZSTD_AVAILABLE:
+        return CACHE_CODEC_ZSTD + zstandard.ZstdCompressor(level=3).compress(data)
+    return CACHE_CODEC_ZLIB + zlib.compress(data, 6)
+
+def decode_cache_value(raw: bytes) -> bytes:
+    """
+    Decodes a value produced by `encode_cache_value`.
+
+    Args:
+        raw (bytes): The encoded value as stored in the cache.
+
+    Returns:
+        bytes: The original serialized value.
+
+    Raises:
+        ValueError: If the value was compressed with an unavailable or unknown codec.
+    """
+    codec, payload = raw[:1], raw[1:]
+    if codec == CACHE_CODEC_RAW:
+        return payload
+    if codec == CACHE_CODEC_ZLIB:
+        return zlib.decompress(payload)
+    if codec == CACHE_CODEC_ZSTD:
+        if not ZSTD_AVAILABLE:
+            raise ValueError("Cache value is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    raise ValueError(f"Unknown cache codec: {codec!r}")
+
 @dataclass
 class PerformanceMetrics:
     """
@@ -84,6 +144,8 @@ class PerformanceMetrics:
         cache_hits (int): The number of cache hits.
         cache_misses (int): The number of cache misses.
         errors (List[str]): A list of errors that occurred.
+        cache_writes (int): The number of documents written to the cache.
+        cache_skips (int): The number of documents skipped because the cached content hash matched.
     """
     start_time: float
     end_time: float
@@ -93,7 +155,9 @@ class PerformanceMetrics:
     cache_hits: int
     cache_misses: int
     errors: List[str]
-    
+    cache_writes: int = 0
+    cache_skips: int = 0
+
     @property
     def total_time(self) -> float:
         """Calculates the total time taken for the operation."""
@@ -122,6 +186,8 @@ class DocumentContent:
         extracted_at (datetime): The timestamp when the document was extracted.
         file_size (int): The size of the file in bytes.
         processing_time (float): The time taken to process the file.
+        chunks (Optional[List[Dict[str, Any]]]): Structure-aligned chunks for code files, or None
+            to let the RAG system chunk the content by size.
     """
     file_path: str
     content_type: str  # 'text', 'code', 'document', 'image', 'binary'
@@ -130,6 +196,200 @@ class DocumentContent:
     extracted_at: datetime
     file_size: int
     processing_time: float
+    chunks: Optional[List[Dict[str, Any]]] = None
+
+class ContentDeduplicator:
+    """
+    Detects duplicate documents before they are chunked and embedded.
+
+    Exact duplicates are detected by a SHA-256 hash of the content. Near duplicates
+    are detected by a 64-bit SimHash over word shingles; fingerprints are split into
+    bands so that only documents sharing at least one band are compared, which by the
+    pigeonhole principle finds every pair within `max_hamming_distance` bits.
+
+    Duplicates are dropped and recorded as aliases on the canonical document, so they
+    share its chunks and embeddings.
+
+    Attributes:
+        shingle_size (int): The number of words per shingle.
+        max_hamming_distance (int): The maximum SimHash distance for near duplicates.
+        min_length (int): The minimum content length for near-duplicate detection.
+        stats (Dict[str, int]): Counters for seen documents and detected duplicates.
+        last_aliases (List[Tuple[str, str, str]]): The (duplicate, canonical, kind) aliases
+            recorded by the last `deduplicate` call.
+        updated (List[DocumentContent]): Canonical documents from earlier calls that gained
+            aliases in the last `deduplicate` call, and so must be stored again.
+    """
+    
+    def __init__(self, shingle_size: int = 5, max_hamming_distance: int = 3, min_length: int = 200):
+        """
+        Initializes the ContentDeduplicator.
+
+        Args:
+            shingle_size (int, optional): The number of words per shingle. Defaults to 5.
+            max_hamming_distance (int, optional): The maximum SimHash distance for near duplicates. Defaults to 3.
+            min_length (int, optional): The minimum content length for near-duplicate detection. Defaults to 200.
+        """
+        self.shingle_size = shingle_size
+        self.max_hamming_distance = max_hamming_distance
+        self.min_length = min_length
+        self._bands = max_hamming_distance + 1
+        self._band_bits = 64 // self._bands
+        self.reset()
+    
+    def reset(self):
+        """Clears the duplicate index and statistics."""
+        self._exact_index: Dict[str, DocumentContent] = {}
+        self._band_index: Dict[Tuple[int, int], List[Tuple[int, DocumentContent]]] = {}
+        self._current: Set[int] = set()
+        self.last_aliases: List[Tuple[str, str, str]] = []
+        self.updated: List[DocumentContent] = []
+        self.stats = {
+            'documents_seen': 0,
+            'exact_duplicates': 0,
+            'near_duplicates': 0
+        }
+    
+    def deduplicate(self, documents: List[DocumentContent]) -> List[DocumentContent]:
+        """
+        Removes duplicates from a list of documents.
+
+        The index is kept between calls, so documents are also compared against
+        canonical documents from earlier batches. Those that gain aliases are
+        listed in `updated`.
+
+        Args:
+            documents (List[DocumentContent]): The documents to deduplicate.
+
+        Returns:
+            List[DocumentContent]: The canonical documents.
+        """
+        canonical = []
+        self._current = set()
+        self.last_aliases = []
+        self.updated = []
+        
+        # Sort so that the canonical document is stable between runs
+        for doc in sorted(documents, key=lambda d: d.file_path):
+            self.stats['documents_seen'] += 1
+            
+            content_hash = hashlib.sha256(doc.content.encode('utf-8', errors='ignore')).hexdigest()
+            original = self._exact_index.get(content_hash)
+            if original is not None:
+                self._add_alias(original, doc, 'exact')
+                self.stats['exact_duplicates'] += 1
+                continue
+            
+            fingerprint = None
+            if len(doc.content) >= self.min_length:
+                fingerprint = self._simhash(doc.content)
+                original = self._find_near_duplicate(fingerprint)
+                if original is not None:
+                    self._add_alias(original, doc, 'near')
+                    self.stats['near_duplicates'] += 1
+                    continue
+            
+            self._exact_index[content_hash] = doc
+            doc.metadata['content_hash'] = content_hash
+            if fingerprint is not None:
+                for band in self._split_bands(fingerprint):
+                    self._band_index.setdefault(band, []).append((fingerprint, doc))
+            self._current.add(id(doc))
+            canonical.append(doc)
+        
+        return canonical
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gets deduplication statistics.
+
+        Returns:
+            Dict[str, Any]: The counters and the dedup ratio (duplicates / documents seen).
+        """
+        duplicates = self.stats['exact_duplicates'] + self.stats['near_duplicates']
+        seen = self.stats['documents_seen']
+        return {
+            **self.stats,
+            'duplicates': duplicates,
+            'dedup_ratio': duplicates / seen if seen > 0 else 0
+        }
+    
+    def _add_alias(self, original: DocumentContent, duplicate: DocumentContent, kind: str):
+        """
+        Records a duplicate as an alias of the canonical document.
+
+        Args:
+            original (DocumentContent): The canonical document.
+            duplicate (DocumentContent): The duplicate document.
+            kind (str): The kind of duplicate ('exact' or 'near').
+        """
+        original.metadata.setdefault('aliases', []).append(duplicate.file_path)
+        original.metadata.setdefault('alias_kinds', {})[duplicate.file_path] = kind
+        self.last_aliases.append((duplicate.file_path, original.file_path, kind))
+        if id(original) not in self._current and all(doc is not original for doc in self.updated):
+            self.updated.append(original)
+        logger.debug(f"Duplicate ({kind}): {duplicate.file_path} -> {original.file_path}")
+    
+    def _find_near_duplicate(self, fingerprint: int) -> Optional[DocumentContent]:
+        """
+        Finds an indexed document within `max_hamming_distance` of a fingerprint.
+
+        Args:
+            fingerprint (int): The SimHash fingerprint.
+
+        Returns:
+            Optional[DocumentContent]: The matching canonical document, or None.
+        """
+        for band in self._split_bands(fingerprint):
+            for candidate_fingerprint, candidate in self._band_index.get(band, []):
+                if bin(fingerprint ^ candidate_fingerprint).count('1') <= self.max_hamming_distance:
+                    return candidate
+        return None
+    
+    def _split_bands(self, fingerprint: int) -> List[Tuple[int, int]]:
+        """
+        Splits a fingerprint into (band number, band value) pairs.
+
+        Args:
+            fingerprint (int): The SimHash fingerprint.
+
+        Returns:
+            List[Tuple[int, int]]: The bands.
+        """
+        mask = (1 << self._band_bits) - 1
+        return [(i, (fingerprint >> (i * self._band_bits)) & mask) for i in range(self._bands)]
+    
+    def _simhash(self, content: str) -> int:
+        """
+        Computes a 64-bit SimHash over word shingles.
+
+        Args:
+            content (str): The content to fingerprint.
+
+        Returns:
+            int: The fingerprint.
+        """
+        words = content.lower().split()
+        if len(words) < self.shingle_size:
+            shingles = [' '.join(words)]
+        else:
+            shingles = [
+                ' '.join(words[i:i + self.shingle_size])
+                for i in range(len(words) - self.shingle_size + 1)
+            ]
+        
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), 'little') for s in shingles],
+            dtype=np.uint64
+        )
+        bits = (hashes[:, None] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+        weights = bits.sum(axis=0) * 2 - len(shingles)
+        
+        fingerprint = 0
+        for i, weight in enumerate(weights):
+            if weight > 0:
+                fingerprint |= 1 << i
+        return fingerprint
 
 class IntelligentFileProcessor:
     """
@@ -142,6 +402,9 @@ class IntelligentFileProcessor:
         max_workers (int): The maximum number of workers for parallel processing.
         chunk_size (int): The size of chunks for processing large files.
         chunk_overlap (int): The overlap between chunks.
+        deduplicator (ContentDeduplicator): The default duplicate detector used before embedding.
+        code_chunker (CodeChunker): The structure-aware chunker for code files.
+        executor (ThreadPoolExecutor): The extraction worker pool for blocking work.
     """
     
     def __init__(self, config: Dict[str, Any] = None):
@@ -194,8 +457,46 @@ class IntelligentFileProcessor:
         self.chunk_size = self.config.get('chunk_size', 1000)
         self.chunk_overlap = self.config.get('chunk_overlap', 200)
         
+        # Extraction worker pool for parsing and chunking
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="extract")
+        
+        # Structure-aware chunking for code
+        self.code_chunker = CodeChunker(
+            max_tokens=self.config.get('code_chunk_max_tokens', 400),
+            min_tokens=self.config.get('code_chunk_min_tokens', 50),
+            use_tree_sitter=self.config.get('use_tree_sitter', True)
+        )
+        
+        # Deduplication before embedding
+        self.deduplicate = self.config.get('deduplicate', True)
+        self.deduplicator = self.create_deduplicator()
+        
         logger.info(f"🚀 Intelligent File Processor is ready (Workers: {self.max_workers})")
     
+    def create_deduplicator(self) -> ContentDeduplicator:
+        """
+        Creates a duplicate detector with the configured settings.
+
+        Each scan uses its own, so concurrent scans do not share a duplicate index.
+
+        Returns:
+            ContentDeduplicator: The new duplicate detector.
+        """
+        return ContentDeduplicator(
+            shingle_size=self.config.get('dedup_shingle_size', 5),
+            max_hamming_distance=self.config.get('dedup_max_hamming_distance', 3),
+            min_length=self.config.get('dedup_min_length', 200)
+        )
+    
+    def close(self):
+        """
+        Shuts down the extraction worker pool.
+
+        Queued extractions are cancelled; running ones finish in the background.
+        """
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        logger.info("🛑 Intelligent File Processor closed")
+    
     async def process_directory_deep(self, root_path: str, 
                                    include_patterns: List[str] = None,
                                    exclude_patterns: List[str] = None) -> List[DocumentContent]:
@@ -213,22 +514,11 @@ class IntelligentFileProcessor:
         start_time = time.time()
         
         try:
-            # Create patterns for filtering
-            include_patterns = include_patterns or ['*']
-            exclude_patterns = exclude_patterns or [
-                '*.exe', '*.dll', '*.so', '*.dylib', '*.bin',
-                '*.zip', '*.tar', '*.gz', '*.rar', '*.7z',
-                '*.mp3', '*.mp4', '*.avi', '*.mov', '*.wmv',
-                '*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp',
-                '*.iso', '*.img', '*.vmdk', '*.vhd'
-            ]
-            
             # Find all files
-            all_files = self._find_files_recursive(root_path, include_patterns, exclude_patterns)
-            logger.info(f"🔍 Found {len(all_files)} files in {root_path}")
+            all_files = self.discover_files(root_path, include_patterns, exclude_patterns)
             
-            # Process in parallel
-            documents = await self._process_files_parallel(all_files)
+            # Process in parallel and drop duplicates
+            documents = await self.process_files(all_files, self.create_deduplicator())
             
             end_time = time.time()
             processing_time = end_time - start_time
@@ -242,6 +532,63 @@ class IntelligentFileProcessor:
             logger.error(f"❌ Error processing directory: {e}")
             return []
     
+    def discover_files(self, root_path: str, 
+                       include_patterns: List[str] = None,
+                       exclude_patterns: List[str] = None) -> List[str]:
+        """
+        Finds the files to process under a directory, in a stable order.
+
+        The sorted order lets a checkpointed scan resume from a cursor position.
+
+        Args:
+            root_path (str): The root path of the directory to scan.
+            include_patterns (List[str], optional): A list of patterns to include. Defaults to None.
+            exclude_patterns (List[str], optional): A list of patterns to exclude. Defaults to None.
+
+        Returns:
+            List[str]: The sorted list of file paths.
+        """
+        # Create patterns for filtering
+        include_patterns = include_patterns or ['*']
+        exclude_patterns = exclude_patterns or [
+            '*.exe', '*.dll', '*.so', '*.dylib', '*.bin',
+            '*.zip', '*.tar', '*.gz', '*.rar', '*.7z',
+            '*.mp3', '*.mp4', '*.avi', '*.mov', '*.wmv',
+            '*.jpg', '*.jpeg', '*.png', '*.gif', '*.bmp',
+            '*.iso', '*.img', '*.vmdk', '*.vhd'
+        ]
+        
+        files = sorted(self._find_files_recursive(root_path, include_patterns, exclude_patterns))
+        logger.info(f"🔍 Found {len(files)} files in {root_path}")
+        return files
+    
+    async def process_files(self, file_paths: List[str],
+                            deduplicator: ContentDeduplicator = None) -> List[DocumentContent]:
+        """
+        Extracts a set of files in parallel and drops duplicates.
+
+        The deduplication index is kept across calls, so a scan processed in
+        several batches still collapses duplicates that span batches.
+
+        Args:
+            file_paths (List[str]): A list of file paths to process.
+            deduplicator (ContentDeduplicator, optional): The scan's duplicate detector.
+                                                          Defaults to the processor's own.
+
+        Returns:
+            List[DocumentContent]: The extracted, deduplicated documents.
+        """
+        documents = await self._process_files_parallel(file_paths)
+        
+        # Drop exact and near duplicates
+        if self.deduplicate:
+            deduplicator = deduplicator or self.deduplicator
+            documents = deduplicator.deduplicate(documents)
+            dedup_stats = deduplicator.get_stats()
+            logger.info(f"🧬 Deduplicated {dedup_stats['duplicates']} files (ratio: {dedup_stats['dedup_ratio']:.2%})")
+        
+        return documents
+    
     def _find_files_recursive(self, root_path: str, include_patterns: List[str], 
                             exclude_patterns: List[str]) -> List[str]:
         """
@@ -373,12 +720,18 @@ class IntelligentFileProcessor:
                 return None
             
             # Extract content
-            content = await self._extract_content(file_path, content_type)
+            chunks = None
+            if content_type == 'code':
+                content, chunks = await self._extract_code_document(file_path)
+            else:
+                content = await self._extract_content(file_path, content_type)
             if not content:
                 return None
             
             # Create metadata
             metadata = self._create_metadata(file_path, content_type, file_size)
+            if chunks:
+                metadata['code_chunks'] = len(chunks)
             
             processing_time = time.time() - start_time
             
@@ -389,7 +742,8 @@ class IntelligentFileProcessor:
                 metadata=metadata,
                 extracted_at=datetime.now(),
                 file_size=file_size,
-                processing_time=processing_time
+                processing_time=processing_time,
+                chunks=chunks
             )
             
         except Exception as e:
@@ -506,13 +860,31 @@ class IntelligentFileProcessor:
         Returns:
             Optional[str]: The extracted code content, or None if extraction fails.
         """
+        content, _ = await self._extract_code_document(file_path)
+        return content
+    
+    async def _extract_code_document(self, file_path: Path) -> Tuple[Optional[str], Optional[List[Dict[str, Any]]]]:
+        """
+        Extracts code content and structure-aligned chunks from a file.
+
+        Structure analysis and chunking run in the extraction worker pool.
+
+        Args:
+            file_path (Path): The path to the file.
+
+        Returns:
+            Tuple[Optional[str], Optional[List[Dict[str, Any]]]]: The extracted code content and
+                the chunks (None if the language has no structure-aware chunker).
+        """
         try:
             content = await self._extract_text_content(file_path)
             if not content:
-                return None
+                return None, None
             
-            # Add metadata for code
-            code_metadata = self._analyze_code_structure(content, file_path.suffix)
+            loop = asyncio.get_event_loop()
+            code_metadata, chunks = await loop.run_in_executor(
+                self.executor, self._analyze_and_chunk_code, content, file_path.suffix.lower()
+            )
             
             # Combine metadata with content
             enhanced_content = f"// File: {file_path.name}\n"
@@ -522,11 +894,34 @@ class IntelligentFileProcessor:
             enhanced_content += "// Content:\n"
             enhanced_content += content
             
-            return enhanced_content
+            return enhanced_content, chunks
             
         except Exception as e:
             logger.error(f"❌ Could not extract code content from {file_path}: {e}")
-            return None
+            return None, None
+    
+    def _analyze_and_chunk_code(self, content: str, file_extension: str) -> Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]:
+        """
+        Analyzes code structure and splits it into chunks (runs in the worker pool).
+
+        Args:
+            content (str): The content of the code file.
+            file_extension (str): The file extension of the code file.
+
+        Returns:
+            Tuple[Dict[str, Any], Optional[List[Dict[str, Any]]]]: The code structure and the chunks.
+        """
+        code_metadata = self._analyze_code_structure(content, file_extension)
+        if not self.code_chunker.supports(file_extension):
+            return code_metadata, None
+        
+        language = code_metadata.get('language', 'Unknown')
+        chunks = []
+        for chunk in self.code_chunker.chunk(content, file_extension):
+            chunk_data = chunk.to_dict()
+            chunk_data['language'] = language
+            chunks.append(chunk_data)
+        return code_metadata, chunks
     
     def _analyze_code_structure(self, content: str, file_extension: str) -> Dict[str, Any]:
         """
@@ -688,9 +1083,7 @@ class IntelligentFileProcessor:
         """
         try:
             loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                content = await loop.run_in_executor(executor, self._extract_pdf_sync, file_path)
-            return content
+            return await loop.run_in_executor(self.executor, self._extract_pdf_sync, file_path)
         except Exception as e:
             logger.error(f"❌ Could not extract PDF content from {file_path}: {e}")
             return None
@@ -728,9 +1121,7 @@ class IntelligentFileProcessor:
         """
         try:
             loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                content = await loop.run_in_executor(executor, self._extract_docx_sync, file_path)
-            return content
+            return await loop.run_in_executor(self.executor, self._extract_docx_sync, file_path)
         except Exception as e:
             logger.error(f"❌ Could not extract DOCX content from {file_path}: {e}")
             return None
@@ -767,9 +1158,7 @@ class IntelligentFileProcessor:
         """
         try:
             loop = asyncio.get_event_loop()
-            with ThreadPoolExecutor() as executor:
-                content = await loop.run_in_executor(executor, self._extract_excel_sync, file_path)
-            return content
+            return await loop.run_in_executor(self.executor, self._extract_excel_sync, file_path)
         except Exception as e:
             logger.error(f"❌ Could not extract Excel content from {file_path}: {e}")
             return None
@@ -983,6 +1372,304 @@ class IntelligentFileProcessor:
             logger.error(f"❌ Could not extract config content from {file_path}: {e}")
             return None
 
+class ScanCheckpointStore:
+    """
+    Durable checkpoints for long-running directory scans.
+
+    Each scan job records its parameters, the sorted file list discovered at
+    start, a cursor into that list, and a per-file state:
+
+    * ``pending`` - not yet extracted.
+    * ``extracted`` - extracted and waiting in an embedding batch.
+    * ``done`` - cached and embedded.
+
+    Files dropped as duplicates are recorded with the canonical file they alias.
+
+    Attributes:
+        db_path (str): The path to the SQLite database file.
+    """
+    
+    def __init__(self, db_path: str = "./scan_checkpoints.db"):
+        """
+        Initializes the ScanCheckpointStore.
+
+        Args:
+            db_path (str, optional): The path to the SQLite database file. Defaults to "./scan_checkpoints.db".
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._init_db()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Opens a connection to the checkpoint database."""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+    
+    def _init_db(self):
+        """Creates the checkpoint tables if they do not exist."""
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scan_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    root_path TEXT NOT NULL,
+                    include_patterns TEXT,
+                    exclude_patterns TEXT,
+                    status TEXT NOT NULL,
+                    cursor INTEGER NOT NULL DEFAULT 0,
+                    total_files INTEGER NOT NULL DEFAULT 0,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scan_files (
+                    job_id TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    file_path TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    PRIMARY KEY (job_id, seq)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_files_state ON scan_files (job_id, state)")
+            conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_scan_files_path ON scan_files (job_id, file_path)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scan_aliases (
+                    job_id TEXT NOT NULL,
+                    file_path TEXT NOT NULL,
+                    canonical_path TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    PRIMARY KEY (job_id, file_path)
+                )
+            """)
+    
+    def create_job(self, job_id: str, root_path: str, file_paths: List[str],
+                   include_patterns: List[str] = None, exclude_patterns: List[str] = None):
+        """
+        Records a new scan job and its discovered file list.
+
+        Args:
+            job_id (str): The scan job ID.
+            root_path (str): The root path being scanned.
+            file_paths (List[str]): The sorted list of files to process.
+            include_patterns (List[str], optional): The include patterns. Defaults to None.
+            exclude_patterns (List[str], optional): The exclude patterns. Defaults to None.
+        """
+        now = datetime.now().isoformat()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO scan_jobs (job_id, root_path, include_patterns, exclude_patterns, status, "
+                "cursor, total_files, created_at, updated_at) VALUES (?, ?, ?, ?, 'running', 0, ?, ?, ?)",
+                (job_id, root_path, json.dumps(include_patterns), json.dumps(exclude_patterns),
+                 len(file_paths), now, now)
+            )
+            conn.executemany(
+                "INSERT INTO scan_files (job_id, seq, file_path) VALUES (?, ?, ?)",
+                [(job_id, seq, path) for seq, path in enumerate(file_paths)]
+            )
+    
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Gets a scan job with its progress counters.
+
+        Args:
+            job_id (str): The scan job ID.
+
+        Returns:
+            Optional[Dict[str, Any]]: The job, or None if it does not exist.
+        """
+        with self._lock, self._connect() as conn:
+            row = conn.execute("SELECT * FROM scan_jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if not row:
+                return None
+            counts = dict(conn.execute(
+                "SELECT state, COUNT(*) FROM scan_files WHERE job_id = ? GROUP BY state", (job_id,)
+            ).fetchall())
+            aliased = conn.execute(
+                "SELECT COUNT(*) FROM scan_aliases WHERE job_id = ?", (job_id,)
+            ).fetchone()[0]
+        
+        job = dict(row)
+        job['include_patterns'] = json.loads(job['include_patterns']) if job['include_patterns'] else None
+        job['exclude_patterns'] = json.loads(job['exclude_patterns']) if job['exclude_patterns'] else None
+        job['files_done'] = counts.get('done', 0)
+        job['files_pending_embedding'] = counts.get('extracted', 0)
+        job['files_remaining'] = counts.get('pending', 0)
+        job['files_aliased'] = aliased
+        return job
+    
+    def list_jobs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Lists the most recent scan jobs.
+
+        Args:
+            limit (int, optional): The maximum number of jobs to return. Defaults to 50.
+
+        Returns:
+            List[Dict[str, Any]]: The jobs, newest first.
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id FROM scan_jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [self.get_job(row['job_id']) for row in rows]
+    
+    def set_status(self, job_id: str, status: str, error: str = None):
+        """
+        Updates the status of a scan job.
+
+        Args:
+            job_id (str): The scan job ID.
+            status (str): The new status.
+            error (str, optional): The error message for failed jobs. Defaults to None.
+        """
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "UPDATE scan_jobs SET status = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status, error, datetime.now().isoformat(), job_id)
+            )
+    
+    def get_files(self, job_id: str, state: str, limit: int = None) -> List[str]:
+        """
+        Gets the files of a job in a given state, in discovery order.
+
+        Args:
+            job_id (str): The scan job ID.
+            state (str): The file state ('pending', 'extracted' or 'done').
+            limit (int, optional): The maximum number of files to return. Defaults to None.
+
+        Returns:
+            List[str]: The file paths.
+        """
+        query = "SELECT file_path FROM scan_files WHERE job_id = ? AND state = ? ORDER BY seq"
+        params: Tuple = (job_id, state)
+        if limit:
+            query += " LIMIT ?"
+            params += (limit,)
+        with self._lock, self._connect() as conn:
+            return [row['file_path'] for row in conn.execute(query, params).fetchall()]
+    
+    def record_aliases(self, job_id: str, aliases: List[Tuple[str, str, str]]):
+        """
+        Records files that were dropped as duplicates of a canonical file.
+
+        Args:
+            job_id (str): The scan job ID.
+            aliases (List[Tuple[str, str, str]]): The (duplicate, canonical, kind) aliases.
+        """
+        if not aliases:
+            return
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO scan_aliases (job_id, file_path, canonical_path, kind) VALUES (?, ?, ?, ?)",
+                [(job_id, path, canonical, kind) for path, canonical, kind in aliases]
+            )
+    
+    def get_aliases(self, job_id: str) -> Dict[str, str]:
+        """
+        Gets the files of a job that were dropped as duplicates.
+
+        Args:
+            job_id (str): The scan job ID.
+
+        Returns:
+            Dict[str, str]: The canonical file path of each duplicate file path.
+        """
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT file_path, canonical_path FROM scan_aliases WHERE job_id = ?", (job_id,)
+            ).fetchall()
+        return {row['file_path']: row['canonical_path'] for row in rows}
+    
+    def checkpoint_batch(self, job_id: str, file_paths: List[str], state: str):
+        """
+        Moves a batch of files to a new state and advances the cursor atomically.
+
+        The cursor counts the files that have left the 'pending' state, so it
+        advances by the number of batch files that were still pending.
+
+        Args:
+            job_id (str): The scan job ID.
+            file_paths (List[str]): The files in the batch.
+            state (str): The new state for the files.
+        """
+        with self._lock, self._connect() as conn:
+            rows = [(state, job_id, path) for path in file_paths]
+            advanced = conn.executemany(
+                "UPDATE scan_files SET state = ? WHERE job_id = ? AND file_path = ? AND state = 'pending'", rows
+            ).rowcount
+            conn.executemany(
+                "UPDATE scan_files SET state = ? WHERE job_id = ? AND file_path = ? AND state != 'pending'", rows
+            )
+            conn.execute(
+                "UPDATE scan_jobs SET cursor = cursor + ?, updated_at = ? WHERE job_id = ?",
+                (advanced, datetime.now().isoformat(), job_id)
+            )
+
+@dataclass
+class ScanRun:
+    """
+    The in-memory state of one scan job while it runs.
+
+    Attributes:
+        job_id (str): The scan job ID.
+        deduplicator (ContentDeduplicator): The job's duplicate index.
+        metrics (PerformanceMetrics): The job's performance metrics.
+        started (bool): Whether the run has started processing files.
+        content_types (Dict[str, int]): The number of documents of each content type.
+        file_extensions (Dict[str, int]): The number of documents with each file extension.
+        total_size (int): The total size of the documents in bytes.
+        sample (List[Dict[str, Any]]): Summaries of the first documents, for the report.
+    """
+    job_id: str
+    deduplicator: ContentDeduplicator
+    metrics: PerformanceMetrics
+    started: bool = False
+    content_types: Dict[str, int] = field(default_factory=dict)
+    file_extensions: Dict[str, int] = field(default_factory=dict)
+    total_size: int = 0
+    sample: List[Dict[str, Any]] = field(default_factory=list)
+    
+    def summarize(self, documents: List[DocumentContent], sample_size: int = 100):
+        """
+        Adds a batch of documents to the run's report counters.
+
+        Only the counters and a bounded sample are kept, so a run's memory does
+        not grow with the number of documents it scans.
+
+        Args:
+            documents (List[DocumentContent]): The documents extracted from a batch.
+            sample_size (int, optional): The number of document summaries to keep. Defaults to 100.
+        """
+        for doc in documents:
+            self.content_types[doc.content_type] = self.content_types.get(doc.content_type, 0) + 1
+            ext = doc.metadata.get('file_extension', 'unknown')
+            self.file_extensions[ext] = self.file_extensions.get(ext, 0) + 1
+            self.total_size += doc.file_size
+            if len(self.sample) < sample_size:
+                self.sample.append({
+                    'file_path': doc.file_path,
+                    'content_type': doc.content_type,
+                    'file_size': doc.file_size,
+                    'processing_time': doc.processing_time,
+                    'metadata': doc.metadata
+                })
+
+def _new_metrics() -> PerformanceMetrics:
+    """Creates zeroed performance metrics."""
+    return PerformanceMetrics(
+        start_time=0,
+        end_time=0,
+        files_processed=0,
+        documents_extracted=0,
+        embeddings_generated=0,
+        cache_hits=0,
+        cache_misses=0,
+        errors=[]
+    )
+
 class EnhancedRAGSystem:
     """
     A high-performance Enhanced RAG System.
@@ -990,8 +1677,9 @@ class EnhancedRAGSystem:
     Attributes:
         config (Dict[str, Any]): The configuration for the RAG system.
         file_processor (IntelligentFileProcessor): The file processor instance.
-        metrics (PerformanceMetrics): The performance metrics for the system.
+        metrics (PerformanceMetrics): The performance metrics for the system, accumulated over scans.
         cache: The Redis cache instance.
+        checkpoints (ScanCheckpointStore): The durable store for scan job progress.
     """
     
     def __init__(self, config: Dict[str, Any] = None):
@@ -1004,19 +1692,10 @@ class EnhancedRAGSystem:
         self.config = config or {}
         
         # Initialize components
-        self.file_processor = IntelligentFileProcessor(config.get('file_processor', {}))
+        self.file_processor = IntelligentFileProcessor(self.config.get('file_processor', {}))
         
         # Performance monitoring
-        self.metrics = PerformanceMetrics(
-            start_time=0,
-            end_time=0,
-            files_processed=0,
-            documents_extracted=0,
-            embeddings_generated=0,
-            cache_hits=0,
-            cache_misses=0,
-            errors=[]
-        )
+        self.metrics = _new_metrics()
         
         # Cache system
         self.cache = redis.Redis(
@@ -1026,179 +1705,501 @@ class EnhancedRAGSystem:
             decode_responses=True
         )
         
+        # Binary client for compressed document values
+        self.binary_cache = redis.Redis(
+            host=self.config.get("redis_host", "localhost"),
+            port=self.config.get("redis_port", 6379),
+            db=self.config.get("redis_db", 1),
+            decode_responses=False
+        )
+        
+        # Bulk caching settings
+        self.cache_ttl = self.config.get('cache_ttl', 3600)
+        self.cache_batch_size = self.config.get('cache_batch_size', 500)
+        self.cache_compression_threshold = self.config.get('cache_compression_threshold', 1024)
+        self.cache_content_limit = self.config.get('cache_content_limit', 10000)
+        
+        # Checkpointed scans
+        self.checkpoints = ScanCheckpointStore(self.config.get('scan_checkpoint_db', './scan_checkpoints.db'))
+        self.scan_batch_size = self.config.get('scan_batch_size', 200)
+        self._scan_controls: Dict[str, str] = {}
+        self._active_scans: Dict[str, ScanRun] = {}
+        
+        # Embedding stage
+        self._rag_system = None
+        self.embedding_document_concurrency = self.config.get('embedding_document_concurrency', 64)
+        
         logger.info("🚀 Enhanced RAG System is ready")
     
     async def scan_directory_deep(self, root_path: str, 
                                 include_patterns: List[str] = None,
                                 exclude_patterns: List[str] = None,
-                                max_depth: int = 10) -> Dict[str, Any]:
+                                max_depth: int = 10,
+                                job_id: str = None) -> Dict[str, Any]:
         """
         Scans a directory deeply.
 
+        The scan runs as a durable job: files are processed in batches of
+        `scan_batch_size` and progress is checkpointed after each batch, so an
+        interrupted scan can be continued with `resume_scan`.
+
         Args:
             root_path (str): The root path of the directory to scan.
             include_patterns (List[str], optional): A list of patterns to include. Defaults to None.
             exclude_patterns (List[str], optional): A list of patterns to exclude. Defaults to None.
             max_depth (int, optional): The maximum depth to scan. Defaults to 10.
+            job_id (str, optional): The ID to give the scan job. Defaults to a generated ID.
 
         Returns:
-            Dict[str, Any]: A report of the scan.
+            Dict[str, Any]: A report of the scan, including its 'job_id' and 'status'.
         """
-        start_time = time.time()
-        self.metrics.start_time = start_time
+        job_id = job_id or uuid.uuid4().hex
         
         try:
-            logger.info(f"🔍 Starting deep scan of directory: {root_path}")
-            
-            # Process files
-            documents = await self.file_processor.process_directory_deep(
-                root_path, include_patterns, exclude_patterns
-            )
-            
-            # Update metrics
-            self.metrics.files_processed = len(documents)
-            self.metrics.documents_extracted = len(documents)
+            logger.info(f"🔍 Starting deep scan of directory: {root_path} (job {job_id})")
             
-            # Cache documents
-            await self._cache_documents(documents)
+            file_paths = self.file_processor.discover_files(root_path, include_patterns, exclude_patterns)
+            self.checkpoints.create_job(job_id, root_path, file_paths, include_patterns, exclude_patterns)
             
-            # Generate embeddings (if needed)
-            if self.config.get('generate_embeddings', True):
-                await self._generate_embeddings_batch(documents)
-            
-            end_time = time.time()
-            self.metrics.end_time = end_time
-            
-            # Create report
-            report = self._create_scan_report(documents)
+        except Exception as e:
+            logger.error(f"❌ Error during scan: {e}")
+            self.metrics.errors.append(str(e))
+            return {'job_id': job_id, 'status': 'failed', 'error': str(e)}
+        
+        return await self._run_scan(self._claim_scan(job_id))
+    
+    async def resume_scan(self, job_id: str) -> Dict[str, Any]:
+        """
+        Resumes an interrupted or paused scan from its last checkpoint.
+
+        Files already embedded are skipped. Files that were extracted but not
+        yet embedded when the scan stopped are re-extracted and embedded first.
+        A job claimed with `prepare_resume` is run as claimed.
+
+        Args:
+            job_id (str): The scan job ID.
+
+        Returns:
+            Dict[str, Any]: A report of the resumed scan, or a dict with an 'error' key.
+        """
+        run = self._active_scans.get(job_id)
+        if run is None or run.started:
+            prepared = self.prepare_resume(job_id)
+            if 'error' in prepared:
+                return prepared
+            run = self._active_scans[job_id]
+        
+        job = self.checkpoints.get_job(job_id)
+        logger.info(f"🔁 Resuming scan {job_id} at file {job['cursor']}/{job['total_files']}")
+        self.checkpoints.set_status(job_id, 'running')
+        return await self._run_scan(run)
+    
+    def prepare_resume(self, job_id: str) -> Dict[str, Any]:
+        """
+        Checks that a scan can be resumed and marks it active, before `resume_scan` runs.
+
+        Claiming the job synchronously lets a caller that runs `resume_scan` in the
+        background reject a second resume of the same job straight away.
+
+        Args:
+            job_id (str): The scan job ID.
+
+        Returns:
+            Dict[str, Any]: The 'job_id', with an 'error' key if the scan cannot be resumed.
+        """
+        job = self.checkpoints.get_job(job_id)
+        if not job:
+            return {'job_id': job_id, 'error': f"Scan job not found: {job_id}"}
+        if job['status'] in ('completed', 'cancelled'):
+            return {'job_id': job_id, 'error': f"Scan job is already {job['status']}"}
+        if job_id in self._active_scans:
+            return {'job_id': job_id, 'error': "Scan job is already running"}
+        self._claim_scan(job_id)
+        return {'job_id': job_id}
+    
+    def _claim_scan(self, job_id: str) -> ScanRun:
+        """
+        Marks a scan job active with its own duplicate index and metrics.
+
+        A pause or cancel left over from an earlier run of the job is dropped;
+        one requested after the claim is honoured before the first batch.
+
+        Args:
+            job_id (str): The scan job ID.
+
+        Returns:
+            ScanRun: The job's run state.
+        """
+        run = ScanRun(job_id, self.file_processor.create_deduplicator(), _new_metrics())
+        self._scan_controls.pop(job_id, None)
+        self._active_scans[job_id] = run
+        return run
+    
+    def pause_scan(self, job_id: str) -> bool:
+        """
+        Requests that a running scan stop after its current batch.
+
+        Args:
+            job_id (str): The scan job ID.
+
+        Returns:
+            bool: True if the scan was running and will pause, False otherwise.
+        """
+        if job_id not in self._active_scans:
+            return False
+        self._scan_controls[job_id] = 'paused'
+        return True
+    
+    def cancel_scan(self, job_id: str) -> bool:
+        """
+        Cancels a scan. A running scan stops after its current batch.
+
+        Args:
+            job_id (str): The scan job ID.
+
+        Returns:
+            bool: True if the scan was cancelled, False if it does not exist or has finished.
+        """
+        job = self.checkpoints.get_job(job_id)
+        if not job or job['status'] in ('completed', 'cancelled'):
+            return False
+        if job_id in self._active_scans:
+            self._scan_controls[job_id] = 'cancelled'
+        else:
+            self.checkpoints.set_status(job_id, 'cancelled')
+        return True
+    
+    def get_scan_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Gets the status and progress of a scan job.
+
+        Args:
+            job_id (str): The scan job ID.
+
+        Returns:
+            Optional[Dict[str, Any]]: The job status, or None if it does not exist.
+        """
+        job = self.checkpoints.get_job(job_id)
+        if job:
+            job['active'] = job_id in self._active_scans
+            job['requested'] = self._scan_controls.get(job_id)
+        return job
+    
+    async def _run_scan(self, run: ScanRun) -> Dict[str, Any]:
+        """
+        Processes the remaining files of a scan job batch by batch.
+
+        Args:
+            run (ScanRun): The claimed job's run state.
+
+        Returns:
+            Dict[str, Any]: A report of the work done in this run.
+        """
+        job_id = run.job_id
+        run.started = True
+        start_time = time.time()
+        run.metrics.start_time = start_time
+        status = 'running'
+        
+        try:
+            # Batches that were extracted but not embedded before an interruption go first
+            batch = self.checkpoints.get_files(job_id, 'extracted')
             
-            logger.info(f"✅ Scan complete: {len(documents)} documents in {end_time - start_time:.2f} seconds")
+            while True:
+                status = self._scan_controls.pop(job_id, 'running')
+                if status != 'running':
+                    break
+                
+                batch = batch or self.checkpoints.get_files(job_id, 'pending', limit=self.scan_batch_size)
+                if not batch:
+                    status = 'completed'
+                    break
+                
+                await self._process_scan_batch(run, batch)
+                batch = None
             
-            return report
+            self.checkpoints.set_status(job_id, status)
             
         except Exception as e:
             logger.error(f"❌ Error during scan: {e}")
-            self.metrics.errors.append(str(e))
-            return {'error': str(e)}
+            run.metrics.errors.append(str(e))
+            status = 'failed'
+            self.checkpoints.set_status(job_id, status, str(e))
+        finally:
+            self._active_scans.pop(job_id, None)
+        
+        end_time = time.time()
+        run.metrics.end_time = end_time
+        self._add_scan_metrics(run.metrics)
+        
+        # Create report
+        report = self._create_scan_report(run)
+        report['job_id'] = job_id
+        report['status'] = status
+        report['progress'] = self.checkpoints.get_job(job_id)
+        
+        logger.info(f"✅ Scan {job_id} {status}: {run.metrics.documents_extracted} documents in {end_time - start_time:.2f} seconds")
+        
+        return report
     
-    async def _cache_documents(self, documents: List[DocumentContent]):
+    async def _process_scan_batch(self, run: ScanRun, file_paths: List[str]):
         """
-        Caches documents.
+        Extracts, caches and embeds one batch of a scan job, checkpointing between steps.
+
+        Args:
+            run (ScanRun): The job's run state.
+            file_paths (List[str]): The files in the batch.
+        """
+        job_id = run.job_id
+        deduplicator = run.deduplicator
+        documents = await self.file_processor.process_files(file_paths, deduplicator)
+        self.checkpoints.record_aliases(job_id, deduplicator.last_aliases)
+        self.checkpoints.checkpoint_batch(job_id, file_paths, 'extracted')
+        
+        # Update metrics
+        run.metrics.files_processed += len(file_paths)
+        run.metrics.documents_extracted += len(documents)
+        run.summarize(documents)
+        
+        # Cache documents, and store the new aliases of documents cached by earlier batches
+        await self._cache_documents(documents, metrics=run.metrics)
+        if deduplicator.updated:
+            await self._cache_documents(deduplicator.updated, force=True, metrics=run.metrics)
+        
+        # Generate embeddings (if needed)
+        if self.config.get('generate_embeddings', True):
+            await self._generate_embeddings_batch(documents, run.metrics)
+        
+        self.checkpoints.checkpoint_batch(job_id, file_paths, 'done')
+    
+    def _add_scan_metrics(self, metrics: PerformanceMetrics):
+        """
+        Adds a finished scan run's counters and duration to the system-wide metrics.
+
+        Args:
+            metrics (PerformanceMetrics): The run's metrics.
+        """
+        self.metrics.end_time += metrics.total_time
+        self.metrics.files_processed += metrics.files_processed
+        self.metrics.documents_extracted += metrics.documents_extracted
+        self.metrics.embeddings_generated += metrics.embeddings_generated
+        self.metrics.cache_writes += metrics.cache_writes
+        self.metrics.cache_skips += metrics.cache_skips
+        self.metrics.errors.extend(metrics.errors)
+    
+    async def _cache_documents(self, documents: List[DocumentContent], force: bool = False,
+                               metrics: PerformanceMetrics = None):
+        """
+        Caches documents in bulk.
+
+        Documents are written in chunks of `cache_batch_size` using Redis pipelines,
+        so each chunk costs two round trips: one MGET for the stored content hashes
+        and one pipelined write. Documents whose content hash matches the cached
+        entry only have their TTL refreshed.
 
         Args:
             documents (List[DocumentContent]): A list of documents to cache.
+            force (bool, optional): Rewrite entries even if their content is unchanged,
+                                    e.g. when their metadata changed. Defaults to False.
+            metrics (PerformanceMetrics, optional): The metrics to count writes in. Defaults to the system's.
         """
+        metrics = metrics or self.metrics
         try:
-            for doc in documents:
-                cache_key = f"doc:{hashlib.md5(doc.file_path.encode()).hexdigest()}"
-                cache_data = {
-                    'file_path': doc.file_path,
-                    'content_type': doc.content_type,
-                    'content': doc.content[:10000],  # Limit size
-                    'metadata': doc.metadata,
-                    'extracted_at': doc.extracted_at.isoformat(),
-                    'file_size': doc.file_size,
-                    'processing_time': doc.processing_time
-                }
-                
-                # Cache for 1 hour
-                self.cache.setex(cache_key, 3600, json.dumps(cache_data))
+            loop = asyncio.get_event_loop()
+            written = 0
+            skipped = 0
+            
+            for i in range(0, len(documents), self.cache_batch_size):
+                chunk = documents[i:i + self.cache_batch_size]
+                chunk_written, chunk_skipped = await loop.run_in_executor(
+                    None, self._write_cache_chunk, chunk, force
+                )
+                written += chunk_written
+                skipped += chunk_skipped
             
-            logger.info(f"✅ Cached {len(documents)} documents")
+            metrics.cache_writes += written
+            metrics.cache_skips += skipped
+            logger.info(f"✅ Cached {written} documents ({skipped} unchanged)")
             
         except Exception as e:
             logger.error(f"❌ Error during caching: {e}")
     
-    async def _generate_embeddings_batch(self, documents: List[DocumentContent]):
+    def _write_cache_chunk(self, documents: List[DocumentContent], force: bool = False) -> Tuple[int, int]:
+        """
+        Writes a chunk of documents to the cache with a single pipeline.
+
+        Args:
+            documents (List[DocumentContent]): The documents in the chunk.
+            force (bool, optional): Rewrite entries even if their content is unchanged. Defaults to False.
+
+        Returns:
+            Tuple[int, int]: The number of documents written and skipped.
+        """
+        cache_keys = [self._document_cache_key(doc.file_path) for doc in documents]
+        hash_keys = [f"doc_hash:{key[len('doc:'):]}" for key in cache_keys]
+        content_hashes = [
+            hashlib.sha256(doc.content.encode('utf-8', errors='ignore')).hexdigest()
+            for doc in documents
+        ]
+        
+        cached_hashes = self.binary_cache.mget(hash_keys)
+        
+        pipe = self.binary_cache.pipeline(transaction=False)
+        written = 0
+        skipped = 0
+        
+        for doc, cache_key, hash_key, content_hash, cached_hash in zip(
+            documents, cache_keys, hash_keys, content_hashes, cached_hashes
+        ):
+            if not force and cached_hash is not None and cached_hash.decode() == content_hash:
+                pipe.expire(cache_key, self.cache_ttl)
+                pipe.expire(hash_key, self.cache_ttl)
+                skipped += 1
+                continue
+            
+            cache_data = {
+                'file_path': doc.file_path,
+                'content_type': doc.content_type,
+                'content': doc.content[:self.cache_content_limit],  # Limit size
+                'metadata': doc.metadata,
+                'extracted_at': doc.extracted_at.isoformat(),
+                'file_size': doc.file_size,
+                'processing_time': doc.processing_time,
+                'content_hash': content_hash
+            }
+            value = encode_cache_value(
+                json.dumps(cache_data).encode('utf-8'),
+                self.cache_compression_threshold
+            )
+            pipe.set(cache_key, value, ex=self.cache_ttl)
+            pipe.set(hash_key, content_hash, ex=self.cache_ttl)
+            written += 1
+        
+        pipe.execute()
+        return written, skipped
+    
+    def _document_cache_key(self, file_path: str) -> str:
+        """
+        Builds the cache key for a document.
+
+        Args:
+            file_path (str): The path to the document.
+
+        Returns:
+            str: The cache key.
+        """
+        return f"doc:{hashlib.md5(file_path.encode()).hexdigest()}"
+    
+    def get_cached_document(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        Gets a cached document.
+
+        Args:
+            file_path (str): The path to the document.
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached document data, or None if it is not cached.
+        """
+        try:
+            raw = self.binary_cache.get(self._document_cache_key(file_path))
+            if raw is None:
+                self.metrics.cache_misses += 1
+                return None
+            
+            self.metrics.cache_hits += 1
+            return json.loads(decode_cache_value(raw))
+            
+        except Exception as e:
+            logger.error(f"❌ Error reading cached document {file_path}: {e}")
+            return None
+    
+    async def _generate_embeddings_batch(self, documents: List[DocumentContent],
+                                         metrics: PerformanceMetrics = None):
         """
         Generates embeddings in a batch.
 
         Args:
             documents (List[DocumentContent]): A list of documents to generate embeddings for.
+            metrics (PerformanceMetrics, optional): The metrics to count embeddings in. Defaults to the system's.
         """
+        metrics = metrics or self.metrics
         try:
-            # Use the original RAG system
-            from .rag_system import RAGSystem
-            
-            rag = RAGSystem(self.config)
+            rag = self._get_rag_system()
+            semaphore = asyncio.Semaphore(self.embedding_document_concurrency)
             
-            for doc in documents:
-                if doc.content:
+            async def add_document(doc: DocumentContent):
+                async with semaphore:
                     success = await rag.add_document(
                         content=doc.content,
                         metadata=doc.metadata,
-                        source=doc.file_path
+                        source=doc.file_path,
+                        chunks=doc.chunks
                     )
-                    if success:
-                        self.metrics.embeddings_generated += 1
+                if success:
+                    metrics.embeddings_generated += 1
             
-            logger.info(f"✅ Generated embeddings for {self.metrics.embeddings_generated} documents")
+            # The embedding limiter adapts the number of concurrent provider calls
+            await asyncio.gather(*(add_document(doc) for doc in documents if doc.content))
+            
+            logger.info(f"✅ Generated embeddings for {metrics.embeddings_generated} documents")
             
         except Exception as e:
             logger.error(f"❌ Error generating embeddings: {e}")
     
-    def _create_scan_report(self, documents: List[DocumentContent]) -> Dict[str, Any]:
+    def _get_rag_system(self):
+        """
+        Gets the RAG system used for embeddings, creating it on first use.
+
+        Reusing one instance keeps the adaptive embedding limiter's state across batches.
+
+        Returns:
+            RAGSystem: The shared RAG system.
+        """
+        if self._rag_system is None:
+            # Use the original RAG system
+            from .rag_system import RAGSystem
+            self._rag_system = RAGSystem(self.config)
+        return self._rag_system
+    
+    def _create_scan_report(self, run: ScanRun) -> Dict[str, Any]:
         """
-        Creates a scan report.
+        Creates a scan report from a run's counters.
 
         Args:
-            documents (List[DocumentContent]): A list of processed documents.
+            run (ScanRun): The scan run to report on.
 
         Returns:
             Dict[str, Any]: A dictionary representing the scan report.
         """
+        metrics = run.metrics
         try:
-            # Group by content type
-            content_types = {}
-            file_extensions = {}
-            total_size = 0
-            
-            for doc in documents:
-                # Content types
-                content_type = doc.content_type
-                if content_type not in content_types:
-                    content_types[content_type] = 0
-                content_types[content_type] += 1
-                
-                # File extensions
-                ext = doc.metadata.get('file_extension', 'unknown')
-                if ext not in file_extensions:
-                    file_extensions[ext] = 0
-                file_extensions[ext] += 1
-                
-                # Total size
-                total_size += doc.file_size
-            
             # Performance metrics
             performance = {
-                'total_time': self.metrics.total_time,
-                'files_per_second': self.metrics.files_per_second,
-                'documents_per_second': self.metrics.documents_per_second,
-                'embeddings_generated': self.metrics.embeddings_generated,
-                'cache_hits': self.metrics.cache_hits,
-                'cache_misses': self.metrics.cache_misses
+                'total_time': metrics.total_time,
+                'files_per_second': metrics.files_per_second,
+                'documents_per_second': metrics.documents_per_second,
+                'embeddings_generated': metrics.embeddings_generated,
+                'cache_hits': metrics.cache_hits,
+                'cache_misses': metrics.cache_misses,
+                'cache_writes': metrics.cache_writes,
+                'cache_skips': metrics.cache_skips
             }
             
+            # Deduplication
+            deduplication = run.deduplicator.get_stats()
+            
             return {
                 'summary': {
-                    'total_documents': len(documents),
-                    'total_size_bytes': total_size,
-                    'total_size_mb': total_size / (1024 * 1024),
-                    'content_types': content_types,
-                    'file_extensions': dict(sorted(file_extensions.items(), key=lambda x: x[1], reverse=True)[:20]),
-                    'performance': performance
+                    'total_documents': metrics.documents_extracted,
+                    'total_size_bytes': run.total_size,
+                    'total_size_mb': run.total_size / (1024 * 1024),
+                    'content_types': dict(run.content_types),
+                    'file_extensions': dict(sorted(run.file_extensions.items(), key=lambda x: x[1], reverse=True)[:20]),
+                    'performance': performance,
+                    'deduplication': deduplication
                 },
-                'documents': [
-                    {
-                        'file_path': doc.file_path,
-                        'content_type': doc.content_type,
-                        'file_size': doc.file_size,
-                        'processing_time': doc.processing_time,
-                        'metadata': doc.metadata
-                    }
-                    for doc in documents[:100]  # Limit to the first 100 documents
-                ],
-                'errors': self.metrics.errors
+                'documents': run.sample,  # The first 100 documents
+                'errors': metrics.errors
             }
             
         except Exception as e:
@@ -1231,8 +2232,7 @@ class EnhancedRAGSystem:
             self.metrics.cache_misses += 1
             
             # Search in the RAG system
-            from .rag_system import RAGSystem
-            rag = RAGSystem(self.config)
+            rag = self._get_rag_system()
             
             results = await rag.search(query, top_k)
             
@@ -1273,5 +2273,23 @@ class EnhancedRAGSystem:
             'cache_hits': self.metrics.cache_hits,
             'cache_misses': self.metrics.cache_misses,
             'cache_hit_rate': self.metrics.cache_hits / (self.metrics.cache_hits + self.metrics.cache_misses) if (self.metrics.cache_hits + self.metrics.cache_misses) > 0 else 0,
+            'cache_writes': self.metrics.cache_writes,
+            'cache_skips': self.metrics.cache_skips,
+            'embedding_concurrency': self._get_embedding_limiter_stats(),
             'errors': self.metrics.errors
         }
+    
+    def _get_embedding_limiter_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Gets the adaptive embedding limiter state, if embeddings have been generated.
+
+        Returns:
+            Optional[Dict[str, Any]]: The limiter state, or None if it does not exist yet.
+        """
+        if self._rag_system is None or self._rag_system.embedding_provider.limiter is None:
+            return None
+        return self._rag_system.embedding_provider.limiter.get_stats()
+    
+    def close(self):
+        """Releases the file processor's extraction workers."""
+        self.file_processor.close()
@@ -16,6 +16,8 @@ import asyncio
 import json
 import logging
 import hashlib
+import time
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union, Tuple
 from dataclasses import dataclass, asdict
@@ -87,19 +89,185 @@ class RAGResponse:
     context_used: str
     processing_time: float
 
+class AdaptiveConcurrencyLimiter:
+    """
+    An AIMD (additive increase, multiplicative decrease) concurrency limiter.
+
+    The limit grows by roughly one slot per window of successful calls while
+    latency stays near its baseline, and is cut by `decrease_factor` when a call
+    is rejected as overloaded (HTTP 429/5xx, timeouts) or its latency exceeds
+    `latency_tolerance` times the baseline. At most one decrease is applied per
+    window: calls started before the last decrease cannot trigger another one.
+
+    Attributes:
+        limit (float): The current concurrency limit.
+        min_limit (int): The lowest allowed limit.
+        max_limit (int): The highest allowed limit.
+        in_flight (int): The number of calls currently holding a slot.
+    """
+    
+    def __init__(self, initial_limit: int = 4, min_limit: int = 1, max_limit: int = 64,
+                 decrease_factor: float = 0.5, latency_tolerance: float = 2.0,
+                 baseline_alpha: float = 0.05, warmup_samples: int = 5):
+        """
+        Initializes the AdaptiveConcurrencyLimiter.
+
+        Args:
+            initial_limit (int, optional): The starting limit. Defaults to 4.
+            min_limit (int, optional): The lowest allowed limit. Defaults to 1.
+            max_limit (int, optional): The highest allowed limit. Defaults to 64.
+            decrease_factor (float, optional): The multiplier applied on overload. Defaults to 0.5.
+            latency_tolerance (float, optional): The latency/baseline ratio treated as a spike. Defaults to 2.0.
+            baseline_alpha (float, optional): The smoothing factor of the latency baseline. Defaults to 0.05.
+            warmup_samples (int, optional): Successful calls needed before latency spikes count. Defaults to 5.
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial_limit, self.min_limit), self.max_limit))
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.baseline_alpha = baseline_alpha
+        self.warmup_samples = warmup_samples
+        
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        self._samples = 0
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        
+        self.stats = {
+            'successes': 0,
+            'overloads': 0,
+            'errors': 0,
+            'increases': 0,
+            'decreases': 0
+        }
+        self.decisions = deque(maxlen=20)
+    
+    @property
+    def condition(self) -> asyncio.Condition:
+        """The condition guarding the slot count, created inside the running loop."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+    
+    async def acquire(self) -> float:
+        """
+        Waits for a free slot under the current limit.
+
+        Returns:
+            float: The start time to pass back to `release`.
+        """
+        async with self.condition:
+            await self.condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return time.monotonic()
+    
+    async def release(self, started_at: float, outcome: str):
+        """
+        Frees a slot and adjusts the limit from the call outcome.
+
+        Args:
+            started_at (float): The value returned by `acquire`.
+            outcome (str): 'success', 'overload' (429/5xx/timeout) or 'error' (any other failure).
+        """
+        latency = time.monotonic() - started_at
+        async with self.condition:
+            self.in_flight -= 1
+            
+            if outcome == 'overload':
+                self.stats['overloads'] += 1
+                self._decrease(started_at, 'overload')
+            elif outcome == 'success':
+                self.stats['successes'] += 1
+                if self._is_latency_spike(latency):
+                    self._decrease(started_at, f'latency {latency * 1000:.0f}ms')
+                else:
+                    self._update_baseline(latency)
+                    self._increase()
+            else:
+                self.stats['errors'] += 1
+            
+            self.condition.notify_all()
+    
+    def _is_latency_spike(self, latency: float) -> bool:
+        """Checks whether a latency is far above the baseline."""
+        return (
+            self._samples >= self.warmup_samples
+            and self.baseline_latency is not None
+            and latency > self.baseline_latency * self.latency_tolerance
+        )
+    
+    def _update_baseline(self, latency: float):
+        """Folds a normal latency sample into the baseline."""
+        self._samples += 1
+        if self.baseline_latency is None:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency += self.baseline_alpha * (latency - self.baseline_latency)
+    
+    def _increase(self):
+        """Adds about one slot per window of successful calls."""
+        if self.limit >= self.max_limit:
+            return
+        previous = int(self.limit)
+        self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        if int(self.limit) > previous:
+            self.stats['increases'] += 1
+            self._record('increase', 'success window')
+    
+    def _decrease(self, started_at: float, reason: str):
+        """Cuts the limit, at most once per window."""
+        if started_at < self._last_decrease:
+            return
+        self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+        self._last_decrease = time.monotonic()
+        self.stats['decreases'] += 1
+        self._record('decrease', reason)
+    
+    def _record(self, action: str, reason: str):
+        """Keeps a short history of limit changes."""
+        self.decisions.append({
+            'time': datetime.now().isoformat(),
+            'action': action,
+            'reason': reason,
+            'limit': int(self.limit)
+        })
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gets the current limit and recent decisions.
+
+        Returns:
+            Dict[str, Any]: The limiter state.
+        """
+        return {
+            'limit': int(self.limit),
+            'in_flight': self.in_flight,
+            'min_limit': self.min_limit,
+            'max_limit': self.max_limit,
+            'baseline_latency_ms': self.baseline_latency * 1000 if self.baseline_latency is not None else None,
+            **self.stats,
+            'recent_decisions': list(self.decisions)
+        }
+
 class EmbeddingProvider:
     """A provider for Embedding Models that uses the UnifiedAIClient."""
 
-    def __init__(self, provider_type: str = "ollama", model_name: str = "nomic-embed-text"):
+    def __init__(self, provider_type: str = "ollama", model_name: str = "nomic-embed-text",
+                 limiter: Optional[AdaptiveConcurrencyLimiter] = None):
         """
         Initializes the EmbeddingProvider.
 
         Args:
             provider_type (str, optional): The type of embedding provider. Defaults to "ollama".
             model_name (str, optional): The name of the embedding model. Defaults to "nomic-embed-text".
+            limiter (Optional[AdaptiveConcurrencyLimiter], optional): The limiter bounding concurrent
+                embedding calls. Defaults to None (unbounded).
         """
         self.provider_type = provider_type
         self.model_name = model_name
+        self.limiter = limiter
         self.ai_client = get_client()
         if not self.ai_client.get_provider(self.provider_type):
              logger.warning(f"⚠️ Provider '{self.provider_type}' not available in UnifiedAIClient.")
@@ -119,18 +287,22 @@ class EmbeddingProvider:
             return False
         try:
             # A simple embedding call to test the connection.
-            result = self.ai_client.embed(self.provider_type, "test", model=self.model_name)
+            result = await self.ai_client.aembed(self.provider_type, "test", model=self.model_name)
             return result.get('success', False)
         except Exception as e:
             logger.error(f"❌ Connection test failed for {self.provider_type}: {e}")
             return False
 
-    async def get_embedding(self, text: str) -> Optional[List[float]]:
+    async def get_embedding(self, text: str, priority: str = "interactive",
+                            user_id: Optional[str] = None) -> Optional[List[float]]:
         """
         Creates an embedding for a text using the UnifiedAIClient.
 
         Args:
             text (str): The text to create an embedding for.
+            priority (str, optional): The rate-limit priority class: "interactive" for
+                queries, "background" for indexing. Defaults to "interactive".
+            user_id (Optional[str], optional): The user the call is made for. Defaults to None.
 
         Returns:
             Optional[List[float]]: The created embedding, or None if an error occurred.
@@ -138,17 +310,45 @@ class EmbeddingProvider:
         if not self.is_ready:
             logger.error(f"❌ Embedding provider '{self.provider_type}' is not ready.")
             return None
+        if not self.ai_client.is_available(self.provider_type, self.model_name):
+            # Fail fast instead of queueing behind the limiter for an open circuit
+            return None
 
+        started_at = await self.limiter.acquire() if self.limiter else None
+        outcome = 'error'
         try:
-            result = self.ai_client.embed(self.provider_type, text, model=self.model_name)
+            result = await self.ai_client.aembed(
+                self.provider_type, text, model=self.model_name, priority=priority, user_id=user_id
+            )
             if result and result.get('success'):
+                outcome = 'success'
                 return result.get('embedding')
             else:
-                logger.error(f"❌ Error creating embedding with {self.provider_type}: {result.get('error')}")
+                outcome = self._classify_failure(result or {})
+                logger.error(f"❌ Error creating embedding with {self.provider_type}: {(result or {}).get('error')}")
                 return None
         except Exception as e:
             logger.error(f"❌ Exception during embedding: {e}")
             return None
+        finally:
+            if self.limiter:
+                await self.limiter.release(started_at, outcome)
+
+    @staticmethod
+    def _classify_failure(result: Dict[str, Any]) -> str:
+        """
+        Classifies a failed embedding result for the concurrency limiter.
+
+        Args:
+            result (Dict[str, Any]): The failed result from the UnifiedAIClient.
+
+        Returns:
+            str: 'overload' for rate limits, server errors and timeouts, otherwise 'error'.
+        """
+        status_code = result.get('status_code')
+        if result.get('timeout') or status_code == 429 or (status_code is not None and status_code >= 500):
+            return 'overload'
+        return 'error'
 
 class VectorDatabase:
     """Vector Database Manager."""
@@ -671,6 +871,57 @@ class DocumentProcessor:
             logger.error(f"❌ Error processing document: {e}")
             return []
     
+    def process_chunks(self, chunks: List[Dict[str, Any]], metadata: Dict[str, Any], source: str) -> List[Document]:
+        """
+        Converts pre-split, structure-aligned chunks into documents.
+
+        Unlike process_document, the chunk text is kept verbatim so that code
+        indentation and line structure survive into the index.
+
+        Args:
+            chunks (List[Dict[str, Any]]): The chunks, each with at least a 'content' key.
+            metadata (Dict[str, Any]): The metadata of the document.
+            source (str): The source of the document.
+
+        Returns:
+            List[Document]: A list of document chunks.
+        """
+        try:
+            documents = []
+            for i, chunk in enumerate(chunks):
+                text = chunk.get("content", "")
+                if not text.strip():
+                    continue
+                
+                chunk_metadata = {
+                    **metadata,
+                    "chunk_index": i,
+                    "total_chunks": len(chunks),
+                    "chunk_size": len(text)
+                }
+                for key in ("start_line", "end_line", "language"):
+                    if key in chunk:
+                        chunk_metadata[key] = chunk[key]
+                if "kind" in chunk:
+                    chunk_metadata["chunk_kind"] = chunk["kind"]
+                if chunk.get("symbols"):
+                    chunk_metadata["symbols"] = ", ".join(chunk["symbols"])
+                
+                documents.append(Document(
+                    id=self._generate_doc_id(source, i, text),
+                    content=text,
+                    metadata=chunk_metadata,
+                    source=source,
+                    chunk_index=i
+                ))
+            
+            logger.info(f"✅ Processed document {source} into {len(documents)} structural chunks")
+            return documents
+            
+        except Exception as e:
+            logger.error(f"❌ Error processing chunks: {e}")
+            return []
+    
     def _clean_content(self, content: str) -> str:
         """
         Cleans the content.
@@ -783,9 +1034,18 @@ class RAGSystem:
         self.config = config or {}
         
         # Initialize components
+        limiter = None
+        if self.config.get("adaptive_embedding_concurrency", True):
+            limiter = AdaptiveConcurrencyLimiter(
+                initial_limit=self.config.get("embedding_initial_concurrency", 4),
+                min_limit=self.config.get("embedding_min_concurrency", 1),
+                max_limit=self.config.get("embedding_max_concurrency", 32),
+                latency_tolerance=self.config.get("embedding_latency_tolerance", 2.0)
+            )
         self.embedding_provider = EmbeddingProvider(
             provider_type=self.config.get("embedding_provider", "ollama"),
-            model_name=self.config.get("embedding_model", "nomic-embed-text")
+            model_name=self.config.get("embedding_model", "nomic-embed-text"),
+            limiter=limiter
         )
         
         self.vector_db = VectorDatabase(
@@ -895,7 +1155,8 @@ class RAGSystem:
             logger.error(f"❌ Could not get system status: {e}")
             return {}
     
-    async def add_document(self, content: str, metadata: Dict[str, Any], source: str) -> bool:
+    async def add_document(self, content: str, metadata: Dict[str, Any], source: str,
+                           chunks: Optional[List[Dict[str, Any]]] = None) -> bool:
         """
         Adds a document to the RAG system.
 
@@ -903,20 +1164,30 @@ class RAGSystem:
             content (str): The content of the document.
             metadata (Dict[str, Any]): The metadata of the document.
             source (str): The source of the document.
+            chunks (Optional[List[Dict[str, Any]]], optional): Pre-split chunks (e.g. from the
+                code chunker) to index instead of size-based chunks. Defaults to None.
 
         Returns:
             bool: True if the document was added successfully, False otherwise.
         """
         try:
             # Process the document
-            documents = self.document_processor.process_document(content, metadata, source)
+            if chunks:
+                documents = self.document_processor.process_chunks(chunks, metadata, source)
+            else:
+                documents = self.document_processor.process_document(content, metadata, source)
             
             if not documents:
                 return False
             
-            # Create embeddings
-            for doc in documents:
-                doc.embedding = await self.embedding_provider.get_embedding(doc.content)
+            # Create embeddings (concurrency is bounded by the provider's limiter);
+            # indexing yields provider quota to interactive queries
+            user_id = metadata.get('user_id')
+            embeddings = await asyncio.gather(
+                *(self.embedding_provider.get_embedding(doc.content, "background", user_id) for doc in documents)
+            )
+            for doc, embedding in zip(documents, embeddings):
+                doc.embedding = embedding
             
             # Add to vector database
             success = await self.vector_db.add_documents(documents)
@@ -1091,12 +1362,14 @@ Answer:
         try:
             if not self.ai_client.get_provider(provider):
                 return f"LLM provider '{provider}' is not supported or configured."
-
-            messages = [{"role": "user", "content": prompt}]
             # Use a default model from config if available, otherwise let the strategy decide
             model = self.config.get(f"{provider}_model")
+            if not self.ai_client.is_available(provider, model):
+                return f"LLM provider '{provider}' is temporarily unavailable. Please try again shortly."
+
+            messages = [{"role": "user", "content": prompt}]
             
-            result = self.ai_client.generate_response(provider, messages, model=model)
+            result = await self.ai_client.agenerate_response(provider, messages, model=model)
 
             if result and result.get('success'):
                 return result.get('content', 'No content received.')
@@ -0,0 +1,77 @@
+from cryptography.fernet import Fernet
+
+from .ai_orchestrator import AIOrchestrator
+from ..utils.provider_health import ProviderRouter
+
+
+class FakeClient:
+    """Answers with the provider's name and records which providers were called."""
+
+    def __init__(self):
+        self.called = []
+
+    def generate_response(self, provider, messages, **kwargs):
+        self.called.append(provider)
+        return {'success': True, 'provider': provider, 'content': provider, 'metadata': {'model': 'm', 'usage': {}}}
+
+    def is_available(self, provider, model=None):
+        return True
+
+
+def _make_orchestrator(monkeypatch):
+    monkeypatch.setenv('ENCRYPTION_KEY', Fernet.generate_key().decode())
+    orchestrator = AIOrchestrator()
+    orchestrator.ai_client = FakeClient()
+    orchestrator.router = ProviderRouter()
+    orchestrator.providers['user'] = {'primary': {}, 'backup': {}}
+    return orchestrator
+
+
+def test_router_orders_by_expected_latency_and_errors():
+    """Tests that slow or failing providers rank behind fast reliable ones."""
+    router = ProviderRouter()
+    for _ in range(5):
+        router.record('slow', 2.0, True)
+        router.record('fast', 0.2, True)
+        router.record('flaky', 1.5, False)
+    router.record('flaky', 1.5, True)
+
+    assert router.order(['slow', 'flaky', 'fast', 'unknown']) == ['fast', 'slow', 'unknown', 'flaky']
+
+
+def test_completions_not_served_by_the_provider_are_not_recorded(monkeypatch):
+    """Tests that cache hits, coalesced results and circuit-open fast-fails leave the latency stats alone."""
+    orchestrator = _make_orchestrator(monkeypatch)
+    orchestrator.providers['user'] = {'primary': {}}
+    results = iter([
+        {'success': True, 'metadata': {'cache': 'HIT'}},
+        {'success': True, 'metadata': {'coalesced': True}},
+        {'success': False, 'circuit_open': True, 'error': 'open'},
+        {'success': True, 'metadata': {'cache': 'MISS'}},
+    ])
+    orchestrator.ai_client.generate_response = lambda provider, messages, **kwargs: next(results)
+
+    for _ in range(3):
+        orchestrator.create_completion('user', 'hello')
+    assert orchestrator.get_routing_stats()['primary']['requests'] == 0
+    orchestrator.create_completion('user', 'hello')
+    assert orchestrator.router.get_stats()['primary']['requests'] == 1
+
+
+def test_create_completion_skips_open_circuits_and_follows_routing_order(monkeypatch):
+    """Tests that completions go to the fastest provider and never to one whose circuit is open for the model."""
+    orchestrator = _make_orchestrator(monkeypatch)
+    orchestrator.providers['user'] = {'broken': {}, 'slow': {}, 'fast': {}}
+    for _ in range(3):
+        orchestrator.router.record('slow', 2.0, True)
+        orchestrator.router.record('fast', 0.2, True)
+    checked = []
+    orchestrator.ai_client.is_available = (
+        lambda provider, model=None: checked.append((provider, model)) or provider != 'broken'
+    )
+
+    result = orchestrator.create_completion('user', 'hello', model='m1')
+
+    assert result['provider'] == 'fast'
+    assert orchestrator.ai_client.called == ['fast']
+    assert sorted(checked) == [('broken', 'm1'), ('fast', 'm1'), ('slow', 'm1')]
@@ -0,0 +1,88 @@
+from .code_chunker import CodeChunker
+
+
+PYTHON_SOURCE = '''import os
+
+
+def load(path):
+    """Loads a file."""
+    with open(path) as handle:
+        return handle.read()
+
+
+class Store:
+    def get(self, key):
+        return self.data[key]
+
+    def put(self, key, value):
+        self.data[key] = value
+'''
+
+GO_SOURCE = '''package main
+
+func Start() {
+    s := "{"
+    go run(s)
+}
+
+type Server struct {
+    addr string
+}
+'''
+
+
+def test_python_chunks_align_with_functions_and_classes():
+    """Tests that Python chunks start and end on definition boundaries."""
+    chunker = CodeChunker(max_tokens=400, min_tokens=0)
+    chunks = chunker.chunk(PYTHON_SOURCE, '.py')
+
+    load_chunk = next(chunk for chunk in chunks if chunk.symbols == ['load'])
+    assert load_chunk.content.lstrip().startswith('def load')
+    assert load_chunk.content.rstrip().endswith('return handle.read()')
+    store_chunk = next(chunk for chunk in chunks if 'Store' in chunk.symbols)
+    assert store_chunk.content.lstrip().startswith('class Store')
+    assert 'def put' in store_chunk.content
+
+
+def test_oversized_python_class_is_split_by_method():
+    """Tests that a class over the token budget is split at method boundaries."""
+    chunker = CodeChunker(max_tokens=15, min_tokens=0)
+    chunks = chunker.chunk(PYTHON_SOURCE, '.py')
+
+    method_symbols = [symbol for chunk in chunks for symbol in chunk.symbols]
+    assert 'Store.get' in method_symbols
+    assert 'Store.put' in method_symbols
+
+
+def test_brace_language_ignores_braces_in_strings():
+    """Tests that brace matching skips string literals."""
+    chunker = CodeChunker(min_tokens=0, use_tree_sitter=False)
+    chunks = chunker.chunk(GO_SOURCE, '.go')
+
+    by_symbol = {tuple(chunk.symbols): chunk for chunk in chunks}
+    assert by_symbol[('Start',)].end_line == 6
+    assert by_symbol[('Server',)].start_line == 8
+
+
+def test_split_class_members_are_not_merged_with_top_level_code():
+    """Tests that the tail of a split class stays apart from the function after it."""
+    source = '''class A:
+    def f(self):
+        total = 0
+        for value in range(100):
+            total += value * value
+        return total
+
+    def g(self):
+        return 1
+
+
+def h():
+    return 2
+'''
+    chunker = CodeChunker(max_tokens=30, min_tokens=10)
+    chunks = chunker.chunk(source, '.py')
+
+    h_chunk = next(chunk for chunk in chunks if 'h' in chunk.symbols)
+    assert h_chunk.symbols == ['h'] and h_chunk.kind == 'function'
+    assert all(symbol.startswith('A') for chunk in chunks if chunk is not h_chunk for symbol in chunk.symbols)
@@ -0,0 +1,239 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from .enhanced_rag_system import (
+    CACHE_CODEC_RAW,
+    ContentDeduplicator,
+    DocumentContent,
+    EnhancedRAGSystem,
+    ScanCheckpointStore,
+    decode_cache_value,
+    encode_cache_value,
+)
+
+
+def _make_document(path, content):
+    return DocumentContent(
+        file_path=path,
+        content_type='text',
+        content=content,
+        metadata={'file_extension': '.md'},
+        extracted_at=datetime.now(),
+        file_size=len(content),
+        processing_time=0.01
+    )
+
+
+def test_encode_cache_value_keeps_small_values_raw():
+    """Tests that values below the threshold are stored uncompressed."""
+    encoded = encode_cache_value(b'{"a": 1}', threshold=1024)
+    assert encoded[:1] == CACHE_CODEC_RAW
+    assert decode_cache_value(encoded) == b'{"a": 1}'
+
+
+def test_encode_cache_value_compresses_large_values():
+    """Tests that values above the threshold are compressed and round-trip."""
+    data = json.dumps({'content': 'lorem ipsum ' * 1000}).encode()
+    encoded = encode_cache_value(data, threshold=1024)
+    assert encoded[:1] != CACHE_CODEC_RAW
+    assert len(encoded) < len(data)
+    assert decode_cache_value(encoded) == data
+
+
+def test_cache_documents_uses_one_pipeline_per_chunk_and_skips_unchanged(tmp_path):
+    """Tests that bulk caching pipelines writes and skips matching content hashes."""
+    rag = EnhancedRAGSystem({'cache_batch_size': 2, 'scan_checkpoint_db': str(tmp_path / 'scans.db')})
+    documents = [_make_document(f'/vault/note{i}.md', f'note {i}') for i in range(3)]
+
+    cached = hashlib.sha256(b'note 0').hexdigest().encode()
+    rag.binary_cache = MagicMock()
+    rag.binary_cache.mget.side_effect = [[cached, None], [None]]
+    pipe = rag.binary_cache.pipeline.return_value
+
+    asyncio.run(rag._cache_documents(documents))
+
+    assert rag.binary_cache.mget.call_count == 2
+    assert pipe.execute.call_count == 2
+    assert rag.metrics.cache_writes == 2
+    assert rag.metrics.cache_skips == 1
+    assert pipe.set.call_count == 4
+    assert pipe.expire.call_count == 2
+
+
+def test_deduplicator_aliases_exact_and_near_duplicates():
+    """Tests that exact and near duplicates collapse onto the canonical document."""
+    body = ' '.join(f'word{i}' for i in range(400))
+    documents = [
+        _make_document('/vault/a.md', body),
+        _make_document('/vault/b.md', body),
+        _make_document('/vault/c.md', body + ' trailing edit'),
+        _make_document('/vault/d.md', ' '.join(f'other{i}' for i in range(400))),
+    ]
+
+    deduplicator = ContentDeduplicator()
+    canonical = deduplicator.deduplicate(documents)
+
+    assert [doc.file_path for doc in canonical] == ['/vault/a.md', '/vault/d.md']
+    assert canonical[0].metadata['aliases'] == ['/vault/b.md', '/vault/c.md']
+    stats = deduplicator.get_stats()
+    assert stats['exact_duplicates'] == 1
+    assert stats['near_duplicates'] == 1
+    assert stats['dedup_ratio'] == 0.5
+
+
+def test_scan_resumes_from_checkpoint_without_redoing_finished_files(tmp_path):
+    """Tests that a paused scan resumes with only the files it had not finished."""
+    vault = tmp_path / 'vault'
+    vault.mkdir()
+    for i in range(5):
+        (vault / f'note{i}.md').write_text(f'unique note number {i}')
+
+    rag = EnhancedRAGSystem({
+        'scan_batch_size': 2,
+        'generate_embeddings': False,
+        'scan_checkpoint_db': str(tmp_path / 'scans.db'),
+    })
+    rag.binary_cache = MagicMock()
+    rag.binary_cache.mget.side_effect = lambda keys: [None] * len(keys)
+
+    processed = []
+    process_files = rag.file_processor.process_files
+
+    async def tracking_process_files(file_paths, deduplicator=None):
+        processed.extend(file_paths)
+        if len(processed) == 2:
+            rag.pause_scan('job-1')
+        return await process_files(file_paths, deduplicator)
+
+    rag.file_processor.process_files = tracking_process_files
+
+    report = asyncio.run(rag.scan_directory_deep(str(vault), job_id='job-1'))
+    assert report['status'] == 'paused'
+    assert report['progress']['files_done'] == 2
+    assert report['progress']['files_remaining'] == 3
+    assert report['progress']['cursor'] == 2
+
+    report = asyncio.run(rag.resume_scan('job-1'))
+    assert report['status'] == 'completed'
+    assert report['summary']['total_documents'] == 3
+    assert report['summary']['file_extensions'] == {'.md': 3}
+    assert [doc['file_path'] for doc in report['documents']] == [str(vault / f'note{i}.md') for i in range(2, 5)]
+    assert len(processed) == len(set(processed)) == 5
+    assert rag.get_scan_status('job-1')['files_done'] == 5
+    assert rag.get_scan_status('job-1')['cursor'] == 5
+    assert rag.cancel_scan('job-1') is False
+
+    rag.close()
+    with pytest.raises(RuntimeError):
+        rag.file_processor.executor.submit(print)
+
+
+def test_scan_stores_aliases_of_duplicates_found_in_later_batches(tmp_path):
+    """Tests that a duplicate in a later batch updates the cached canonical document and the checkpoint."""
+    vault = tmp_path / 'vault'
+    vault.mkdir()
+    body = ' '.join(f'word{i}' for i in range(100))
+    (vault / 'a.md').write_text(body)
+    (vault / 'b.md').write_text('an unrelated note')
+    (vault / 'c.md').write_text(body)
+
+    rag = EnhancedRAGSystem({
+        'scan_batch_size': 2,
+        'generate_embeddings': False,
+        'scan_checkpoint_db': str(tmp_path / 'scans.db'),
+    })
+    # A Redis stand-in: the second batch sees the first batch's content hashes
+    stored = {}
+    rag.binary_cache = MagicMock()
+    rag.binary_cache.mget.side_effect = lambda keys: [stored.get(key) for key in keys]
+    pipe = rag.binary_cache.pipeline.return_value
+    pipe.set.side_effect = lambda key, value, ex=None: stored.__setitem__(
+        key, value.encode() if isinstance(value, str) else value
+    )
+
+    report = asyncio.run(rag.scan_directory_deep(str(vault), job_id='job-1'))
+
+    assert report['status'] == 'completed'
+    canonical = json.loads(decode_cache_value(stored[rag._document_cache_key(str(vault / 'a.md'))]))
+    assert canonical['metadata']['aliases'] == [str(vault / 'c.md')]
+    assert rag.checkpoints.get_aliases('job-1') == {str(vault / 'c.md'): str(vault / 'a.md')}
+    assert rag.get_scan_status('job-1')['files_aliased'] == 1
+
+
+def test_concurrent_scans_keep_their_own_duplicate_index_and_resume_is_claimed_once(tmp_path):
+    """Tests that scans running together do not dedup against each other and a job resumes only once."""
+    vaults = []
+    for name in ('one', 'two'):
+        vault = tmp_path / name
+        vault.mkdir()
+        (vault / 'note.md').write_text('the same note in both vaults')
+        vaults.append(vault)
+
+    rag = EnhancedRAGSystem({
+        'generate_embeddings': False,
+        'scan_checkpoint_db': str(tmp_path / 'scans.db'),
+    })
+    rag.binary_cache = MagicMock()
+    rag.binary_cache.mget.side_effect = lambda keys: [None] * len(keys)
+
+    async def scan_both():
+        return await asyncio.gather(*(
+            rag.scan_directory_deep(str(vault), job_id=f'job-{vault.name}') for vault in vaults
+        ))
+
+    reports = asyncio.run(scan_both())
+    assert [report['summary']['total_documents'] for report in reports] == [1, 1]
+    assert [report['summary']['deduplication']['duplicates'] for report in reports] == [0, 0]
+    assert rag.metrics.files_processed == 2
+
+    rag.checkpoints.set_status('job-one', 'paused')
+    assert 'error' not in rag.prepare_resume('job-one')
+    assert rag.get_scan_status('job-one')['active'] is True
+    assert rag.prepare_resume('job-one')['error'] == "Scan job is already running"
+    assert asyncio.run(rag.resume_scan('job-one'))['status'] == 'completed'
+
+
+def test_cancel_after_resume_is_claimed_stops_the_run_before_its_first_batch(tmp_path):
+    """Tests that a cancel between prepare_resume and resume_scan is honoured, and a stale one is not."""
+    vault = tmp_path / 'vault'
+    vault.mkdir()
+    (vault / 'note.md').write_text('a note')
+
+    rag = EnhancedRAGSystem({
+        'generate_embeddings': False,
+        'scan_checkpoint_db': str(tmp_path / 'scans.db'),
+    })
+    rag.binary_cache = MagicMock()
+    rag.binary_cache.mget.side_effect = lambda keys: [None] * len(keys)
+    rag.checkpoints.create_job('job-1', str(vault), [str(vault / 'note.md')])
+    rag.checkpoints.set_status('job-1', 'paused')
+
+    rag._scan_controls['job-1'] = 'paused'  # left over from an earlier run
+    assert 'error' not in rag.prepare_resume('job-1')
+    assert rag.get_scan_status('job-1')['requested'] is None
+    assert rag.cancel_scan('job-1') is True
+
+    report = asyncio.run(rag.resume_scan('job-1'))
+    assert report['status'] == 'cancelled'
+    assert report['progress']['files_remaining'] == 1
+    rag.close()
+
+
+def test_checkpoint_batch_advances_cursor_once_per_file(tmp_path):
+    """Tests that re-checkpointing an extracted batch does not move the cursor again."""
+    store = ScanCheckpointStore(str(tmp_path / 'scans.db'))
+    store.create_job('job-1', '/vault', ['/vault/a.md', '/vault/b.md', '/vault/c.md'])
+
+    store.checkpoint_batch('job-1', ['/vault/a.md', '/vault/b.md'], 'extracted')
+    store.checkpoint_batch('job-1', ['/vault/a.md', '/vault/b.md'], 'extracted')
+    store.checkpoint_batch('job-1', ['/vault/a.md', '/vault/b.md'], 'done')
+
+    job = store.get_job('job-1')
+    assert job['cursor'] == 2
+    assert job['files_done'] == 2
+    assert job['files_remaining'] == 1
@@ -0,0 +1,70 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import httpx
+import openai
+
+from .rag_system import AdaptiveConcurrencyLimiter, EmbeddingProvider
+from ..utils.unified_ai_client import OpenAIStrategy
+
+
+async def _run_calls(limiter, outcomes):
+    for outcome in outcomes:
+        started_at = await limiter.acquire()
+        await limiter.release(started_at, outcome)
+
+
+def test_limiter_grows_additively_on_success():
+    """Tests that successful calls raise the limit by about one per window."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=8)
+    asyncio.run(_run_calls(limiter, ['success'] * 5))
+
+    stats = limiter.get_stats()
+    assert stats['limit'] == 3
+    assert stats['increases'] == 1
+    assert stats['recent_decisions'][-1]['action'] == 'increase'
+
+
+def test_limiter_backs_off_multiplicatively_on_overload():
+    """Tests that an overload halves the limit once per window."""
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=16)
+
+    async def overlapping_overloads():
+        first = await limiter.acquire()
+        second = await limiter.acquire()
+        await limiter.release(first, 'overload')
+        await limiter.release(second, 'overload')
+
+    asyncio.run(overlapping_overloads())
+
+    stats = limiter.get_stats()
+    assert stats['limit'] == 4
+    assert stats['decreases'] == 1
+    assert stats['overloads'] == 2
+    assert stats['in_flight'] == 0
+
+
+def test_embedding_failures_are_classified_for_the_limiter():
+    """Tests that rate limits, server errors and timeouts count as overload."""
+    assert EmbeddingProvider._classify_failure({'status_code': 429}) == 'overload'
+    assert EmbeddingProvider._classify_failure({'status_code': 503}) == 'overload'
+    assert EmbeddingProvider._classify_failure({'status_code': None, 'timeout': True}) == 'overload'
+    assert EmbeddingProvider._classify_failure({'status_code': 400}) == 'error'
+
+
+def test_openai_timeouts_are_classified_as_overload():
+    """Tests that SDK timeouts, raised directly or wrapped as connection errors, reach the limiter as overload."""
+    request = httpx.Request('POST', 'https://api.openai.com/v1/embeddings')
+    connect_timeout = openai.APIConnectionError(request=request)
+    connect_timeout.__cause__ = httpx.ConnectTimeout('connect timed out')
+    strategy = OpenAIStrategy(api_key='test')
+    strategy._async_client = AsyncMock()
+
+    for error in (openai.APITimeoutError(request=request), connect_timeout):
+        strategy._async_client.embeddings.create.side_effect = error
+        result = asyncio.run(strategy.aembed('hello'))
+        assert result['timeout'] is True
+        assert EmbeddingProvider._classify_failure(result) == 'overload'
+
+    strategy._async_client.embeddings.create.side_effect = openai.APIConnectionError(request=request)
+    assert EmbeddingProvider._classify_failure(asyncio.run(strategy.aembed('hello'))) == 'error'
@@ -2,15 +2,57 @@
 MCP AI Orchestrator - Main Entry Point.
 """
 
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan: pre-warms configured Ollama models, pre-spawns MCP
+    server replicas and discovers MCP tools in the background on startup, and
+    closes pooled AI provider connections, MCP clients and their shared HTTP
+    connections, and the scan system's workers on shutdown.
+    """
+    prewarm_task = asyncio.create_task(prewarm_ai_models()) if prewarm_ai_models else None
+    prespawn_task = None
+    if mcp_pool and settings:
+        mcp_pool.start_maintenance()
+        prespawn_task = asyncio.create_task(warm_mcp())
+    yield
+    for task in (prewarm_task, prespawn_task):
+        if task and not task.done():
+            task.cancel()
+    if close_ai_client:
+        await close_ai_client()
+    if mcp_pool:
+        await mcp_pool.close()
+    if mcp_http_clients:
+        await mcp_http_clients.aclose()
+    if close_rag_system:
+        await close_rag_system()
+
+
+async def warm_mcp():
+    """Pre-spawns MCP server replicas, then fills the tool catalog through them."""
+    if settings.mcp_prespawn:
+        await mcp_pool.prespawn(list_mcp_servers().values())
+    await mcp_catalog.refresh()
+
 
 # Create FastAPI app for MCP orchestrator
 app = FastAPI(
     title="MCP AI Orchestrator",
     description="AI-powered MCP (Model Context Protocol) Orchestrator",
     version="2.2.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -34,27 +76,47 @@ app.add_middleware(
 # Import MCP components from unified backend
 try:
     from .mcp.registry import MCPRegistry
+    from .mcp.registry import list_servers as list_mcp_servers
     from .mcp.client import MCPClient
+    from .mcp.pool import pool as mcp_pool
+    from .mcp.catalog import catalog as mcp_catalog
+    from .mcp.result_cache import tool_cache as mcp_tool_cache
+    from .mcp.http_clients import http_clients as mcp_http_clients
+    from .mcp.telemetry import telemetry as mcp_telemetry
     from .config import Settings
+    from .models import MCPCallBatchReq
     from api.handlers import router as api_router
     from api.chat_routes import router as chat_router
+    from api.scan_routes import router as scan_router
+    from api.scan_routes import close_rag_system
+    from .utils.unified_ai_client import close_client as close_ai_client
+    from .utils.unified_ai_client import prewarm_models as prewarm_ai_models
 
     # Initialize MCP components
     settings = Settings()
     mcp_registry = MCPRegistry()
-    mcp_client = (
-        MCPClient()
+    mcp_client = MCPClient(
+        max_concurrency=settings.mcp_batch_max_concurrency
     )  # Unified client that handles server selection automatically
 
     # Include API router
     app.include_router(api_router, prefix="/api", tags=["api"])
     app.include_router(chat_router, prefix="/api/v1", tags=["v1"])
+    app.include_router(scan_router, prefix="/api/v1", tags=["v1"])
 
 except ImportError as e:
     print(f"Warning: MCP components not available: {e}")
     mcp_registry = None
     mcp_client = None
+    mcp_pool = None
+    mcp_catalog = None
+    mcp_tool_cache = None
+    mcp_http_clients = None
+    mcp_telemetry = None
     settings = None
+    close_ai_client = None
+    close_rag_system = None
+    prewarm_ai_models = None
 
 # API Endpoints for MCP Orchestrator
 
@@ -85,14 +147,14 @@ async def list_servers():
 @app.get("/mcp/tools")
 async def list_tools():
     """
-    Lists the available MCP tools.
+    Lists the available MCP tools from the cached tool catalog.
     """
     if not mcp_registry:
         raise HTTPException(status_code=503, detail="MCP registry not available")
 
     try:
         tools = await mcp_registry.list_tools()
-        return {"tools": tools}
+        return {"tools": tools, "fresh": mcp_catalog.is_fresh()}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to list tools: {str(e)}")
 
@@ -118,6 +180,72 @@ async def call_tool(tool_call: dict):
         raise HTTPException(status_code=500, detail=f"Tool execution failed: {str(e)}")
 
 
+@app.post("/mcp/call_stream")
+async def call_tool_stream(tool_call: dict, http_request: Request):
+    """
+    Executes an MCP tool, streaming its progress as server-sent events.
+
+    Each event is a JSON object: 'progress' events carry the progress the
+    server reports (and any partial results), and a final 'result' event
+    carries the result (or an 'error' event on failure). The tool call is
+    cancelled when the client disconnects.
+    """
+    tool_name = tool_call.get("tool")
+    if not tool_name:
+        raise HTTPException(status_code=400, detail="Tool name is required")
+
+    if not mcp_client:
+        raise HTTPException(status_code=503, detail="MCP client not available")
+
+    async def event_source():
+        stream = mcp_client.call_tool_stream(tool_name, tool_call.get("parameters", {}))
+        try:
+            async for event in stream:
+                if await http_request.is_disconnected():
+                    break
+                yield f"data: {json.dumps(event, default=str)}\n\n"
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.post("/mcp/call_batch")
+async def call_tool_batch(request: dict):
+    """
+    Executes several MCP tools, running independent calls concurrently.
+
+    The body holds the `calls` (each with a `tool`, its `parameters`, and
+    optionally an `id`, the `depends_on` ids of calls that must succeed first
+    and a `timeout_s`) and an optional default `timeout_s`. Results are
+    returned in request order with per-call timing.
+    """
+    if not mcp_client:
+        raise HTTPException(status_code=503, detail="MCP client not available")
+
+    started = time.perf_counter()
+    try:
+        batch = MCPCallBatchReq(**request)
+        results = await mcp_client.call_tools(
+            [call.dict() for call in batch.calls],
+            timeout=batch.timeout_s or settings.mcp_batch_call_timeout,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Tool batch failed: {str(e)}")
+
+    return {
+        "success": all(result.get("success") for result in results),
+        "results": results,
+        "total_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
 @app.get("/mcp/status")
 async def get_status():
     """
@@ -127,10 +255,50 @@ async def get_status():
         "status": "operational" if mcp_registry and mcp_client else "degraded",
         "registry": "available" if mcp_registry else "unavailable",
         "client": "available" if mcp_client else "unavailable",
+        "pool": mcp_pool.get_stats() if mcp_pool else None,
+        "catalog": mcp_catalog.get_stats() if mcp_catalog else None,
+        "tool_cache": mcp_tool_cache.get_stats() if mcp_tool_cache else None,
+        "http_clients": mcp_http_clients.get_stats() if mcp_http_clients else None,
+        "telemetry": mcp_telemetry.get_stats() if mcp_telemetry else None,
         "settings": settings.dict() if settings else None,
     }
 
 
+@app.get("/mcp/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Gets MCP call telemetry in the Prometheus text format: per-tool latency,
+    queueing and execution histograms, call, error and payload counters, and
+    per-server pool wait histograms.
+    """
+    if not mcp_telemetry:
+        raise HTTPException(status_code=503, detail="MCP telemetry not available")
+
+    return PlainTextResponse(
+        mcp_telemetry.render_prometheus(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.post("/mcp/cache/invalidate")
+async def invalidate_tool_cache(request: dict):
+    """
+    Drops cached MCP tool results, e.g. when a file watcher sees changes.
+
+    The body may name a `server`, a `tool` and/or an `event` (such as
+    "filesystem"); an empty body clears the whole cache.
+    """
+    if not mcp_tool_cache:
+        raise HTTPException(status_code=503, detail="MCP tool cache not available")
+
+    dropped = mcp_tool_cache.invalidate(
+        server=request.get("server"),
+        tool=request.get("tool"),
+        event=request.get("event"),
+    )
+    return {"success": True, "invalidated": dropped}
+
+
 def run_app(host: str = "0.0.0.0", port: int = 8765, reload: bool = True) -> None:
     """
     Run the MCP AI Orchestrator application.
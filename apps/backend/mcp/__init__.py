@@ -6,5 +6,6 @@ MCP (Model Context Protocol) Implementation
 from .client import MCPClient
 from .pool import MCPPool
 from .registry import REGISTRY
+from .catalog import ToolCatalog
 
-__all__ = ["MCPClient", "MCPPool", "REGISTRY"]
+__all__ = ["MCPClient", "MCPPool", "REGISTRY", "ToolCatalog"]
@@ -0,0 +1,318 @@
+"""
+MCP Tool Catalog.
+This module discovers the tools of MCP servers by calling `tools/list` on them
+concurrently through the connection pool, and caches the merged catalog with a
+TTL. Only servers that are already pooled or marked `discover` are listed, so
+discovery never starts clients the pool would have to evict again. Servers that announce `notifications/tools/list_changed`
+invalidate the cache, and a name index resolves tools to their server in O(1).
+"""
+
+import asyncio
+import time
+import weakref
+from typing import Any, Callable, Dict, List, Optional, Tuple
+try:
+    # Try unified backend path
+    from ..models import MCPServer, ToolCachePolicy
+    from ..config import Settings
+    from ..utils.log import get_logger
+    from .pool import MCPPool, pool as default_pool
+    from .registry import list_servers
+    from .result_cache import cache_policy
+
+    # Initialize settings
+    settings = Settings()
+    logger = get_logger(__name__)
+
+except ImportError:
+    # Fallback for standalone usage
+    from models import MCPServer, ToolCachePolicy
+    from mcp.pool import MCPPool, pool as default_pool
+    from mcp.registry import list_servers
+    from mcp.result_cache import cache_policy
+
+    # Simple settings fallback
+    class SimpleSettings:
+        mcp_catalog_ttl_seconds = 300
+        mcp_discovery_timeout = 10.0
+
+    settings = SimpleSettings()
+
+    # Simple logger fallback
+    import logging
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+
+class ToolCatalog:
+    """
+    A cached catalog of the tools offered by the registered MCP servers.
+
+    Tools are listed under their qualified name, `<server>.<tool>`, and can also be
+    resolved by their bare name when only one server offers it. A server that is
+    neither pooled nor marked `discover` is listed once a call by qualified name
+    has started it; its tools stay listed after its clients are stopped. A stale catalog is
+    still served while a refresh runs in the background, so listing and resolving
+    tools never wait on the servers once the catalog has been filled.
+
+    Usage:
+        tools = await catalog.list_tools()
+        server_name, tool = await catalog.resolve("filesystem.semantic_search")
+    """
+
+    def __init__(self, pool: MCPPool = None, servers: Callable[[], Dict[str, MCPServer]] = None,
+                 ttl_seconds: int = None, timeout: float = None):
+        """
+        Initializes the tool catalog.
+
+        Args:
+            pool (MCPPool, optional): The pool to reach the servers through. Defaults to the global pool.
+            servers (Callable[[], Dict[str, MCPServer]], optional): Returns the servers to discover.
+                                                                    Defaults to the registry's `list_servers`.
+            ttl_seconds (int, optional): How long a discovered catalog is fresh.
+                                         Defaults to the value from settings.
+            timeout (float, optional): The per-server discovery deadline in seconds.
+                                       Defaults to the value from settings.
+        """
+        self.pool = pool or default_pool
+        self.servers = servers or list_servers
+        self.ttl_seconds = ttl_seconds or settings.mcp_catalog_ttl_seconds
+        self.timeout = timeout or settings.mcp_discovery_timeout
+
+        # server -> its tools, as listed
+        self._by_server: Dict[str, List[Dict[str, Any]]] = {}
+        # qualified or unique bare name -> (server, tool)
+        self._index: Dict[str, Tuple[str, str]] = {}
+        # (server, tool) -> result cache policy, for cacheable tools
+        self._policies: Dict[Tuple[str, str], ToolCachePolicy] = {}
+        # The merged listing, rebuilt only when the catalog changes
+        self._tools: List[Dict[str, Any]] = []
+        self._refreshed_at: Optional[float] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Clients whose list_changed notifications are already subscribed to
+        self._subscribed = weakref.WeakSet()
+        self._stats = {
+            "refreshes": 0,
+            "invalidations": 0,
+            "hits": 0,
+            "misses": 0,
+            "failed_servers": 0
+        }
+
+    def is_fresh(self) -> bool:
+        """
+        Checks whether the catalog was discovered within its TTL.
+
+        Returns:
+            bool: True if the catalog is fresh.
+        """
+        return self._refreshed_at is not None and time.time() - self._refreshed_at < self.ttl_seconds
+
+    async def list_tools(self) -> List[Dict[str, Any]]:
+        """
+        Gets the merged tool catalog.
+
+        Only the first call waits for discovery; later calls get the cached
+        catalog, refreshed in the background once it is stale.
+
+        Returns:
+            List[Dict[str, Any]]: The tools of all servers, each with its `name`, `tool`,
+                                  `server`, `description`, `inputSchema` and `category`.
+        """
+        await self._ensure_loaded()
+        return self._tools
+
+    async def resolve(self, name: str) -> Optional[Tuple[str, str]]:
+        """
+        Finds the server offering a tool.
+
+        Args:
+            name (str): A qualified (`filesystem.semantic_search`) or bare (`semantic_search`) tool name.
+
+        Returns:
+            Optional[Tuple[str, str]]: The server name and the tool's name on that server, or None.
+        """
+        await self._ensure_loaded()
+        target = self._index.get(name)
+        if target is None and not self.is_fresh():
+            # The tool may be new: rediscover once before giving up
+            await self.refresh()
+            target = self._index.get(name)
+        if target is None and "." in name:
+            # Not discovered (e.g. the server was unreachable): trust an explicit server prefix
+            server_name, tool = name.split(".", 1)
+            if server_name in self.servers():
+                target = (server_name, tool)
+        self._stats["hits" if target else "misses"] += 1
+        return target
+
+    def cache_policy(self, server_name: str, tool: str) -> Optional[ToolCachePolicy]:
+        """
+        Gets the result cache policy of a tool.
+
+        Args:
+            server_name (str): The server offering the tool.
+            tool (str): The tool's name on that server.
+
+        Returns:
+            Optional[ToolCachePolicy]: The policy, or None if the tool's results must not be cached.
+        """
+        policy = self._policies.get((server_name, tool))
+        if policy is None:
+            # Not discovered: fall back to what is configured for the server
+            server = self.servers().get(server_name)
+            policy = (server.tool_cache or {}).get(tool) if server else None
+        return policy
+
+    def invalidate(self, server_name: str = None) -> None:
+        """
+        Marks the catalog stale so the next lookup rediscovers it.
+
+        Args:
+            server_name (str, optional): The server whose tools changed. Defaults to None (all servers).
+        """
+        self._stats["invalidations"] += 1
+        self._refreshed_at = None
+        logger.info(f"Tool catalog invalidated ({server_name or 'all servers'})")
+
+    async def refresh(self) -> List[Dict[str, Any]]:
+        """
+        Rediscovers the tools of all servers, sharing a refresh that is already running.
+
+        Returns:
+            List[Dict[str, Any]]: The merged tool catalog.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.ensure_future(self._discover())
+        await asyncio.shield(self._refresh_task)
+        return self._tools
+
+    async def _ensure_loaded(self) -> None:
+        """Waits for the first discovery, or starts a background refresh if the catalog is stale."""
+        if self._refreshed_at is None and not self._tools:
+            await self.refresh()
+        elif not self.is_fresh() and (self._refresh_task is None or self._refresh_task.done()):
+            self._refresh_task = asyncio.ensure_future(self._discover())
+
+    async def _discover(self) -> None:
+        """Calls `tools/list` on every pooled or `discover` server concurrently and rebuilds the catalog."""
+        servers = self.servers()
+        targets = [server for name, server in servers.items() if server.discover or name in self.pool]
+        started = time.time()
+        results = await asyncio.gather(
+            *(self._list_server_tools(server) for server in targets),
+            return_exceptions=True
+        )
+
+        for server, result in zip(targets, results):
+            if isinstance(result, BaseException):
+                self._stats["failed_servers"] += 1
+                logger.warning(f"Tool discovery failed for {server.name}: {result}")
+                # Keep serving what the server offered before, if anything
+                continue
+            self._by_server[server.name] = result
+        for name in list(self._by_server):
+            if name not in servers:
+                del self._by_server[name]
+
+        self._rebuild(servers)
+        self._refreshed_at = started
+        self._stats["refreshes"] += 1
+        logger.info(f"Discovered {len(self._tools)} MCP tools on {len(targets)} of {len(servers)} servers "
+                    f"in {(time.time() - started) * 1000:.0f}ms")
+
+    async def _list_server_tools(self, server: MCPServer) -> List[Dict[str, Any]]:
+        """
+        Lists one server's tools through the pool and subscribes to its catalog changes.
+
+        Args:
+            server (MCPServer): The server to query.
+
+        Returns:
+            List[Dict[str, Any]]: The server's tools.
+        """
+        async def list_tools():
+            async with self.pool.acquire(server.name, server) as client:
+                if client not in self._subscribed:
+                    client.on_notification(self._notification_handler(server.name))
+                    self._subscribed.add(client)
+                return await client.tools_list(raise_on_error=True)
+
+        return await asyncio.wait_for(list_tools(), self.timeout)
+
+    def _notification_handler(self, server_name: str) -> Callable[[str, Dict[str, Any]], None]:
+        """
+        Builds the notification handler that invalidates the catalog when a server's tools change.
+
+        Args:
+            server_name (str): The server the handler is for.
+
+        Returns:
+            Callable[[str, Dict[str, Any]], None]: The handler.
+        """
+        def handle(method: str, params: Dict[str, Any]) -> None:
+            if method == "notifications/tools/list_changed":
+                self.invalidate(server_name)
+
+        return handle
+
+    def _rebuild(self, servers: Dict[str, MCPServer]) -> None:
+        """
+        Rebuilds the merged listing, the name index and the cache policies from the per-server tools.
+
+        Args:
+            servers (Dict[str, MCPServer]): The registered servers, for their configured cache policies.
+        """
+        tools = []
+        index: Dict[str, Tuple[str, str]] = {}
+        bare: Dict[str, List[Tuple[str, str]]] = {}
+        policies: Dict[Tuple[str, str], ToolCachePolicy] = {}
+        for server_name, server_tools in self._by_server.items():
+            overrides = servers[server_name].tool_cache or {}
+            for tool in server_tools:
+                tool_name = tool.get("name")
+                if not tool_name:
+                    continue
+                policy = cache_policy(tool, overrides.get(tool_name))
+                if policy is not None:
+                    policies[(server_name, tool_name)] = policy
+                tools.append({
+                    "name": f"{server_name}.{tool_name}",
+                    "tool": tool_name,
+                    "server": server_name,
+                    "description": tool.get("description", ""),
+                    "inputSchema": tool.get("inputSchema", {}),
+                    "annotations": tool.get("annotations", {}),
+                    "cache": policy.dict() if policy else None,
+                    "category": server_name
+                })
+                index[f"{server_name}.{tool_name}"] = (server_name, tool_name)
+                bare.setdefault(tool_name, []).append((server_name, tool_name))
+
+        # Bare names only resolve when a single server offers the tool
+        for tool_name, targets in bare.items():
+            if len(targets) == 1 and tool_name not in index:
+                index[tool_name] = targets[0]
+
+        self._tools = tools
+        self._index = index
+        self._policies = policies
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gets the statistics for the catalog.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the catalog's statistics.
+        """
+        return {
+            "tools": len(self._tools),
+            "servers": len(self._by_server),
+            "fresh": self.is_fresh(),
+            "ttl_seconds": self.ttl_seconds,
+            "refreshed_at": self._refreshed_at,
+            **self._stats
+        }
+
+# Global catalog instance
+catalog = ToolCatalog()
@@ -11,14 +11,18 @@ import uuid
 import time
 import contextlib
 import sys
-from typing import Any, Dict, Optional, List
+from typing import Any, AsyncIterator, Callable, Dict, Optional, List, Tuple, Union
 try:
     # Try unified backend path
     from ..models import MCPServer
     from ..utils.log import get_logger
+    from .http_clients import http_clients
+    from .telemetry import telemetry
 except ImportError:
     # Fallback for standalone usage
     from models import MCPServer
+    from mcp.http_clients import http_clients
+    from mcp.telemetry import telemetry
     # Simple logger fallback
     import logging
     logging.basicConfig(level=logging.INFO)
@@ -32,33 +36,193 @@ class MCPClient:
     A unified MCP client for orchestrator usage.
 
     This class provides a single entry point for calling tools on various MCP servers.
-    It manages multiple MCPClient instances, one for each server, and dynamically
-    creates them as needed.
+    Tools are resolved through the tool catalog and called on clients from the
+    connection pool, which starts them as needed.
+
+    Attributes:
+        timeout_grace_s (float): How long `call_tools` waits past a call's deadline before
+                                 abandoning it, for time spent outside the tool call itself.
     """
 
-    def __init__(self):
+    timeout_grace_s = 1.0
+
+    def __init__(self, max_concurrency: int = 8):
         """
         Initializes the unified MCP client.
+
+        Args:
+            max_concurrency (int, optional): The maximum number of tool calls `call_tools` runs at once,
+                                             across all batches. Defaults to 8.
         """
-        self.clients = {}  # server_name -> MCPClient instance
-        self.pool = None
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
 
-    async def call_tool(self, tool_name: str, parameters: dict = None):
+    async def call_tools(self, calls: List[Dict[str, Any]], timeout: Optional[float] = None) -> List[Dict[str, Any]]:
         """
-        Calls an MCP tool by its name.
+        Calls several tools, running independent calls concurrently.
+
+        Each call is a dict with the `tool` name and optionally its `parameters`,
+        an `id`, the ids of calls it `depends_on` (which must succeed first) and
+        its own `timeout_s`. Calls without dependencies between them run in
+        parallel across servers, limited by `max_concurrency`.
+
+        Args:
+            calls (List[Dict[str, Any]]): The tool invocations.
+            timeout (Optional[float], optional): The default per-call deadline in seconds. Defaults to None (no limit).
+
+        Returns:
+            List[Dict[str, Any]]: The result of each call, in request order, with its `id`,
+                                  `queued_ms` (time waiting for dependencies and a slot) and `duration_ms`.
+
+        Raises:
+            ValueError: If call ids repeat, or dependencies are unknown or circular.
+        """
+        ids = [str(call.get("id") or index) for index, call in enumerate(calls)]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Call ids must be unique")
+        dependencies = {
+            call_id: [str(dependency) for dependency in call.get("depends_on") or []]
+            for call_id, call in zip(ids, calls)
+        }
+        for call_id, depends_on in dependencies.items():
+            unknown = [dependency for dependency in depends_on if dependency not in dependencies]
+            if unknown:
+                raise ValueError(f"Call '{call_id}' depends on unknown calls: {', '.join(unknown)}")
+        self._check_acyclic(dependencies)
+
+        started = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run(call_id: str, call: Dict[str, Any]) -> Dict[str, Any]:
+            tool_name = call.get("tool")
+            failed = []
+            for dependency in dependencies[call_id]:
+                if not (await tasks[dependency]).get("success"):
+                    failed.append(dependency)
+            queued_at = time.perf_counter()
+            if failed:
+                result = {"success": False, "error": f"Skipped: dependencies failed: {', '.join(failed)}"}
+                call_started = queued_at
+            else:
+                async with self._slots:
+                    call_started = time.perf_counter()
+                    call_timeout = call.get("timeout_s") or timeout
+                    # The deadline is enforced by the tool call itself, so it is reported
+                    # as a timeout; the outer wait also bounds pool startup and lookups
+                    try:
+                        result = await asyncio.wait_for(
+                            self.call_tool(tool_name, call.get("parameters") or {}, timeout=call_timeout),
+                            call_timeout + self.timeout_grace_s if call_timeout else None
+                        )
+                    except asyncio.TimeoutError:
+                        result = {"success": False, "error": f"Timed out after {call_timeout}s"}
+            return {
+                **result,
+                "id": call_id,
+                "tool": tool_name,
+                "queued_ms": round((call_started - started) * 1000, 2),
+                "duration_ms": round((time.perf_counter() - call_started) * 1000, 2),
+            }
+
+        for call_id, call in zip(ids, calls):
+            tasks[call_id] = asyncio.ensure_future(run(call_id, call))
+        return list(await asyncio.gather(*(tasks[call_id] for call_id in ids)))
+
+    async def call_tool_stream(self, tool_name: str, parameters: dict = None,
+                               use_cache: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Calls an MCP tool and yields its progress while it runs.
+
+        Yields 'progress' events as the server reports them (with any partial
+        results it includes), then a 'result' event, or an 'error' event if the
+        call fails. A cached result is yielded straight away.
+
+        Args:
+            tool_name (str): The name of the tool to call.
+            parameters (dict, optional): The parameters for the tool. Defaults to None.
+            use_cache (bool, optional): Whether a cached result may be used. Defaults to True.
+
+        Yields:
+            Dict[str, Any]: The call's events.
+        """
+        if parameters is None:
+            parameters = {}
+
+        from .catalog import catalog
+        from .pool import pool
+        from .registry import get_server
+        from .result_cache import tool_cache
+
+        try:
+            target = await catalog.resolve(tool_name)
+            server = get_server(target[0]) if target else None
+            if not server:
+                yield {"type": "error", "error": f"Tool '{tool_name}' not found", "tool": tool_name}
+                return
+            server_name, tool_short_name = target
+
+            policy = catalog.cache_policy(server_name, tool_short_name) if use_cache and tool_cache.enabled else None
+            key = tool_cache.make_key(server_name, tool_short_name, parameters, policy) if policy else None
+            if key:
+                result, hit = tool_cache.get(key)
+                if hit:
+                    telemetry.record_cache_hit(server_name, tool_short_name)
+                    yield {"type": "result", "result": result, "tool": tool_name, "server": server_name, "cached": True}
+                    return
 
-        The tool name should be in the format "server_name.tool_short_name".
-        This method will look up the server, create a client for it if one doesn't
-        already exist, and then call the tool.
+            generation = tool_cache.generation(server_name)
+            async with telemetry.track(server_name, tool_short_name, parameters) as trace:
+                async with pool.acquire(server_name, server) as client:
+                    trace.acquired()
+                    tool_cache.watch(server_name, client)
+                    async for event in client.tools_call_stream(tool_short_name, parameters):
+                        if event["type"] == "result":
+                            result = event["result"]
+                            trace.finish(result)
+                            if key and not (isinstance(result, dict) and result.get("isError")):
+                                tool_cache.set(key, result, server_name, tool_short_name, policy, generation)
+                            event = {**event, "tool": tool_name, "server": server_name, "cached": False}
+                        yield event
+        except Exception as e:
+            yield {"type": "error", "error": str(e), "tool": tool_name}
+
+    @staticmethod
+    def _check_acyclic(dependencies: Dict[str, List[str]]) -> None:
+        """
+        Checks that call dependencies contain no cycle.
+
+        Args:
+            dependencies (Dict[str, List[str]]): The ids each call depends on, by call id.
+
+        Raises:
+            ValueError: If the dependencies are circular.
+        """
+        remaining = {call_id: set(depends_on) for call_id, depends_on in dependencies.items()}
+        while remaining:
+            ready = [call_id for call_id, depends_on in remaining.items() if not depends_on]
+            if not ready:
+                raise ValueError(f"Circular dependencies between calls: {', '.join(sorted(remaining))}")
+            for call_id in ready:
+                del remaining[call_id]
+            for depends_on in remaining.values():
+                depends_on.difference_update(ready)
+
+    async def call_tool(self, tool_name: str, parameters: dict = None, use_cache: bool = True,
+                        timeout: Optional[float] = None):
+        """
+        Calls an MCP tool by its name.
 
-        Note:
-            The current implementation includes a mock response for the
-            "filesystem" server for testing purposes. The actual client
-            initialization and tool calling logic is yet to be implemented.
+        The tool is looked up in the tool catalog, by its qualified name
+        ("filesystem.semantic_search") or, if only one server offers it, its bare
+        name, and called on the least-loaded pooled client of its server.
+        Results of tools with a cache policy are served from the tool result
+        cache when the same arguments were used before.
 
         Args:
             tool_name (str): The name of the tool to call.
             parameters (dict, optional): The parameters for the tool. Defaults to None.
+            use_cache (bool, optional): Whether a cached result may be used. Defaults to True.
+            timeout (Optional[float], optional): The deadline in seconds. Defaults to the server's `timeout_s`.
 
         Returns:
             A dictionary containing the result of the tool call.
@@ -67,78 +231,53 @@ class MCPClient:
             parameters = {}
 
         try:
-            # Parse tool name to determine server
-            # Example: "fs.semantic_search" -> server="filesystem", tool="semantic_search"
-            if "." in tool_name:
-                server_name, tool_short_name = tool_name.split(".", 1)
-
-                # Get server from registry
-                from .registry import get_server
-                server = get_server(server_name)
-
-                if not server:
-                    return {
-                        "success": False,
-                        "error": f"Server '{server_name}' not found"
-                    }
-
-                # Get or create client for this server
-                if server_name not in self.clients:
-                    self.clients[server_name] = MCPClientOriginal(server)
-
-                client = self.clients[server_name]
-
-                # For now, return mock result for testing
-                # TODO: Implement actual MCP client initialization
-                if server_name == "filesystem":
-                    if tool_short_name == "semantic_search":
-                        return {
-                            "success": True,
-                            "result": {
-                                "results": [
-                                    {
-                                        "file": f"src/{parameters.get('query', 'test')}_component.tsx",
-                                        "score": 0.95,
-                                        "snippet": f"// Component related to {parameters.get('query', 'test')}"
-                                    }
-                                ],
-                                "total": 1,
-                                "query": parameters.get('query', 'test')
-                            },
-                            "tool": tool_name,
-                            "server": server_name
-                        }
-                    elif tool_short_name == "pattern_extract":
-                        return {
-                            "success": True,
-                            "result": {
-                                "patterns": [
-                                    {
-                                        "pattern": parameters.get('pattern', 'test'),
-                                        "occurrences": 3,
-                                        "locations": [
-                                            {"line": 15, "column": 10},
-                                            {"line": 23, "column": 5}
-                                        ]
-                                    }
-                                ],
-                                "file": parameters.get('file_path', 'unknown')
-                            },
-                            "tool": tool_name,
-                            "server": server_name
-                        }
+            from .catalog import catalog
+            from .pool import pool
+            from .registry import get_server
+            from .result_cache import tool_cache
 
+            target = await catalog.resolve(tool_name)
+            if not target:
                 return {
                     "success": False,
-                    "error": f"Tool '{tool_name}' not implemented yet",
-                    "tool": tool_name,
-                    "server": server_name
+                    "error": f"Tool '{tool_name}' not found",
+                    "tool": tool_name
                 }
-            else:
+
+            server_name, tool_short_name = target
+            server = get_server(server_name)
+            if not server:
                 return {
                     "success": False,
-                    "error": f"Invalid tool name format: {tool_name}"
+                    "error": f"Server '{server_name}' not found",
+                    "tool": tool_name
                 }
+
+            async def call():
+                async with telemetry.track(server_name, tool_short_name, parameters) as trace:
+                    async with pool.acquire(server_name, server) as client:
+                        trace.acquired()
+                        tool_cache.watch(server_name, client)
+                        result = await client.tools_call(tool_short_name, parameters, timeout=timeout)
+                        trace.finish(result)
+                        return result
+
+            policy = catalog.cache_policy(server_name, tool_short_name) if use_cache else None
+            if policy is not None:
+                result, cached = await tool_cache.get_or_call(
+                    server_name, tool_short_name, parameters, policy, call
+                )
+                if cached:
+                    telemetry.record_cache_hit(server_name, tool_short_name)
+            else:
+                result, cached = await call(), False
+            return {
+                "success": True,
+                "result": result,
+                "tool": tool_name,
+                "server": server_name,
+                "cached": cached
+            }
         except Exception as e:
             return {
                 "success": False,
@@ -155,25 +294,97 @@ class BaseTransport:
     """
     A base class for all transport implementations.
 
-    This class defines the interface that all transport classes must implement.
+    This class defines the interface that all transport classes must implement,
+    and routes notifications from the server: `notifications/progress` to the
+    handler watching its progress token, everything else to `on_notification`.
     """
+    def __init__(self):
+        """Initializes the notification routing."""
+        # Called with (method, params) for every server-to-client notification
+        self.on_notification: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        # progress token -> called with the params of each progress notification
+        self.progress_handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+
+    def _notify(self, msg: Dict[str, Any]) -> None:
+        """
+        Passes a notification from the server to its handler.
+
+        Args:
+            msg (Dict[str, Any]): A JSON-RPC notification.
+        """
+        method, params = msg["method"], msg.get("params") or {}
+        try:
+            if method == "notifications/progress":
+                handler = self.progress_handlers.get(str(params.get("progressToken")))
+                if handler:
+                    handler(params)
+            elif self.on_notification:
+                self.on_notification(method, params)
+        except Exception as e:
+            logger.warning(f"Notification handler failed for {method}: {e}")
+
+    @property
+    def closed(self) -> bool:
+        """Whether the transport can no longer carry requests, e.g. because the server exited."""
+        return False
+
     async def start(self):
         """Starts the transport layer."""
         ...
     async def stop(self):
         """Stops the transport layer."""
         ...
-    async def send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    async def send(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Sends a payload through the transport layer.
 
         Args:
             payload (Dict[str, Any]): The payload to send.
+            timeout (Optional[float], optional): The deadline in seconds. Defaults to the transport's timeout.
 
         Returns:
             Dict[str, Any]: The response from the server.
         """
         ...
+    async def send_batch(self, payloads: List[Dict[str, Any]], timeout: Optional[float] = None,
+                         on_result: Optional[Callable[[int, Union[Any, Exception]], None]] = None
+                         ) -> List[Union[Any, Exception]]:
+        """
+        Sends several requests, one at a time unless the transport supports JSON-RPC batches.
+
+        Args:
+            payloads (List[Dict[str, Any]]): The requests to send.
+            timeout (Optional[float], optional): The deadline in seconds. Defaults to the transport's timeout.
+            on_result (Optional[Callable[[int, Union[Any, Exception]], None]], optional): Called with the index
+                and the result or error of each request as soon as it is answered. Defaults to None.
+
+        Returns:
+            List[Union[Any, Exception]]: The result or the error of each request, in request order.
+        """
+        async def send(index: int, payload: Dict[str, Any]) -> Union[Any, Exception]:
+            try:
+                result = await self.send(payload, timeout)
+            except Exception as e:
+                result = e
+            if on_result:
+                on_result(index, result)
+            return result
+
+        return list(await asyncio.gather(*(send(index, payload) for index, payload in enumerate(payloads))))
+
+    def cancel_request(self, request_id: str, reason: str, timed_out: bool = False) -> bool:
+        """
+        Withdraws one outstanding request and tells the server to cancel it, if the transport can.
+
+        Args:
+            request_id (str): The id of the request.
+            reason (str): The reason given to the server.
+            timed_out (bool, optional): Whether the caller gave up because its deadline passed. Defaults to False.
+
+        Returns:
+            bool: True if the request was outstanding and has been withdrawn.
+        """
+        return False
 
 # ---------- STDIO-like process (stdio / python / npx / docker) ----------
 class ProcessTransport(BaseTransport):
@@ -182,6 +393,12 @@ class ProcessTransport(BaseTransport):
 
     This class manages a subprocess and communicates with it over stdin and stdout.
 
+    Every request has a deadline. A request that times out or whose caller is
+    cancelled is withdrawn and the server is sent an MCP `notifications/cancelled`
+    for it; requests in a JSON-RPC batch are withdrawn individually. If the process exits or its output stream ends, all pending requests
+    fail with a `ConnectionError` instead of hanging. At most `max_in_flight`
+    requests are outstanding at once; further callers wait for a slot.
+
     Usage:
         transport = ProcessTransport(argv=["python", "my_script.py"])
         await transport.start()
@@ -189,7 +406,8 @@ class ProcessTransport(BaseTransport):
         await transport.stop()
     """
     
-    def __init__(self, argv: List[str], env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None):
+    def __init__(self, argv: List[str], env: Optional[Dict[str, str]] = None, cwd: Optional[str] = None,
+                 timeout: float = 60.0, max_in_flight: int = 16):
         """
         Initializes the process transport.
 
@@ -197,15 +415,28 @@ class ProcessTransport(BaseTransport):
             argv (List[str]): The command and arguments to execute.
             env (Optional[Dict[str, str]], optional): Environment variables for the process. Defaults to None.
             cwd (Optional[str], optional): The working directory for the process. Defaults to None.
+            timeout (float, optional): The default request deadline in seconds. Defaults to 60.0.
+            max_in_flight (int, optional): The maximum number of outstanding requests. Defaults to 16.
         """
+        super().__init__()
         self.argv = argv
         self.env = {**os.environ, **(env or {})}
         self.cwd = cwd
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
         self.proc: Optional[asyncio.subprocess.Process] = None
         self.reader: Optional[asyncio.StreamReader] = None
         self.writer: Optional[asyncio.StreamWriter] = None
         self.pending: Dict[str, asyncio.Future] = {}
         self._listen_task: Optional[asyncio.Task] = None
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._closed: Optional[Exception] = None
+        self.stats = {"timeouts": 0, "cancelled": 0, "failed_on_exit": 0}
+
+    @property
+    def closed(self) -> bool:
+        """Whether the process has exited or closed its output."""
+        return self._closed is not None
 
     async def start(self):
         """Starts the process and sets up communication streams."""
@@ -221,15 +452,21 @@ class ProcessTransport(BaseTransport):
         
         assert self.proc.stdout and self.proc.stdin
         self.reader, self.writer = self.proc.stdout, self.proc.stdin
+        self._closed = None
         self._listen_task = asyncio.create_task(self._listen())
 
     async def _listen(self):
         """Listens for responses from the process and fulfills pending futures."""
         assert self.reader
+        reason = "MCP server closed its output"
         try:
             while True:
                 line = await self.reader.readline()
                 if not line:
+                    # Output closed: give the process a moment to exit so its code can be reported
+                    if self.proc:
+                        with contextlib.suppress(asyncio.TimeoutError):
+                            await asyncio.wait_for(self.proc.wait(), 1.0)
                     break
                 try:
                     msg = json.loads(line.decode("utf-8"))
@@ -238,43 +475,242 @@ class ProcessTransport(BaseTransport):
                     logger.warning(f"Invalid JSON from server: {e}")
                     continue
                 
-                _id = str(msg.get("id"))
-                fut = self.pending.pop(_id, None)
-                if fut:
-                    if "result" in msg:
-                        fut.set_result(msg["result"])
-                    else:
-                        fut.set_exception(RuntimeError(str(msg.get("error"))))
+                # A batch response is an array of responses, in any order
+                for response in msg if isinstance(msg, list) else [msg]:
+                    self._resolve(response)
+        except asyncio.CancelledError:
+            reason = "MCP transport stopped"
+            raise
         except Exception as e:
             logger.error(f"Error in process listener: {e}")
+            reason = f"MCP server connection failed: {e}"
         finally:
+            if self.proc and self.proc.returncode is not None:
+                reason = f"MCP server process exited with code {self.proc.returncode}"
+            self._fail_pending(ConnectionError(reason))
             logger.info("Process listener stopped")
 
-    async def send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def _resolve(self, msg: Dict[str, Any]) -> None:
+        """
+        Completes the pending request a response belongs to.
+
+        Args:
+            msg (Dict[str, Any]): A JSON-RPC response.
+        """
+        if not isinstance(msg, dict):
+            return
+        if "id" not in msg and "method" in msg:
+            self._notify(msg)
+            return
+        fut = self.pending.pop(str(msg.get("id")), None)
+        if fut and not fut.done():
+            if "result" in msg:
+                fut.set_result(msg["result"])
+            else:
+                fut.set_exception(RuntimeError(str(msg.get("error"))))
+
+    def _fail_pending(self, error: Exception) -> None:
+        """
+        Fails all pending requests and rejects new ones.
+
+        Args:
+            error (Exception): The error to raise in the waiting callers.
+        """
+        self._closed = error
+        pending, self.pending = self.pending, {}
+        for fut in pending.values():
+            if not fut.done():
+                fut.set_exception(error)
+                self.stats["failed_on_exit"] += 1
+
+    def _notify_cancelled(self, request_id: str, reason: str) -> None:
+        """
+        Tells the server to stop working on a request, without waiting.
+
+        Args:
+            request_id (str): The id of the withdrawn request.
+            reason (str): The reason given to the server.
+        """
+        if not self.writer or self._closed:
+            return
+        notification = {
+            "jsonrpc": "2.0",
+            "method": "notifications/cancelled",
+            "params": {"requestId": request_id, "reason": reason}
+        }
+        with contextlib.suppress(Exception):
+            self.writer.write((json.dumps(notification) + "\n").encode("utf-8"))
+
+    async def send(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Sends a message to the process.
 
         Args:
             payload (Dict[str, Any]): The payload to send.
+            timeout (Optional[float], optional): The deadline in seconds, including the wait for
+                                                 an in-flight slot. Defaults to the transport's timeout.
 
         Returns:
             Dict[str, Any]: The response from the server.
+
+        Raises:
+            TimeoutError: If the server does not answer before the deadline.
+            ConnectionError: If the process has exited or exits before answering.
+        """
+        result = (await self._exchange([payload], payload, timeout))[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def send_batch(self, payloads: List[Dict[str, Any]], timeout: Optional[float] = None,
+                         on_result: Optional[Callable[[int, Union[Any, Exception]], None]] = None
+                         ) -> List[Union[Any, Exception]]:
+        """
+        Sends several requests as one JSON-RPC batch array, in a single write.
+
+        Each request takes an in-flight slot (a batch larger than `max_in_flight`
+        takes them all). Requests still unanswered at the deadline fail with a
+        `TimeoutError` of their own; answered ones keep their results. A request
+        can be withdrawn early with `cancel_request`.
+
+        Args:
+            payloads (List[Dict[str, Any]]): The requests to send.
+            timeout (Optional[float], optional): The deadline in seconds. Defaults to the transport's timeout.
+            on_result (Optional[Callable[[int, Union[Any, Exception]], None]], optional): Called with the index
+                and the result or error of each request as soon as it is answered. Defaults to None.
+
+        Returns:
+            List[Union[Any, Exception]]: The result or the error of each request, in request order.
+
+        Raises:
+            TimeoutError: If no in-flight slot frees up before the deadline.
+            ConnectionError: If the process has exited.
+        """
+        return await self._exchange(payloads, payloads, timeout, on_result)
+
+    def cancel_request(self, request_id: str, reason: str, timed_out: bool = False) -> bool:
+        """
+        Withdraws one outstanding request and tells the server to cancel it.
+
+        Args:
+            request_id (str): The id of the request.
+            reason (str): The reason given to the server.
+            timed_out (bool, optional): Whether the caller gave up because its deadline passed. Defaults to False.
+
+        Returns:
+            bool: True if the request was outstanding and has been withdrawn.
+        """
+        fut = self.pending.pop(str(request_id), None)
+        if fut is None or fut.done():
+            return False
+        fut.set_exception(RuntimeError(f"MCP request {request_id} withdrawn: {reason}"))
+        self.stats["timeouts" if timed_out else "cancelled"] += 1
+        self._notify_cancelled(str(request_id), reason)
+        return True
+
+    async def _acquire_slots(self, count: int, timeout: float) -> None:
+        """
+        Takes in-flight slots, all or none: slots taken before a timeout or a
+        cancellation are given back.
+
+        Args:
+            count (int): The number of slots.
+            timeout (float): How long to wait for them.
+
+        Raises:
+            TimeoutError: If the slots do not free up in time.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        acquired = 0
+        try:
+            for _ in range(count):
+                await asyncio.wait_for(self._slots.acquire(), max(deadline - loop.time(), 0))
+                acquired += 1
+        except BaseException as e:
+            for _ in range(acquired):
+                self._slots.release()
+            if isinstance(e, asyncio.TimeoutError):
+                self.stats["timeouts"] += 1
+                raise TimeoutError(f"No in-flight slot for MCP request within {timeout}s") from None
+            raise
+
+    async def _exchange(self, payloads: List[Dict[str, Any]], message: Union[Dict[str, Any], List[Dict[str, Any]]],
+                        timeout: Optional[float],
+                        on_result: Optional[Callable[[int, Union[Any, Exception]], None]] = None
+                        ) -> List[Union[Any, Exception]]:
+        """
+        Writes one message (a request or a batch) and waits for the responses to its requests.
+
+        Args:
+            payloads (List[Dict[str, Any]]): The requests in the message.
+            message (Union[Dict[str, Any], List[Dict[str, Any]]]): What to write: a request or a batch array.
+            timeout (Optional[float]): The deadline in seconds. Defaults to the transport's timeout.
+            on_result (Optional[Callable[[int, Union[Any, Exception]], None]], optional): Called with the index
+                and the result or error of each request as soon as it is answered. Defaults to None.
+
+        Returns:
+            List[Union[Any, Exception]]: The result or the error of each request, in request order;
+                                         unanswered requests get a `TimeoutError`.
         """
         assert self.writer
-        _id = str(payload.get("id"))
-        if not _id:
+        ids = [str(payload.get("id")) for payload in payloads]
+        if not all(ids):
             raise RuntimeError("missing id")
-        
-        fut = asyncio.get_running_loop().create_future()
-        self.pending[_id] = fut
-        
+        if self._closed:
+            raise self._closed
+        timeout = timeout or self.timeout
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        slots = min(len(payloads), self.max_in_flight)
+        await self._acquire_slots(slots, timeout)
+
+        futures = [loop.create_future() for _ in payloads]
+        if on_result:
+            for index, fut in enumerate(futures):
+                fut.add_done_callback(
+                    lambda done, index=index: None if done.cancelled()
+                    else on_result(index, done.exception() or done.result())
+                )
+        self.pending.update(zip(ids, futures))
         try:
-            self.writer.write((json.dumps(payload) + "\n").encode("utf-8"))
+            self.writer.write((json.dumps(message) + "\n").encode("utf-8"))
             await self.writer.drain()
-            return await fut
-        except Exception as e:
-            self.pending.pop(_id, None)
-            raise e
+            _, unanswered = await asyncio.wait(futures, timeout=max(deadline - loop.time(), 0))
+        except asyncio.CancelledError:
+            self.stats["cancelled"] += 1
+            self._withdraw(ids, futures, "Cancelled by client")
+            raise
+        finally:
+            if any(not fut.done() for fut in futures):
+                self._withdraw(ids, futures, f"Timed out after {timeout}s")
+            for _id in ids:
+                self.pending.pop(_id, None)
+            for _ in range(slots):
+                self._slots.release()
+
+        if unanswered:
+            self.stats["timeouts"] += 1
+        return [
+            TimeoutError(f"MCP request {payload.get('method')} timed out after {timeout}s")
+            if fut in unanswered else fut.exception() or fut.result()
+            for payload, fut in zip(payloads, futures)
+        ]
+
+    def _withdraw(self, ids: List[str], futures: List[asyncio.Future], reason: str) -> None:
+        """
+        Gives up on unanswered requests and tells the server to cancel them.
+
+        Args:
+            ids (List[str]): The request ids.
+            futures (List[asyncio.Future]): Their futures.
+            reason (str): The reason given to the server.
+        """
+        for _id, fut in zip(ids, futures):
+            if not fut.done():
+                fut.cancel()
+                self._notify_cancelled(_id, reason)
 
     async def stop(self):
         """Stops the process and cleans up resources."""
@@ -296,6 +732,8 @@ class ProcessTransport(BaseTransport):
         
         if self._listen_task:
             self._listen_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listen_task
         
         if self.proc:
             with contextlib.suppress(ProcessLookupError):
@@ -308,6 +746,8 @@ class HTTPTransport(BaseTransport):
     An HTTP/HTTPS transport layer.
 
     This class uses the `httpx` library to send and receive MCP messages over HTTP.
+    The `httpx` client is borrowed from the process-wide registry of its server's
+    origin, so connections stay open for other transports to the same host.
 
     Usage:
         transport = HTTPTransport(base_url="http://localhost:8000/mcp")
@@ -328,6 +768,7 @@ class HTTPTransport(BaseTransport):
             verify (bool, optional): Whether to verify the server's TLS certificate. Defaults to True.
             timeout (float, optional): The request timeout in seconds. Defaults to 60.0.
         """
+        super().__init__()
         self.url = base_url.rstrip("/")
         self.headers = headers or {}
         if bearer_token:
@@ -336,54 +777,193 @@ class HTTPTransport(BaseTransport):
         self.timeout = timeout
         self.client: Optional[Any] = None
 
+    @property
+    def closed(self) -> bool:
+        """Whether the borrowed client has been returned or closed."""
+        return self.client is None or self.client.is_closed
+
     async def start(self):
-        """Initializes the `httpx` client."""
-        try:
-            import httpx
-            self.client = httpx.AsyncClient(
-                timeout=self.timeout, 
-                verify=self.verify, 
-                headers=self.headers
-            )
-            logger.info(f"HTTP client started for {self.url}")
-        except ImportError:
-            raise ImportError("httpx is required for HTTP transport")
-
-    async def send(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Borrows the `httpx` client of the server's origin."""
+        self.client = await http_clients.acquire(self.url, self.verify)
+        logger.info(f"HTTP client started for {self.url}")
+
+    async def send(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
         """
         Sends an HTTP POST request to the server.
 
         Args:
             payload (Dict[str, Any]): The payload to send.
+            timeout (Optional[float], optional): The deadline in seconds. Defaults to the transport's timeout.
 
         Returns:
             Dict[str, Any]: The JSON response from the server.
         """
-        assert self.client
         try:
-            r = await self.client.post(self.url, json=payload)
-            r.raise_for_status()
-            msg = r.json()
-            if "result" in msg:
-                return msg["result"]
-            raise RuntimeError(str(msg.get("error")))
+            responses = await self._post(payload, timeout)
         except Exception as e:
             logger.error(f"HTTP request failed: {e}")
             raise
+        msg = next((response for response in responses if str(response.get("id")) == str(payload.get("id"))),
+                   responses[0] if responses else {})
+        if "result" in msg:
+            return msg["result"]
+        raise RuntimeError(str(msg.get("error")))
+
+    async def _post(self, message: Union[Dict[str, Any], List[Dict[str, Any]]],
+                    timeout: Optional[float]) -> List[Dict[str, Any]]:
+        """
+        POSTs a request or batch and collects the responses.
+
+        The server may answer with JSON or, for long-running requests, with a
+        server-sent event stream; notifications in the stream (such as progress)
+        are routed as they arrive.
+
+        Args:
+            message (Union[Dict[str, Any], List[Dict[str, Any]]]): The request or batch array.
+            timeout (Optional[float]): The deadline in seconds. Defaults to the transport's timeout.
+
+        Returns:
+            List[Dict[str, Any]]: The JSON-RPC responses.
+        """
+        assert self.client
+        # The client is shared by origin: this server's headers go with each request
+        headers = {**self.headers, "Accept": "application/json, text/event-stream"}
+        async with self.client.stream("POST", self.url, json=message, headers=headers,
+                                      timeout=timeout or self.timeout) as r:
+            r.raise_for_status()
+            if not r.headers.get("content-type", "").startswith("text/event-stream"):
+                body = json.loads(await r.aread())
+                return body if isinstance(body, list) else [body]
+
+            responses = []
+            data: List[str] = []
+            async for line in r.aiter_lines():
+                if line.startswith("data:"):
+                    data.append(line[5:].strip())
+                    continue
+                if line or not data:
+                    continue
+                event, data = json.loads("\n".join(data)), []
+                for msg in event if isinstance(event, list) else [event]:
+                    if "id" not in msg and "method" in msg:
+                        self._notify(msg)
+                    else:
+                        responses.append(msg)
+            return responses
+
+    async def send_batch(self, payloads: List[Dict[str, Any]], timeout: Optional[float] = None,
+                         on_result: Optional[Callable[[int, Union[Any, Exception]], None]] = None
+                         ) -> List[Union[Any, Exception]]:
+        """
+        Sends several requests as one JSON-RPC batch array in a single POST.
+
+        Args:
+            payloads (List[Dict[str, Any]]): The requests to send.
+            timeout (Optional[float], optional): The deadline in seconds. Defaults to the transport's timeout.
+            on_result (Optional[Callable[[int, Union[Any, Exception]], None]], optional): Called with the index
+                and the result or error of each request once the response arrives. Defaults to None.
+
+        Returns:
+            List[Union[Any, Exception]]: The result or the error of each request, in request order.
+        """
+        try:
+            msg = await self._post(payloads, timeout)
+        except Exception as e:
+            logger.error(f"HTTP batch request failed: {e}")
+            raise
+        ids = {str(payload.get("id")) for payload in payloads}
+        if len(msg) == 1 and str(msg[0].get("id")) not in ids:
+            # The server rejected the batch as a whole
+            raise RuntimeError(str(msg[0].get("error")))
+
+        responses = {str(response.get("id")): response for response in msg if isinstance(response, dict)}
+        results = []
+        for payload in payloads:
+            response = responses.get(str(payload.get("id")))
+            if response is None:
+                results.append(RuntimeError(f"No response to batched request {payload.get('id')}"))
+            elif "result" in response:
+                results.append(response["result"])
+            else:
+                results.append(RuntimeError(str(response.get("error"))))
+        if on_result:
+            for index, result in enumerate(results):
+                on_result(index, result)
+        return results
 
     async def stop(self):
-        """Closes the `httpx` client."""
+        """Returns the `httpx` client to the registry, leaving its connections open."""
         if self.client:
-            await self.client.aclose()
+            http_clients.release(self.url, self.verify)
+            self.client = None
             logger.info("HTTP client stopped")
 
 # ---------- Client ----------
+class MCPBatch:
+    """
+    Requests collected by `MCPClientOriginal.batch()` and sent as one JSON-RPC batch.
+
+    Each call returns a future that is resolved when the batch is sent, on leaving
+    the `async with` block.
+    """
+
+    def __init__(self, client: "MCPClientOriginal", timeout: Optional[float] = None):
+        """
+        Initializes the batch.
+
+        Args:
+            client (MCPClientOriginal): The client that sends the batch.
+            timeout (Optional[float], optional): The batch deadline in seconds. Defaults to the server's `timeout_s`.
+        """
+        self.client = client
+        self.timeout = timeout
+        self.items: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None) -> asyncio.Future:
+        """
+        Adds an RPC request to the batch.
+
+        Args:
+            method (str): The name of the RPC method to call.
+            params (Optional[Dict[str, Any]], optional): The parameters for the RPC method. Defaults to None.
+
+        Returns:
+            asyncio.Future: The future result of the request.
+        """
+        fut = asyncio.get_running_loop().create_future()
+        self.items.append((self.client._payload(method, params), fut))
+        return fut
+
+    def tools_call(self, name: str, arguments: Dict[str, Any]) -> asyncio.Future:
+        """
+        Adds a tool call to the batch.
+
+        Args:
+            name (str): The name of the tool to call.
+            arguments (Dict[str, Any]): The arguments for the tool.
+
+        Returns:
+            asyncio.Future: The future result of the tool call.
+        """
+        return self.call("tools/call", {"name": name, "arguments": arguments})
+
+
 class MCPClientOriginal:
     """
     The original MCP client, which supports multiple transport types.
 
     This class is responsible for starting, stopping, and communicating with an MCP server
     using the appropriate transport layer based on the server's configuration.
+
+    Several requests can share one round trip as a JSON-RPC batch: explicitly with
+    `batch()`, or, for servers with `batching` enabled, automatically for requests
+    issued in the same event-loop tick (e.g. from `asyncio.gather`).
+
+    Usage:
+        async with client.batch() as batch:
+            search = batch.tools_call("semantic_search", {"query": "auth"})
+            patterns = batch.tools_call("pattern_extract", {"pattern": "def"})
+        results = search.result(), patterns.result()
     """
     
     def __init__(self, server: MCPServer):
@@ -399,6 +979,12 @@ class MCPClientOriginal:
         self.start_time = None
         self.error_count = 0
         self.last_error = None
+        # Requests waiting for the end of the current event-loop tick to be sent together
+        self._queue: List[Tuple[Dict[str, Any], asyncio.Future, Optional[float]]] = []
+        self._flushes: set = set()
+        self.batch_stats = {"batches": 0, "batched_requests": 0}
+        self.capabilities: Dict[str, Any] = {}
+        self._notification_handlers: List[Callable[[str, Dict[str, Any]], None]] = []
 
     async def start(self) -> Dict[str, Any]:
         """
@@ -412,25 +998,29 @@ class MCPClientOriginal:
         """
         try:
             kind = self.server.kind
+            process_options = {
+                "timeout": self.server.timeout_s or 60.0,
+                "max_in_flight": self.server.max_in_flight,
+            }
             
             if kind == "stdio":
                 argv = self.server.cmd or []
                 if not argv:
                     raise ValueError("cmd is required for stdio transport")
-                self.transport = ProcessTransport(argv, self.server.env, self.server.cwd)
+                self.transport = ProcessTransport(argv, self.server.env, self.server.cwd, **process_options)
                 
             elif kind == "python":
                 module = self.server.module
                 if not module:
                     raise ValueError("module is required for python transport")
                 argv = [sys.executable, "-u", "-m", module] + (self.server.args or [])
-                self.transport = ProcessTransport(argv, self.server.env, self.server.cwd)
+                self.transport = ProcessTransport(argv, self.server.env, self.server.cwd, **process_options)
                 
             elif kind == "npx":
                 argv = self.server.cmd or ["npx", "-y"]
                 if self.server.args:
                     argv += self.server.args
-                self.transport = ProcessTransport(argv, self.server.env, self.server.cwd)
+                self.transport = ProcessTransport(argv, self.server.env, self.server.cwd, **process_options)
                 
             elif kind == "docker":
                 image = self.server.image
@@ -443,7 +1033,7 @@ class MCPClientOriginal:
                 if self.server.cwd:
                     base += ["-v", f"{self.server.cwd}:{self.server.cwd}", "-w", self.server.cwd]
                 argv = base + [image] + (self.server.entrypoint or []) + (self.server.args or [])
-                self.transport = ProcessTransport(argv, None, None)
+                self.transport = ProcessTransport(argv, None, None, **process_options)
                 
             elif kind == "http":
                 url = self.server.url
@@ -460,6 +1050,7 @@ class MCPClientOriginal:
                 raise ValueError(f"unsupported transport {kind}")
 
             # Start transport
+            self.transport.on_notification = self._dispatch_notification
             await self.transport.start()
             
             # Initialize MCP server
@@ -469,6 +1060,7 @@ class MCPClientOriginal:
                 "clientInfo": {"name": "chonost-mcp", "version": "0.2.0"},
             })
             
+            self.capabilities = (init_result or {}).get("capabilities", {})
             self.initialized = True
             self.start_time = time.time()
             logger.info(f"MCP server {self.server.name} initialized successfully")
@@ -481,44 +1073,183 @@ class MCPClientOriginal:
             logger.error(f"Failed to start MCP server {self.server.name}: {e}")
             raise
 
-    async def _rpc(self, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+    async def _rpc(self, method: str, params: Optional[Dict[str, Any]] = None,
+                   timeout: Optional[float] = None) -> Any:
         """
         Sends an RPC request to the server.
 
         Args:
             method (str): The name of the RPC method to call.
             params (Optional[Dict[str, Any]], optional): The parameters for the RPC method. Defaults to None.
+            timeout (Optional[float], optional): The deadline in seconds. Defaults to the server's `timeout_s`.
 
         Returns:
             Any: The result of the RPC call.
+
+        Raises:
+            TimeoutError: If the server does not answer before the deadline.
         """
         assert self.transport
+        payload = self._payload(method, params)
+        if not self.server.batching:
+            return await self.transport.send(payload, timeout=timeout)
+
+        # Batched: this caller keeps its own deadline and withdraws only its own request
+        timeout = timeout or self._default_timeout()
+        fut = asyncio.get_running_loop().create_future()
+        if not self._queue:
+            asyncio.get_running_loop().call_soon(self._flush)
+        self._queue.append((payload, fut, timeout))
+        try:
+            return await asyncio.wait_for(fut, timeout)
+        except asyncio.TimeoutError:
+            self.transport.cancel_request(payload["id"], f"Timed out after {timeout}s", timed_out=True)
+            raise TimeoutError(f"MCP request {method} timed out after {timeout}s")
+        except asyncio.CancelledError:
+            self.transport.cancel_request(payload["id"], "Cancelled by client")
+            raise
+
+    def _default_timeout(self) -> float:
+        """Gets the default request deadline: the transport's, or the server's `timeout_s`."""
+        return getattr(self.transport, "timeout", None) or self.server.timeout_s or 60.0
+
+    @staticmethod
+    def _payload(method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Builds a JSON-RPC request.
+
+        Args:
+            method (str): The name of the RPC method to call.
+            params (Optional[Dict[str, Any]], optional): The parameters for the RPC method. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: The request.
+        """
         payload = {"jsonrpc": "2.0", "id": str(uuid.uuid4()), "method": method}
         if params is not None:
             payload["params"] = params
-        return await self.transport.send(payload)
+        return payload
+
+    def _flush(self) -> None:
+        """
+        Sends the requests queued during the last event-loop tick.
+
+        The batch is held open until the latest deadline among its requests; each
+        caller still gives up at its own deadline and withdraws its own request.
+        """
+        queued, self._queue = self._queue, []
+        timeout = max(timeout or self._default_timeout() for _, _, timeout in queued)
+        task = asyncio.ensure_future(self._send([(payload, fut) for payload, fut, _ in queued], timeout))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _send(self, items: List[Tuple[Dict[str, Any], asyncio.Future]], timeout: Optional[float]) -> None:
+        """
+        Sends requests, as a batch if there are several, and resolves each future as soon as it is answered.
+
+        Args:
+            items (List[Tuple[Dict[str, Any], asyncio.Future]]): The requests and their futures.
+            timeout (Optional[float]): The deadline in seconds. Defaults to the server's `timeout_s`.
+        """
+        # Callers that gave up before the flush are not sent
+        items = [(payload, fut) for payload, fut in items if not fut.done()]
+        if not items:
+            return
+        payloads = [payload for payload, _ in items]
+
+        def resolve(index: int, result: Union[Any, Exception]) -> None:
+            fut = items[index][1]
+            if fut.done():
+                return
+            if isinstance(result, Exception):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
+
+        try:
+            if len(payloads) == 1:
+                results = [await self.transport.send(payloads[0], timeout=timeout)]
+            else:
+                self.batch_stats["batches"] += 1
+                self.batch_stats["batched_requests"] += len(payloads)
+                results = await self.transport.send_batch(payloads, timeout=timeout, on_result=resolve)
+        except Exception as e:
+            results = [e] * len(items)
+
+        for index, result in enumerate(results):
+            resolve(index, result)
 
-    async def tools_list(self) -> List[Dict[str, Any]]:
+    @contextlib.asynccontextmanager
+    async def batch(self, timeout: Optional[float] = None) -> AsyncIterator[MCPBatch]:
         """
-        Lists the available tools on the server.
+        Collects requests and sends them as one JSON-RPC batch when the block exits.
+
+        Args:
+            timeout (Optional[float], optional): The batch deadline in seconds. Defaults to the server's `timeout_s`.
+
+        Yields:
+            MCPBatch: The batch to add requests to.
+        """
+        assert self.transport
+        batch = MCPBatch(self, timeout)
+        try:
+            yield batch
+        except BaseException:
+            for _, fut in batch.items:
+                fut.cancel()
+            raise
+        await self._send(batch.items, batch.timeout)
+
+    def on_notification(self, handler: Callable[[str, Dict[str, Any]], None]) -> None:
+        """
+        Registers a handler for notifications from the server, e.g. `notifications/tools/list_changed`.
+
+        Args:
+            handler (Callable[[str, Dict[str, Any]], None]): Called with the method and params of each notification.
+        """
+        self._notification_handlers.append(handler)
+
+    def _dispatch_notification(self, method: str, params: Dict[str, Any]) -> None:
+        """Passes a server notification to the registered handlers."""
+        logger.debug(f"Notification from {self.server.name}: {method}")
+        for handler in list(self._notification_handlers):
+            handler(method, params)
+
+    async def tools_list(self, raise_on_error: bool = False) -> List[Dict[str, Any]]:
+        """
+        Lists the available tools on the server, following pagination cursors.
+
+        Args:
+            raise_on_error (bool, optional): Whether to raise instead of returning an empty list
+                                             when the server cannot be queried. Defaults to False.
 
         Returns:
             List[Dict[str, Any]]: A list of available tools.
         """
         try:
-            result = await self._rpc("tools/list", {})
-            return result.get("tools", [])
+            tools = []
+            params: Dict[str, Any] = {}
+            while True:
+                result = await self._rpc("tools/list", params)
+                tools.extend(result.get("tools", []))
+                cursor = result.get("nextCursor")
+                if not cursor:
+                    return tools
+                params = {"cursor": cursor}
         except Exception as e:
             logger.error(f"Failed to list tools from {self.server.name}: {e}")
+            if raise_on_error:
+                raise
             return []
 
-    async def tools_call(self, name: str, arguments: Dict[str, Any]) -> Any:
+    async def tools_call(self, name: str, arguments: Dict[str, Any], timeout: Optional[float] = None) -> Any:
         """
         Calls a tool on the server.
 
         Args:
             name (str): The name of the tool to call.
             arguments (Dict[str, Any]): The arguments for the tool.
+            timeout (Optional[float], optional): The deadline in seconds. Defaults to the server's `timeout_s`.
 
         Returns:
             Any: The result of the tool call.
@@ -528,15 +1259,69 @@ class MCPClientOriginal:
             result = await self._rpc("tools/call", {
                 "name": name, 
                 "arguments": arguments
-            })
+            }, timeout=timeout)
             execution_time = (time.time() - start_time) * 1000
-            logger.info(f"Tool {name} executed in {execution_time:.2f}ms")
+            logger.debug(f"Tool {name} executed in {execution_time:.2f}ms")
             return result
         except Exception as e:
             execution_time = (time.time() - start_time) * 1000
             logger.error(f"Tool {name} failed after {execution_time:.2f}ms: {e}")
             raise
 
+    async def tools_call_stream(self, name: str, arguments: Dict[str, Any],
+                                timeout: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Calls a tool and yields its progress as it runs.
+
+        The call carries an MCP progress token, so the server can send
+        `notifications/progress`; each becomes a 'progress' event with the
+        notification's fields (`progress`, `total`, `message`, and any partial
+        results the server includes). A final 'result' event carries the result.
+        Closing the iterator early cancels the call.
+
+        Args:
+            name (str): The name of the tool to call.
+            arguments (Dict[str, Any]): The arguments for the tool.
+            timeout (Optional[float], optional): The deadline in seconds. Defaults to the server's `timeout_s`.
+
+        Yields:
+            Dict[str, Any]: {'type': 'progress', ...} events, then {'type': 'result', 'result': ...}.
+        """
+        assert self.transport
+        token = str(uuid.uuid4())
+        events: asyncio.Queue = asyncio.Queue()
+        self.transport.progress_handlers[token] = events.put_nowait
+        call = asyncio.ensure_future(self._rpc("tools/call", {
+            "name": name,
+            "arguments": arguments,
+            "_meta": {"progressToken": token}
+        }, timeout=timeout))
+        try:
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                await asyncio.wait({call, next_event}, return_when=asyncio.FIRST_COMPLETED)
+                if not next_event.done():
+                    next_event.cancel()
+                    break
+                params = next_event.result()
+                yield {"type": "progress", **{key: value for key, value in params.items() if key != "progressToken"}}
+            # Progress that arrived together with the result
+            while not events.empty():
+                params = events.get_nowait()
+                yield {"type": "progress", **{key: value for key, value in params.items() if key != "progressToken"}}
+            yield {"type": "result", "result": await call}
+        finally:
+            self.transport.progress_handlers.pop(token, None)
+            if not call.done():
+                call.cancel()
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await call
+
+    @property
+    def alive(self) -> bool:
+        """Whether the client is initialized and its transport can still carry requests."""
+        return self.initialized and self.transport is not None and not self.transport.closed
+
     async def stop(self) -> None:
         """Stops the client and the transport layer."""
         try:
@@ -562,9 +1347,12 @@ class MCPClientOriginal:
         return {
             "name": self.server.name,
             "kind": self.server.kind,
-            "status": "running" if self.initialized else "stopped",
+            "status": "running" if self.alive else "stopped",
             "uptime_seconds": uptime,
             "error_count": self.error_count,
             "last_error": self.last_error,
-            "initialized": self.initialized
+            "initialized": self.initialized,
+            "pending_requests": len(getattr(self.transport, "pending", {})),
+            "batch_stats": self.batch_stats.copy(),
+            "transport_stats": dict(getattr(self.transport, "stats", {}))
         }
@@ -0,0 +1,238 @@
+"""
+MCP HTTP Client Registry.
+This module shares `httpx` clients between the HTTP transports of MCP servers,
+one client per origin, so keep-alive connections outlive the transports that
+use them. Pool churn (TTL refreshes, replica retirement, evictions) then reuses
+warm connections instead of paying new TCP and TLS handshakes to the same hosts.
+"""
+
+import time
+from typing import Any, Dict, Tuple
+from urllib.parse import urlsplit
+try:
+    # Try unified backend path
+    from ..config import Settings
+    from ..utils.log import get_logger
+
+    # Initialize settings
+    settings = Settings()
+    logger = get_logger(__name__)
+
+except ImportError:
+    # Simple settings fallback
+    class SimpleSettings:
+        mcp_http_max_connections = 100
+        mcp_http_max_keepalive = 20
+        mcp_http_keepalive_expiry = 30.0
+        mcp_http2 = False
+
+    settings = SimpleSettings()
+
+    # Simple logger fallback
+    import logging
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# (scheme, host, port, verify)
+OriginKey = Tuple[str, str, int, bool]
+
+
+def origin_key(url: str, verify: bool = True) -> OriginKey:
+    """
+    Builds the registry key of a URL: its origin and TLS verification setting.
+
+    Args:
+        url (str): The server URL.
+        verify (bool, optional): Whether the server's TLS certificate is verified. Defaults to True.
+
+    Returns:
+        OriginKey: The scheme, host, port and verification setting.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower() or "http"
+    port = parts.port or (443 if scheme == "https" else 80)
+    return scheme, (parts.hostname or "").lower(), port, bool(verify)
+
+
+class _SharedClient:
+    """One origin's client, with its borrowers and connection counters."""
+
+    __slots__ = ("client", "borrowers", "created_ts", "requests", "connections")
+
+    def __init__(self, client: Any):
+        self.client = client
+        self.borrowers = 0
+        self.created_ts = time.time()
+        self.requests = 0
+        self.connections = 0
+
+
+class HTTPClientRegistry:
+    """
+    A process-wide registry of `httpx.AsyncClient`s for MCP HTTP servers, keyed by origin.
+
+    Transports borrow the client of their server's origin and return it when they
+    stop; the client and its keep-alive connections stay open for the next borrower
+    until the registry is closed. Clients carry no per-server state, so servers on
+    the same origin pass their headers and timeouts with each request.
+
+    Usage:
+        client = await http_clients.acquire("https://tools.example.com/mcp")
+        try:
+            await client.post("https://tools.example.com/mcp", json=payload)
+        finally:
+            http_clients.release("https://tools.example.com/mcp")
+    """
+
+    def __init__(self, max_connections: int = None, max_keepalive: int = None,
+                 keepalive_expiry: float = None, http2: bool = None):
+        """
+        Initializes the client registry.
+
+        Args:
+            max_connections (int, optional): The maximum number of connections per origin.
+                                             Defaults to the value from settings.
+            max_keepalive (int, optional): The maximum number of idle keep-alive connections per origin.
+                                           Defaults to the value from settings.
+            keepalive_expiry (float, optional): Seconds an idle connection is kept open.
+                                                Defaults to the value from settings.
+            http2 (bool, optional): Whether to negotiate HTTP/2 (needs the `h2` package).
+                                    Defaults to the value from settings.
+        """
+        self.max_connections = max_connections or settings.mcp_http_max_connections
+        self.max_keepalive = max_keepalive or settings.mcp_http_max_keepalive
+        self.keepalive_expiry = keepalive_expiry or settings.mcp_http_keepalive_expiry
+        self.http2 = settings.mcp_http2 if http2 is None else http2
+        if self.http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("⚠️ HTTP/2 requested for MCP servers but the h2 package is missing; using HTTP/1.1")
+                self.http2 = False
+
+        self._clients: Dict[OriginKey, _SharedClient] = {}
+        self._stats = {
+            "clients_created": 0,
+            "borrows": 0,
+            "client_reuses": 0
+        }
+
+    async def acquire(self, url: str, verify: bool = True) -> Any:
+        """
+        Borrows the client for a URL's origin, creating it on first use.
+
+        Args:
+            url (str): The server URL.
+            verify (bool, optional): Whether to verify the server's TLS certificate. Defaults to True.
+
+        Returns:
+            httpx.AsyncClient: The shared client. Give it back with `release`.
+        """
+        key = origin_key(url, verify)
+        shared = self._clients.get(key)
+        if shared is None or shared.client.is_closed:
+            shared = self._clients[key] = _SharedClient(self._create_client(key))
+            self._stats["clients_created"] += 1
+            logger.info(f"🔌 HTTP client created for {key[0]}://{key[1]}:{key[2]}")
+        else:
+            self._stats["client_reuses"] += 1
+        shared.borrowers += 1
+        self._stats["borrows"] += 1
+        return shared.client
+
+    def release(self, url: str, verify: bool = True) -> None:
+        """
+        Returns a borrowed client. It stays open for later borrowers.
+
+        Args:
+            url (str): The server URL the client was borrowed for.
+            verify (bool, optional): The TLS verification setting it was borrowed with. Defaults to True.
+        """
+        shared = self._clients.get(origin_key(url, verify))
+        if shared and shared.borrowers > 0:
+            shared.borrowers -= 1
+
+    def _create_client(self, key: OriginKey) -> Any:
+        """
+        Creates the client of an origin, with the registry's pool limits and connection counters.
+
+        Args:
+            key (OriginKey): The origin the client is for.
+
+        Returns:
+            httpx.AsyncClient: The new client.
+        """
+        try:
+            import httpx
+        except ImportError:
+            raise ImportError("httpx is required for HTTP transport")
+
+        async def trace(event: str, info: Dict[str, Any]) -> None:
+            # httpcore reports each new connection and each request sent on any connection
+            shared = self._clients.get(key)
+            if shared is None:
+                return
+            if event == "connection.connect_tcp.complete":
+                shared.connections += 1
+            elif event.endswith(".send_request_headers.started"):
+                shared.requests += 1
+
+        async def add_trace(request: Any) -> None:
+            request.extensions["trace"] = trace
+
+        return httpx.AsyncClient(
+            verify=key[3],
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            event_hooks={"request": [add_trace]},
+        )
+
+    async def aclose(self) -> None:
+        """Closes all clients and their connections."""
+        for shared in self._clients.values():
+            try:
+                await shared.client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client: {e}")
+        self._clients.clear()
+        logger.info("HTTP client registry closed")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gets the statistics for the registry.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the registry's statistics, including
+                            the share of requests sent on an already open connection.
+        """
+        origins = {}
+        requests = connections = 0
+        for (scheme, host, port, verify), shared in self._clients.items():
+            origins[f"{scheme}://{host}:{port}"] = {
+                "borrowers": shared.borrowers,
+                "requests": shared.requests,
+                "connections_opened": shared.connections,
+                "verify": verify,
+                "age": time.time() - shared.created_ts
+            }
+            requests += shared.requests
+            connections += shared.connections
+        return {
+            "clients": len(self._clients),
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive": self.max_keepalive,
+            "keepalive_expiry": self.keepalive_expiry,
+            "requests": requests,
+            "connections_opened": connections,
+            "connection_reuse_rate": max(0.0, 1 - connections / requests) if requests else 0,
+            "origins": origins,
+            **self._stats
+        }
+
+# Global registry instance
+http_clients = HTTPClientRegistry()
@@ -6,11 +6,13 @@ This module provides a connection pool for MCP servers, supporting various trans
 import asyncio
 import time
 from collections import OrderedDict
-from typing import Dict, Optional, Tuple
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set
 try:
     # Try unified backend path
     from ..models import MCPServer
-    from .client import MCPClient
+    from .client import MCPClientOriginal
+    from .telemetry import telemetry
     from ..config import Settings
     from ..utils.log import get_logger
 
@@ -21,12 +23,16 @@ try:
 except ImportError:
     # Fallback for standalone usage
     from models import MCPServer
-    from mcp.client import MCPClient
+    from mcp.client import MCPClientOriginal
+    from mcp.telemetry import telemetry
 
     # Simple settings fallback
     class SimpleSettings:
         mcp_pool_max = 4
         mcp_ttl_seconds = 300
+        mcp_refresh_ratio = 0.8
+        mcp_replica_idle_seconds = 60
+        mcp_maintenance_interval = 15
 
     settings = SimpleSettings()
 
@@ -35,91 +41,449 @@ except ImportError:
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger(__name__)
 
+class _Replica:
+    """One started client of a server, with its load and lifecycle state."""
+
+    __slots__ = ("client", "created_ts", "last_used_ts", "in_flight", "retiring", "refreshing")
+
+    def __init__(self, client: MCPClientOriginal):
+        now = time.time()
+        self.client = client
+        self.created_ts = now
+        self.last_used_ts = now
+        self.in_flight = 0
+        self.retiring = False
+        self.refreshing = False
+
+
+class _ReplicaSet:
+    """The replicas of one pool key."""
+
+    def __init__(self, server: MCPServer):
+        self.server = server
+        self.replicas: List[_Replica] = []
+        self.spawning = 0
+        self.last_used_ts = time.time()
+
+    def active(self) -> List[_Replica]:
+        """Gets the replicas that may take new calls: not retiring, and with a live transport."""
+        return [replica for replica in self.replicas if not replica.retiring and replica.client.alive]
+
+    def dead(self) -> List[_Replica]:
+        """Gets the replicas, not yet retiring, whose server exited or whose transport closed."""
+        return [replica for replica in self.replicas if not replica.retiring and not replica.client.alive]
+
+    def least_loaded(self) -> Optional[_Replica]:
+        """Gets the active replica with the fewest calls in flight."""
+        active = self.active()
+        return min(active, key=lambda replica: replica.in_flight) if active else None
+
+
 class MCPPool:
     """
     A connection pool for MCP servers that supports multiple transport types.
 
     This class manages a pool of MCP clients to avoid the overhead of creating
     a new client for every request. It also handles client expiration and eviction.
+
+    Starting a client (spawning a process or container and running the
+    `initialize` RPC) can take seconds, so no lock is held across it: the first
+    startup for a key is shared by all callers for that key, while lookups for
+    other keys proceed in parallel. Expired and evicted clients are stopped in
+    background tasks, off the request path.
+
+    A process-based server answers one request at a time over its stdio pipe,
+    so each key holds a replica set of `server.min_replicas` to
+    `server.max_replicas` clients. Calls made through `acquire` go to the
+    replica with the fewest calls in flight; when every replica is busy,
+    another is spawned in the background. Replicas are replaced before they
+    reach their TTL (at `refresh_ratio` of it), so callers never wait for a
+    respawn, and servers marked `prespawn` are started by `prespawn()`.
+    Pre-spawned servers are never evicted to make room for others, and
+    `maintain()` restores them if they leave the pool.
     """
     
-    def __init__(self, maxsize: int = None, ttl_seconds: int = None):
+    def __init__(self, maxsize: int = None, ttl_seconds: int = None, refresh_ratio: float = None,
+                 idle_seconds: int = None):
         """
         Initializes the MCP pool.
 
         Args:
-            maxsize (int, optional): The maximum number of clients to keep in the pool.
+            maxsize (int, optional): The maximum number of servers to keep clients for.
                                      Defaults to the value from settings.
             ttl_seconds (int, optional): The time-to-live for clients in seconds.
                                          Defaults to the value from settings.
+            refresh_ratio (float, optional): The fraction of the TTL after which a replica is
+                                             replaced in the background. Defaults to the value from settings.
+            idle_seconds (int, optional): How long extra replicas (above `min_replicas`) may sit
+                                          idle before they are retired. Defaults to the value from settings.
         """
         self.maxsize = maxsize or settings.mcp_pool_max
         self.ttl_seconds = ttl_seconds or settings.mcp_ttl_seconds
+        self.refresh_ratio = refresh_ratio or getattr(settings, "mcp_refresh_ratio", 0.8)
+        self.idle_seconds = idle_seconds or getattr(settings, "mcp_replica_idle_seconds", 60)
         
-        # Pool storage: key -> (client, timestamp, last_used)
-        self._pool: OrderedDict[str, Tuple[MCPClient, float, float]] = OrderedDict()
-        self._lock = asyncio.Lock()
+        # Pool storage: key -> replica set, least recently used first
+        self._pool: OrderedDict[str, _ReplicaSet] = OrderedDict()
+        # First startups in progress: key -> creation task shared by all callers for the key
+        self._starting: Dict[str, asyncio.Task] = {}
+        # Background replica spawns (scale-up, refresh, prespawn) and shutdowns
+        self._spawning: Set[asyncio.Task] = set()
+        self._stopping: Set[asyncio.Task] = set()
+        self._maintenance_task: Optional[asyncio.Task] = None
+        # Pre-spawned servers, kept in the pool regardless of use: key -> server
+        self._pinned: Dict[str, MCPServer] = {}
         self._stats = {
             "total_connections": 0,
             "active_connections": 0,
             "failed_connections": 0,
             "pool_hits": 0,
-            "pool_misses": 0
+            "pool_misses": 0,
+            "shared_startups": 0,
+            "scale_ups": 0,
+            "refreshes": 0
         }
 
-    async def get(self, key: str, server: MCPServer) -> MCPClient:
+    def __contains__(self, key: str) -> bool:
+        """
+        Checks whether a server has a replica set in the pool.
+
+        Args:
+            key (str): The pool key.
+
+        Returns:
+            bool: True if the server's clients are pooled or being started.
+        """
+        return key in self._pool or key in self._starting
+
+    async def get(self, key: str, server: MCPServer) -> MCPClientOriginal:
         """
         Gets an MCP client from the pool or creates a new one.
 
-        If a valid client for the given key exists in the pool, it is returned.
-        Otherwise, a new client is created and added to the pool.
+        If the key has replicas, the least-loaded one is returned. If its first
+        client is being started, the caller waits for that startup instead of
+        starting another. Otherwise, a new client is created and added to the pool.
+
+        Prefer `acquire`, which also counts the call towards the replica's load.
+
+        Args:
+            key (str): The pool key, which is typically the server name.
+            server (MCPServer): The configuration for the MCP server.
+
+        Returns:
+            MCPClientOriginal: An MCP client instance.
+        """
+        replica = await self._checkout(key, server)
+        return replica.client
+
+    @asynccontextmanager
+    async def acquire(self, key: str, server: MCPServer) -> AsyncIterator[MCPClientOriginal]:
+        """
+        Checks out the least-loaded replica of a server for the duration of a call.
+
+        Usage:
+            async with pool.acquire("filesystem", server) as client:
+                result = await client.tools_call("semantic_search", {"query": "auth"})
 
         Args:
             key (str): The pool key, which is typically the server name.
             server (MCPServer): The configuration for the MCP server.
 
+        Yields:
+            MCPClientOriginal: The client to call.
+        """
+        started = time.perf_counter()
+        replica = await self._checkout(key, server)
+        telemetry.record_pool_wait(key, time.perf_counter() - started)
+        replica.in_flight += 1
+        try:
+            yield replica.client
+        finally:
+            replica.in_flight -= 1
+            replica.last_used_ts = time.time()
+            if replica.retiring and replica.in_flight == 0:
+                self._stop_in_background(key, replica.client)
+
+    async def _checkout(self, key: str, server: MCPServer) -> _Replica:
+        """
+        Picks the replica for a call, starting the key's first client if needed.
+
+        Args:
+            key (str): The pool key.
+            server (MCPServer): The configuration for the MCP server.
+
+        Returns:
+            _Replica: The least-loaded replica.
+        """
+        replica_set = self._pool.get(key)
+        if replica_set is not None:
+            self._drop_dead(key, replica_set)
+        replica = replica_set.least_loaded() if replica_set else None
+        if replica is not None:
+            self._pool.move_to_end(key)
+            replica_set.last_used_ts = time.time()
+            self._stats["pool_hits"] += 1
+            logger.debug(f"Pool hit for {key}")
+            self._maintain(key, replica_set, busy=replica.in_flight > 0)
+            return replica
+
+        task = self._starting.get(key)
+        if task is None:
+            self._stats["pool_misses"] += 1
+            task = asyncio.ensure_future(self._spawn(key, server))
+            self._starting[key] = task
+            task.add_done_callback(lambda done: self._starting.pop(key, None) if self._starting.get(key) is done else None)
+        else:
+            self._stats["shared_startups"] += 1
+            logger.debug(f"Waiting for in-progress startup of {key}")
+
+        # Shielded so that one caller giving up does not abort the startup for the others
+        replica = await asyncio.shield(task)
+        if key in self._pool:
+            self._maintain(key, self._pool[key], busy=False)
+        return replica
+
+    async def _spawn(self, key: str, server: MCPServer) -> _Replica:
+        """
+        Starts a client and adds it to the key's replica set, evicting the least recently used servers if the pool is full.
+
+        Pre-spawned servers are not evicted; if only they are left, the pool stays over `maxsize`.
+
+        Args:
+            key (str): The pool key.
+            server (MCPServer): The configuration for the MCP server.
+
         Returns:
-            MCPClient: An MCP client instance.
-        """
-        async with self._lock:
-            now = time.time()
-            
-            if key in self._pool:
-                client, created_ts, last_used_ts = self._pool.pop(key)
-                
-                if now - created_ts <= self.ttl_seconds:
-                    self._pool[key] = (client, created_ts, now)
-                    self._stats["pool_hits"] += 1
-                    logger.debug(f"Pool hit for {key}")
-                    return client
-                else:
-                    logger.debug(f"Client {key} expired, stopping")
-                    await client.stop()
-                    self._stats["active_connections"] -= 1
-            
+            _Replica: The started replica.
+        """
+        client = MCPClientOriginal(server)
+        try:
+            await client.start()
+        except asyncio.CancelledError:
+            await client.stop()
+            raise
+        except Exception as e:
+            self._stats["failed_connections"] += 1
+            logger.error(f"Failed to create MCP client for {key}: {e}")
+            # A failed initialize can leave the process or container running
+            await client.stop()
+            raise
+
+        replica = _Replica(client)
+        replica_set = self._pool.get(key)
+        if replica_set is None:
+            replica_set = self._pool[key] = _ReplicaSet(server)
+        replica_set.replicas.append(replica)
+        self._pool.move_to_end(key)
+        self._stats["total_connections"] += 1
+        self._stats["active_connections"] += 1
+        logger.info(f"Created new MCP client for {key} (transport: {server.kind}, replicas: {len(replica_set.replicas)})")
+
+        while len(self._pool) > self.maxsize:
+            oldest_key = next((name for name in self._pool if name != key and name not in self._pinned), None)
+            if oldest_key is None:
+                break
+            oldest_set = self._pool.pop(oldest_key)
+            logger.debug(f"Pool full, removing oldest server: {oldest_key}")
+            for oldest in oldest_set.replicas:
+                if oldest.retiring:
+                    continue  # Already stopped, or stopped when its last call returns
+                oldest.retiring = True
+                # Replicas with calls in flight are stopped when the last call returns
+                if oldest.in_flight == 0:
+                    self._stop_in_background(oldest_key, oldest.client)
+
+        return replica
+
+    def _spawn_in_background(self, key: str, replica_set: _ReplicaSet, replaces: Optional[_Replica] = None) -> None:
+        """
+        Adds a replica to a set without making any caller wait.
+
+        Args:
+            key (str): The pool key.
+            replica_set (_ReplicaSet): The set to grow.
+            replaces (Optional[_Replica], optional): A replica to retire once the new one is up.
+        """
+        async def spawn():
             try:
-                client = MCPClient(server)
-                await client.start()
-                
-                self._pool[key] = (client, now, now)
-                self._stats["total_connections"] += 1
-                self._stats["active_connections"] += 1
-                self._stats["pool_misses"] += 1
-                
-                logger.info(f"Created new MCP client for {key} (transport: {server.kind})")
-                
-                while len(self._pool) > self.maxsize:
-                    oldest_key, (oldest_client, _, _) = self._pool.popitem(last=False)
-                    logger.debug(f"Pool full, removing oldest client: {oldest_key}")
-                    await oldest_client.stop()
-                    self._stats["active_connections"] -= 1
-                
-                return client
-                
+                if self._pool.get(key) is not replica_set:
+                    return  # Evicted or removed meanwhile
+                await self._spawn(key, replica_set.server)
+                if replaces is not None:
+                    replaces.retiring = True
+                    if replaces.in_flight == 0:
+                        self._stop_in_background(key, replaces.client)
+            except Exception:
+                if replaces is not None:
+                    replaces.refreshing = False
+            finally:
+                replica_set.spawning -= 1
+
+        replica_set.spawning += 1
+        task = asyncio.ensure_future(spawn())
+        self._spawning.add(task)
+        task.add_done_callback(self._spawning.discard)
+
+    def _drop_dead(self, key: str, replica_set: _ReplicaSet) -> int:
+        """
+        Stops the replicas of a set whose server died, so they are no longer picked or counted.
+
+        Args:
+            key (str): The pool key.
+            replica_set (_ReplicaSet): The set to check.
+
+        Returns:
+            int: The number of replicas dropped.
+        """
+        dead = replica_set.dead()
+        for replica in dead:
+            logger.warning(f"MCP client {key} is no longer alive, replacing it")
+            replica.retiring = True
+            # Replicas with calls in flight are stopped when the last call returns
+            if replica.in_flight == 0:
+                self._stop_in_background(key, replica.client)
+        return len(dead)
+
+    def _maintain(self, key: str, replica_set: _ReplicaSet, busy: bool) -> None:
+        """
+        Schedules the background work a replica set needs: scale-up, TTL refresh and top-up
+        (which also replaces replicas that died).
+
+        Args:
+            key (str): The pool key.
+            replica_set (_ReplicaSet): The set to check.
+            busy (bool): Whether the replica just picked already had calls in flight.
+        """
+        if key not in self._pool:
+            return
+        self._drop_dead(key, replica_set)
+        server = replica_set.server
+        now = time.time()
+        active = replica_set.active()
+        target = len(active) + replica_set.spawning
+
+        # Replace replicas before they expire, so no call waits for a respawn
+        refresh_after = self.ttl_seconds * self.refresh_ratio
+        for replica in active:
+            if not replica.refreshing and now - replica.created_ts >= refresh_after:
+                replica.refreshing = True
+                self._stats["refreshes"] += 1
+                logger.debug(f"Refreshing MCP client for {key} before TTL expiry")
+                self._spawn_in_background(key, replica_set, replaces=replica)
+
+        if target < server.min_replicas:
+            for _ in range(server.min_replicas - target):
+                self._spawn_in_background(key, replica_set)
+        elif busy and target < server.max_replicas:
+            self._stats["scale_ups"] += 1
+            logger.debug(f"All replicas of {key} busy, spawning another")
+            self._spawn_in_background(key, replica_set)
+
+    def _stop_in_background(self, key: str, client: MCPClientOriginal) -> None:
+        """
+        Stops a client that has left the pool without making the caller wait.
+
+        Args:
+            key (str): The pool key the client was stored under.
+            client (MCPClientOriginal): The client to stop.
+        """
+        replica_set = self._pool.get(key)
+        if replica_set is not None:
+            replica_set.replicas = [replica for replica in replica_set.replicas if replica.client is not client]
+
+        async def stop():
+            try:
+                await client.stop()
+            finally:
+                self._stats["active_connections"] -= 1
+                logger.debug(f"Stopped MCP client {key}")
+
+        task = asyncio.ensure_future(stop())
+        self._stopping.add(task)
+        task.add_done_callback(self._stopping.discard)
+
+    async def prespawn(self, servers: Iterable[MCPServer]) -> Dict[str, int]:
+        """
+        Starts `min_replicas` clients for every server marked `prespawn`.
+
+        Args:
+            servers (Iterable[MCPServer]): The servers to consider, e.g. the registry's.
+
+        Returns:
+            Dict[str, int]: The number of replicas running per pre-spawned server.
+        """
+        async def warm(server: MCPServer):
+            try:
+                # The first replica shares any startup already in progress; the rest are topped up in the background
+                await self._checkout(server.name, server)
             except Exception as e:
-                self._stats["failed_connections"] += 1
-                logger.error(f"Failed to create MCP client for {key}: {e}")
-                raise
+                logger.warning(f"Could not pre-spawn MCP server {server.name}: {e}")
+
+        targets = [server for server in servers if server.prespawn and server.min_replicas > 0]
+        self._pinned.update((server.name, server) for server in targets)
+        await asyncio.gather(*(warm(server) for server in targets))
+        await asyncio.gather(*self._spawning, return_exceptions=True)
+        return {server.name: len(self._pool[server.name].active()) if server.name in self._pool else 0
+                for server in targets}
+
+    async def maintain(self) -> None:
+        """
+        Runs one maintenance pass over all replica sets.
+
+        Replicas nearing their TTL are refreshed, pre-spawned servers are topped
+        up to `min_replicas` (and restored if they left the pool), extra replicas
+        idle for `idle_seconds` are retired, and servers unused for a whole TTL
+        (and not pre-spawned) are dropped.
+        """
+        now = time.time()
+        for key, server in self._pinned.items():
+            if key not in self._pool and key not in self._starting:
+                logger.info(f"Restoring pre-spawned MCP server {key}")
+                self._pool[key] = _ReplicaSet(server)
+        for key, replica_set in list(self._pool.items()):
+            server = replica_set.server
+            if not server.prespawn and now - replica_set.last_used_ts > self.ttl_seconds:
+                logger.debug(f"MCP server {key} unused for {self.ttl_seconds}s, stopping its clients")
+                self._pool.pop(key, None)
+                for replica in replica_set.replicas:
+                    self._stop_in_background(key, replica.client)
+                continue
+
+            idle = sorted(
+                (replica for replica in replica_set.active()
+                 if replica.in_flight == 0 and now - replica.last_used_ts > self.idle_seconds),
+                key=lambda replica: replica.last_used_ts
+            )
+            surplus = len(replica_set.active()) - max(server.min_replicas, 1)
+            for replica in idle[:max(surplus, 0)]:
+                replica.retiring = True
+                self._stop_in_background(key, replica.client)
+
+            self._maintain(key, replica_set, busy=False)
+
+    def start_maintenance(self, interval: float = None) -> asyncio.Task:
+        """
+        Runs `maintain` periodically in the background.
+
+        Args:
+            interval (float, optional): Seconds between passes. Defaults to the value from settings.
+
+        Returns:
+            asyncio.Task: The maintenance task (cancelled by `close`).
+        """
+        interval = interval or getattr(settings, "mcp_maintenance_interval", 15)
+
+        async def loop():
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    await self.maintain()
+                except Exception as e:
+                    logger.error(f"MCP pool maintenance failed: {e}")
+
+        if self._maintenance_task is None or self._maintenance_task.done():
+            self._maintenance_task = asyncio.ensure_future(loop())
+        return self._maintenance_task
 
     async def release(self, key: str) -> None:
         """
@@ -135,65 +499,63 @@ class MCPPool:
 
     async def remove(self, key: str) -> None:
         """
-        Removes a client from the pool.
+        Removes a server's clients from the pool.
 
         Args:
             key (str): The pool key.
         """
-        async with self._lock:
-            if key in self._pool:
-                client, _, _ = self._pool.pop(key)
-                await client.stop()
-                self._stats["active_connections"] -= 1
-                logger.info(f"Removed client {key} from pool")
+        self._pinned.pop(key, None)
+        if key in self._pool:
+            replica_set = self._pool.pop(key)
+            await asyncio.gather(*(replica.client.stop() for replica in replica_set.replicas), return_exceptions=True)
+            self._stats["active_connections"] -= len(replica_set.replicas)
+            logger.info(f"Removed client {key} from pool")
 
     async def clear(self) -> None:
-        """Clears the entire pool, stopping all clients."""
-        async with self._lock:
-            logger.info("Clearing MCP pool")
-            for key, (client, _, _) in self._pool.items():
-                await client.stop()
-            
-            self._pool.clear()
-            self._stats["active_connections"] = 0
+        """Clears the entire pool, stopping all clients (including those still starting)."""
+        logger.info("Clearing MCP pool")
+        starting = list(self._starting.values()) + list(self._spawning)
+        for task in starting:
+            task.cancel()
+        await asyncio.gather(*starting, return_exceptions=True)
+
+        clients = [replica.client for replica_set in self._pool.values() for replica in replica_set.replicas]
+        self._pool.clear()
+        self._pinned.clear()
+        await asyncio.gather(*(client.stop() for client in clients), return_exceptions=True)
+        await asyncio.gather(*self._stopping, return_exceptions=True)
+        self._stats["active_connections"] = 0
 
     async def health_check(self) -> Dict[str, any]:
         """
         Checks the health of the clients in the pool.
 
         This method iterates through the clients in the pool, checks their status,
-        and removes any unhealthy clients.
+        removes any unhealthy clients (not initialized, or with a closed transport)
+        and spawns replacements up to each server's `min_replicas`.
 
         Returns:
             Dict[str, any]: A dictionary containing the health check results.
         """
-        async with self._lock:
-            healthy_clients = 0
-            total_clients = len(self._pool)
-            
-            for key, (client, created_ts, last_used_ts) in self._pool.items():
-                try:
-                    if client.initialized:
-                        healthy_clients += 1
-                    else:
-                        logger.warning(f"Unhealthy client {key} detected, removing")
-                        await client.stop()
-                        self._pool.pop(key, None)
-                        self._stats["active_connections"] -= 1
-                        
-                except Exception as e:
-                    logger.error(f"Error checking client {key} health: {e}")
-                    self._pool.pop(key, None)
-                    self._stats["active_connections"] -= 1
-            
-            return {
-                "total_clients": total_clients,
-                "healthy_clients": healthy_clients,
-                "pool_size": len(self._pool),
-                "max_size": self.maxsize,
-                "ttl_seconds": self.ttl_seconds,
-                "stats": self._stats.copy()
-            }
+        healthy_clients = 0
+        total_clients = 0
+        
+        for key, replica_set in list(self._pool.items()):
+            total_clients += len(replica_set.replicas)
+            healthy_clients += len(replica_set.replicas) - self._drop_dead(key, replica_set)
+            if not replica_set.replicas and not replica_set.spawning and not replica_set.server.min_replicas:
+                self._pool.pop(key, None)
+            else:
+                self._maintain(key, replica_set, busy=False)
+        
+        return {
+            "total_clients": total_clients,
+            "healthy_clients": healthy_clients,
+            "pool_size": len(self._pool),
+            "max_size": self.maxsize,
+            "ttl_seconds": self.ttl_seconds,
+            "stats": self._stats.copy()
+        }
 
     def get_stats(self) -> Dict[str, any]:
         """
@@ -206,12 +568,26 @@ class MCPPool:
             "pool_size": len(self._pool),
             "max_size": self.maxsize,
             "ttl_seconds": self.ttl_seconds,
+            "starting": len(self._starting) + len(self._spawning),
+            "stopping": len(self._stopping),
+            "replicas": {
+                key: {
+                    "active": len(replica_set.active()),
+                    "in_flight": sum(replica.in_flight for replica in replica_set.replicas),
+                    "min": replica_set.server.min_replicas,
+                    "max": replica_set.server.max_replicas
+                }
+                for key, replica_set in self._pool.items()
+            },
             **self._stats
         }
 
     async def close(self) -> None:
         """Closes the pool and stops all clients."""
         logger.info("Closing MCP pool")
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
         await self.clear()
 
 # Global pool instance
@@ -88,11 +88,15 @@ def initialize_default_servers():
     filesystem_server = MCPServer(
         name="filesystem",
         kind="python",
-        module="backend.mcp.mock_servers.filesystem",  # Mock filesystem server
+        module="backend.mock_servers.filesystem",      # Mock filesystem server
         env=None,
         cwd=None,
         description="File System MCP Server",
-        version="1.0.0"
+        version="1.0.0",
+        min_replicas=1,                               # Searched on most requests: keep one warm,
+        max_replicas=4,                               # and scale out under concurrent load
+        prespawn=True,
+        batching=True                                 # Accepts JSON-RPC batch arrays
     )
 
     postgres_server = MCPServer(
@@ -295,43 +299,13 @@ class MCPRegistry:
         """
         Lists all available tools from all registered servers.
 
+        The tools are discovered from the servers and served from the tool catalog's cache.
+
         Returns:
             list: A list of all available tools.
         """
-        servers = list_servers()
-        tools = []
-
-        for server_name, server in servers.items():
-            # Mock tools for each server type
-            if server_name == "filesystem":
-                tools.extend([
-                    {
-                        "name": "fs.semantic_search",
-                        "description": "Semantic search in codebase",
-                        "category": "filesystem"
-                    },
-                    {
-                        "name": "fs.pattern_extract",
-                        "description": "Extract code patterns",
-                        "category": "filesystem"
-                    }
-                ])
-            elif server_name == "github":
-                tools.extend([
-                    {
-                        "name": "gh.pr_create_smart",
-                        "description": "Create smart pull request",
-                        "category": "github"
-                    },
-                    {
-                        "name": "gh.issue_triage",
-                        "description": "Triage GitHub issues",
-                        "category": "github"
-                    }
-                ])
-            # Add more server-specific tools here
-
-        return tools
+        from .catalog import catalog
+        return await catalog.list_tools()
 
     async def get_server(self, name: str):
         """
@@ -0,0 +1,313 @@
+"""
+MCP Tool Result Cache.
+This module caches the results of idempotent MCP tools in memory, so agents
+that retry or re-plan with identical arguments do not call the server again.
+Entries are bounded in number (least recently used first out), expire after
+the tool's TTL, and can be invalidated by server, tool or named event (for
+example "filesystem" when files change).
+"""
+
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+try:
+    # Try unified backend path
+    from ..models import ToolCachePolicy
+    from ..config import Settings
+    from ..utils.log import get_logger
+    from ..utils.single_flight import SingleFlight, make_request_key
+
+    # Initialize settings
+    settings = Settings()
+    logger = get_logger(__name__)
+
+except ImportError:
+    # Fallback for standalone usage
+    from models import ToolCachePolicy
+    from utils.single_flight import SingleFlight, make_request_key
+
+    # Simple settings fallback
+    class SimpleSettings:
+        mcp_tool_cache_enabled = True
+        mcp_tool_cache_max_entries = 1024
+        mcp_tool_cache_default_ttl = 60.0
+
+    settings = SimpleSettings()
+
+    # Simple logger fallback
+    import logging
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+
+def cache_policy(tool: Dict[str, Any], override: Optional[ToolCachePolicy] = None,
+                 default_ttl: float = None) -> Optional[ToolCachePolicy]:
+    """
+    Decides whether and how a tool's results may be cached.
+
+    A policy configured for the server wins; otherwise the tool's own `cache`
+    declaration is used; otherwise a tool annotated both `readOnlyHint` and
+    `idempotentHint` is cached with the default TTL. Anything else is not cached.
+
+    Args:
+        tool (Dict[str, Any]): The tool as listed by its server.
+        override (Optional[ToolCachePolicy], optional): The policy configured for the server. Defaults to None.
+        default_ttl (float, optional): The TTL for annotated tools. Defaults to the value from settings.
+
+    Returns:
+        Optional[ToolCachePolicy]: The policy, or None if the tool is not cacheable.
+    """
+    if override is not None:
+        return override
+    declared = tool.get("cache")
+    if declared:
+        try:
+            return ToolCachePolicy(**declared)
+        except Exception as e:
+            logger.warning(f"Ignoring invalid cache declaration of tool {tool.get('name')}: {e}")
+    annotations = tool.get("annotations") or {}
+    if annotations.get("readOnlyHint") and annotations.get("idempotentHint"):
+        return ToolCachePolicy(ttl_seconds=default_ttl or settings.mcp_tool_cache_default_ttl)
+    return None
+
+
+class ToolResultCache:
+    """
+    A bounded in-memory LRU cache of MCP tool results.
+
+    Concurrent identical calls that miss the cache share one upstream call.
+    A result is not stored if the cache was invalidated for its server while
+    the call that produced it was running.
+
+    Usage:
+        result, cached = await tool_cache.get_or_call(
+            "filesystem", "semantic_search", {"query": "auth"}, policy,
+            lambda: client.tools_call("semantic_search", {"query": "auth"})
+        )
+    """
+
+    # Server notifications after which a server's cached results may be stale
+    INVALIDATING_NOTIFICATIONS = (
+        "notifications/resources/updated",
+        "notifications/resources/list_changed",
+        "notifications/tools/list_changed",
+    )
+
+    def __init__(self, max_entries: int = None, enabled: bool = None):
+        """
+        Initializes the tool result cache.
+
+        Args:
+            max_entries (int, optional): The maximum number of cached results.
+                                         Defaults to the value from settings.
+            enabled (bool, optional): Whether results are cached at all. Defaults to the value from settings.
+        """
+        self.max_entries = max_entries or settings.mcp_tool_cache_max_entries
+        self.enabled = settings.mcp_tool_cache_enabled if enabled is None else enabled
+        # Clients whose change notifications are already subscribed to
+        self._watched = weakref.WeakSet()
+        # key -> (result, expires_at, server, tool, invalidating events)
+        self._entries: OrderedDict[str, Tuple[Any, float, str, str, Tuple[str, ...]]] = OrderedDict()
+        self._flight = SingleFlight()
+        # Bumped by every invalidation: globally, or per server when it names one
+        self._generation = 0
+        self._server_generations: Dict[str, int] = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "stale_writes": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0
+        }
+
+    @staticmethod
+    def make_key(server: str, tool: str, arguments: Dict[str, Any], policy: ToolCachePolicy) -> str:
+        """
+        Builds the cache key of a call from the arguments its policy names.
+
+        Args:
+            server (str): The server name.
+            tool (str): The tool name.
+            arguments (Dict[str, Any]): The call arguments.
+            policy (ToolCachePolicy): The tool's cache policy.
+
+        Returns:
+            str: The cache key.
+        """
+        if policy.key_args is not None:
+            arguments = {name: arguments.get(name) for name in policy.key_args}
+        return make_request_key("tools/call", server, arguments, tool=tool)
+
+    def generation(self, server: str) -> Tuple[int, int]:
+        """
+        Gets the invalidation generation of a server's results.
+
+        Callers take it before a call and pass it to `set`, so that a result
+        from a call that started before an invalidation is not stored after it.
+
+        Args:
+            server (str): The server name.
+
+        Returns:
+            Tuple[int, int]: The global and per-server generation.
+        """
+        return self._generation, self._server_generations.get(server, 0)
+
+    def get(self, key: str) -> Tuple[Any, bool]:
+        """
+        Looks up a cached result.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Tuple[Any, bool]: The result and True on a hit; None and False otherwise.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None, False
+        if entry[1] <= time.time():
+            del self._entries[key]
+            self._stats["expired"] += 1
+            self._stats["misses"] += 1
+            return None, False
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return entry[0], True
+
+    def set(self, key: str, result: Any, server: str, tool: str, policy: ToolCachePolicy,
+            generation: Optional[Tuple[int, int]] = None) -> None:
+        """
+        Stores a result, evicting the least recently used ones if the cache is full.
+
+        Args:
+            key (str): The cache key.
+            result (Any): The tool result.
+            server (str): The server name.
+            tool (str): The tool name.
+            policy (ToolCachePolicy): The tool's cache policy.
+            generation (Optional[Tuple[int, int]], optional): The server's `generation` when the call
+                                                              started; the result is dropped if it changed.
+                                                              Defaults to None (always store).
+        """
+        if generation is not None and generation != self.generation(server):
+            self._stats["stale_writes"] += 1
+            return
+        self._entries[key] = (result, time.time() + policy.ttl_seconds, server, tool, tuple(policy.invalidate_on))
+        self._entries.move_to_end(key)
+        self._stats["writes"] += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    async def get_or_call(self, server: str, tool: str, arguments: Dict[str, Any], policy: ToolCachePolicy,
+                          call) -> Tuple[Any, bool]:
+        """
+        Serves a call from the cache, or makes it once for all identical concurrent callers and caches the result.
+
+        Results flagged `isError` are returned but not cached. Callers arriving
+        after an invalidation do not share a call that started before it.
+
+        Args:
+            server (str): The server name.
+            tool (str): The tool name.
+            arguments (Dict[str, Any]): The call arguments.
+            policy (ToolCachePolicy): The tool's cache policy.
+            call (Callable[[], Awaitable[Any]]): Makes the upstream call.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether it came from the cache.
+        """
+        if not self.enabled:
+            return await call(), False
+        key = self.make_key(server, tool, arguments, policy)
+        result, hit = self.get(key)
+        if hit:
+            return result, True
+
+        generation = self.generation(server)
+
+        async def call_and_store():
+            result = await call()
+            if not (isinstance(result, dict) and result.get("isError")):
+                self.set(key, result, server, tool, policy, generation)
+            return result
+
+        result, _ = await self._flight.do(f"{key}:{generation}", call_and_store)
+        return result, False
+
+    def watch(self, server: str, client) -> None:
+        """
+        Invalidates a server's cached results when the server reports that its resources or tools changed.
+
+        Args:
+            server (str): The server name.
+            client (MCPClientOriginal): A client connected to the server.
+        """
+        if client in self._watched:
+            return
+
+        def handle(method: str, params: Dict[str, Any]) -> None:
+            if method in self.INVALIDATING_NOTIFICATIONS:
+                self.invalidate(server=server)
+
+        client.on_notification(handle)
+        self._watched.add(client)
+
+    def invalidate(self, server: str = None, tool: str = None, event: str = None) -> int:
+        """
+        Drops cached results, e.g. from a file watcher or a server notification.
+
+        With no arguments, the whole cache is cleared. Results of calls still
+        running are not stored: of the server's calls when `server` is given,
+        of every call otherwise.
+
+        Args:
+            server (str, optional): Only results of this server. Defaults to None.
+            tool (str, optional): Only results of this tool. Defaults to None.
+            event (str, optional): Only results whose policy lists this event. Defaults to None.
+
+        Returns:
+            int: The number of results dropped.
+        """
+        if server is None:
+            self._generation += 1
+        else:
+            self._server_generations[server] = self._server_generations.get(server, 0) + 1
+        stale: List[str] = [
+            key for key, (_, _, entry_server, entry_tool, events) in self._entries.items()
+            if (server is None or entry_server == server)
+            and (tool is None or entry_tool == tool)
+            and (event is None or event in events)
+        ]
+        for key in stale:
+            del self._entries[key]
+        self._stats["invalidations"] += len(stale)
+        if stale:
+            logger.debug(f"Invalidated {len(stale)} cached tool results "
+                         f"(server={server}, tool={tool}, event={event})")
+        return len(stale)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gets the statistics for the cache.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the cache's statistics.
+        """
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0,
+            "coalesced": self._flight.stats["coalesced"],
+            **self._stats
+        }
+
+# Global cache instance
+tool_cache = ToolResultCache()
@@ -0,0 +1,460 @@
+"""
+MCP Call Telemetry.
+This module records per-server and per-tool statistics for MCP tool calls:
+latency histograms split into queueing (waiting for a pooled client) and
+execution, request and response payload sizes, error classes, calls abandoned
+by their caller, and the time callers wait on the connection pool. Histograms use fixed buckets, so memory
+stays constant however many calls are recorded. Statistics are served as JSON
+and in the Prometheus text format, and each call can optionally be traced as
+an OpenTelemetry span.
+"""
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager, nullcontext
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+try:
+    # Try unified backend path
+    from ..config import Settings
+    from ..utils.log import get_logger
+
+    # Initialize settings
+    settings = Settings()
+    logger = get_logger(__name__)
+
+except ImportError:
+    # Simple settings fallback
+    class SimpleSettings:
+        mcp_telemetry_enabled = True
+        mcp_telemetry_otel = False
+
+    settings = SimpleSettings()
+
+    # Simple logger fallback
+    import logging
+    logging.basicConfig(level=logging.INFO)
+    logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0
+)
+
+
+class Histogram:
+    """
+    A fixed-bucket histogram of durations, with percentile estimates.
+
+    Attributes:
+        bounds (Tuple[float, ...]): The upper bounds of the buckets; a last bucket holds everything above.
+        counts (List[int]): The number of observations in each bucket.
+        count (int): The total number of observations.
+        total (float): The sum of all observations.
+        max (float): The largest observation.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total", "max")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Initializes the histogram.
+
+        Args:
+            bounds (Sequence[float], optional): The ascending bucket upper bounds. Defaults to LATENCY_BUCKETS.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """
+        Records one observation.
+
+        Args:
+            value (float): The observed value.
+        """
+        index = 0
+        while index < len(self.bounds) and value > self.bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Estimates a percentile by interpolating within its bucket.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.95.
+
+        Returns:
+            Optional[float]: The estimate, or None without observations.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(estimate, self.max)
+            seen += bucket_count
+        return self.max
+
+    def summary(self, scale: float = 1.0) -> Dict[str, Any]:
+        """
+        Summarizes the histogram.
+
+        Args:
+            scale (float, optional): Multiplies every figure, e.g. 1000 for milliseconds. Defaults to 1.0.
+
+        Returns:
+            Dict[str, Any]: The count, mean, max and p50/p95/p99 estimates.
+        """
+        if not self.count:
+            return {"count": 0, "mean": None, "max": None, "p50": None, "p95": None, "p99": None}
+        return {
+            "count": self.count,
+            "mean": round(self.total / self.count * scale, 3),
+            "max": round(self.max * scale, 3),
+            "p50": round(self.percentile(0.5) * scale, 3),
+            "p95": round(self.percentile(0.95) * scale, 3),
+            "p99": round(self.percentile(0.99) * scale, 3)
+        }
+
+
+class _CallStats:
+    """The recorded calls of one server or tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cancelled = 0
+        self.cache_hits = 0
+        self.error_classes: Dict[str, int] = {}
+        self.latency = Histogram()
+        self.queue = Histogram()
+        self.execution = Histogram()
+        self.pool_wait = Histogram()
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.max_response_bytes = 0
+
+    def summary(self) -> Dict[str, Any]:
+        """Summarizes the statistics, with durations in milliseconds."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "error_rate": self.errors / self.calls if self.calls else 0,
+            "error_classes": dict(self.error_classes),
+            "cancelled": self.cancelled,
+            "cache_hits": self.cache_hits,
+            "latency_ms": self.latency.summary(1000),
+            "queue_ms": self.queue.summary(1000),
+            "execution_ms": self.execution.summary(1000),
+            "pool_wait_ms": self.pool_wait.summary(1000),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "max_response_bytes": self.max_response_bytes
+        }
+
+
+class CallTrace:
+    """
+    The timing and outcome of one tool call, filled in while the call runs.
+
+    Attributes:
+        server (str): The server name.
+        tool (str): The tool's name on the server.
+        request_bytes (int): The size of the JSON-encoded arguments.
+        response_bytes (int): The size of the JSON-encoded result.
+        error_class (Optional[str]): The class of the error the call failed with.
+        cancelled (bool): Whether the caller gave up on the call (cancelled, or closed the stream).
+    """
+
+    def __init__(self, server: str, tool: str, request_bytes: int = 0):
+        """
+        Initializes the call trace, starting its clock.
+
+        Args:
+            server (str): The server name.
+            tool (str): The tool's name on the server.
+            request_bytes (int, optional): The size of the JSON-encoded arguments. Defaults to 0.
+        """
+        self.server = server
+        self.tool = tool
+        self.request_bytes = request_bytes
+        self.response_bytes = 0
+        self.error_class: Optional[str] = None
+        self.cancelled = False
+        self.started_at = time.perf_counter()
+        self.acquired_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def acquired(self) -> None:
+        """Marks the end of queueing: the call has a client and is sent to the server."""
+        self.acquired_at = time.perf_counter()
+
+    def finish(self, result: Any, measure: bool = True) -> None:
+        """
+        Records the call's result.
+
+        A result flagged `isError` counts as a `ToolError`.
+
+        Args:
+            result (Any): The tool result.
+            measure (bool, optional): Whether to measure the result's size. Defaults to True.
+        """
+        self.finished_at = time.perf_counter()
+        if measure:
+            self.response_bytes = _json_size(result)
+        if isinstance(result, dict) and result.get("isError"):
+            self.error_class = "ToolError"
+
+    @property
+    def queue_seconds(self) -> float:
+        """The time spent waiting for a client; all of it if none was acquired."""
+        end = self.acquired_at or self.finished_at or time.perf_counter()
+        return end - self.started_at
+
+    @property
+    def execution_seconds(self) -> float:
+        """The time from acquiring a client until the result arrived."""
+        if self.acquired_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.acquired_at
+
+
+def _json_size(value: Any) -> int:
+    """Gets the size of a value encoded as JSON, or 0 if it cannot be encoded."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+class MCPTelemetry:
+    """
+    Per-server and per-tool telemetry for MCP tool calls.
+
+    Usage:
+        async with telemetry.track("filesystem", "semantic_search", arguments) as trace:
+            async with pool.acquire("filesystem", server) as client:
+                trace.acquired()
+                trace.finish(await client.tools_call("semantic_search", arguments))
+    """
+
+    def __init__(self, enabled: bool = None, otel: bool = None):
+        """
+        Initializes the telemetry.
+
+        Args:
+            enabled (bool, optional): Whether calls are recorded. Defaults to the value from settings.
+            otel (bool, optional): Whether each call is traced as an OpenTelemetry span
+                                   (needs the `opentelemetry-api` package). Defaults to the value from settings.
+        """
+        self.enabled = settings.mcp_telemetry_enabled if enabled is None else enabled
+        self._tracer = None
+        if settings.mcp_telemetry_otel if otel is None else otel:
+            try:
+                from opentelemetry import trace as otel_trace
+                self._tracer = otel_trace.get_tracer(__name__)
+            except ImportError:
+                logger.warning("⚠️ OpenTelemetry spans requested for MCP calls but opentelemetry-api is missing")
+
+        self._servers: Dict[str, _CallStats] = {}
+        self._tools: Dict[Tuple[str, str], _CallStats] = {}
+
+    def _stats_for(self, server: str, tool: str = None) -> List[_CallStats]:
+        """Gets (or creates) the statistics a call or pool wait is recorded into."""
+        stats = [self._servers.setdefault(server, _CallStats())]
+        if tool is not None:
+            stats.append(self._tools.setdefault((server, tool), _CallStats()))
+        return stats
+
+    @asynccontextmanager
+    async def track(self, server: str, tool: str, arguments: Dict[str, Any] = None) -> AsyncIterator[CallTrace]:
+        """
+        Times a tool call and records it when the block exits.
+
+        Call `acquired()` on the trace once a client is checked out and `finish(result)`
+        when the result arrives; an exception leaving the block is recorded by its class.
+        A call abandoned by its caller (a `CancelledError`, or `GeneratorExit` when a
+        stream is closed early) is counted as cancelled, not as an error.
+
+        Args:
+            server (str): The server name.
+            tool (str): The tool's name on the server.
+            arguments (Dict[str, Any], optional): The call arguments, for the request size. Defaults to None.
+
+        Yields:
+            CallTrace: The trace to fill in.
+        """
+        trace = CallTrace(server, tool, _json_size(arguments) if self.enabled and arguments else 0)
+        span_context = (
+            self._tracer.start_as_current_span(f"mcp.tools/call {tool}")
+            if self._tracer else nullcontext()
+        )
+        with span_context as span:
+            try:
+                yield trace
+            except (asyncio.CancelledError, GeneratorExit):
+                trace.cancelled = True
+                raise
+            except Exception as e:
+                trace.error_class = type(e).__name__
+                raise
+            finally:
+                if trace.finished_at is None:
+                    trace.finished_at = time.perf_counter()
+                if self.enabled:
+                    self.record(trace)
+                if span is not None:
+                    self._annotate(span, trace)
+
+    def record(self, trace: CallTrace) -> None:
+        """
+        Records a finished call. Cancelled calls are only counted, so they do not
+        skew the latency figures or the error rate.
+
+        Args:
+            trace (CallTrace): The call's trace.
+        """
+        if trace.cancelled:
+            for stats in self._stats_for(trace.server, trace.tool):
+                stats.cancelled += 1
+            return
+        latency = trace.finished_at - trace.started_at
+        for stats in self._stats_for(trace.server, trace.tool):
+            stats.calls += 1
+            stats.latency.observe(latency)
+            stats.queue.observe(trace.queue_seconds)
+            stats.execution.observe(trace.execution_seconds)
+            stats.request_bytes += trace.request_bytes
+            stats.response_bytes += trace.response_bytes
+            stats.max_response_bytes = max(stats.max_response_bytes, trace.response_bytes)
+            if trace.error_class:
+                stats.errors += 1
+                stats.error_classes[trace.error_class] = stats.error_classes.get(trace.error_class, 0) + 1
+
+    def record_cache_hit(self, server: str, tool: str) -> None:
+        """
+        Records a call served from the result cache, which is left out of the latency figures.
+
+        Args:
+            server (str): The server name.
+            tool (str): The tool's name on the server.
+        """
+        if self.enabled:
+            for stats in self._stats_for(server, tool):
+                stats.cache_hits += 1
+
+    def record_pool_wait(self, server: str, seconds: float) -> None:
+        """
+        Records how long a caller waited for a pooled client of a server.
+
+        Args:
+            server (str): The server name (pool key).
+            seconds (float): The wait in seconds.
+        """
+        if self.enabled:
+            self._stats_for(server)[0].pool_wait.observe(seconds)
+
+    @staticmethod
+    def _annotate(span: Any, trace: CallTrace) -> None:
+        """Adds a call's server, timing, sizes and error class to its span."""
+        span.set_attribute("mcp.server", trace.server)
+        span.set_attribute("mcp.tool", trace.tool)
+        span.set_attribute("mcp.queue_ms", trace.queue_seconds * 1000)
+        span.set_attribute("mcp.execution_ms", trace.execution_seconds * 1000)
+        span.set_attribute("mcp.request_bytes", trace.request_bytes)
+        span.set_attribute("mcp.response_bytes", trace.response_bytes)
+        if trace.error_class:
+            span.set_attribute("error.type", trace.error_class)
+        if trace.cancelled:
+            span.set_attribute("mcp.cancelled", True)
+
+    def reset(self) -> None:
+        """Drops everything recorded so far."""
+        self._servers.clear()
+        self._tools.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gets the statistics for all servers and tools.
+
+        Returns:
+            Dict[str, Any]: Per-server and per-tool figures, and the servers ordered
+                            by p95 latency, slowest first.
+        """
+        servers = {name: stats.summary() for name, stats in self._servers.items()}
+        return {
+            "enabled": self.enabled,
+            "otel": self._tracer is not None,
+            "servers": servers,
+            "tools": {f"{server}.{tool}": stats.summary() for (server, tool), stats in self._tools.items()},
+            "slowest_servers": sorted(
+                (name for name, summary in servers.items() if summary["latency_ms"]["count"]),
+                key=lambda name: servers[name]["latency_ms"]["p95"],
+                reverse=True
+            )
+        }
+
+    def render_prometheus(self) -> str:
+        """
+        Renders the per-tool call metrics and per-server pool waits in the Prometheus text format.
+
+        Returns:
+            str: The metrics exposition.
+        """
+        lines: List[str] = []
+
+        def histogram(name: str, help_text: str, series: List[Tuple[str, Histogram]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in series:
+                cumulative = 0
+                for bound, bucket_count in zip(hist.bounds + (float("inf"),), hist.counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{labels}}} {hist.total}")
+                lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+        def counter(name: str, help_text: str, series: List[Tuple[str, int]]) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{{{labels}}} {value}" for labels, value in series)
+
+        tools = [(f'server="{server}",tool="{tool}"', stats) for (server, tool), stats in self._tools.items()]
+        histogram("mcp_tool_call_duration_seconds", "MCP tool call latency, including queueing.",
+                  [(labels, stats.latency) for labels, stats in tools])
+        histogram("mcp_tool_call_queue_seconds", "Time MCP tool calls waited for a pooled client.",
+                  [(labels, stats.queue) for labels, stats in tools])
+        histogram("mcp_tool_call_execution_seconds", "Time MCP tool calls spent on the server.",
+                  [(labels, stats.execution) for labels, stats in tools])
+        counter("mcp_tool_calls_total", "MCP tool calls.", [(labels, stats.calls) for labels, stats in tools])
+        counter("mcp_tool_call_errors_total", "Failed MCP tool calls by error class.", [
+            (f'{labels},error_class="{error_class}"', count)
+            for labels, stats in tools for error_class, count in stats.error_classes.items()
+        ])
+        counter("mcp_tool_call_cancellations_total", "MCP tool calls abandoned by their caller.",
+                [(labels, stats.cancelled) for labels, stats in tools])
+        counter("mcp_tool_call_cache_hits_total", "MCP tool calls served from the result cache.",
+                [(labels, stats.cache_hits) for labels, stats in tools])
+        counter("mcp_tool_call_request_bytes_total", "Size of MCP tool call arguments.",
+                [(labels, stats.request_bytes) for labels, stats in tools])
+        counter("mcp_tool_call_response_bytes_total", "Size of MCP tool call results.",
+                [(labels, stats.response_bytes) for labels, stats in tools])
+        histogram("mcp_pool_wait_seconds", "Time callers waited for a pooled MCP client.",
+                  [(f'server="{server}"', stats.pool_wait) for server, stats in self._servers.items()])
+        return "\n".join(lines) + "\n"
+
+# Global telemetry instance
+telemetry = MCPTelemetry()
@@ -0,0 +1,105 @@
+import asyncio
+
+from ..models import MCPServer
+from . import pool as pool_module
+from .catalog import ToolCatalog
+from .pool import MCPPool
+
+
+class CatalogClient:
+    """Offers a per-server tool list and lets tests emit notifications."""
+
+    tools = {}
+    listed = []
+    clients = {}
+
+    def __init__(self, server):
+        self.server = server
+        self.initialized = False
+        self.handlers = []
+        self.clients[server.name] = self
+
+    @property
+    def alive(self):
+        return self.initialized
+
+    async def start(self):
+        if self.server.name == 'broken':
+            raise ConnectionError('no such binary')
+        self.initialized = True
+
+    async def stop(self):
+        self.initialized = False
+
+    def on_notification(self, handler):
+        self.handlers.append(handler)
+
+    async def tools_list(self, raise_on_error=False):
+        self.listed.append(self.server.name)
+        await asyncio.sleep(0.05)
+        return [{'name': name, 'description': f'{name} tool'} for name in self.tools[self.server.name]]
+
+
+def _servers():
+    return {name: MCPServer(name=name, kind='http', url=f'http://{name}.test', discover=True)
+            for name in ('filesystem', 'github', 'broken')}
+
+
+async def test_catalog_discovers_servers_concurrently_and_indexes_tool_names(monkeypatch):
+    """Tests concurrent discovery, the name index and that failed servers do not break the catalog."""
+    CatalogClient.tools = {'filesystem': ['semantic_search', 'open'], 'github': ['open', 'pr_create']}
+    CatalogClient.listed = []
+    monkeypatch.setattr(pool_module, 'MCPClientOriginal', CatalogClient)
+    catalog = ToolCatalog(pool=MCPPool(maxsize=4, ttl_seconds=60), servers=_servers, ttl_seconds=60)
+
+    tools = await asyncio.wait_for(catalog.list_tools(), timeout=0.09)
+
+    assert {tool['name'] for tool in tools} == {
+        'filesystem.semantic_search', 'filesystem.open', 'github.open', 'github.pr_create'
+    }
+    assert await catalog.resolve('semantic_search') == ('filesystem', 'semantic_search')
+    assert await catalog.resolve('github.open') == ('github', 'open')
+    assert await catalog.resolve('open') is None  # Offered by two servers
+    assert await catalog.list_tools() is tools
+    assert sorted(CatalogClient.listed) == ['filesystem', 'github']
+    assert catalog.get_stats()['failed_servers'] == 1
+
+
+async def test_catalog_rediscovers_after_list_changed_notification(monkeypatch):
+    """Tests that a tools/list_changed notification invalidates the cache and the stale catalog is served meanwhile."""
+    CatalogClient.tools = {'filesystem': ['semantic_search'], 'github': []}
+    CatalogClient.listed = []
+    monkeypatch.setattr(pool_module, 'MCPClientOriginal', CatalogClient)
+    catalog = ToolCatalog(pool=MCPPool(maxsize=4, ttl_seconds=60), servers=_servers, ttl_seconds=60)
+    await catalog.list_tools()
+
+    CatalogClient.tools['filesystem'].append('pattern_extract')
+    for handler in CatalogClient.clients['filesystem'].handlers:
+        handler('notifications/tools/list_changed', {})
+
+    assert len(await catalog.list_tools()) == 1  # Stale while the refresh runs
+    await asyncio.sleep(0.1)
+    assert len(await catalog.list_tools()) == 2
+    assert await catalog.resolve('pattern_extract') == ('filesystem', 'pattern_extract')
+    assert CatalogClient.listed.count('filesystem') == 2
+
+
+async def test_catalog_only_lists_pooled_or_discoverable_servers(monkeypatch):
+    """Tests that discovery does not start idle servers, and that a qualified call adds its server later."""
+    CatalogClient.tools = {'filesystem': ['semantic_search'], 'github': ['pr_create'], 'docker': ['run']}
+    CatalogClient.listed = []
+    monkeypatch.setattr(pool_module, 'MCPClientOriginal', CatalogClient)
+    servers = {'filesystem': MCPServer(name='filesystem', kind='http', url='http://filesystem.test', discover=True),
+               'github': MCPServer(name='github', kind='http', url='http://github.test'),
+               'docker': MCPServer(name='docker', kind='http', url='http://docker.test')}
+    pool = MCPPool(maxsize=4, ttl_seconds=60)
+    catalog = ToolCatalog(pool=pool, servers=lambda: servers, ttl_seconds=60)
+
+    assert [tool['name'] for tool in await catalog.list_tools()] == ['filesystem.semantic_search']
+    assert CatalogClient.listed == ['filesystem'] and 'github' not in pool
+
+    assert await catalog.resolve('github.pr_create') == ('github', 'pr_create')
+    await pool.get('github', servers['github'])
+    await catalog.refresh()
+    assert await catalog.resolve('pr_create') == ('github', 'pr_create')
+    assert 'docker' not in pool and 'docker' not in CatalogClient.listed
@@ -0,0 +1,204 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+from ..models import MCPServer
+from .client import MCPClient, MCPClientOriginal, ProcessTransport
+
+# Answers "echo" (and "initialize"), never answers "hang", exits on "crash", and reports the
+# cancellations it received; batch arrays get an array of the answers
+SERVER = """
+import json, sys
+cancelled = []
+def handle(msg):
+    method = msg.get("method")
+    if method == "notifications/cancelled":
+        cancelled.append(msg["params"]["requestId"])
+    elif method in ("echo", "initialize"):
+        return {"jsonrpc": "2.0", "id": msg["id"], "result": {"cancelled": list(cancelled)}}
+    elif method == "crash":
+        sys.exit(3)
+for line in sys.stdin:
+    msg = json.loads(line)
+    if isinstance(msg, list):
+        answers = [answer for answer in map(handle, msg) if answer]
+        if answers:
+            print(json.dumps(answers), flush=True)
+    else:
+        answer = handle(msg)
+        if answer:
+            print(json.dumps(answer), flush=True)
+"""
+
+
+def _request(request_id, method):
+    return {"jsonrpc": "2.0", "id": request_id, "method": method}
+
+
+async def test_process_transport_times_out_and_notifies_cancellation():
+    """Tests that a request past its deadline is withdrawn and the server told to cancel it."""
+    transport = ProcessTransport([sys.executable, "-c", SERVER], timeout=5)
+    await transport.start()
+    try:
+        with pytest.raises(TimeoutError):
+            await transport.send(_request("slow", "hang"), timeout=0.1)
+
+        assert transport.pending == {}
+        result = await transport.send(_request("ping", "echo"))
+        assert result == {"cancelled": ["slow"]}
+    finally:
+        await transport.stop()
+
+
+async def test_process_transport_fails_pending_requests_when_process_exits():
+    """Tests that callers waiting on a dead process fail instead of hanging, and new calls fail fast."""
+    transport = ProcessTransport([sys.executable, "-c", SERVER], timeout=5, max_in_flight=1)
+    await transport.start()
+    try:
+        hanging = asyncio.create_task(transport.send(_request("a", "hang")))
+        queued = asyncio.create_task(transport.send(_request("b", "crash")))
+        await asyncio.sleep(0.1)
+        assert transport.pending.keys() == {"a"}  # "b" waits for the only in-flight slot
+
+        hanging.cancel()
+        with pytest.raises(ConnectionError, match="exited with code 3"):
+            await asyncio.wait_for(queued, timeout=5)
+        with pytest.raises(ConnectionError):
+            await transport.send(_request("c", "echo"))
+        assert transport.closed
+        assert transport.stats["cancelled"] == 1
+    finally:
+        await transport.stop()
+
+
+async def test_process_transport_returns_slots_of_a_cancelled_batch():
+    """Tests that a batch cancelled while waiting for in-flight slots gives back the ones it took."""
+    transport = ProcessTransport([sys.executable, "-c", SERVER], timeout=5, max_in_flight=2)
+    await transport.start()
+    try:
+        hanging = asyncio.create_task(transport.send(_request("a", "hang")))
+        await asyncio.sleep(0.05)
+        batch = asyncio.create_task(transport.send_batch([_request("b", "echo"), _request("c", "echo")]))
+        await asyncio.sleep(0.05)
+        batch.cancel()
+        hanging.cancel()
+        await asyncio.gather(batch, hanging, return_exceptions=True)
+
+        results = await asyncio.wait_for(
+            transport.send_batch([_request("d", "echo"), _request("e", "echo")]), timeout=1
+        )
+        assert [sorted(result) for result in results] == [["cancelled"], ["cancelled"]]
+    finally:
+        await transport.stop()
+
+
+async def test_client_batches_calls_issued_together():
+    """Tests that calls gathered in one tick, and calls in batch(), share one JSON-RPC batch each."""
+    server = MCPServer(name="filesystem", kind="python", module="backend.mock_servers.filesystem",
+                       cwd=str(Path(__file__).resolve().parents[2]), batching=True, timeout_s=10)
+    client = MCPClientOriginal(server)
+    await client.start()
+    try:
+        results = await asyncio.gather(*(
+            client.tools_call("semantic_search", {"query": query, "limit": 1})
+            for query in ("auth", "cache", "queue")
+        ))
+        assert [result["query"] for result in results] == ["auth", "cache", "queue"]
+        assert client.batch_stats == {"batches": 1, "batched_requests": 3}
+
+        async with client.batch() as batch:
+            search = batch.tools_call("semantic_search", {"query": "auth"})
+            unknown = batch.tools_call("no_such_tool", {})
+        assert search.result()["query"] == "auth"
+        with pytest.raises(RuntimeError, match="Unknown tool"):
+            unknown.result()
+        assert client.batch_stats == {"batches": 2, "batched_requests": 5}
+    finally:
+        await client.stop()
+
+
+async def test_batched_calls_keep_their_own_deadlines_and_cancellation():
+    """Tests that a batched call times out at its own deadline, siblings keep their answers, and a
+    cancelled batched call is withdrawn with a cancellation sent to the server."""
+    server = MCPServer(name="stub", kind="stdio", cmd=[sys.executable, "-c", SERVER],
+                       batching=True, timeout_s=3)
+    client = MCPClientOriginal(server)
+    await client.start()
+    try:
+        started = asyncio.get_running_loop().time()
+        hang, echo = await asyncio.gather(
+            client._rpc("hang", timeout=0.2), client._rpc("echo"), return_exceptions=True
+        )
+        assert isinstance(hang, TimeoutError) and echo == {"cancelled": []}
+        assert asyncio.get_running_loop().time() - started < 1
+
+        task = asyncio.ensure_future(client._rpc("hang"))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert client.transport.pending == {}
+        assert len((await client._rpc("echo"))["cancelled"]) == 2
+        assert client.transport.stats["timeouts"] == 1 and client.transport.stats["cancelled"] == 1
+    finally:
+        await client.stop()
+
+
+async def test_call_tools_runs_independent_calls_concurrently_and_orders_dependents(monkeypatch):
+    """Tests fan-out with a concurrency cap, dependency ordering, skipped dependents and per-call timeouts."""
+    client = MCPClient(max_concurrency=2)
+    running, peak, order = 0, 0, []
+
+    async def call_tool(tool_name, parameters, use_cache=True, timeout=None):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        delay = parameters.get('delay', 0.02)
+        await asyncio.sleep(min(delay, timeout or delay))
+        running -= 1
+        order.append(tool_name)
+        if timeout and delay > timeout:
+            return {'success': False, 'error': f'MCP request tools/call timed out after {timeout}s'}
+        return {'success': tool_name != 'broken', 'result': tool_name}
+
+    monkeypatch.setattr(client, 'call_tool', call_tool)
+    results = await client.call_tools([
+        {'id': 'search', 'tool': 'search'},
+        {'id': 'summary', 'tool': 'summarize', 'depends_on': ['search', 'grep']},
+        {'id': 'grep', 'tool': 'grep'},
+        {'tool': 'lint'},
+        {'tool': 'broken'},
+        {'tool': 'after_broken', 'depends_on': ['4']},
+        {'tool': 'slow', 'parameters': {'delay': 1}, 'timeout_s': 0.05},
+    ])
+
+    assert [result['id'] for result in results] == ['search', 'summary', 'grep', '3', '4', '5', '6']
+    assert peak == 2
+    assert order.index('summarize') > max(order.index('search'), order.index('grep'))
+    assert results[1]['success'] and results[1]['queued_ms'] >= results[0]['duration_ms']
+    assert results[5] == {**results[5], 'success': False, 'error': 'Skipped: dependencies failed: 4'}
+    assert results[6]['error'] == 'MCP request tools/call timed out after 0.05s'
+    assert results[6]['duration_ms'] < 500
+    with pytest.raises(ValueError, match='Circular'):
+        await client.call_tools([{'id': 'a', 'tool': 'x', 'depends_on': ['b']},
+                                 {'id': 'b', 'tool': 'y', 'depends_on': ['a']}])
+
+
+async def test_tools_call_stream_yields_progress_before_the_result():
+    """Tests that progress notifications (with partial results) stream ahead of the final result."""
+    server = MCPServer(name="filesystem", kind="python", module="backend.mock_servers.filesystem",
+                       cwd=str(Path(__file__).resolve().parents[2]), timeout_s=10)
+    client = MCPClientOriginal(server)
+    await client.start()
+    try:
+        events = [event async for event in client.tools_call_stream("semantic_search", {"query": "auth"})]
+        *progress, result = events
+        hits = result["result"]["results"]
+        assert result["type"] == "result" and len(hits) > 1
+        assert [event["progress"] for event in progress] == list(range(1, len(hits) + 1))
+        assert [item for event in progress for item in event["partial"]] == hits
+        assert client.transport.progress_handlers == {}
+    finally:
+        await client.stop()
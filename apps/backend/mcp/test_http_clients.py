@@ -0,0 +1,60 @@
+import asyncio
+import json
+
+from . import client as client_module
+from .client import HTTPTransport
+from .http_clients import HTTPClientRegistry
+
+
+async def _serve_jsonrpc(reader, writer):
+    """A minimal keep-alive HTTP/1.1 server answering every JSON-RPC request with its own headers.
+
+    It serves requests until the client closes the connection, then closes its end.
+    """
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except asyncio.IncompleteReadError:
+                break
+            lines = head.decode().split('\r\n')
+            headers = {name.lower(): value for name, value in (line.split(': ', 1) for line in lines[1:] if line)}
+            request = json.loads(await reader.readexactly(int(headers['content-length'])))
+            body = json.dumps({'jsonrpc': '2.0', 'id': request['id'],
+                               'result': {'authorization': headers.get('authorization')}}).encode()
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                         b'Content-Length: %d\r\n\r\n%s' % (len(body), body))
+            await writer.drain()
+    finally:
+        writer.close()
+
+
+async def test_transports_share_origin_client_and_connections(monkeypatch):
+    """Tests that transports for servers on one origin borrow one client and reuse its keep-alive connection."""
+    registry = HTTPClientRegistry(max_connections=4, max_keepalive=4, keepalive_expiry=30)
+    monkeypatch.setattr(client_module, 'http_clients', registry)
+    server = await asyncio.start_server(_serve_jsonrpc, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        first = HTTPTransport(f'http://127.0.0.1:{port}/alpha', bearer_token='a')
+        await first.start()
+        assert await first.send({'jsonrpc': '2.0', 'id': 1, 'method': 'ping'}) == {'authorization': 'Bearer a'}
+        client = first.client
+        await first.stop()
+
+        # A replacement transport for another server on the same origin reuses the warm connection
+        second = HTTPTransport(f'http://127.0.0.1:{port}/beta', bearer_token='b')
+        await second.start()
+        assert second.client is client and not client.is_closed
+        assert await second.send({'jsonrpc': '2.0', 'id': 2, 'method': 'ping'}) == {'authorization': 'Bearer b'}
+        await second.stop()
+
+        stats = registry.get_stats()
+        assert stats['clients_created'] == 1 and stats['client_reuses'] == 1
+        assert stats['requests'] == 2 and stats['connections_opened'] == 1
+        assert stats['connection_reuse_rate'] == 0.5
+        assert stats['origins'][f'http://127.0.0.1:{port}']['borrowers'] == 0
+    finally:
+        await registry.aclose()
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,151 @@
+import asyncio
+
+from ..models import MCPServer
+from . import pool as pool_module
+from .pool import MCPPool
+
+
+class SlowClient:
+    """Starts after a per-server delay and records starts and stops."""
+
+    events = []
+
+    def __init__(self, server):
+        self.server = server
+        self.initialized = False
+        self.exited = False
+
+    @property
+    def alive(self):
+        return self.initialized and not self.exited
+
+    async def start(self):
+        self.events.append(('start', self.server.name))
+        await asyncio.sleep(0.1 if self.server.name == 'slow' else 0.01)
+        self.initialized = True
+
+    async def stop(self):
+        await asyncio.sleep(0.05)
+        self.events.append(('stop', self.server.name))
+
+
+def _server(name, **options):
+    return MCPServer(name=name, kind='http', url=f'http://{name}.test', **options)
+
+
+async def test_pool_shares_startups_per_key_and_starts_other_keys_in_parallel(monkeypatch):
+    """Tests that one slow startup neither runs twice nor blocks other keys."""
+    SlowClient.events = []
+    monkeypatch.setattr(pool_module, 'MCPClientOriginal', SlowClient)
+    pool = MCPPool(maxsize=4, ttl_seconds=60)
+
+    slow_a = asyncio.create_task(pool.get('slow', _server('slow')))
+    slow_b = asyncio.create_task(pool.get('slow', _server('slow')))
+    await asyncio.sleep(0)
+    fast = await asyncio.wait_for(pool.get('fast', _server('fast')), timeout=0.05)
+
+    assert fast.initialized and not slow_a.done()
+    assert await slow_a is await slow_b
+    assert SlowClient.events.count(('start', 'slow')) == 1
+    assert pool.get_stats()['shared_startups'] == 1
+
+
+async def test_pool_stops_evicted_clients_off_the_request_path(monkeypatch):
+    """Tests that eviction does not make the caller wait for the old client to stop."""
+    SlowClient.events = []
+    monkeypatch.setattr(pool_module, 'MCPClientOriginal', SlowClient)
+    pool = MCPPool(maxsize=1, ttl_seconds=60)
+
+    await pool.get('first', _server('first'))
+    await pool.get('second', _server('second'))
+
+    assert ('stop', 'first') not in SlowClient.events
+    assert pool.get_stats()['stopping'] == 1
+    await pool.close()
+    assert {('stop', 'first'), ('stop', 'second')} <= set(SlowClient.events)
+    assert pool.get_stats()['active_connections'] == 0
+
+
+async def test_pool_stops_evicted_clients_only_after_their_calls_return(monkeypatch):
+    """Tests that evicting a server with a call in flight leaves the call's client running until it returns."""
+    SlowClient.events = []
+    monkeypatch.setattr(pool_module, 'MCPClientOriginal', SlowClient)
+    pool = MCPPool(maxsize=1, ttl_seconds=60)
+
+    async with pool.acquire('first', _server('first')):
+        await pool.get('second', _server('second'))
+        await asyncio.sleep(0.1)
+        assert 'first' not in pool
+        assert ('stop', 'first') not in SlowClient.events
+
+    await asyncio.sleep(0.1)
+    assert ('stop', 'first') in SlowClient.events
+    await pool.close()
+
+
+async def test_pool_routes_to_least_loaded_replica_and_refreshes_before_expiry(monkeypatch):
+    """Tests scale-up when every replica is busy, least-loaded routing and proactive TTL refresh."""
+    SlowClient.events = []
+    monkeypatch.setattr(pool_module, 'MCPClientOriginal', SlowClient)
+    pool = MCPPool(maxsize=4, ttl_seconds=60, refresh_ratio=0.5)
+    server = MCPServer(name='fs', kind='http', url='http://fs.test', max_replicas=2)
+
+    async with pool.acquire('fs', server) as first:
+        async with pool.acquire('fs', server) as again:
+            assert again is first
+        await asyncio.sleep(0.05)
+        assert pool.get_stats()['replicas']['fs']['active'] == 2
+        async with pool.acquire('fs', server) as second:
+            assert second is not first
+
+    # Age the replicas past the refresh point: they are replaced without the caller waiting
+    for replica in pool._pool['fs'].replicas:
+        replica.created_ts -= 45
+    await pool.get('fs', server)
+    await asyncio.sleep(0.1)
+    assert pool.get_stats()['refreshes'] == 2
+    assert SlowClient.events.count(('stop', 'fs')) == 2
+    assert pool.get_stats()['replicas']['fs']['active'] == 2
+    await pool.close()
+
+
+async def test_pool_replaces_replicas_whose_server_died(monkeypatch):
+    """Tests that a replica whose process exited is neither picked nor counted, and is respawned."""
+    SlowClient.events = []
+    monkeypatch.setattr(pool_module, 'MCPClientOriginal', SlowClient)
+    pool = MCPPool(maxsize=4, ttl_seconds=60)
+    server = MCPServer(name='fs', kind='http', url='http://fs.test', min_replicas=2, max_replicas=2)
+    first = await pool.get('fs', server)
+    await asyncio.gather(*pool._spawning)
+    second = next(replica.client for replica in pool._pool['fs'].replicas if replica.client is not first)
+
+    first.exited = True
+    assert await pool.get('fs', server) is second
+    await asyncio.gather(*pool._spawning)
+    assert pool.get_stats()['replicas']['fs']['active'] == 2
+    assert first not in [replica.client for replica in pool._pool['fs'].replicas]
+
+    second.exited = True
+    health = await pool.health_check()
+    assert health['healthy_clients'] == 1
+    await asyncio.gather(*pool._spawning)
+    assert pool.get_stats()['replicas']['fs']['active'] == 2
+    await pool.close()
+
+
+async def test_pool_keeps_prespawned_servers_when_evicting_and_restores_them(monkeypatch):
+    """Tests that LRU eviction skips pre-spawned servers and maintenance brings them back if they leave."""
+    SlowClient.events = []
+    monkeypatch.setattr(pool_module, 'MCPClientOriginal', SlowClient)
+    pool = MCPPool(maxsize=2, ttl_seconds=60)
+    assert await pool.prespawn([_server('warm', prespawn=True), _server('cold')]) == {'warm': 1}
+
+    for name in ('a', 'b', 'c'):
+        await pool.get(name, _server(name))
+    assert 'warm' in pool and 'a' not in pool and 'b' not in pool and 'c' in pool
+
+    pool._pool.pop('warm')  # e.g. dropped by a health check
+    await pool.maintain()
+    await asyncio.gather(*pool._spawning)
+    assert pool.get_stats()['replicas']['warm']['active'] == 1
+    await pool.close()
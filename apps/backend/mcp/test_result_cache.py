@@ -0,0 +1,73 @@
+import asyncio
+
+from ..models import ToolCachePolicy
+from .result_cache import ToolResultCache, cache_policy
+
+
+def test_cache_policy_prefers_configuration_then_declaration_then_annotations():
+    """Tests which tools are cacheable and with what policy."""
+    configured = ToolCachePolicy(ttl_seconds=5)
+    declared = {'name': 'search', 'cache': {'ttl_seconds': 120, 'key_args': ['query']}}
+    annotated = {'name': 'read', 'annotations': {'readOnlyHint': True, 'idempotentHint': True}}
+    writes = {'name': 'write', 'annotations': {'readOnlyHint': False, 'idempotentHint': True}}
+
+    assert cache_policy(declared, configured) is configured
+    assert cache_policy(declared).key_args == ['query']
+    assert cache_policy(annotated, default_ttl=30).ttl_seconds == 30
+    assert cache_policy(writes) is None
+
+
+async def test_tool_cache_serves_repeats_once_and_invalidates_by_event():
+    """Tests keying on the declared arguments, call coalescing, LRU bounds and event invalidation."""
+    cache = ToolResultCache(max_entries=2, enabled=True)
+    policy = ToolCachePolicy(ttl_seconds=60, key_args=['query'], invalidate_on=['filesystem'])
+    calls = []
+
+    async def search(query):
+        calls.append(query)
+        await asyncio.sleep(0.01)
+        return {'query': query}
+
+    def call(query, **extra):
+        return cache.get_or_call('filesystem', 'search', {'query': query, **extra}, policy,
+                                 lambda: search(query))
+
+    results = await asyncio.gather(call('auth'), call('auth'), call('auth', trace_id='x'))
+    assert [cached for _, cached in results] == [False, False, False]
+    assert calls == ['auth']
+    assert await call('auth', trace_id='y') == ({'query': 'auth'}, True)
+
+    await call('cache')
+    await call('queue')  # Evicts 'auth', the least recently used
+    assert (await call('auth'))[1] is False
+    assert cache.invalidate(event='github') == 0
+    assert cache.invalidate(event='filesystem') == 2
+    stats = cache.get_stats()
+    assert stats['entries'] == 0 and stats['evictions'] == 2 and stats['coalesced'] == 2
+
+
+async def test_tool_cache_drops_results_of_calls_that_outlive_an_invalidation():
+    """Tests that a call started before an invalidation of its server neither fills nor shares the cache."""
+    cache = ToolResultCache(enabled=True)
+    policy = ToolCachePolicy(ttl_seconds=60)
+    calls = []
+
+    async def read(version):
+        calls.append(version)
+        await asyncio.sleep(0.02)
+        return {'version': version}
+
+    def call(version):
+        return cache.get_or_call('filesystem', 'read', {'path': 'a.md'}, policy, lambda: read(version))
+
+    before = asyncio.ensure_future(call('old'))
+    await asyncio.sleep(0)
+    cache.invalidate(server='github')  # Other servers' invalidations do not matter
+    cache.invalidate(server='filesystem')
+    after = asyncio.ensure_future(call('new'))
+
+    assert await before == ({'version': 'old'}, False)
+    assert await after == ({'version': 'new'}, False)
+    assert calls == ['old', 'new']
+    assert await call('ignored') == ({'version': 'new'}, True)
+    assert cache.get_stats()['stale_writes'] == 1
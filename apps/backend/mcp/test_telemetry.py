@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from .telemetry import Histogram, MCPTelemetry
+
+
+def test_histogram_estimates_percentiles_within_buckets():
+    """Tests percentile interpolation and that estimates never exceed the largest observation."""
+    histogram = Histogram(bounds=(0.01, 0.1, 1.0))
+    for _ in range(90):
+        histogram.observe(0.005)
+    for _ in range(10):
+        histogram.observe(0.5)
+
+    assert histogram.percentile(0.5) < 0.01
+    assert 0.1 < histogram.percentile(0.95) <= 0.5
+    assert histogram.percentile(0.99) <= 0.5
+    assert histogram.summary(1000)['max'] == 500.0
+
+
+async def test_track_splits_queueing_from_execution_and_classifies_errors():
+    """Tests per-tool and per-server timing, payload sizes, error classes and the Prometheus output."""
+    telemetry = MCPTelemetry(enabled=True, otel=False)
+
+    async with telemetry.track('filesystem', 'search', {'query': 'auth'}) as trace:
+        await asyncio.sleep(0.02)
+        trace.acquired()
+        await asyncio.sleep(0.01)
+        trace.finish({'hits': ['a.py']})
+    async with telemetry.track('filesystem', 'search', {'query': 'x'}) as trace:
+        trace.acquired()
+        trace.finish({'isError': True})
+    with pytest.raises(asyncio.TimeoutError):
+        async with telemetry.track('filesystem', 'read') as trace:
+            raise asyncio.TimeoutError()
+    telemetry.record_cache_hit('filesystem', 'search')
+    telemetry.record_pool_wait('filesystem', 0.003)
+
+    stats = telemetry.get_stats()
+    search = stats['tools']['filesystem.search']
+    assert search['calls'] == 2 and search['cache_hits'] == 1
+    assert search['error_classes'] == {'ToolError': 1}
+    assert search['queue_ms']['max'] >= 20 and search['execution_ms']['max'] >= 10
+    assert search['request_bytes'] > 0 and search['max_response_bytes'] == len('{"hits": ["a.py"]}')
+
+    server = stats['servers']['filesystem']
+    assert server['calls'] == 3 and server['errors'] == 2
+    assert server['error_classes']['TimeoutError'] == 1
+    assert server['pool_wait_ms']['count'] == 1
+    assert stats['slowest_servers'] == ['filesystem']
+
+    metrics = telemetry.render_prometheus()
+    assert 'mcp_tool_calls_total{server="filesystem",tool="search"} 2' in metrics
+    assert 'mcp_tool_call_duration_seconds_bucket{server="filesystem",tool="search",le="+Inf"} 2' in metrics
+    assert 'mcp_tool_call_errors_total{server="filesystem",tool="read",error_class="TimeoutError"} 1' in metrics
+    assert 'mcp_pool_wait_seconds_count{server="filesystem"} 1' in metrics
+
+
+async def test_track_counts_cancelled_calls_apart_from_errors():
+    """Tests that a cancelled call and a stream closed early are counted as cancellations, not errors."""
+    telemetry = MCPTelemetry(enabled=True, otel=False)
+
+    async def hang():
+        async with telemetry.track('filesystem', 'search') as trace:
+            trace.acquired()
+            await asyncio.sleep(10)
+
+    task = asyncio.ensure_future(hang())
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    async def stream():
+        async with telemetry.track('filesystem', 'search') as trace:
+            trace.acquired()
+            yield 'progress'
+            yield 'result'
+
+    events = stream()
+    assert await events.__anext__() == 'progress'
+    await events.aclose()
+
+    search = telemetry.get_stats()['tools']['filesystem.search']
+    assert search['cancelled'] == 2
+    assert search['calls'] == 0 and search['errors'] == 0 and search['latency_ms']['count'] == 0
+    assert 'mcp_tool_call_cancellations_total{server="filesystem",tool="search"} 2' in telemetry.render_prometheus()
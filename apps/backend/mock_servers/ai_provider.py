@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Mock AI Provider Server for Load and Latency Testing.
+This module serves the offline provider simulator over HTTP, speaking the
+Ollama (/api/*) and OpenAI (/v1/*) wire formats, so the real provider
+strategies, the API and load tests (tests/load/locustfile.py) can be run
+against it without a model or network.
+
+Usage:
+    python -m backend.mock_servers.ai_provider --port 11435 --latency-ms 300 --tokens-per-second 40
+
+Then point the backend at it with OLLAMA_BASE_URL=http://localhost:11435 or
+OPENAI_BASE_URL=http://localhost:11435/v1.
+"""
+
+import argparse
+import json
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+try:
+    from ..utils.provider_simulator import LATENCY_DISTRIBUTIONS, ProviderSimulator, SimulatedProviderError
+except ImportError:
+    from utils.provider_simulator import LATENCY_DISTRIBUTIONS, ProviderSimulator, SimulatedProviderError
+
+
+def _ollama_error(error: SimulatedProviderError) -> JSONResponse:
+    """Builds an Ollama-style error response."""
+    headers = {"Retry-After": "1"} if error.status_code == 429 else None
+    return JSONResponse({"error": str(error)}, status_code=error.status_code, headers=headers)
+
+
+def _openai_error(error: SimulatedProviderError) -> JSONResponse:
+    """Builds an OpenAI-style error response."""
+    headers = {"Retry-After": "1"} if error.status_code == 429 else None
+    error_type = "rate_limit_exceeded" if error.status_code == 429 else "server_error"
+    return JSONResponse(
+        {"error": {"message": str(error), "type": error_type, "code": error.status_code}},
+        status_code=error.status_code,
+        headers=headers
+    )
+
+
+async def _start_stream(simulator: ProviderSimulator, messages: List[Dict[str, str]],
+                        max_tokens: Optional[int]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Starts a simulated stream and waits for its first event.
+
+    Injected errors surface here, before any response bytes are sent, so they
+    can be answered with an HTTP error status like a real provider would.
+
+    Raises:
+        SimulatedProviderError: If an error is injected.
+    """
+    events = simulator.stream(messages, max_tokens)
+    first = await events.__anext__()
+
+    async def replay():
+        yield first
+        async for event in events:
+            yield event
+
+    return replay()
+
+
+def create_app(simulator: ProviderSimulator) -> FastAPI:
+    """
+    Creates the mock provider application.
+
+    Args:
+        simulator (ProviderSimulator): The simulator that produces latency, output and errors.
+
+    Returns:
+        FastAPI: The application.
+    """
+    app = FastAPI(title="Mock AI Provider", description="Offline Ollama/OpenAI-compatible provider simulator")
+
+    # --- Ollama wire format ---
+
+    async def ollama_generation(body: Dict[str, Any], messages: List[Dict[str, str]], chat: bool):
+        """Serves /api/chat and /api/generate, streaming NDJSON unless `stream` is false."""
+        model = body.get("model", "simulator")
+        max_tokens = (body.get("options") or {}).get("num_predict")
+        started = time.perf_counter()
+
+        def chunk(content: str, done: bool, **extra) -> Dict[str, Any]:
+            payload = {"model": model, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "done": done}
+            if chat:
+                payload["message"] = {"role": "assistant", "content": content}
+            else:
+                payload["response"] = content
+            return {**payload, **extra}
+
+        def final(content: str, usage: Dict[str, int]) -> Dict[str, Any]:
+            return chunk(
+                content, True,
+                done_reason="stop",
+                total_duration=int((time.perf_counter() - started) * 1e9),
+                prompt_eval_count=usage["prompt_tokens"],
+                eval_count=usage["completion_tokens"]
+            )
+
+        if not body.get("stream", True):
+            try:
+                completion = await simulator.acomplete(messages, max_tokens)
+            except SimulatedProviderError as e:
+                return _ollama_error(e)
+            return final(completion["content"], completion["usage"])
+
+        try:
+            events = await _start_stream(simulator, messages, max_tokens)
+        except SimulatedProviderError as e:
+            return _ollama_error(e)
+
+        async def ndjson():
+            async for event in events:
+                if event["type"] == "delta":
+                    yield json.dumps(chunk(event["content"], False)) + "\n"
+                else:
+                    yield json.dumps(final("", event["usage"])) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    @app.post("/api/chat")
+    async def ollama_chat(request: Request):
+        """Ollama chat completion."""
+        body = await request.json()
+        return await ollama_generation(body, body.get("messages") or [], chat=True)
+
+    @app.post("/api/generate")
+    async def ollama_generate(request: Request):
+        """Ollama prompt completion; an empty prompt just 'loads' the model."""
+        body = await request.json()
+        if not body.get("prompt"):
+            return {"model": body.get("model"), "response": "", "done": True, "done_reason": "load"}
+        messages = [{"role": "user", "content": body["prompt"]}]
+        if body.get("system"):
+            messages.insert(0, {"role": "system", "content": body["system"]})
+        return await ollama_generation(body, messages, chat=False)
+
+    @app.post("/api/embeddings")
+    async def ollama_embeddings(request: Request):
+        """Ollama single-text embedding (legacy endpoint)."""
+        body = await request.json()
+        try:
+            return {"embedding": await simulator.aembed(body.get("prompt", ""))}
+        except SimulatedProviderError as e:
+            return _ollama_error(e)
+
+    @app.post("/api/embed")
+    async def ollama_embed(request: Request):
+        """Ollama batch embedding."""
+        body = await request.json()
+        inputs = body.get("input", "")
+        inputs = inputs if isinstance(inputs, list) else [inputs]
+        try:
+            embeddings = [await simulator.aembed(text) for text in inputs]
+        except SimulatedProviderError as e:
+            return _ollama_error(e)
+        return {"model": body.get("model"), "embeddings": embeddings}
+
+    @app.get("/api/tags")
+    async def ollama_tags():
+        """Lists the simulated models."""
+        return {"models": [{"name": "simulator", "model": "simulator"}]}
+
+    # --- OpenAI wire format ---
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat_completions(request: Request):
+        """OpenAI chat completion, with SSE streaming when `stream` is true."""
+        body = await request.json()
+        model = body.get("model", "simulator")
+        messages = body.get("messages") or []
+        max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if not body.get("stream"):
+            try:
+                completion = await simulator.acomplete(messages, max_tokens)
+            except SimulatedProviderError as e:
+                return _openai_error(e)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": completion["content"]},
+                    "finish_reason": "stop"
+                }],
+                "usage": completion["usage"]
+            }
+
+        try:
+            events = await _start_stream(simulator, messages, max_tokens)
+        except SimulatedProviderError as e:
+            return _openai_error(e)
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+        def chunk(choices: List[Dict[str, Any]], **extra) -> str:
+            payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created,
+                       "model": model, "choices": choices, **extra}
+            return f"data: {json.dumps(payload)}\n\n"
+
+        async def sse():
+            async for event in events:
+                if event["type"] == "delta":
+                    yield chunk([{"index": 0, "delta": {"content": event["content"]}, "finish_reason": None}])
+                else:
+                    yield chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+                    if include_usage:
+                        yield chunk([], usage=event["usage"])
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(sse(), media_type="text/event-stream")
+
+    @app.post("/v1/embeddings")
+    async def openai_embeddings(request: Request):
+        """OpenAI embeddings for one text or a batch."""
+        body = await request.json()
+        inputs = body.get("input", "")
+        inputs = inputs if isinstance(inputs, list) else [inputs]
+        try:
+            embeddings = [await simulator.aembed(str(text)) for text in inputs]
+        except SimulatedProviderError as e:
+            return _openai_error(e)
+        prompt_tokens = sum(len(str(text).split()) for text in inputs)
+        return {
+            "object": "list",
+            "data": [{"object": "embedding", "index": index, "embedding": embedding}
+                     for index, embedding in enumerate(embeddings)],
+            "model": body.get("model", "simulator"),
+            "usage": {"prompt_tokens": prompt_tokens, "total_tokens": prompt_tokens}
+        }
+
+    @app.get("/v1/models")
+    async def openai_models():
+        """Lists the simulated models."""
+        return {"object": "list", "data": [{"id": "simulator", "object": "model", "owned_by": "simulator"}]}
+
+    @app.get("/simulator/stats")
+    async def simulator_stats():
+        """Reports the simulator's configuration and request counters."""
+        return simulator.get_stats()
+
+    return app
+
+
+def main():
+    """Parses command-line options and serves the simulator."""
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve an offline Ollama/OpenAI-compatible provider simulator.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mean time to first token.")
+    parser.add_argument("--jitter-ms", type=float, default=50.0, help="Spread of the latency.")
+    parser.add_argument("--distribution", choices=LATENCY_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0, help="Streaming rate; 0 is instant.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability that a request fails.")
+    parser.add_argument("--error-statuses", default="429,500,503", help="Comma-separated statuses of injected errors.")
+    parser.add_argument("--embedding-dim", type=int, default=768)
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible latency and errors.")
+    args = parser.parse_args()
+
+    simulator = ProviderSimulator(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        distribution=args.distribution,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        error_statuses=[int(status) for status in args.error_statuses.split(",") if status.strip()],
+        embedding_dim=args.embedding_dim,
+        seed=args.seed
+    )
+    print(f"🧪 Mock AI provider on http://{args.host}:{args.port} "
+          f"({args.distribution} latency ~{args.latency_ms}ms, {args.tokens_per_second} tok/s, "
+          f"error rate {args.error_rate})")
+    uvicorn.run(create_app(simulator), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,7 +32,9 @@ class MockFilesystemServer:
                         "limit": {"type": "integer", "default": 10}
                     },
                     "required": ["query"]
-                }
+                },
+                "annotations": {"readOnlyHint": True, "idempotentHint": True},
+                "cache": {"ttl_seconds": 120, "key_args": ["query", "limit"], "invalidate_on": ["filesystem"]}
             },
             {
                 "name": "pattern_extract",
@@ -44,7 +46,9 @@ class MockFilesystemServer:
                         "file_path": {"type": "string", "description": "File path to analyze"}
                     },
                     "required": ["pattern"]
-                }
+                },
+                "annotations": {"readOnlyHint": True, "idempotentHint": True},
+                "cache": {"ttl_seconds": 120, "invalidate_on": ["filesystem"]}
             }
         ]
 
@@ -161,6 +165,44 @@ class MockFilesystemServer:
         }
 
 
+async def respond(server, message):
+    """
+    Handles one request and wraps its outcome in a JSON-RPC response.
+
+    Args:
+        server (MockFilesystemServer): The server handling the request.
+        message (dict): The JSON-RPC request.
+
+    Returns:
+        dict: The JSON-RPC response.
+    """
+    result = await server.handle_message(message)
+    token = ((message.get("params") or {}).get("_meta") or {}).get("progressToken")
+    if token is not None and "error" not in result:
+        # Report each search hit as progress with a partial result
+        items = result.get("results") or result.get("patterns") or [result]
+        for index, item in enumerate(items, 1):
+            print(json.dumps({
+                "jsonrpc": "2.0",
+                "method": "notifications/progress",
+                "params": {
+                    "progressToken": token,
+                    "progress": index,
+                    "total": len(items),
+                    "message": f"Processed {index} of {len(items)}",
+                    "partial": [item]
+                }
+            }), flush=True)
+            await asyncio.sleep(0.01)
+    if "error" in result:
+        response = {"error": {"code": -32601, "message": result["error"]}}
+    else:
+        response = {"result": result}
+    response["jsonrpc"] = "2.0"
+    response["id"] = message.get("id")
+    return response
+
+
 async def main():
     """
     The main entry point for the mock server.
@@ -178,13 +220,13 @@ async def main():
         for line in sys.stdin:
             try:
                 message = json.loads(line.strip())
-                response = await server.handle_message(message)
-
-                # Add jsonrpc version and id
-                response["jsonrpc"] = "2.0"
-                response["id"] = message.get("id")
-
-                print(json.dumps(response))
+                if isinstance(message, list):
+                    # JSON-RPC batch: one array of responses, notifications get none
+                    responses = [await respond(server, item) for item in message if "id" in item]
+                    if responses:
+                        print(json.dumps(responses), flush=True)
+                elif "id" in message:
+                    print(json.dumps(await respond(server, message)), flush=True)
 
             except json.JSONDecodeError:
                 print(json.dumps({
@@ -196,7 +238,7 @@ async def main():
                 print(json.dumps({
                     "jsonrpc": "2.0",
                     "error": {"code": -32000, "message": str(e)},
-                    "id": message.get("id")
+                    "id": message.get("id") if isinstance(message, dict) else None
                 }))
 
     except KeyboardInterrupt:
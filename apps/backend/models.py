@@ -11,6 +11,28 @@ import uuid
 
 TransportKind = Literal["stdio", "python", "npx", "docker", "http"]
 
+class ToolCachePolicy(BaseModel):
+    """
+    How the results of an idempotent MCP tool may be cached.
+
+    Attributes:
+        ttl_seconds (float): How long a result stays valid.
+        key_args (Optional[List[str]]): The arguments that identify a result;
+                                        None means all of them.
+        invalidate_on (List[str]): Events (e.g. "filesystem") that make the
+                                   cached results stale.
+    """
+
+    ttl_seconds: float = Field(default=60.0, gt=0, description="Lifetime of cached results in seconds")
+    key_args: Optional[List[str]] = Field(
+        default=None,
+        description="Arguments that identify a result (all if unset)"
+    )
+    invalidate_on: List[str] = Field(
+        default_factory=list,
+        description="Events that invalidate cached results"
+    )
+
 class MCPServer(BaseModel):
     """
     An MCP Server configuration that supports multiple transport types.
@@ -33,6 +55,21 @@ class MCPServer(BaseModel):
         verify_tls (Optional[bool]): A flag indicating whether to verify the
                                       TLS certificate.
         timeout_s (Optional[float]): The request timeout in seconds.
+        max_in_flight (int): The maximum number of outstanding requests per
+                             process-based client.
+        batching (bool): A flag indicating whether requests issued together
+                         are sent as one JSON-RPC batch (the server must
+                         accept batch arrays).
+        tool_cache (Optional[Dict[str, ToolCachePolicy]]): Result cache
+                         policies by tool name, overriding what the server
+                         declares.
+        min_replicas (int): The number of clients the pool keeps running.
+        max_replicas (int): The number of clients the pool may scale up to
+                            when all replicas are busy.
+        prespawn (bool): A flag indicating whether to start the replicas at
+                         application startup instead of on first use.
+        discover (bool): A flag indicating whether tool discovery lists the
+                         server's tools even when no client of it is running.
     """
     
     name: str = Field(..., description="Server name/identifier")
@@ -99,6 +136,39 @@ class MCPServer(BaseModel):
         default=60.0,
         description="Request timeout in seconds"
     )
+    max_in_flight: int = Field(
+        default=16,
+        ge=1,
+        description="Maximum outstanding requests per process-based client"
+    )
+    batching: bool = Field(
+        default=False,
+        description="Send requests issued together as one JSON-RPC batch"
+    )
+    tool_cache: Optional[Dict[str, ToolCachePolicy]] = Field(
+        default=None,
+        description="Result cache policies by tool name"
+    )
+
+    # pooling
+    min_replicas: int = Field(
+        default=1,
+        ge=0,
+        description="Number of clients kept running"
+    )
+    max_replicas: int = Field(
+        default=1,
+        ge=1,
+        description="Maximum number of clients when all are busy"
+    )
+    prespawn: bool = Field(
+        default=False,
+        description="Start the replicas at application startup"
+    )
+    discover: bool = Field(
+        default=False,
+        description="List the tools during discovery even when no client is running"
+    )
 
     @validator('name')
     def validate_name(cls, v):
@@ -130,6 +200,12 @@ class MCPServer(BaseModel):
             raise ValueError('Image is required for Docker transport')
         return v
 
+    @validator('max_replicas')
+    def validate_max_replicas(cls, v, values):
+        if v < values.get('min_replicas', 1):
+            raise ValueError('max_replicas cannot be less than min_replicas')
+        return v
+
 class MCPTool(BaseModel):
     """
     An MCP Tool definition.
@@ -139,6 +215,9 @@ class MCPTool(BaseModel):
         description (str): A description of the tool.
         inputSchema (Optional[Dict[str, Any]]): A JSON schema for the tool's
                                                  input.
+        annotations (Optional[Dict[str, Any]]): MCP behaviour hints such as
+                                                 `readOnlyHint` and `idempotentHint`.
+        cache (Optional[ToolCachePolicy]): How the tool's results may be cached.
     """
 
     name: str = Field(..., description="Tool name")
@@ -147,6 +226,14 @@ class MCPTool(BaseModel):
         default=None,
         description="JSON Schema for tool input"
     )
+    annotations: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="MCP tool behaviour hints"
+    )
+    cache: Optional[ToolCachePolicy] = Field(
+        default=None,
+        description="Result cache policy"
+    )
 
 class MCPListToolsReq(BaseModel):
     """
@@ -211,6 +298,51 @@ class MCPCallResp(BaseModel):
         description="Tool execution time in milliseconds"
     )
 
+class MCPBatchCall(BaseModel):
+    """
+    One tool invocation in a batch.
+
+    Attributes:
+        id (Optional[str]): The call id that other calls can depend on;
+                            defaults to its position in the batch.
+        tool (str): The name of the tool to call.
+        parameters (Dict[str, Any]): The parameters for the tool.
+        depends_on (List[str]): The ids of calls that must succeed first.
+        timeout_s (Optional[float]): The call's deadline in seconds.
+    """
+
+    id: Optional[str] = Field(default=None, description="Call id")
+    tool: str = Field(..., description="Tool name to call")
+    parameters: Dict[str, Any] = Field(
+        default={},
+        description="Tool parameters"
+    )
+    depends_on: List[str] = Field(
+        default_factory=list,
+        description="Ids of calls that must succeed first"
+    )
+    timeout_s: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Call deadline in seconds"
+    )
+
+class MCPCallBatchReq(BaseModel):
+    """
+    A request to call several tools at once.
+
+    Attributes:
+        calls (List[MCPBatchCall]): The tool invocations.
+        timeout_s (Optional[float]): The default per-call deadline in seconds.
+    """
+
+    calls: List[MCPBatchCall] = Field(..., min_length=1, description="Tool invocations")
+    timeout_s: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Default per-call deadline in seconds"
+    )
+
 class MCPServersResp(BaseModel):
     """
     A response containing the available MCP servers.
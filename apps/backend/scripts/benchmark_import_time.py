@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark.
+This script measures how long backend modules take to import, using the
+interpreter's `-X importtime` trace, so startup regressions can be caught
+before they ship. It is not run by any CI workflow; run it by hand after
+changing imports.
+
+Each module is imported in a fresh interpreter several times and the fastest
+run is reported, along with the slowest imports it pulls in. The script exits
+with status 1 if a module exceeds its time budget or imports a forbidden
+module (for example a provider SDK that should only load on first use).
+
+Usage:
+    python apps/backend/scripts/benchmark_import_time.py
+    python apps/backend/scripts/benchmark_import_time.py --max-ms 800 --forbid openai
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# The directory containing the `backend` package
+APPS_DIR = Path(__file__).resolve().parents[2]
+
+DEFAULT_MODULES = ["backend.utils.unified_ai_client"]
+DEFAULT_FORBIDDEN = ["openai", "google.generativeai"]
+
+
+def measure_import(module: str, python: str = sys.executable) -> Dict[str, int]:
+    """
+    Imports a module in a fresh interpreter and parses its import-time trace.
+
+    Args:
+        module (str): The dotted module name to import.
+        python (str, optional): The interpreter to use. Defaults to the current one.
+
+    Returns:
+        Dict[str, int]: The cumulative import time in microseconds of every module imported.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [str(APPS_DIR), os.environ.get("PYTHONPATH")])))
+    completed = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APPS_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    timings = {}
+    for line in completed.stderr.splitlines():
+        # Format: "import time: <self us> | <cumulative us> | <indented module name>"
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        timings[parts[2].strip()] = int(parts[1])
+    return timings
+
+
+def benchmark(module: str, repeat: int) -> Dict[str, int]:
+    """
+    Runs `measure_import` several times and keeps the fastest run, to reduce noise.
+
+    Args:
+        module (str): The dotted module name to import.
+        repeat (int): The number of runs.
+
+    Returns:
+        Dict[str, int]: The timings of the fastest run.
+    """
+    runs = [measure_import(module) for _ in range(repeat)]
+    return min(runs, key=lambda timings: timings.get(module, 0))
+
+
+def report(module: str, timings: Dict[str, int], top: int, max_ms: Optional[float],
+           forbidden: List[str]) -> List[str]:
+    """
+    Prints the results for one module and returns the budget violations.
+
+    Args:
+        module (str): The benchmarked module.
+        timings (Dict[str, int]): Its import timings in microseconds.
+        top (int): How many of the slowest imports to list.
+        max_ms (Optional[float]): The time budget in milliseconds, if any.
+        forbidden (List[str]): Modules that must not be imported.
+
+    Returns:
+        List[str]: The violations found.
+    """
+    total_ms = timings.get(module, 0) / 1000
+    print(f"📦 {module}: {total_ms:.1f} ms ({len(timings)} modules imported)")
+    slowest = sorted((item for item in timings.items() if item[0] != module), key=lambda item: -item[1])
+    for name, micros in slowest[:top]:
+        print(f"   {micros / 1000:8.1f} ms  {name}")
+
+    violations = []
+    if max_ms is not None and total_ms > max_ms:
+        violations.append(f"{module} took {total_ms:.1f} ms (budget {max_ms:.1f} ms)")
+    for name in forbidden:
+        if name in timings:
+            violations.append(f"{module} imports {name} at import time")
+    return violations
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Runs the benchmark.
+
+    Args:
+        argv (Optional[List[str]], optional): Command-line arguments. Defaults to sys.argv.
+
+    Returns:
+        int: The exit status: 0 if all budgets are met, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Measure backend import time with -X importtime.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to import.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the fastest is kept.")
+    parser.add_argument("--top", type=int, default=10, help="How many of the slowest imports to list.")
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if a module takes longer to import.")
+    parser.add_argument("--forbid", action="append", default=None,
+                        help=f"Fail if this module gets imported (default: {', '.join(DEFAULT_FORBIDDEN)}).")
+    args = parser.parse_args(argv)
+    forbidden = args.forbid if args.forbid is not None else DEFAULT_FORBIDDEN
+
+    violations = []
+    for module in args.modules:
+        violations += report(module, benchmark(module, args.repeat), args.top, args.max_ms, forbidden)
+
+    for violation in violations:
+        print(f"❌ {violation}")
+    if not violations:
+        print("✅ Import-time budgets met")
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
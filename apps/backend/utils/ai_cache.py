@@ -0,0 +1,158 @@
+"""
+On-disk cache for deterministic AI completions.
+
+Temperature-0 completions are a pure function of (provider, model, messages,
+generation params), so their results can be reused across requests and
+restarts. Entries live in a local SQLite file with a TTL; when the total size
+exceeds a budget, the least recently used entries are evicted.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CompletionCache:
+    """
+    A SQLite-backed completion cache with TTL and size-based LRU eviction.
+
+    Attributes:
+        db_path (str): The path to the SQLite database file.
+        ttl_seconds (int): How long entries stay valid.
+        max_bytes (int): The total size budget for cached values.
+        stats (Dict[str, int]): Hit, miss, write, expiry and eviction counters.
+    """
+
+    def __init__(self, db_path: str = "./ai_completion_cache.db", ttl_seconds: int = 86400,
+                 max_bytes: int = 100 * 1024 * 1024):
+        """
+        Initializes the CompletionCache.
+
+        Args:
+            db_path (str, optional): The path to the SQLite database file. Defaults to "./ai_completion_cache.db".
+            ttl_seconds (int, optional): How long entries stay valid. Defaults to 86400 (one day).
+            max_bytes (int, optional): The total size budget for cached values. Defaults to 100MB.
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'writes': 0, 'expired': 0, 'evictions': 0}
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Opens a connection to the cache database."""
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def _init_db(self):
+        """Creates the cache table if it does not exist."""
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS completions (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_completions_access ON completions (last_access)")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up a cached completion.
+
+        Args:
+            key (str): The canonical request key.
+
+        Returns:
+            Optional[Dict[str, Any]]: The cached result, or None on a miss or expired entry.
+        """
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute("SELECT value, expires_at FROM completions WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    self.stats['misses'] += 1
+                    return None
+                if row[1] <= now:
+                    conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    self.stats['expired'] += 1
+                    self.stats['misses'] += 1
+                    return None
+                conn.execute("UPDATE completions SET last_access = ? WHERE key = ?", (now, key))
+                self.stats['hits'] += 1
+                return json.loads(row[0])
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"⚠️ Completion cache read failed: {e}")
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, key: str, result: Dict[str, Any]):
+        """
+        Stores a completion and evicts the least recently used entries if over budget.
+
+        Args:
+            key (str): The canonical request key.
+            result (Dict[str, Any]): The successful completion result.
+        """
+        now = time.time()
+        value = json.dumps(result, default=str)
+        size = len(value.encode())
+        if size > self.max_bytes:
+            return
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, value, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                    (key, value, size, now + self.ttl_seconds, now)
+                )
+                self.stats['writes'] += 1
+                self._evict(conn, now)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Completion cache write failed: {e}")
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drops expired entries, then the least recently used ones until under the size budget."""
+        expired = conn.execute("DELETE FROM completions WHERE expires_at <= ?", (now,)).rowcount
+        self.stats['expired'] += max(expired, 0)
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM completions ORDER BY last_access").fetchall():
+            conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+            self.stats['evictions'] += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def clear(self):
+        """Removes all cached completions."""
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM completions")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gets cache counters and current size.
+
+        Returns:
+            Dict[str, Any]: The cache statistics.
+        """
+        with self._lock, self._connect() as conn:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions").fetchone()
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': self.stats['hits'] / lookups if lookups else 0,
+            'entries': entries,
+            'size_bytes': size,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl_seconds
+        }
@@ -0,0 +1,394 @@
+"""
+Provider health tracking, latency-aware routing and circuit breaking.
+
+Each provider's request latency and error rate are tracked as exponentially
+weighted moving averages, with a window of recent latencies for percentile
+estimates. The router orders candidate providers by expected latency.
+
+Circuit breakers stop calls to a provider/model that keeps failing, so callers
+fail over immediately instead of waiting for connection timeouts.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+
+class ProviderStats:
+    """
+    Rolling latency and error statistics for one provider.
+
+    Attributes:
+        ewma_latency (Optional[float]): Smoothed latency of successful calls, in seconds.
+        ewma_error_rate (float): Smoothed share of failed calls.
+        latencies (Deque[float]): Recent successful-call latencies for percentile estimates.
+        requests (int): The total number of recorded calls.
+        errors (int): The total number of failed calls.
+    """
+
+    def __init__(self, window: int = 100):
+        """
+        Initializes the ProviderStats.
+
+        Args:
+            window (int, optional): How many recent latencies to keep. Defaults to 100.
+        """
+        self.ewma_latency: Optional[float] = None
+        self.ewma_error_rate = 0.0
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.last_updated = 0.0
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Estimates a latency percentile from the recent window.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.9.
+
+        Returns:
+            Optional[float]: The latency in seconds, or None without samples.
+        """
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index]
+
+
+class ProviderRouter:
+    """
+    Orders providers by expected latency.
+
+    Expected latency is the EWMA latency inflated by the EWMA error rate, so a
+    fast provider that often fails ranks behind a slightly slower reliable one.
+    Providers without samples use `default_latency`, which keeps them in
+    their configured position until they have been measured.
+
+    Attributes:
+        alpha (float): The EWMA smoothing factor.
+        default_latency (float): The assumed latency of unmeasured providers, in seconds.
+    """
+
+    def __init__(self, alpha: float = 0.2, window: int = 100, default_latency: float = 2.0):
+        """
+        Initializes the ProviderRouter.
+
+        Args:
+            alpha (float, optional): The EWMA smoothing factor. Defaults to 0.2.
+            window (int, optional): How many recent latencies to keep per provider. Defaults to 100.
+            default_latency (float, optional): The assumed latency of unmeasured providers. Defaults to 2.0.
+        """
+        self.alpha = alpha
+        self.window = window
+        self.default_latency = default_latency
+        self._stats: Dict[str, ProviderStats] = {}
+        self._lock = threading.Lock()
+
+    def _get_stats(self, provider: str) -> ProviderStats:
+        """Gets or creates the statistics for a provider."""
+        provider = provider.lower()
+        if provider not in self._stats:
+            self._stats[provider] = ProviderStats(self.window)
+        return self._stats[provider]
+
+    def record(self, provider: str, latency: float, success: bool):
+        """
+        Records the outcome of a provider call.
+
+        Args:
+            provider (str): The provider name.
+            latency (float): The call latency in seconds.
+            success (bool): Whether the call succeeded.
+        """
+        with self._lock:
+            stats = self._get_stats(provider)
+            stats.requests += 1
+            stats.last_updated = time.time()
+            stats.ewma_error_rate += self.alpha * ((0.0 if success else 1.0) - stats.ewma_error_rate)
+            if success:
+                stats.latencies.append(latency)
+                if stats.ewma_latency is None:
+                    stats.ewma_latency = latency
+                else:
+                    stats.ewma_latency += self.alpha * (latency - stats.ewma_latency)
+            else:
+                stats.errors += 1
+
+    def expected_latency(self, provider: str) -> float:
+        """
+        Estimates the latency of a call to a provider, including the cost of failures.
+
+        Args:
+            provider (str): The provider name.
+
+        Returns:
+            float: The expected latency in seconds.
+        """
+        with self._lock:
+            stats = self._get_stats(provider)
+            latency = stats.ewma_latency if stats.ewma_latency is not None else self.default_latency
+            return latency / max(0.05, 1.0 - stats.ewma_error_rate)
+
+    def order(self, providers: List[str]) -> List[str]:
+        """
+        Orders providers by expected latency; ties keep their given order.
+
+        Args:
+            providers (List[str]): The candidate provider names.
+
+        Returns:
+            List[str]: The providers, fastest expected first.
+        """
+        return sorted(providers, key=self.expected_latency)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Gets routing statistics for every measured provider.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Per-provider latency, error and percentile figures.
+        """
+        with self._lock:
+            providers = list(self._stats.items())
+        return {
+            name: {
+                'requests': stats.requests,
+                'errors': stats.errors,
+                'ewma_latency_ms': stats.ewma_latency * 1000 if stats.ewma_latency is not None else None,
+                'ewma_error_rate': stats.ewma_error_rate,
+                'p50_latency_ms': (stats.percentile(0.5) or 0) * 1000 if stats.latencies else None,
+                'p90_latency_ms': (stats.percentile(0.9) or 0) * 1000 if stats.latencies else None,
+                'expected_latency_ms': self.expected_latency(name) * 1000
+            }
+            for name, stats in providers
+        }
+
+
+class CircuitBreaker:
+    """
+    A closed/open/half-open circuit breaker for one provider/model.
+
+    * closed: calls pass; `failure_threshold` consecutive failures open the circuit.
+    * open: calls are rejected until `recovery_timeout` seconds have passed.
+    * half_open: up to `half_open_max_calls` probe calls pass; a successful probe
+      closes the circuit and a failed one opens it again.
+
+    Attributes:
+        name (str): The provider/model key.
+        state (str): The current state.
+        failure_threshold (int): Consecutive failures that open the circuit.
+        recovery_timeout (float): Seconds to stay open before probing.
+        half_open_max_calls (int): Concurrent probe calls allowed while half-open.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        """
+        Initializes the CircuitBreaker.
+
+        Args:
+            name (str): The provider/model key.
+            failure_threshold (int, optional): Consecutive failures that open the circuit. Defaults to 5.
+            recovery_timeout (float, optional): Seconds to stay open before probing. Defaults to 30.0.
+            half_open_max_calls (int, optional): Concurrent probe calls while half-open. Defaults to 1.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.stats = {'successes': 0, 'failures': 0, 'rejected': 0, 'opened': 0}
+        self._lock = threading.Lock()
+
+    def _refresh(self, now: float):
+        """Moves an open circuit to half-open once the recovery timeout has passed."""
+        if self.state == self.OPEN and now - self.opened_at >= self.recovery_timeout:
+            self.state = self.HALF_OPEN
+            self.probes_in_flight = 0
+
+    def allow_request(self) -> bool:
+        """
+        Checks whether a call may go ahead, reserving a probe slot when half-open.
+
+        Returns:
+            bool: True if the call may proceed, False if it should fail fast.
+        """
+        with self._lock:
+            self._refresh(time.monotonic())
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and self.probes_in_flight < self.half_open_max_calls:
+                self.probes_in_flight += 1
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def is_available(self) -> bool:
+        """
+        Checks whether a call would be allowed, without reserving a probe slot.
+
+        Returns:
+            bool: False while the circuit is open or all probe slots are taken.
+        """
+        with self._lock:
+            self._refresh(time.monotonic())
+            if self.state == self.HALF_OPEN:
+                return self.probes_in_flight < self.half_open_max_calls
+            return self.state == self.CLOSED
+
+    def record_success(self):
+        """Records a successful call, closing a half-open circuit."""
+        with self._lock:
+            self.stats['successes'] += 1
+            self.consecutive_failures = 0
+            if self.state == self.HALF_OPEN:
+                self.probes_in_flight = max(0, self.probes_in_flight - 1)
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        """Records a failed call, opening the circuit when the threshold is reached."""
+        with self._lock:
+            self.stats['failures'] += 1
+            self.consecutive_failures += 1
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    self.stats['opened'] += 1
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                self.probes_in_flight = 0
+
+    def record_cancelled(self):
+        """Releases a probe slot held by a call that was cancelled before it finished."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+    def retry_after(self) -> float:
+        """
+        Gets the seconds until an open circuit starts probing.
+
+        Returns:
+            float: The remaining seconds, or 0 if the circuit is not open.
+        """
+        with self._lock:
+            if self.state != self.OPEN:
+                return 0.0
+            return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+
+    def get_status(self) -> Dict[str, Any]:
+        """
+        Gets the breaker state and counters.
+
+        Returns:
+            Dict[str, Any]: The breaker status.
+        """
+        self.is_available()  # apply any pending open -> half-open transition
+        return {
+            'state': self.state,
+            'consecutive_failures': self.consecutive_failures,
+            'retry_after_seconds': round(self.retry_after(), 2),
+            **self.stats
+        }
+
+
+class CircuitBreakerRegistry:
+    """
+    Holds one circuit breaker per provider/model key.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open a circuit.
+        recovery_timeout (float): Seconds a circuit stays open before probing.
+        half_open_max_calls (int): Concurrent probe calls allowed while half-open.
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_max_calls: int = 1):
+        """
+        Initializes the CircuitBreakerRegistry.
+
+        Args:
+            failure_threshold (int, optional): Consecutive failures that open a circuit. Defaults to 5.
+            recovery_timeout (float, optional): Seconds a circuit stays open before probing. Defaults to 30.0.
+            half_open_max_calls (int, optional): Concurrent probe calls while half-open. Defaults to 1.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(provider: str, model: Optional[str] = None) -> str:
+        """Builds the breaker key for a provider and model."""
+        return f"{provider.lower()}:{model or 'default'}"
+
+    def get(self, provider: str, model: Optional[str] = None) -> CircuitBreaker:
+        """
+        Gets (or creates) the breaker for a provider and model.
+
+        Args:
+            provider (str): The provider name.
+            model (Optional[str]): The model name, or None for the provider default.
+
+        Returns:
+            CircuitBreaker: The breaker.
+        """
+        key = self.make_key(provider, model)
+        with self._lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(
+                    key, self.failure_threshold, self.recovery_timeout, self.half_open_max_calls
+                )
+            return self._breakers[key]
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Gets the status of every breaker.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Breaker status by provider/model key.
+        """
+        with self._lock:
+            breakers = list(self._breakers.items())
+        return {key: breaker.get_status() for key, breaker in breakers}
+
+
+def is_provider_failure(result: Optional[Dict[str, Any]]) -> bool:
+    """
+    Decides whether a failed result should count against a provider's breaker.
+
+    Connection errors, timeouts, rate limits and server errors count; client
+    errors such as a bad request (4xx) say nothing about provider health.
+
+    Args:
+        result (Optional[Dict[str, Any]]): The result dict from a strategy call.
+
+    Returns:
+        bool: True if the result is a provider-side failure.
+    """
+    if not result or result.get('success', True):
+        return False
+    status_code = result.get('status_code')
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+# --- Singleton Router Instance ---
+_router_instance = None
+
+def get_router() -> ProviderRouter:
+    """
+    Returns a singleton instance of the ProviderRouter.
+    """
+    global _router_instance
+    if _router_instance is None:
+        _router_instance = ProviderRouter()
+    return _router_instance
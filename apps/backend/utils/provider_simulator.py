@@ -0,0 +1,288 @@
+"""
+Offline AI provider simulator.
+
+Produces provider-like behaviour without a model or network: latency drawn
+from a configurable distribution, completions streamed at a fixed tokens-per-
+second rate, injected errors at a configurable rate, and deterministic
+embeddings derived from a hash of the input text. Completion text and
+embeddings depend only on the input, so runs are reproducible; latency and
+error injection are reproducible when a seed is given.
+
+The same simulator backs the in-process `SimulatorStrategy` of the unified AI
+client and the standalone HTTP server in `mock_servers/ai_provider.py`, which
+speaks the Ollama and OpenAI wire formats.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import struct
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+_VOCABULARY = (
+    "the a model system query document context answer result data index vector search "
+    "retrieve token stream latency provider request response cache scan chunk embed "
+    "orchestrator agent tool server client user file code function class value error "
+    "quickly reliably clearly simply therefore however because while when and or with"
+).split()
+
+LATENCY_DISTRIBUTIONS = ('fixed', 'uniform', 'normal', 'lognormal')
+
+
+class SimulatedProviderError(Exception):
+    """
+    An error injected by the simulator.
+
+    Attributes:
+        status_code (int): The HTTP status the simulated provider answers with.
+    """
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Simulated provider error (HTTP {status_code})")
+        self.status_code = status_code
+
+
+class ProviderSimulator:
+    """
+    Simulates the timing, output and failures of an AI provider.
+
+    Attributes:
+        latency_ms (float): The mean time to first token in milliseconds.
+        jitter_ms (float): The spread of the latency distribution in milliseconds.
+        distribution (str): One of 'fixed', 'uniform', 'normal' or 'lognormal'.
+        tokens_per_second (float): The streaming rate of completion tokens.
+        error_rate (float): The probability that a request fails.
+        error_statuses (List[int]): The HTTP statuses injected errors are drawn from.
+        embedding_dim (int): The dimension of generated embeddings.
+        stats (Dict[str, int]): Request, error, token and embedding counters.
+    """
+
+    def __init__(self, latency_ms: float = 200.0, jitter_ms: float = 50.0, distribution: str = 'lognormal',
+                 tokens_per_second: float = 50.0, error_rate: float = 0.0,
+                 error_statuses: Optional[List[int]] = None, embedding_dim: int = 768,
+                 seed: Optional[int] = None):
+        """
+        Initializes the ProviderSimulator.
+
+        Args:
+            latency_ms (float, optional): The mean time to first token. Defaults to 200.0.
+            jitter_ms (float, optional): The spread (standard deviation, or half-range for
+                'uniform'). Defaults to 50.0.
+            distribution (str, optional): The latency distribution. Defaults to 'lognormal'.
+            tokens_per_second (float, optional): The streaming rate; 0 streams instantly. Defaults to 50.0.
+            error_rate (float, optional): The probability that a request fails. Defaults to 0.0.
+            error_statuses (Optional[List[int]], optional): The statuses of injected errors.
+                Defaults to [429, 500, 503].
+            embedding_dim (int, optional): The embedding dimension. Defaults to 768.
+            seed (Optional[int], optional): Seeds latency and error sampling. Defaults to None.
+
+        Raises:
+            ValueError: If the distribution is unknown.
+        """
+        if distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution '{distribution}', expected one of {LATENCY_DISTRIBUTIONS}")
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.distribution = distribution
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses or [429, 500, 503]
+        self.embedding_dim = embedding_dim
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'completion_tokens': 0, 'embeddings': 0}
+
+    def sample_latency(self) -> float:
+        """
+        Draws a time to first token from the latency distribution.
+
+        Returns:
+            float: The latency in seconds, never negative.
+        """
+        with self._lock:
+            if self.distribution == 'fixed' or self.jitter_ms <= 0:
+                latency = self.latency_ms
+            elif self.distribution == 'uniform':
+                latency = self._random.uniform(self.latency_ms - self.jitter_ms, self.latency_ms + self.jitter_ms)
+            elif self.distribution == 'normal':
+                latency = self._random.gauss(self.latency_ms, self.jitter_ms)
+            else:
+                # Parameterized so the mean and standard deviation match latency_ms and jitter_ms
+                sigma2 = math.log(1 + (self.jitter_ms / max(self.latency_ms, 1e-9)) ** 2)
+                mu = math.log(max(self.latency_ms, 1e-9)) - sigma2 / 2
+                latency = self._random.lognormvariate(mu, math.sqrt(sigma2))
+        return max(0.0, latency) / 1000
+
+    def check_failure(self):
+        """
+        Counts a request and decides whether it fails.
+
+        Raises:
+            SimulatedProviderError: With probability `error_rate`.
+        """
+        with self._lock:
+            self.stats['requests'] += 1
+            if self.error_rate > 0 and self._random.random() < self.error_rate:
+                self.stats['errors'] += 1
+                raise SimulatedProviderError(self._random.choice(self.error_statuses))
+
+    def completion_tokens(self, messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> List[str]:
+        """
+        Builds the deterministic completion for a conversation.
+
+        Args:
+            messages (List[Dict[str, str]]): The conversation.
+            max_tokens (Optional[int], optional): The completion length limit. Defaults to None.
+
+        Returns:
+            List[str]: The completion split into tokens (words with their leading space).
+        """
+        digest = hashlib.sha256(repr([(m.get('role'), m.get('content')) for m in messages]).encode()).digest()
+        rng = random.Random(digest)
+        length = rng.randint(16, 96)
+        if max_tokens:
+            length = min(length, max_tokens)
+        words = [rng.choice(_VOCABULARY) for _ in range(length)]
+        return [word if index == 0 else f" {word}" for index, word in enumerate(words)]
+
+    @staticmethod
+    def prompt_tokens(messages: List[Dict[str, str]]) -> int:
+        """Counts the prompt tokens of a conversation (whitespace-separated words)."""
+        return sum(len(str(message.get('content', '')).split()) for message in messages)
+
+    def embed(self, text: str) -> List[float]:
+        """
+        Builds a deterministic unit-length embedding from a hash of the text.
+
+        Identical texts get identical vectors; different texts get unrelated ones.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            List[float]: The embedding.
+        """
+        values = []
+        counter = 0
+        while len(values) < self.embedding_dim:
+            block = hashlib.sha256(f"{counter}:{text}".encode()).digest()
+            values.extend(value / 2 ** 31 - 1 for value in struct.unpack('>8I', block))
+            counter += 1
+        values = values[:self.embedding_dim]
+        norm = math.sqrt(sum(value * value for value in values)) or 1.0
+        with self._lock:
+            self.stats['embeddings'] += 1
+        return [value / norm for value in values]
+
+    def _token_delay(self) -> float:
+        """Gets the seconds between streamed tokens."""
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def _usage(self, messages: List[Dict[str, str]], tokens: List[str]) -> Dict[str, int]:
+        """Builds the usage record of a completion and counts its tokens."""
+        with self._lock:
+            self.stats['completion_tokens'] += len(tokens)
+        prompt_tokens = self.prompt_tokens(messages)
+        return {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': len(tokens),
+            'total_tokens': prompt_tokens + len(tokens)
+        }
+
+    def complete(self, messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Simulates a blocking completion, sleeping for the full generation time.
+
+        Args:
+            messages (List[Dict[str, str]]): The conversation.
+            max_tokens (Optional[int], optional): The completion length limit. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: The 'content' and 'usage' of the completion.
+
+        Raises:
+            SimulatedProviderError: If an error is injected.
+        """
+        self.check_failure()
+        tokens = self.completion_tokens(messages, max_tokens)
+        time.sleep(self.sample_latency() + len(tokens) * self._token_delay())
+        return {'content': ''.join(tokens), 'usage': self._usage(messages, tokens)}
+
+    async def acomplete(self, messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Simulates a completion without blocking the event loop.
+
+        Args:
+            messages (List[Dict[str, str]]): The conversation.
+            max_tokens (Optional[int], optional): The completion length limit. Defaults to None.
+
+        Returns:
+            Dict[str, Any]: The 'content' and 'usage' of the completion.
+
+        Raises:
+            SimulatedProviderError: If an error is injected.
+        """
+        self.check_failure()
+        tokens = self.completion_tokens(messages, max_tokens)
+        await asyncio.sleep(self.sample_latency() + len(tokens) * self._token_delay())
+        return {'content': ''.join(tokens), 'usage': self._usage(messages, tokens)}
+
+    async def stream(self, messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Simulates a streamed completion: one 'delta' per token, then a 'done' with the usage.
+
+        Args:
+            messages (List[Dict[str, str]]): The conversation.
+            max_tokens (Optional[int], optional): The completion length limit. Defaults to None.
+
+        Yields:
+            Dict[str, Any]: {'type': 'delta', 'content': ...} events, then {'type': 'done', 'usage': ...}.
+
+        Raises:
+            SimulatedProviderError: If an error is injected (before the first token).
+        """
+        self.check_failure()
+        tokens = self.completion_tokens(messages, max_tokens)
+        await asyncio.sleep(self.sample_latency())
+        delay = self._token_delay()
+        for token in tokens:
+            yield {'type': 'delta', 'content': token}
+            if delay:
+                await asyncio.sleep(delay)
+        yield {'type': 'done', 'usage': self._usage(messages, tokens)}
+
+    async def aembed(self, text: str) -> List[float]:
+        """
+        Simulates an embedding request: latency, error injection, then the hash-based vector.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            List[float]: The embedding.
+
+        Raises:
+            SimulatedProviderError: If an error is injected.
+        """
+        self.check_failure()
+        await asyncio.sleep(self.sample_latency())
+        return self.embed(text)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Gets the simulator's configuration and counters.
+
+        Returns:
+            Dict[str, Any]: The statistics.
+        """
+        return {
+            **self.stats,
+            'latency_ms': self.latency_ms,
+            'jitter_ms': self.jitter_ms,
+            'distribution': self.distribution,
+            'tokens_per_second': self.tokens_per_second,
+            'error_rate': self.error_rate
+        }
@@ -0,0 +1,421 @@
+"""
+Client-side rate limiting and quota-aware scheduling for AI providers.
+
+Each provider key gets two token buckets, one for requests per minute and one
+for tokens per minute. Calls that would exceed either budget wait in a queue
+instead of being sent and rejected with a 429.
+
+Queued calls are granted by priority class first ('interactive' before
+'background') and round-robin across users within a class, so one user's bulk
+ingest cannot starve everyone else. A share of each bucket is reserved for
+interactive calls: background work only draws on the budget above that floor.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+PRIORITIES = (INTERACTIVE, BACKGROUND)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Roughly estimates the token count of a text (about four characters per token).
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The estimated token count, at least 1.
+    """
+    return max(1, len(text) // 4)
+
+
+class TokenBucket:
+    """
+    A token bucket that refills continuously at a per-minute rate.
+
+    The level may go negative when a call is charged more than was reserved
+    (see `ProviderQuota.adjust`); later calls then wait for the debt to refill.
+
+    Attributes:
+        rate (float): The refill rate in tokens per second.
+        capacity (float): The maximum level (the burst size).
+        level (float): The current number of available tokens.
+    """
+
+    def __init__(self, per_minute: int, capacity: Optional[int] = None):
+        """
+        Initializes the TokenBucket, full.
+
+        Args:
+            per_minute (int): The refill rate in tokens per minute.
+            capacity (Optional[int], optional): The burst size. Defaults to one minute's worth.
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = float(capacity or per_minute)
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        """Adds the tokens accrued since the last update."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, floor: float = 0.0) -> float:
+        """
+        Gets the seconds until `amount` tokens are available above `floor`.
+
+        Amounts larger than the bucket can ever hold are capped at its capacity
+        so that oversized calls are delayed rather than blocked forever.
+
+        Args:
+            amount (float): The tokens needed.
+            floor (float, optional): A level the call may not draw below. Defaults to 0.0.
+
+        Returns:
+            float: 0 if the tokens are available now, else the seconds to wait.
+        """
+        needed = min(amount, self.capacity - floor) + floor
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+
+class ProviderQuota:
+    """
+    The request and token budgets of one provider key.
+
+    Attributes:
+        requests (Optional[TokenBucket]): The requests-per-minute bucket, or None if unlimited.
+        tokens (Optional[TokenBucket]): The tokens-per-minute bucket, or None if unlimited.
+        interactive_reserve (float): The fraction of each bucket only interactive calls may use.
+    """
+
+    def __init__(self, requests_per_minute: int = 0, tokens_per_minute: int = 0, interactive_reserve: float = 0.2):
+        """
+        Initializes the ProviderQuota.
+
+        Args:
+            requests_per_minute (int, optional): The request budget; 0 means unlimited. Defaults to 0.
+            tokens_per_minute (int, optional): The token budget; 0 means unlimited. Defaults to 0.
+            interactive_reserve (float, optional): The share of each bucket reserved for
+                interactive calls. Defaults to 0.2.
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.interactive_reserve = interactive_reserve
+
+    def wait_time(self, tokens: int, priority: str) -> float:
+        """
+        Gets the seconds until a call of `tokens` tokens fits in both budgets.
+
+        Args:
+            tokens (int): The estimated tokens of the call.
+            priority (str): The call's priority class.
+
+        Returns:
+            float: 0 if the call may go now, else the seconds to wait.
+        """
+        now = time.monotonic()
+        wait = 0.0
+        for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+            if bucket is None:
+                continue
+            bucket.refill(now)
+            floor = bucket.capacity * self.interactive_reserve if priority == BACKGROUND else 0.0
+            wait = max(wait, bucket.wait_time(amount, floor))
+        return wait
+
+    def consume(self, tokens: int):
+        """Charges one request and `tokens` tokens to the budgets."""
+        if self.requests is not None:
+            self.requests.level -= 1
+        if self.tokens is not None:
+            self.tokens.level -= min(tokens, self.tokens.capacity)
+
+    def adjust(self, estimated: int, actual: int):
+        """Corrects the token budget once a call's real usage is known."""
+        if self.tokens is not None:
+            self.tokens.level -= actual - estimated
+
+    def pause(self, seconds: float):
+        """Empties the request budget so no call is sent for `seconds` (after a 429)."""
+        if self.requests is not None:
+            self.requests.refill(time.monotonic())
+            self.requests.level = min(self.requests.level, -self.requests.rate * seconds)
+
+    @property
+    def unlimited(self) -> bool:
+        """Whether neither budget is configured."""
+        return self.requests is None and self.tokens is None
+
+
+class _Waiter:
+    """A queued call waiting for budget."""
+
+    __slots__ = ('future', 'tokens', 'enqueued_at')
+
+    def __init__(self, future: asyncio.Future, tokens: int):
+        self.future = future
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+
+
+class RateLimitScheduler:
+    """
+    Queues provider calls until their provider's request and token budgets allow them.
+
+    Async callers are queued per provider and granted by a dispatcher task in
+    priority order, round-robin across users. Blocking callers poll the same
+    budgets and defer to queued async callers.
+
+    Attributes:
+        quotas (Dict[str, ProviderQuota]): The budgets by provider key.
+        stats (Dict[str, Dict[str, float]]): Granted, delayed and wait-time counters by provider.
+    """
+
+    def __init__(self, limits: Dict[str, Dict[str, int]], interactive_reserve: float = 0.2):
+        """
+        Initializes the RateLimitScheduler.
+
+        Args:
+            limits (Dict[str, Dict[str, int]]): Maps a provider key to its `requests_per_minute`
+                and `tokens_per_minute`; missing or 0 values mean unlimited.
+            interactive_reserve (float, optional): The share of each bucket reserved for
+                interactive calls. Defaults to 0.2.
+        """
+        self.quotas: Dict[str, ProviderQuota] = {}
+        for provider, limit in limits.items():
+            quota = ProviderQuota(
+                requests_per_minute=limit.get('requests_per_minute', 0),
+                tokens_per_minute=limit.get('tokens_per_minute', 0),
+                interactive_reserve=interactive_reserve
+            )
+            if not quota.unlimited:
+                self.quotas[provider] = quota
+        self._queues: Dict[str, Dict[str, 'OrderedDict[str, Deque[_Waiter]]']] = {}
+        self._dispatchers: Dict[str, asyncio.Task] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _record(self, provider: str, waited: float):
+        """Updates the grant counters of a provider."""
+        stats = self.stats.setdefault(provider, {'granted': 0, 'delayed': 0, 'wait_seconds': 0.0})
+        stats['granted'] += 1
+        if waited > 0:
+            stats['delayed'] += 1
+            stats['wait_seconds'] += waited
+
+    def _queued(self, provider: str) -> int:
+        """Counts the calls queued for a provider."""
+        return sum(
+            len(waiters)
+            for users in self._queues.get(provider, {}).values()
+            for waiters in users.values()
+        )
+
+    async def acquire(self, provider: str, tokens: int, priority: str = INTERACTIVE,
+                      user_id: Optional[str] = None) -> float:
+        """
+        Waits until a call fits in its provider's budgets and charges it.
+
+        Args:
+            provider (str): The provider key.
+            tokens (int): The estimated tokens of the call (prompt plus completion).
+            priority (str, optional): 'interactive' or 'background'. Defaults to 'interactive'.
+            user_id (Optional[str], optional): The user to queue the call under. Defaults to None.
+
+        Returns:
+            float: The seconds the call waited.
+        """
+        quota = self.quotas.get(provider)
+        if quota is None:
+            return 0.0
+        priority = priority if priority in PRIORITIES else INTERACTIVE
+
+        with self._lock:
+            if self._queued(provider) == 0 and quota.wait_time(tokens, priority) == 0:
+                quota.consume(tokens)
+                self._record(provider, 0.0)
+                return 0.0
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), tokens)
+        users = self._queues.setdefault(provider, {p: OrderedDict() for p in PRIORITIES})[priority]
+        users.setdefault(user_id or '', deque()).append(waiter)
+        self._ensure_dispatcher(provider)
+        self._wakeups[provider].set()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            self._discard(provider, priority, user_id or '', waiter)
+            raise
+        return time.monotonic() - waiter.enqueued_at
+
+    def _discard(self, provider: str, priority: str, user_id: str, waiter: _Waiter):
+        """Removes a cancelled call from its queue."""
+        users = self._queues.get(provider, {}).get(priority, {})
+        waiters = users.get(user_id)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del users[user_id]
+        if provider in self._wakeups:
+            self._wakeups[provider].set()
+
+    def _ensure_dispatcher(self, provider: str):
+        """Starts the dispatcher task of a provider if it is not running in this loop."""
+        task = self._dispatchers.get(provider)
+        loop = asyncio.get_running_loop()
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._wakeups[provider] = asyncio.Event()
+            self._dispatchers[provider] = loop.create_task(self._dispatch(provider))
+
+    def _next_waiter(self, provider: str) -> Optional[Tuple[str, str, _Waiter]]:
+        """Finds the next call to grant: the highest priority class, then the next user in turn."""
+        for priority in PRIORITIES:
+            users = self._queues[provider][priority]
+            for user_id in list(users):
+                waiters = users[user_id]
+                while waiters and waiters[0].future.done():
+                    waiters.popleft()
+                if waiters:
+                    return priority, user_id, waiters[0]
+                del users[user_id]
+        return None
+
+    async def _dispatch(self, provider: str):
+        """Grants queued calls of one provider as its budgets refill."""
+        quota = self.quotas[provider]
+        wakeup = self._wakeups[provider]
+        while True:
+            with self._lock:
+                head = self._next_waiter(provider)
+                if head is None:
+                    return
+                priority, user_id, waiter = head
+                wait = quota.wait_time(waiter.tokens, priority)
+                if wait == 0:
+                    quota.consume(waiter.tokens)
+                    users = self._queues[provider][priority]
+                    users[user_id].popleft()
+                    if users[user_id]:
+                        users.move_to_end(user_id)
+                    else:
+                        del users[user_id]
+                    waiter.future.set_result(None)
+                    self._record(provider, time.monotonic() - waiter.enqueued_at)
+                    continue
+
+            # Sleep until the budget refills, or until a higher-priority call arrives
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    def acquire_sync(self, provider: str, tokens: int, priority: str = INTERACTIVE) -> float:
+        """
+        Blocks the calling thread until a call fits in its provider's budgets and charges it.
+
+        Args:
+            provider (str): The provider key.
+            tokens (int): The estimated tokens of the call.
+            priority (str, optional): 'interactive' or 'background'. Defaults to 'interactive'.
+
+        Returns:
+            float: The seconds the call waited.
+        """
+        quota = self.quotas.get(provider)
+        if quota is None:
+            return 0.0
+        priority = priority if priority in PRIORITIES else INTERACTIVE
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                wait = quota.wait_time(tokens, priority)
+                if wait == 0 and self._queued(provider) == 0:
+                    quota.consume(tokens)
+                    waited = time.monotonic() - started
+                    self._record(provider, waited)
+                    return waited
+            time.sleep(min(max(wait, 0.01), 0.5))
+
+    def adjust(self, provider: str, estimated: int, actual: Optional[int]):
+        """
+        Charges the difference between a call's estimated and actual token usage.
+
+        Args:
+            provider (str): The provider key.
+            estimated (int): The tokens charged when the call was granted.
+            actual (Optional[int]): The tokens the provider reported, if any.
+        """
+        quota = self.quotas.get(provider)
+        if quota is not None and actual:
+            with self._lock:
+                quota.adjust(estimated, actual)
+
+    def pause(self, provider: str, seconds: float):
+        """
+        Holds back a provider's calls after it answered with a rate-limit error.
+
+        Args:
+            provider (str): The provider key.
+            seconds (float): How long to send nothing.
+        """
+        quota = self.quotas.get(provider)
+        if quota is not None:
+            with self._lock:
+                quota.pause(seconds)
+            logger.warning(f"⏳ {provider} rate limited upstream; pausing for {seconds:.1f}s")
+
+    async def aclose(self):
+        """
+        Stops the dispatcher tasks running in this event loop and cancels the calls still queued.
+        """
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in self._dispatchers.values() if task.get_loop() is loop]
+        self._dispatchers = {
+            provider: task for provider, task in self._dispatchers.items() if task.get_loop() is not loop
+        }
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for by_priority in self._queues.values():
+            for users in by_priority.values():
+                for waiter in [waiter for waiters in users.values() for waiter in waiters]:
+                    if waiter.future.get_loop() is loop:
+                        waiter.future.cancel()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Gets budgets, queue depths and wait times by provider.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The statistics by provider key.
+        """
+        stats = {}
+        with self._lock:
+            now = time.monotonic()
+            for provider, quota in self.quotas.items():
+                entry = dict(self.stats.get(provider, {'granted': 0, 'delayed': 0, 'wait_seconds': 0.0}))
+                for name, bucket in (('requests', quota.requests), ('tokens', quota.tokens)):
+                    if bucket is not None:
+                        bucket.refill(now)
+                        entry[f'{name}_per_minute'] = int(bucket.rate * 60)
+                        entry[f'{name}_available'] = round(bucket.level, 1)
+                entry['queued'] = {
+                    priority: sum(len(waiters) for waiters in users.values())
+                    for priority, users in self._queues.get(provider, {}).items()
+                }
+                stats[provider] = entry
+        return stats
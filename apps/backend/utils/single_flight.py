@@ -0,0 +1,144 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight call: the
+first caller (the leader) runs it and every caller that arrives while it is
+running (a follower) receives the leader's result instead of issuing its own
+upstream request.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+def make_request_key(operation: str, provider: str, content: Any, **params) -> str:
+    """
+    Builds a canonical key for a provider request.
+
+    Parameters set to None are dropped, so an explicit default and an omitted
+    argument map to the same key.
+
+    Args:
+        operation (str): The kind of request, e.g. 'generate' or 'embed'.
+        provider (str): The provider name.
+        content (Any): The JSON-serializable request content (messages or text).
+        **params: The generation parameters, including the model.
+
+    Returns:
+        str: A SHA-256 hex digest identifying the request.
+    """
+    normalized = {key: value for key, value in params.items() if value is not None}
+    canonical = json.dumps(
+        {
+            'operation': operation,
+            'provider': provider.lower(),
+            'params': normalized,
+            'content': hashlib.sha256(json.dumps(content, sort_keys=True, default=str).encode()).hexdigest()
+        },
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls, for both asyncio and thread callers.
+
+    Attributes:
+        stats (Dict[str, int]): Counters for leader calls and coalesced (saved) calls.
+    """
+
+    def __init__(self):
+        """Initializes the SingleFlight group."""
+        self._tasks: Dict[str, Tuple[asyncio.Task, Dict[str, int]]] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {'leaders': 0, 'coalesced': 0}
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Runs an async call once for all concurrent callers with the same key.
+
+        The call runs as a task so that one caller being cancelled does not
+        cancel it for the others; it is cancelled only when every caller
+        waiting on it has gone away.
+
+        Args:
+            key (str): The request key.
+            call (Callable[[], Awaitable[Any]]): Creates the awaitable to run if no call is in flight.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether this caller was coalesced onto another's call.
+        """
+        entry = self._tasks.get(key)
+        coalesced = entry is not None
+        if coalesced:
+            task, waiters = entry
+            self.stats['coalesced'] += 1
+        else:
+            task = asyncio.ensure_future(call())
+            waiters = {'count': 0}
+            self._tasks[key] = (task, waiters)
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+            self.stats['leaders'] += 1
+
+        waiters['count'] += 1
+        try:
+            return await asyncio.shield(task), coalesced
+        except asyncio.CancelledError:
+            if waiters['count'] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            waiters['count'] -= 1
+
+    def do_sync(self, key: str, call: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Runs a blocking call once for all concurrent threads with the same key.
+
+        Args:
+            key (str): The request key.
+            call (Callable[[], Any]): The blocking call to run if no call is in flight.
+
+        Returns:
+            Tuple[Any, bool]: The result and whether this caller was coalesced onto another's call.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._futures[key] = future
+                self.stats['leaders'] += 1
+            else:
+                self.stats['coalesced'] += 1
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = call()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Gets the coalescing counters.
+
+        Returns:
+            Dict[str, int]: Leader calls, coalesced (saved) calls and calls in flight.
+        """
+        return {
+            **self.stats,
+            'in_flight': len(self._tasks) + len(self._futures)
+        }
@@ -0,0 +1,35 @@
+import time
+
+from .ai_cache import CompletionCache
+
+
+def _result(content):
+    return {'success': True, 'provider': 'ollama', 'content': content, 'metadata': {'model': 'llama3'}}
+
+
+def test_completion_cache_round_trips_and_expires(tmp_path):
+    """Tests that entries are returned until their TTL passes."""
+    cache = CompletionCache(db_path=str(tmp_path / 'cache.db'), ttl_seconds=1)
+    cache.set('key', _result('cached answer'))
+
+    assert cache.get('key')['content'] == 'cached answer'
+
+    time.sleep(1.1)
+    assert cache.get('key') is None
+    stats = cache.get_stats()
+    assert stats['hits'] == 1
+    assert stats['expired'] == 1
+
+
+def test_completion_cache_evicts_least_recently_used(tmp_path):
+    """Tests that the size budget evicts the least recently used entries first."""
+    cache = CompletionCache(db_path=str(tmp_path / 'cache.db'), max_bytes=400)
+    cache.set('a', _result('a' * 100))
+    cache.set('b', _result('b' * 100))
+    cache.get('a')
+    cache.set('c', _result('c' * 100))
+
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.get('c') is not None
+    assert cache.get_stats()['evictions'] == 1
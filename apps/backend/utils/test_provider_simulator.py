@@ -0,0 +1,52 @@
+import httpx
+
+from ..mock_servers.ai_provider import create_app
+from .provider_simulator import ProviderSimulator
+from .unified_ai_client import OllamaStrategy, SimulatorStrategy
+
+
+def test_simulator_output_is_deterministic():
+    """Tests that completions and embeddings depend only on the input."""
+    simulator = ProviderSimulator(embedding_dim=64)
+    messages = [{'role': 'user', 'content': 'Hello'}]
+
+    first, again = simulator.embed('same text'), simulator.embed('same text')
+    other = simulator.embed('other text')
+
+    assert first == again and first != other
+    assert len(first) == 64
+    assert abs(sum(value * value for value in first) - 1) < 1e-9
+    assert simulator.completion_tokens(messages) == simulator.completion_tokens(messages)
+    assert len(simulator.completion_tokens(messages, max_tokens=5)) == 5
+
+
+async def test_simulator_strategy_reports_injected_errors_with_status():
+    """Tests that injected errors look like provider HTTP errors."""
+    strategy = SimulatorStrategy(ProviderSimulator(latency_ms=0, error_rate=1.0, error_statuses=[503]))
+
+    response = await strategy.agenerate_response([{'role': 'user', 'content': 'Hi'}])
+
+    assert response['success'] is False
+    assert response['status_code'] == 503
+
+
+async def test_mock_server_speaks_ollama_chat_format():
+    """Tests that the real Ollama strategy works against the simulator server."""
+    simulator = ProviderSimulator(latency_ms=0, tokens_per_second=0, seed=1)
+    strategy = OllamaStrategy(base_url='http://sim.test', model='simulator')
+    strategy._async_client = httpx.AsyncClient(
+        base_url='http://sim.test', transport=httpx.ASGITransport(app=create_app(simulator))
+    )
+    messages = [{'role': 'user', 'content': 'Summarize the report'}]
+
+    response = await strategy.agenerate_response(messages, max_tokens=8)
+    events = [event async for event in strategy.generate_stream(messages, max_tokens=8)]
+    embedding = await strategy.aembed('some text')
+    await strategy.aclose()
+
+    expected = ''.join(simulator.completion_tokens(messages, max_tokens=8))
+    assert response['content'] == expected
+    assert response['metadata']['usage']['completion_tokens'] == 8
+    assert ''.join(event['content'] for event in events if event['type'] == 'delta') == expected
+    assert events[-1]['usage']['completion_tokens'] == 8
+    assert embedding['embedding'] == simulator.embed('some text')
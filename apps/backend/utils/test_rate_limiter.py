@@ -0,0 +1,61 @@
+import asyncio
+
+from .rate_limiter import RateLimitScheduler
+
+
+async def test_scheduler_grants_interactive_first_then_round_robin_by_user():
+    """Tests that queued calls are granted by priority, then fairly across users."""
+    scheduler = RateLimitScheduler({'openai': {'requests_per_minute': 6000}}, interactive_reserve=0)
+    scheduler.quotas['openai'].requests.level = 0
+    granted = []
+
+    async def call(name, priority, user_id):
+        await scheduler.acquire('openai', 10, priority, user_id)
+        granted.append(name)
+
+    await asyncio.gather(
+        call('a1', 'background', 'alice'),
+        call('a2', 'background', 'alice'),
+        call('a3', 'background', 'alice'),
+        call('b1', 'background', 'bob'),
+        call('chat', 'interactive', 'carol'),
+    )
+
+    assert granted == ['chat', 'a1', 'b1', 'a2', 'a3']
+    stats = scheduler.get_stats()['openai']
+    assert stats['granted'] == 5
+    assert stats['queued'] == {'interactive': 0, 'background': 0}
+    await scheduler.aclose()
+
+
+async def test_scheduler_reserves_budget_for_interactive_calls():
+    """Tests that background calls cannot draw on the interactive reserve."""
+    scheduler = RateLimitScheduler({'openai': {'tokens_per_minute': 1000}}, interactive_reserve=0.5)
+    scheduler.quotas['openai'].tokens.level = 600
+
+    assert await scheduler.acquire('openai', 50, 'interactive') == 0
+    background = asyncio.create_task(scheduler.acquire('openai', 100, 'background'))
+    await asyncio.sleep(0.01)
+
+    assert not background.done()
+    background.cancel()
+    await asyncio.sleep(0)
+    assert scheduler.get_stats()['openai']['queued']['background'] == 0
+    assert await scheduler.acquire('openai', 500, 'interactive') == 0
+    await scheduler.aclose()
+    assert all(task.done() for task in scheduler._dispatchers.values())
+
+
+async def test_scheduler_close_cancels_queued_calls():
+    """Tests that closing the scheduler stops its dispatcher and cancels calls still waiting for budget."""
+    scheduler = RateLimitScheduler({'openai': {'requests_per_minute': 60}}, interactive_reserve=0)
+    scheduler.quotas['openai'].requests.level = 0
+    waiting = asyncio.create_task(scheduler.acquire('openai', 10))
+    await asyncio.sleep(0.01)
+    dispatcher = scheduler._dispatchers['openai']
+
+    await scheduler.aclose()
+    await asyncio.sleep(0)
+
+    assert dispatcher.cancelled() and waiting.cancelled()
+    assert scheduler.get_stats()['openai']['queued']['interactive'] == 0
@@ -1,6 +1,11 @@
+import asyncio
+import json
+
+import httpx
 import pytest
 from unittest.mock import patch, MagicMock
-from .unified_ai_client import GoogleStrategy
+from .ai_cache import CompletionCache
+from .unified_ai_client import GoogleStrategy, OllamaStrategy, UnifiedAIClient
 
 @patch('google.generativeai.configure')
 def test_google_strategy_initialization(mock_configure):
@@ -71,3 +76,223 @@ def test_google_strategy_embed_error(mock_configure, mock_embed_content):
 
     assert response['success'] is False
     assert response['error'] == 'Embedding Error'
+
+async def test_ollama_strategy_agenerate_response_uses_pooled_client():
+    """Tests the async Ollama path sends the full history to /api/chat and never streams."""
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append((request.url.path, json.loads(request.content)))
+        return httpx.Response(200, json={
+            'model': 'llama3', 'message': {'role': 'assistant', 'content': 'Hi there'},
+            'done': True, 'prompt_eval_count': 12, 'eval_count': 3
+        })
+
+    strategy = OllamaStrategy(base_url='http://ollama.test', model='llama3', keep_alive='1h')
+    strategy._async_client = httpx.AsyncClient(base_url='http://ollama.test', transport=httpx.MockTransport(handler))
+    messages = [
+        {'role': 'system', 'content': 'Be brief.'},
+        {'role': 'user', 'content': 'Hello'},
+        {'role': 'assistant', 'content': 'Hi!'},
+        {'role': 'user', 'content': 'How are you?'},
+    ]
+
+    response = await strategy.agenerate_response(messages, temperature=0.2, max_tokens=64, stream=True)
+    await strategy.aclose()
+
+    path, payload = requests_seen[0]
+    assert response['success'] is True
+    assert response['content'] == 'Hi there'
+    assert response['metadata']['usage']['total_tokens'] == 15
+    assert path == '/api/chat'
+    assert payload['messages'] == messages
+    assert payload['keep_alive'] == '1h'
+    assert payload['stream'] is False
+    assert payload['options'] == {'temperature': 0.2, 'num_predict': 64}
+
+async def test_ollama_strategy_reuses_generate_context_per_session():
+    """Tests that without the chat API, returned context tokens are sent back on the session's next turn."""
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(json.loads(request.content))
+        return httpx.Response(200, json={'model': 'llama3', 'response': 'ok', 'context': [1, 2, len(requests_seen)]})
+
+    strategy = OllamaStrategy(base_url='http://ollama.test', model='llama3', use_chat_api=False)
+    strategy._async_client = httpx.AsyncClient(base_url='http://ollama.test', transport=httpx.MockTransport(handler))
+
+    await strategy.agenerate_response([{'role': 'user', 'content': 'First'}], session_id='s1')
+    await strategy.agenerate_response([{'role': 'user', 'content': 'Second'}], session_id='s1')
+    await strategy.agenerate_response([{'role': 'user', 'content': 'Other'}], session_id='s2')
+    await strategy.aclose()
+
+    assert 'context' not in requests_seen[0]
+    assert requests_seen[1]['prompt'] == 'Second'
+    assert requests_seen[1]['context'] == [1, 2, 1]
+    assert 'context' not in requests_seen[2]
+
+async def test_ollama_strategy_aembed_reports_status_code():
+    """Tests that async embedding failures carry the HTTP status code."""
+    transport = httpx.MockTransport(lambda request: httpx.Response(429, json={'error': 'busy'}))
+    strategy = OllamaStrategy(base_url='http://ollama.test')
+    strategy._async_client = httpx.AsyncClient(base_url='http://ollama.test', transport=transport)
+
+    response = await strategy.aembed('some text')
+    await strategy.aclose()
+
+    assert response['success'] is False
+    assert response['status_code'] == 429
+    assert response['timeout'] is False
+
+async def test_ollama_strategy_generate_stream_yields_deltas_and_usage():
+    """Tests that Ollama NDJSON output becomes delta events and a final usage record."""
+    lines = [
+        {'model': 'llama3', 'message': {'role': 'assistant', 'content': 'Hel'}, 'done': False},
+        {'model': 'llama3', 'message': {'role': 'assistant', 'content': 'lo'}, 'done': False},
+        {'model': 'llama3', 'message': {'role': 'assistant', 'content': ''}, 'done': True, 'done_reason': 'stop',
+         'prompt_eval_count': 5, 'eval_count': 2},
+    ]
+    body = '\n'.join(json.dumps(line) for line in lines).encode()
+    requests_seen = []
+
+    def handler(request):
+        requests_seen.append(json.loads(request.content))
+        return httpx.Response(200, content=body)
+
+    strategy = OllamaStrategy(base_url='http://ollama.test', model='llama3')
+    strategy._async_client = httpx.AsyncClient(base_url='http://ollama.test', transport=httpx.MockTransport(handler))
+
+    events = [event async for event in strategy.generate_stream([{'role': 'user', 'content': 'Hi'}])]
+    await strategy.aclose()
+
+    assert requests_seen[0]['stream'] is True
+    assert [event['content'] for event in events if event['type'] == 'delta'] == ['Hel', 'lo']
+    assert events[-1]['type'] == 'done'
+    assert events[-1]['usage'] == {'prompt_tokens': 5, 'completion_tokens': 2, 'total_tokens': 7}
+
+async def test_ollama_strategy_generate_stream_reports_invalid_lines_as_an_error_event():
+    """Tests that a line that is not JSON ends the stream with an error event instead of raising."""
+    body = json.dumps({'model': 'llama3', 'message': {'content': 'Hel'}, 'done': False}) + '\n<html>Bad Gateway'
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=body.encode()))
+    strategy = OllamaStrategy(base_url='http://ollama.test', model='llama3')
+    strategy._async_client = httpx.AsyncClient(base_url='http://ollama.test', transport=transport)
+
+    events = [event async for event in strategy.generate_stream([{'role': 'user', 'content': 'Hi'}])]
+    await strategy.aclose()
+
+    assert [event['type'] for event in events] == ['delta', 'error']
+    assert events[-1]['error'].startswith('Invalid response from Ollama')
+
+async def test_unified_client_coalesces_identical_concurrent_requests():
+    """Tests that identical in-flight requests share one upstream call."""
+    calls = []
+
+    class SlowStrategy(OllamaStrategy):
+        async def aembed(self, text, model=None):
+            calls.append(text)
+            await asyncio.sleep(0.05)
+            return {'success': True, 'provider': 'ollama', 'embedding': [0.1], 'metadata': {'model': model}}
+
+    client = UnifiedAIClient()
+    client._strategies['ollama'] = SlowStrategy()
+
+    results = await asyncio.gather(
+        client.aembed('ollama', 'same chunk', model='nomic'),
+        client.aembed('ollama', 'same chunk', model='nomic'),
+        client.aembed('ollama', 'other chunk', model='nomic'),
+    )
+
+    assert sorted(calls) == ['other chunk', 'same chunk']
+    assert [result['metadata'].get('coalesced', False) for result in results] == [False, True, False]
+    stats = client.get_coalescing_stats()
+    assert stats['coalesced'] == 1
+    assert stats['in_flight'] == 0
+
+async def test_unified_client_caches_only_deterministic_completions(tmp_path):
+    """Tests that temperature-0 completions are cached per resolved model and other calls bypass the cache."""
+    calls = []
+
+    class CountingStrategy(OllamaStrategy):
+        async def agenerate_response(self, messages, **kwargs):
+            calls.append(kwargs)
+            return {'success': True, 'provider': 'ollama', 'content': 'label: positive', 'metadata': {}}
+
+    client = UnifiedAIClient()
+    client._strategies['ollama'] = CountingStrategy()
+    client._completion_cache = CompletionCache(db_path=str(tmp_path / 'cache.db'))
+    messages = [{'role': 'user', 'content': 'Classify: great product'}]
+
+    first = await client.agenerate_response('ollama', messages, temperature=0, cache=True)
+    second = await client.agenerate_response('ollama', messages, temperature=0, cache=True)
+    sampled = await client.agenerate_response('ollama', messages, temperature=0.7, cache=True)
+
+    assert first['metadata']['cache'] == 'MISS'
+    assert second['metadata']['cache'] == 'HIT'
+    assert 'cache' not in sampled['metadata']
+    assert len(calls) == 2
+    assert all('cache' not in kwargs for kwargs in calls)
+    assert client.get_cache_stats()['bypassed'] == 1
+
+    # The same call names the default model explicitly, then runs against a new default
+    default = client._strategies['ollama'].model
+    explicit = await client.agenerate_response('ollama', messages, temperature=0, cache=True, model=default)
+    client._strategies['ollama'].model = 'another-model'
+    switched = await client.agenerate_response('ollama', messages, temperature=0, cache=True)
+    assert explicit['metadata']['cache'] == 'HIT'
+    assert switched['metadata']['cache'] == 'MISS' and len(calls) == 3
+
+async def test_unified_client_circuit_breaker_fails_fast_and_recovers():
+    """Tests that repeated server errors open the circuit and a successful probe closes it."""
+    calls = []
+    healthy = {'value': False}
+
+    class FlakyStrategy(OllamaStrategy):
+        async def agenerate_response(self, messages, **kwargs):
+            calls.append(kwargs)
+            if healthy['value']:
+                return {'success': True, 'provider': 'ollama', 'content': 'ok', 'metadata': {}}
+            return {'success': False, 'provider': 'ollama', 'error': 'unavailable', 'status_code': 503}
+
+    client = UnifiedAIClient()
+    client._strategies['ollama'] = FlakyStrategy()
+    breaker = client.breakers.get('ollama', 'llama3')
+    breaker.failure_threshold = 2
+    breaker.recovery_timeout = 0.05
+    messages = [{'role': 'user', 'content': 'Hello'}]
+
+    for _ in range(2):
+        await client.agenerate_response('ollama', messages, model='llama3')
+    rejected = await client.agenerate_response('ollama', messages, model='llama3')
+
+    assert len(calls) == 2
+    assert rejected['circuit_open'] is True
+    assert not client.is_available('ollama', 'llama3')
+    assert client.is_available('ollama', 'other-model')
+
+    await asyncio.sleep(0.06)
+    healthy['value'] = True
+    probe = await client.agenerate_response('ollama', messages, model='llama3')
+
+    assert probe['success'] is True
+    assert client.get_provider_status()['circuit_breakers']['ollama:llama3']['state'] == 'closed'
+
+def test_client_defers_provider_sdk_imports():
+    """Tests that importing the module and creating the client do not import provider SDKs."""
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    apps_dir = Path(__file__).resolve().parents[2]
+    code = (
+        "import sys\n"
+        "from backend.utils.unified_ai_client import get_client\n"
+        "client = get_client()\n"
+        "assert client.has_provider('openai') and client.has_provider('google')\n"
+        "print(sorted(name for name in ('openai', 'google.generativeai') if name in sys.modules))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(apps_dir), OPENAI_API_KEY='sk-test', GOOGLE_API_KEY='test-key')
+    completed = subprocess.run([sys.executable, '-c', code], cwd=apps_dir, env=env, capture_output=True, text=True)
+
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip().splitlines()[-1] == '[]'
@@ -5,28 +5,166 @@ Unified AI Client for Multiple LLM Providers.
 This module provides a single client for interacting with various Large
 Language Model providers, such as OpenAI, Ollama, Anthropic, etc. It uses
 a Strategy design pattern to handle the differences between provider APIs.
+
+Provider SDKs (`openai`, `google.generativeai`) are imported only when their
+strategy is first used, so importing this module and creating the client stay
+cheap for deployments that only talk to Ollama.
 """
 
 import os
+import asyncio
 import requests
+import httpx
 import json
 import logging
-import openai
-import google.generativeai as genai
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, AsyncIterator, Callable, Tuple
 
 from ..config import settings
+from .single_flight import SingleFlight, make_request_key
+from .ai_cache import CompletionCache
+from .provider_health import CircuitBreaker, CircuitBreakerRegistry, get_router, is_provider_failure
+from .rate_limiter import INTERACTIVE, RateLimitScheduler, estimate_tokens
+from .provider_simulator import ProviderSimulator, SimulatedProviderError
 
 # --- Setup Logging ---
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+def _request_error_details(error: requests.exceptions.RequestException) -> Dict[str, Any]:
+    """
+    Extracts the HTTP status and timeout flag from a requests error.
+
+    Callers such as the embedding concurrency limiter use these fields to tell
+    overload (429/5xx, timeouts) apart from other failures.
+    """
+    response = getattr(error, 'response', None)
+    return {
+        'status_code': response.status_code if response is not None else None,
+        'timeout': isinstance(error, requests.exceptions.Timeout)
+    }
+
+
+def _httpx_error_details(error: httpx.HTTPError) -> Dict[str, Any]:
+    """
+    Extracts the HTTP status and timeout flag from an httpx error.
+    """
+    response = error.response if isinstance(error, httpx.HTTPStatusError) else None
+    return {
+        'status_code': response.status_code if response is not None else None,
+        'timeout': isinstance(error, httpx.TimeoutException)
+    }
+
+
+def _sdk_error_details(error: Exception) -> Dict[str, Any]:
+    """
+    Extracts the HTTP status and timeout flag from a provider SDK error.
+
+    SDKs raise their own timeout type (OpenAI's `APITimeoutError`) or wrap the
+    transport's, so the error and its cause are both checked. The SDK is matched
+    by class name because it is imported lazily.
+    """
+    timed_out = any(
+        isinstance(e, (TimeoutError, asyncio.TimeoutError, httpx.TimeoutException))
+        or type(e).__name__ == 'APITimeoutError'
+        for e in (error, error.__cause__) if e is not None
+    )
+    return {'status_code': getattr(error, 'status_code', None), 'timeout': timed_out}
+
+
+def _stream_done(provider: Optional[str], model: Optional[str], finish_reason: Optional[str],
+                 usage: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Builds the final event of a response stream."""
+    return {
+        'type': 'done',
+        'provider': provider,
+        'model': model,
+        'finish_reason': finish_reason,
+        'usage': usage or {}
+    }
+
+
+def _stream_error(error: str, details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Builds the error event of a response stream."""
+    event = {'type': 'error', 'error': error}
+    if details and details.get('status_code') is not None:
+        event['status_code'] = details['status_code']
+    return event
+
+
+def _mark_coalesced(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copies a shared result for a coalesced caller and flags it in the metadata."""
+    return {**result, 'metadata': {**result.get('metadata', {}), 'coalesced': True}}
+
+
+def _with_cache_status(result: Dict[str, Any], status: str) -> Dict[str, Any]:
+    """Copies a result and records whether it was served from the completion cache."""
+    return {**result, 'metadata': {**result.get('metadata', {}), 'cache': status}}
+
+
+def _estimate_request_tokens(messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> int:
+    """Estimates the tokens a completion will use: the prompt plus the requested completion length."""
+    prompt = sum(estimate_tokens(str(message.get('content', ''))) for message in messages)
+    return prompt + int(kwargs.get('max_tokens') or 256)
+
+
+def _circuit_open_result(provider: str, breaker: CircuitBreaker) -> Dict[str, Any]:
+    """Builds the fail-fast result returned while a provider's circuit is open."""
+    return {
+        'success': False,
+        'provider': provider,
+        'error': f"Circuit open for {breaker.name}; failing fast",
+        'circuit_open': True,
+        'retry_after': round(breaker.retry_after(), 2)
+    }
+
+
+def _record_outcome(breaker: CircuitBreaker, result: Dict[str, Any]):
+    """Feeds a strategy result into its circuit breaker."""
+    if is_provider_failure(result):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def _guarded_call(breaker: CircuitBreaker, call) -> Dict[str, Any]:
+    """Runs a blocking strategy call and records its outcome on the breaker."""
+    try:
+        result = call()
+    except Exception:
+        breaker.record_failure()
+        raise
+    _record_outcome(breaker, result)
+    return result
+
+
+async def _aguarded_call(breaker: CircuitBreaker, call) -> Dict[str, Any]:
+    """Awaits a strategy call and records its outcome on the breaker."""
+    try:
+        result = await call()
+    except asyncio.CancelledError:
+        breaker.record_cancelled()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    _record_outcome(breaker, result)
+    return result
+
+
 # --- Strategy Interface ---
 class AIProviderStrategy(ABC):
     """
     Abstract base class for AI provider strategies.
+
+    Strategies implement the blocking `generate_response`/`embed` pair and may
+    override `agenerate_response`/`aembed` with native asyncio versions. The
+    default async methods run the blocking ones in a worker thread so every
+    strategy can be awaited from the event loop.
     """
     @abstractmethod
     def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
@@ -56,119 +194,463 @@ class AIProviderStrategy(ABC):
         """
         pass
 
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """
+        Generates a response without blocking the event loop.
+
+        Args:
+            messages (List[Dict[str, str]]): A list of message objects, each with 'role' and 'content'.
+            **kwargs: Provider-specific arguments like model, temperature, etc.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the AI's response and other metadata.
+        """
+        return await asyncio.to_thread(self.generate_response, messages, **kwargs)
+
+    async def aembed(self, text: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generates an embedding without blocking the event loop.
+
+        Args:
+            text (str): The input text to embed.
+            model (Optional[str]): The specific model to use.
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the embedding and other metadata.
+        """
+        return await asyncio.to_thread(self.embed, text, model)
+
+    async def generate_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams a response as normalized events.
+
+        Yields ``{'type': 'delta', 'content': str}`` for each piece of text,
+        then a single ``{'type': 'done', ...}`` event carrying the model,
+        finish reason and usage, or ``{'type': 'error', 'error': str}`` on
+        failure. Closing the generator early cancels the upstream request.
+
+        The default implementation yields the full non-streaming response as
+        one delta.
+
+        Args:
+            messages (List[Dict[str, str]]): A list of message objects, each with 'role' and 'content'.
+            **kwargs: Provider-specific arguments like model, temperature, etc.
+
+        Yields:
+            Dict[str, Any]: The stream events.
+        """
+        result = await self.agenerate_response(messages, **kwargs)
+        if not result.get('success', True):
+            yield _stream_error(result.get('error', 'Unknown error'), result)
+            return
+        if result.get('content'):
+            yield {'type': 'delta', 'content': result['content']}
+        metadata = result.get('metadata', {})
+        yield _stream_done(
+            result.get('provider'), metadata.get('model'), metadata.get('finish_reason'), metadata.get('usage', {})
+        )
+
+    async def aclose(self):
+        """Closes any pooled async connections held by the strategy."""
+        pass
+
 # --- Concrete Strategies ---
 
 class OpenAIStrategy(AIProviderStrategy):
     """Strategy for interacting with OpenAI models."""
-    def __init__(self, api_key: str, base_url: Optional[str] = None, model: str = "gpt-4o-mini", temperature: float = 0.7, max_tokens: int = 2000):
-        self.client = openai.OpenAI(api_key=api_key, base_url=base_url)
+    def __init__(self, api_key: str, base_url: Optional[str] = None, model: str = "gpt-4o-mini", temperature: float = 0.7, max_tokens: int = 2000,
+                 max_connections: int = 100, timeout: float = 60.0):
+        self._client = None
+        self.api_key = api_key
+        self.base_url = base_url
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._async_client = None
         logger.info(f"OpenAIStrategy initialized for model {self.model}")
 
-    def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
-        """Generates a response using the OpenAI API."""
-        try:
-            response = self.client.chat.completions.create(
-                model=kwargs.get('model', self.model),
-                messages=messages,
-                max_tokens=kwargs.get('max_tokens', self.max_tokens),
-                temperature=kwargs.get('temperature', self.temperature)
+    @property
+    def client(self) -> "openai.OpenAI":
+        """The blocking OpenAI client, created (and the SDK imported) on first use."""
+        if self._client is None:
+            import openai
+            self._client = openai.OpenAI(api_key=self.api_key, base_url=self.base_url)
+        return self._client
+
+    @property
+    def async_client(self) -> "openai.AsyncOpenAI":
+        """The pooled async OpenAI client, created on first use."""
+        if self._async_client is None:
+            import openai
+            self._async_client = openai.AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=max(1, self.max_connections // 5),
+                        keepalive_expiry=30.0
+                    ),
+                    timeout=self.timeout
+                )
             )
-            return {
-                'success': True,
-                'provider': 'openai',
-                'content': response.choices[0].message.content,
-                'metadata': {
-                    'model': response.model,
-                    'usage': {
-                        'prompt_tokens': response.usage.prompt_tokens,
-                        'completion_tokens': response.usage.completion_tokens,
-                        'total_tokens': response.usage.total_tokens
-                    },
-                    'finish_reason': response.choices[0].finish_reason
+        return self._async_client
+
+    def _completion_params(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """Builds the chat completion request parameters."""
+        return {
+            'model': kwargs.get('model') or self.model,
+            'messages': messages,
+            'max_tokens': kwargs.get('max_tokens') or self.max_tokens,
+            'temperature': kwargs.get('temperature', self.temperature)
+        }
+
+    @staticmethod
+    def _completion_result(response) -> Dict[str, Any]:
+        """Normalizes a chat completion response."""
+        return {
+            'success': True,
+            'provider': 'openai',
+            'content': response.choices[0].message.content,
+            'metadata': {
+                'model': response.model,
+                'usage': {
+                    'prompt_tokens': response.usage.prompt_tokens,
+                    'completion_tokens': response.usage.completion_tokens,
+                    'total_tokens': response.usage.total_tokens
+                },
+                'finish_reason': response.choices[0].finish_reason
+            }
+        }
+
+    @staticmethod
+    def _embedding_result(response) -> Dict[str, Any]:
+        """Normalizes an embeddings response."""
+        return {
+            'success': True,
+            'provider': 'openai',
+            'embedding': response.data[0].embedding,
+            'metadata': {
+                'model': response.model,
+                'usage': {
+                    'prompt_tokens': response.usage.prompt_tokens,
+                    'total_tokens': response.usage.total_tokens
                 }
             }
+        }
+
+    def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """Generates a response using the OpenAI API."""
+        try:
+            response = self.client.chat.completions.create(**self._completion_params(messages, **kwargs))
+            return self._completion_result(response)
         except Exception as e:
             logger.error(f"❌ OpenAI API error: {str(e)}")
-            return {'success': False, 'error': str(e)}
+            return {'success': False, 'error': str(e), **_sdk_error_details(e)}
+
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """Generates a response using the async OpenAI API."""
+        try:
+            response = await self.async_client.chat.completions.create(**self._completion_params(messages, **kwargs))
+            return self._completion_result(response)
+        except Exception as e:
+            logger.error(f"❌ OpenAI API error: {str(e)}")
+            return {'success': False, 'error': str(e), **_sdk_error_details(e)}
+
+    async def generate_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Streams a response from the OpenAI API, ending with a usage record."""
+        stream = None
+        try:
+            stream = await self.async_client.chat.completions.create(
+                **self._completion_params(messages, **kwargs),
+                stream=True,
+                stream_options={'include_usage': True}
+            )
+            model, finish_reason, usage = None, None, {}
+            async for chunk in stream:
+                model = chunk.model or model
+                if chunk.usage:
+                    usage = {
+                        'prompt_tokens': chunk.usage.prompt_tokens,
+                        'completion_tokens': chunk.usage.completion_tokens,
+                        'total_tokens': chunk.usage.total_tokens
+                    }
+                if not chunk.choices:
+                    continue
+                choice = chunk.choices[0]
+                finish_reason = choice.finish_reason or finish_reason
+                if choice.delta and choice.delta.content:
+                    yield {'type': 'delta', 'content': choice.delta.content}
+            yield _stream_done('openai', model, finish_reason, usage)
+        except Exception as e:
+            logger.error(f"❌ OpenAI streaming error: {str(e)}")
+            yield _stream_error(str(e), _sdk_error_details(e))
+        finally:
+            if stream is not None:
+                await stream.close()
 
     def embed(self, text: str, model: Optional[str] = None) -> Dict[str, Any]:
         """Generates an embedding using the OpenAI API."""
         try:
-            model_to_use = model or "text-embedding-3-small"
             response = self.client.embeddings.create(
-                model=model_to_use,
+                model=model or "text-embedding-3-small",
                 input=text
             )
-            return {
-                'success': True,
-                'provider': 'openai',
-                'embedding': response.data[0].embedding,
-                'metadata': {
-                    'model': response.model,
-                    'usage': {
-                        'prompt_tokens': response.usage.prompt_tokens,
-                        'total_tokens': response.usage.total_tokens
-                    }
-                }
-            }
+            return self._embedding_result(response)
         except Exception as e:
             logger.error(f"❌ OpenAI embedding error: {str(e)}")
-            return {'success': False, 'error': str(e)}
+            return {'success': False, 'error': str(e), **_sdk_error_details(e)}
+
+    async def aembed(self, text: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """Generates an embedding using the async OpenAI API."""
+        try:
+            response = await self.async_client.embeddings.create(
+                model=model or "text-embedding-3-small",
+                input=text
+            )
+            return self._embedding_result(response)
+        except Exception as e:
+            logger.error(f"❌ OpenAI embedding error: {str(e)}")
+            return {'success': False, 'error': str(e), **_sdk_error_details(e)}
+
+    async def aclose(self):
+        """Closes the pooled async OpenAI client."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
 
 
 class OllamaStrategy(AIProviderStrategy):
-    """Strategy for interacting with Ollama models."""
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "deepseek-coder:6.7b-instruct", timeout: int = 30):
+    """
+    Strategy for interacting with Ollama models.
+
+    Conversations go to /api/chat with their full history (set `use_chat_api`
+    to False for servers without it). Every request carries `keep_alive` so
+    models stay loaded between turns.
+    """
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "deepseek-coder:6.7b-instruct", timeout: int = 30,
+                 max_connections: int = 8, keep_alive: str = "30m", use_chat_api: bool = True, max_sessions: int = 256):
         self.base_url = base_url.rstrip('/')
         self.model = model
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.keep_alive = keep_alive
+        self.use_chat_api = use_chat_api
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[Tuple[str, str], List[int]]" = OrderedDict()
         self.session = requests.Session()
         self.session.timeout = timeout
+        self._async_client: Optional[httpx.AsyncClient] = None
         logger.info(f"OllamaStrategy initialized for model {self.model} at {self.base_url}")
 
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        The pooled async HTTP client, created on first use.
+
+        A local Ollama server serves a handful of requests in parallel, so the
+        pool is small but its connections are kept alive for long idle gaps.
+        """
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=300.0
+                ),
+                timeout=self.timeout
+            )
+        return self._async_client
+
+    def _options(self, **kwargs) -> Dict[str, Any]:
+        """Builds the sampling options shared by the chat and generate endpoints."""
+        options = dict(kwargs.get('options') or {})
+        if kwargs.get('temperature') is not None:
+            options['temperature'] = kwargs['temperature']
+        if kwargs.get('max_tokens') is not None:
+            options['num_predict'] = kwargs['max_tokens']
+        return options
+
+    def _request(self, messages: List[Dict[str, str]], **kwargs) -> Tuple[str, Dict[str, Any]]:
+        """
+        Builds the endpoint and payload for a generation request.
+
+        With the chat API the full message history is sent to /api/chat; a
+        stable history prefix lets the server reuse its prompt cache while the
+        model stays loaded (`keep_alive`). Without it, /api/generate gets the
+        last message as the prompt, and the `context` tokens returned for a
+        `session_id` are sent back on the next turn instead of the history.
+        """
+        model = kwargs.get('model') or self.model
+        payload: Dict[str, Any] = {"model": model, "stream": False, "keep_alive": kwargs.get('keep_alive', self.keep_alive)}
+        options = self._options(**kwargs)
+        if options:
+            payload["options"] = options
+
+        if self.use_chat_api:
+            payload["messages"] = messages
+            return "/api/chat", payload
+
+        payload["prompt"] = messages[-1]['content']
+        system_prompt = next((msg['content'] for msg in messages if msg['role'] == 'system'), None)
+        if system_prompt:
+            payload["system"] = system_prompt
+        context = self._sessions.get((kwargs.get('session_id'), model)) if kwargs.get('session_id') else None
+        if context:
+            payload["context"] = context
+        return "/api/generate", payload
+
+    def _remember_context(self, session_id: Optional[str], model: str, result: Dict[str, Any]):
+        """Stores the `context` tokens of a /api/generate response for the session's next turn."""
+        if not session_id or not result.get('context'):
+            return
+        key = (session_id, model)
+        self._sessions[key] = result['context']
+        self._sessions.move_to_end(key)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    @staticmethod
+    def _chunk_content(chunk: Dict[str, Any]) -> str:
+        """Gets the generated text of a /api/chat or /api/generate response (or stream chunk)."""
+        if 'message' in chunk:
+            return (chunk.get('message') or {}).get('content', '')
+        return chunk.get('response', '')
+
+    @staticmethod
+    def _usage(result: Dict[str, Any]) -> Dict[str, int]:
+        """Converts Ollama's eval counts to the normalized usage record."""
+        prompt_tokens = result.get('prompt_eval_count') or 0
+        completion_tokens = result.get('eval_count') or 0
+        return {
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens': prompt_tokens + completion_tokens
+        }
+
+    def _generate_result(self, result: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Normalizes a /api/chat or /api/generate response."""
+        self._remember_context(kwargs.get('session_id'), result.get('model') or kwargs.get('model') or self.model, result)
+        return {
+            'success': True,
+            'provider': 'ollama',
+            'content': self._chunk_content(result),
+            'metadata': {
+                'model': result.get('model'),
+                'total_duration': result.get('total_duration'),
+                'load_duration': result.get('load_duration'),
+                'prompt_eval_count': result.get('prompt_eval_count'),
+                'eval_count': result.get('eval_count'),
+                'usage': self._usage(result),
+                'finish_reason': result.get('done_reason', 'stop')
+            }
+        }
+
     def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """
         Generates a response from an Ollama server.
-        It uses the last message as the main prompt and can handle a system prompt.
         """
         if not messages:
             return {'success': False, 'error': 'Message list cannot be empty.'}
 
-        prompt = messages[-1]['content']
-        system_prompt = next((msg['content'] for msg in messages if msg['role'] == 'system'), None)
-
         try:
-            payload = {
-                "model": kwargs.get('model', self.model),
-                "prompt": prompt,
-                "stream": False,
-                **kwargs
-            }
-            if system_prompt:
-                payload["system"] = system_prompt
-
-            logger.info(f"🤖 Sending prompt to Ollama model {payload['model']}...")
-            response = self.session.post(f"{self.base_url}/api/generate", json=payload)
+            endpoint, payload = self._request(messages, **kwargs)
+            logger.info(f"🤖 Sending {len(messages)} message(s) to Ollama model {payload['model']}...")
+            response = self.session.post(f"{self.base_url}{endpoint}", json=payload)
             response.raise_for_status()  # Raise an exception for bad status codes
 
             result = response.json()
             logger.info(f"✅ Received response from {payload['model']}.")
-            return {
-                'success': True,
-                'provider': 'ollama',
-                'content': result.get('response', ''),
-                'metadata': {
-                    'model': result.get('model'),
-                    'total_duration': result.get('total_duration'),
-                    'prompt_eval_count': result.get('prompt_eval_count'),
-                    'eval_count': result.get('eval_count'),
-                }
-            }
+            return self._generate_result(result, **kwargs)
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ An error occurred while communicating with Ollama: {str(e)}")
-            return {'success': False, 'error': str(e)}
+            return {'success': False, 'error': str(e), **_request_error_details(e)}
+
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """
+        Generates a response from an Ollama server over the pooled async client.
+        """
+        if not messages:
+            return {'success': False, 'error': 'Message list cannot be empty.'}
+
+        try:
+            endpoint, payload = self._request(messages, **kwargs)
+            logger.info(f"🤖 Sending {len(messages)} message(s) to Ollama model {payload['model']}...")
+            response = await self.async_client.post(endpoint, json=payload)
+            response.raise_for_status()
+
+            result = response.json()
+            logger.info(f"✅ Received response from {payload['model']}.")
+            return self._generate_result(result, **kwargs)
+        except httpx.HTTPError as e:
+            logger.error(f"❌ An error occurred while communicating with Ollama: {str(e)}")
+            return {'success': False, 'error': str(e), **_httpx_error_details(e)}
+
+    async def generate_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams a response from an Ollama server by reading its NDJSON output.
+        """
+        if not messages:
+            yield _stream_error('Message list cannot be empty.')
+            return
+
+        endpoint, payload = self._request(messages, **kwargs)
+        payload["stream"] = True
+        try:
+            async with self.async_client.stream("POST", endpoint, json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get('error'):
+                        yield _stream_error(chunk['error'])
+                        return
+                    content = self._chunk_content(chunk)
+                    if content:
+                        yield {'type': 'delta', 'content': content}
+                    if chunk.get('done'):
+                        self._remember_context(kwargs.get('session_id'), payload['model'], chunk)
+                        yield _stream_done('ollama', chunk.get('model'), chunk.get('done_reason', 'stop'), self._usage(chunk))
+                        return
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Ollama streaming error: {str(e)}")
+            yield _stream_error(str(e), _httpx_error_details(e))
+        except ValueError as e:
+            # A truncated or non-JSON line, e.g. from a proxy in front of Ollama
+            logger.error(f"❌ Invalid Ollama stream output: {str(e)}")
+            yield _stream_error(f"Invalid response from Ollama: {e}")
+
+    async def prewarm(self, models: List[str]) -> Dict[str, bool]:
+        """
+        Loads models into the Ollama server's memory so the first request does not pay the load time.
+
+        An empty /api/generate request loads a model without generating anything;
+        `keep_alive` then keeps it resident between calls.
+
+        Args:
+            models (List[str]): The models to load.
+
+        Returns:
+            Dict[str, bool]: Whether each model was loaded.
+        """
+        async def load(model: str) -> bool:
+            try:
+                response = await self.async_client.post(
+                    "/api/generate", json={"model": model, "keep_alive": self.keep_alive}
+                )
+                response.raise_for_status()
+                logger.info(f"🔥 Pre-warmed Ollama model {model} (keep_alive={self.keep_alive})")
+                return True
+            except httpx.HTTPError as e:
+                logger.warning(f"⚠️ Could not pre-warm Ollama model {model}: {e}")
+                return False
+
+        results = await asyncio.gather(*(load(model) for model in models))
+        return dict(zip(models, results))
 
     def embed(self, text: str, model: Optional[str] = None) -> Dict[str, Any]:
         """Generates an embedding using the Ollama API."""
@@ -179,7 +661,8 @@ class OllamaStrategy(AIProviderStrategy):
                 f"{self.base_url}/api/embeddings",
                 json={
                     "model": model_to_use,
-                    "prompt": text
+                    "prompt": text,
+                    "keep_alive": self.keep_alive
                 }
             )
             response.raise_for_status()
@@ -192,7 +675,37 @@ class OllamaStrategy(AIProviderStrategy):
             }
         except requests.exceptions.RequestException as e:
             logger.error(f"❌ Ollama embedding error: {str(e)}")
-            return {'success': False, 'error': str(e)}
+            return {'success': False, 'error': str(e), **_request_error_details(e)}
+
+    async def aembed(self, text: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """Generates an embedding using the Ollama API over the pooled async client."""
+        try:
+            model_to_use = model or self.model
+            response = await self.async_client.post(
+                "/api/embeddings",
+                json={
+                    "model": model_to_use,
+                    "prompt": text,
+                    "keep_alive": self.keep_alive
+                }
+            )
+            response.raise_for_status()
+            result = response.json()
+            return {
+                'success': True,
+                'provider': 'ollama',
+                'embedding': result.get('embedding'),
+                'metadata': {'model': model_to_use}
+            }
+        except httpx.HTTPError as e:
+            logger.error(f"❌ Ollama embedding error: {str(e)}")
+            return {'success': False, 'error': str(e), **_httpx_error_details(e)}
+
+    async def aclose(self):
+        """Closes the pooled async HTTP client."""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
 
 
 # Placeholder for other strategies
@@ -207,6 +720,8 @@ class GoogleStrategy(AIProviderStrategy):
     """Strategy for interacting with Google's Generative AI models."""
     def __init__(self, api_key: str, model: str = "gemini-1.5-flash"):
         try:
+            import google.generativeai as genai
+            self.genai = genai
             genai.configure(api_key=api_key)
             self.model = genai.GenerativeModel(model)
             self.model_name = model
@@ -215,49 +730,109 @@ class GoogleStrategy(AIProviderStrategy):
             logger.error(f"❌ Failed to initialize GoogleStrategy: {str(e)}")
             raise
 
+    def _prepare_request(self, messages: List[Dict[str, str]], **kwargs):
+        """Builds the model, contents and generation config for a request."""
+        model_name = kwargs.get('model') or self.model_name
+        model = self.genai.GenerativeModel(model_name) if model_name != self.model_name else self.model
+
+        # Convert messages to the format expected by the Google API
+        # The role for the model's response should be 'model'.
+        formatted_messages = [
+            {
+                "role": "user" if msg["role"] == "user" else "model",
+                "parts": [{"text": msg["content"]}]
+            } for msg in messages
+        ]
+
+        generation_config = self.genai.types.GenerationConfig(
+            # Only one candidate is needed
+            candidate_count=1,
+            temperature=kwargs.get('temperature', 0.7)
+        )
+        return model_name, model, formatted_messages, generation_config
+
+    @staticmethod
+    def _generate_result(response, model_name: str) -> Dict[str, Any]:
+        """Normalizes a generate_content response."""
+        return {
+            'success': True,
+            'provider': 'google',
+            'content': response.text,
+            'metadata': {
+                'model': model_name,
+                'prompt_feedback': str(response.prompt_feedback) if hasattr(response, 'prompt_feedback') else 'N/A'
+            }
+        }
+
     def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """Generates a response using the Google Generative AI API."""
         try:
-            model_name = kwargs.get('model', self.model_name)
-            model = genai.GenerativeModel(model_name) if model_name != self.model_name else self.model
-
-            # Convert messages to the format expected by the Google API
-            # The role for the model's response should be 'model'.
-            formatted_messages = [
-                {
-                    "role": "user" if msg["role"] == "user" else "model",
-                    "parts": [{"text": msg["content"]}]
-                } for msg in messages
-            ]
-
-            response = model.generate_content(
-                formatted_messages,
-                generation_config=genai.types.GenerationConfig(
-                    # Only one candidate is needed
-                    candidate_count=1,
-                    temperature=kwargs.get('temperature', 0.7)
-                )
+            model_name, model, formatted_messages, generation_config = self._prepare_request(messages, **kwargs)
+            response = model.generate_content(formatted_messages, generation_config=generation_config)
+            return self._generate_result(response, model_name)
+        except Exception as e:
+            logger.error(f"❌ Google AI API error: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """Generates a response using the async Google Generative AI API."""
+        try:
+            model_name, model, formatted_messages, generation_config = self._prepare_request(messages, **kwargs)
+            response = await model.generate_content_async(formatted_messages, generation_config=generation_config)
+            return self._generate_result(response, model_name)
+        except Exception as e:
+            logger.error(f"❌ Google AI API error: {str(e)}")
+            return {'success': False, 'error': str(e)}
+
+
+    async def generate_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Streams a response from the Google Generative AI API."""
+        try:
+            model_name, model, formatted_messages, generation_config = self._prepare_request(messages, **kwargs)
+            response = await model.generate_content_async(
+                formatted_messages, generation_config=generation_config, stream=True
             )
+            async for chunk in response:
+                if chunk.text:
+                    yield {'type': 'delta', 'content': chunk.text}
 
+            usage = {}
+            usage_metadata = getattr(response, 'usage_metadata', None)
+            if usage_metadata:
+                usage = {
+                    'prompt_tokens': usage_metadata.prompt_token_count,
+                    'completion_tokens': usage_metadata.candidates_token_count,
+                    'total_tokens': usage_metadata.total_token_count
+                }
+            yield _stream_done('google', model_name, 'stop', usage)
+        except Exception as e:
+            logger.error(f"❌ Google AI streaming error: {str(e)}")
+            yield _stream_error(str(e))
+
+    def embed(self, text: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """Generates an embedding using the Google Generative AI API."""
+        try:
+            model_to_use = model or "models/embedding-001"
+            result = self.genai.embed_content(
+                model=model_to_use,
+                content=text,
+                task_type="retrieval_document"
+            )
             return {
                 'success': True,
                 'provider': 'google',
-                'content': response.text,
-                'metadata': {
-                    'model': model_name,
-                    'prompt_feedback': str(response.prompt_feedback) if hasattr(response, 'prompt_feedback') else 'N/A'
-                }
+                'embedding': result['embedding'],
+                'metadata': {'model': model_to_use}
             }
         except Exception as e:
-            logger.error(f"❌ Google AI API error: {str(e)}")
+            logger.error(f"❌ Google embedding error: {str(e)}")
             return {'success': False, 'error': str(e)}
 
-
-    def embed(self, text: str, model: Optional[str] = None) -> Dict[str, Any]:
-        """Generates an embedding using the Google Generative AI API."""
+    async def aembed(self, text: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """Generates an embedding using the async Google Generative AI API."""
         try:
             model_to_use = model or "models/embedding-001"
-            result = genai.embed_content(
+            result = await self.genai.embed_content_async(
                 model=model_to_use,
                 content=text,
                 task_type="retrieval_document"
@@ -293,52 +868,223 @@ class MistralStrategy(AIProviderStrategy):
         return {'success': False, 'error': 'Not implemented'}
 
 
+class SimulatorStrategy(AIProviderStrategy):
+    """
+    Strategy backed by the in-process provider simulator, for load and latency tests without a model.
+
+    Injected errors are reported like HTTP errors from a real provider, with
+    their `status_code`, so breakers, rate limiting and routing react to them.
+    """
+    def __init__(self, simulator: ProviderSimulator, model: str = "simulator"):
+        self.simulator = simulator
+        self.model = model
+        logger.info(f"SimulatorStrategy initialized ({simulator.distribution} latency ~{simulator.latency_ms}ms)")
+
+    def _error(self, error: SimulatedProviderError) -> Dict[str, Any]:
+        """Builds the failure result of an injected error."""
+        return {'success': False, 'provider': 'simulator', 'error': str(error), 'status_code': error.status_code, 'timeout': False}
+
+    def _result(self, completion: Dict[str, Any], **kwargs) -> Dict[str, Any]:
+        """Normalizes a simulated completion."""
+        return {
+            'success': True,
+            'provider': 'simulator',
+            'content': completion['content'],
+            'metadata': {'model': kwargs.get('model') or self.model, 'usage': completion['usage'], 'finish_reason': 'stop'}
+        }
+
+    def generate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """Generates a simulated response, blocking for the simulated generation time."""
+        try:
+            return self._result(self.simulator.complete(messages, kwargs.get('max_tokens')), **kwargs)
+        except SimulatedProviderError as e:
+            return self._error(e)
+
+    async def agenerate_response(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """Generates a simulated response without blocking the event loop."""
+        try:
+            return self._result(await self.simulator.acomplete(messages, kwargs.get('max_tokens')), **kwargs)
+        except SimulatedProviderError as e:
+            return self._error(e)
+
+    async def generate_stream(self, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Streams a simulated response at the simulator's tokens-per-second rate."""
+        try:
+            async for event in self.simulator.stream(messages, kwargs.get('max_tokens')):
+                if event['type'] == 'done':
+                    yield _stream_done('simulator', kwargs.get('model') or self.model, 'stop', event['usage'])
+                else:
+                    yield event
+        except SimulatedProviderError as e:
+            yield _stream_error(str(e), {'status_code': e.status_code})
+
+    def embed(self, text: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """Generates a deterministic hash-based embedding after the simulated latency."""
+        try:
+            self.simulator.check_failure()
+        except SimulatedProviderError as e:
+            return self._error(e)
+        time.sleep(self.simulator.sample_latency())
+        return {'success': True, 'provider': 'simulator', 'embedding': self.simulator.embed(text),
+                'metadata': {'model': model or self.model}}
+
+    async def aembed(self, text: str, model: Optional[str] = None) -> Dict[str, Any]:
+        """Generates a deterministic hash-based embedding without blocking the event loop."""
+        try:
+            embedding = await self.simulator.aembed(text)
+        except SimulatedProviderError as e:
+            return self._error(e)
+        return {'success': True, 'provider': 'simulator', 'embedding': embedding, 'metadata': {'model': model or self.model}}
+
+
 class UnifiedAIClient:
     """
     A unified client for interacting with multiple AI providers.
     It loads its configuration and initializes the appropriate strategies.
+
+    Identical concurrent generate/embed calls (same provider, model, params and
+    content) are coalesced into one upstream call unless `ai_coalesce_requests`
+    is disabled; coalesced results are flagged with `metadata['coalesced']`.
+
+    Temperature-0 completions can be served from an on-disk cache, either for
+    every call (`ai_cache_enabled`) or per call with `cache=True`; cached
+    calls report `metadata['cache']` as 'HIT' or 'MISS'.
+
+    Every provider/model has a circuit breaker. While it is open, calls return
+    immediately with `circuit_open: True` instead of waiting on a dead endpoint.
+
+    Calls to rate-limited providers wait for request and token budget before
+    they are sent. The `priority` ('interactive' or 'background') and `user_id`
+    options decide the order in which waiting calls are let through.
+
+    Strategies are registered as factories and built on first use, so a
+    provider's SDK is never imported unless that provider is called.
     """
     def __init__(self):
         """
         Initializes the client by loading configuration and setting up strategies.
         """
         self._strategies: Dict[str, AIProviderStrategy] = {}
+        self._factories: Dict[str, Callable[[], AIProviderStrategy]] = {}
+        self._strategy_lock = threading.Lock()
         self.config = settings
+        self.coalesce_requests = self.config.ai_coalesce_requests
+        self._single_flight = SingleFlight()
+        self._completion_cache: Optional[CompletionCache] = None
+        self._cache_bypasses = 0
+        self.breakers = CircuitBreakerRegistry(
+            failure_threshold=self.config.ai_breaker_failure_threshold,
+            recovery_timeout=self.config.ai_breaker_recovery_seconds,
+            half_open_max_calls=self.config.ai_breaker_half_open_probes
+        )
+        self.rate_limiter = RateLimitScheduler(
+            limits={
+                'openai': {
+                    'requests_per_minute': self.config.openai_requests_per_minute,
+                    'tokens_per_minute': self.config.openai_tokens_per_minute
+                },
+                'google': {
+                    'requests_per_minute': self.config.google_requests_per_minute,
+                    'tokens_per_minute': self.config.google_tokens_per_minute
+                }
+            },
+            interactive_reserve=self.config.ai_interactive_reserve
+        )
         self._init_strategies()
 
     def _init_strategies(self):
-        """Initializes all available strategies based on the loaded configuration."""
+        """Registers a factory for every available strategy based on the loaded configuration."""
         # OpenAI
         if self.config.openai_api_key:
-            self._strategies['openai'] = OpenAIStrategy(
+            self.register_provider('openai', lambda: OpenAIStrategy(
                 api_key=self.config.openai_api_key,
-                base_url=self.config.openai_base_url
-            )
+                base_url=self.config.openai_base_url,
+                max_connections=self.config.openai_max_connections,
+                timeout=self.config.ai_request_timeout
+            ))
         # Ollama
-        self._strategies['ollama'] = OllamaStrategy(base_url=self.config.ollama_base_url)
+        self.register_provider('ollama', lambda: OllamaStrategy(
+            base_url=self.config.ollama_base_url,
+            timeout=self.config.ai_request_timeout,
+            max_connections=self.config.ollama_max_connections,
+            keep_alive=self.config.ollama_keep_alive,
+            use_chat_api=self.config.ollama_use_chat_api
+        ))
 
         # Google
         if self.config.google_api_key:
-            self._strategies['google'] = GoogleStrategy(api_key=self.config.google_api_key)
+            self.register_provider('google', lambda: GoogleStrategy(api_key=self.config.google_api_key))
 
         # Add other strategies here as they are implemented
-        self._strategies['openrouter'] = OpenRouterStrategy()
-        self._strategies['anthropic'] = AnthropicStrategy()
-        self._strategies['deepseek'] = DeepSeekStrategy()
-        self._strategies['mistral'] = MistralStrategy()
+        self.register_provider('openrouter', OpenRouterStrategy)
+        self.register_provider('anthropic', AnthropicStrategy)
+        self.register_provider('deepseek', DeepSeekStrategy)
+        self.register_provider('mistral', MistralStrategy)
+
+        # Offline simulator for load and latency testing
+        if self.config.ai_simulator_enabled:
+            self.register_provider('simulator', lambda: SimulatorStrategy(ProviderSimulator(
+                latency_ms=self.config.ai_simulator_latency_ms,
+                jitter_ms=self.config.ai_simulator_jitter_ms,
+                distribution=self.config.ai_simulator_distribution,
+                tokens_per_second=self.config.ai_simulator_tokens_per_second,
+                error_rate=self.config.ai_simulator_error_rate,
+                embedding_dim=self.config.ai_simulator_embedding_dim,
+                seed=self.config.ai_simulator_seed
+            )))
+
+    def register_provider(self, name: str, factory: Callable[[], AIProviderStrategy]):
+        """
+        Registers a strategy factory, called the first time the provider is used.
+
+        Args:
+            name (str): The provider name.
+            factory (Callable[[], AIProviderStrategy]): Builds the strategy.
+        """
+        with self._strategy_lock:
+            self._factories[name.lower()] = factory
+            self._strategies.pop(name.lower(), None)
+
+    def has_provider(self, provider_name: str) -> bool:
+        """
+        Checks whether a provider is configured, without building its strategy.
+
+        Args:
+            provider_name (str): The name of the provider.
+
+        Returns:
+            bool: True if the provider is configured.
+        """
+        name = provider_name.lower()
+        return name in self._strategies or name in self._factories
 
 
     def get_provider(self, provider_name: str) -> Optional[AIProviderStrategy]:
         """
         Gets the strategy for a given provider.
 
+        The strategy is built on first use; a provider whose strategy fails to
+        build is dropped and treated as not configured.
+
         Args:
             provider_name (str): The name of the provider.
 
         Returns:
             Optional[AIProviderStrategy]: The provider strategy, or None if not found.
         """
-        return self._strategies.get(provider_name.lower())
+        name = provider_name.lower()
+        strategy = self._strategies.get(name)
+        if strategy is not None or name not in self._factories:
+            return strategy
+        with self._strategy_lock:
+            if name not in self._strategies and name in self._factories:
+                try:
+                    self._strategies[name] = self._factories[name]()
+                except Exception as e:
+                    logger.error(f"❌ Failed to initialize provider '{name}': {e}")
+                    del self._factories[name]
+                    return None
+            return self._strategies.get(name)
 
     def generate_response(self, provider: str, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """
@@ -359,9 +1105,39 @@ class UnifiedAIClient:
         if not strategy:
             raise ValueError(f"Provider '{provider}' is not supported or configured.")
 
-        return strategy.generate_response(messages, **kwargs)
+        priority = kwargs.pop('priority', INTERACTIVE)
+        kwargs.pop('user_id', None)
+        cache_key = self._completion_cache_key(provider, messages, kwargs)
+        if cache_key:
+            cached = self.completion_cache.get(cache_key)
+            if cached:
+                return _with_cache_status(cached, 'HIT')
+
+        breaker = self.breakers.get(provider, kwargs.get('model'))
+        tokens = _estimate_request_tokens(messages, kwargs)
 
-    def embed(self, provider: str, text: str, model: Optional[str] = None) -> Dict[str, Any]:
+        def call():
+            if not breaker.is_available():
+                return _circuit_open_result(provider, breaker)
+            self.rate_limiter.acquire_sync(provider, tokens, priority)
+            if not breaker.allow_request():
+                return _circuit_open_result(provider, breaker)
+            result = _guarded_call(breaker, lambda: strategy.generate_response(messages, **kwargs))
+            self._settle_rate_limit(provider, tokens, result)
+            if cache_key and result.get('success'):
+                self.completion_cache.set(cache_key, result)
+            return result
+
+        if self.coalesce_requests:
+            key = make_request_key('generate', provider, messages, **kwargs)
+            result, coalesced = self._single_flight.do_sync(key, call)
+            result = _mark_coalesced(result) if coalesced else result
+        else:
+            result = call()
+        return _with_cache_status(result, 'MISS') if cache_key else result
+
+    def embed(self, provider: str, text: str, model: Optional[str] = None,
+              priority: str = INTERACTIVE) -> Dict[str, Any]:
         """
         Generates an embedding using a specified provider.
 
@@ -369,6 +1145,98 @@ class UnifiedAIClient:
             provider (str): The name of the provider to use.
             text (str): The text to embed.
             model (Optional[str]): The specific model to use.
+            priority (str): 'interactive' or 'background', for rate-limit scheduling.
+
+        Returns:
+            Dict[str, Any]: The embedding response from the provider.
+
+        Raises:
+            ValueError: If the specified provider is not supported or configured.
+        """
+        strategy = self.get_provider(provider)
+        if not strategy:
+            raise ValueError(f"Provider '{provider}' is not supported or configured.")
+
+        breaker = self.breakers.get(provider, model)
+
+        def call():
+            if not breaker.is_available():
+                return _circuit_open_result(provider, breaker)
+            self.rate_limiter.acquire_sync(provider, estimate_tokens(text), priority)
+            if not breaker.allow_request():
+                return _circuit_open_result(provider, breaker)
+            result = _guarded_call(breaker, lambda: strategy.embed(text, model))
+            self._settle_rate_limit(provider, 0, result)
+            return result
+
+        if not self.coalesce_requests:
+            return call()
+        key = make_request_key('embed', provider, text, model=model)
+        result, coalesced = self._single_flight.do_sync(key, call)
+        return _mark_coalesced(result) if coalesced else result
+
+    async def agenerate_response(self, provider: str, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
+        """
+        Generates a response using a specified provider without blocking the event loop.
+
+        Args:
+            provider (str): The name of the provider to use (e.g., 'openai', 'ollama').
+            messages (List[Dict[str, str]]): The list of messages for the conversation.
+            **kwargs: Additional provider-specific arguments, plus the client-level `cache`,
+                `priority` and `user_id` options.
+
+        Returns:
+            Dict[str, Any]: The response from the provider.
+
+        Raises:
+            ValueError: If the specified provider is not supported or configured.
+        """
+        strategy = self.get_provider(provider)
+        if not strategy:
+            raise ValueError(f"Provider '{provider}' is not supported or configured.")
+
+        priority = kwargs.pop('priority', INTERACTIVE)
+        user_id = kwargs.pop('user_id', None)
+        cache_key = self._completion_cache_key(provider, messages, kwargs)
+        if cache_key:
+            cached = await asyncio.to_thread(self.completion_cache.get, cache_key)
+            if cached:
+                return _with_cache_status(cached, 'HIT')
+
+        breaker = self.breakers.get(provider, kwargs.get('model'))
+        tokens = _estimate_request_tokens(messages, kwargs)
+
+        async def call():
+            if not breaker.is_available():
+                return _circuit_open_result(provider, breaker)
+            await self.rate_limiter.acquire(provider, tokens, priority, user_id)
+            if not breaker.allow_request():
+                return _circuit_open_result(provider, breaker)
+            result = await _aguarded_call(breaker, lambda: strategy.agenerate_response(messages, **kwargs))
+            self._settle_rate_limit(provider, tokens, result)
+            if cache_key and result.get('success'):
+                await asyncio.to_thread(self.completion_cache.set, cache_key, result)
+            return result
+
+        if self.coalesce_requests:
+            key = make_request_key('generate', provider, messages, **kwargs)
+            result, coalesced = await self._single_flight.do(key, call)
+            result = _mark_coalesced(result) if coalesced else result
+        else:
+            result = await call()
+        return _with_cache_status(result, 'MISS') if cache_key else result
+
+    async def aembed(self, provider: str, text: str, model: Optional[str] = None,
+                     priority: str = INTERACTIVE, user_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Generates an embedding using a specified provider without blocking the event loop.
+
+        Args:
+            provider (str): The name of the provider to use.
+            text (str): The text to embed.
+            model (Optional[str]): The specific model to use.
+            priority (str): 'interactive' or 'background', for rate-limit scheduling.
+            user_id (Optional[str]): The user to queue the call under, for fair scheduling.
 
         Returns:
             Dict[str, Any]: The embedding response from the provider.
@@ -380,7 +1248,223 @@ class UnifiedAIClient:
         if not strategy:
             raise ValueError(f"Provider '{provider}' is not supported or configured.")
 
-        return strategy.embed(text, model)
+        breaker = self.breakers.get(provider, model)
+
+        async def call():
+            if not breaker.is_available():
+                return _circuit_open_result(provider, breaker)
+            await self.rate_limiter.acquire(provider, estimate_tokens(text), priority, user_id)
+            if not breaker.allow_request():
+                return _circuit_open_result(provider, breaker)
+            result = await _aguarded_call(breaker, lambda: strategy.aembed(text, model))
+            self._settle_rate_limit(provider, 0, result)
+            return result
+
+        if not self.coalesce_requests:
+            return await call()
+        key = make_request_key('embed', provider, text, model=model)
+        result, coalesced = await self._single_flight.do(key, call)
+        return _mark_coalesced(result) if coalesced else result
+
+    @property
+    def completion_cache(self) -> CompletionCache:
+        """The on-disk completion cache, opened on first use."""
+        if self._completion_cache is None:
+            self._completion_cache = CompletionCache(
+                db_path=self.config.ai_cache_path,
+                ttl_seconds=self.config.ai_cache_ttl_seconds,
+                max_bytes=self.config.ai_cache_max_mb * 1024 * 1024
+            )
+        return self._completion_cache
+
+    def _completion_cache_key(self, provider: str, messages: List[Dict[str, str]], kwargs: Dict[str, Any]) -> Optional[str]:
+        """
+        Decides whether a completion may be cached and returns its cache key.
+
+        Pops the client-level `cache` and `force_cache` options from kwargs.
+        `cache` (default: the `ai_cache_enabled` setting) opts a call in or out;
+        only temperature-0 calls are cached unless `force_cache` is set. Calls
+        without a `model` are keyed by the provider's current default model, so
+        changing the default does not serve answers from the previous one.
+
+        Args:
+            provider (str): The provider name.
+            messages (List[Dict[str, str]]): The conversation messages.
+            kwargs (Dict[str, Any]): The call's keyword arguments (modified in place).
+
+        Returns:
+            Optional[str]: The cache key, or None if the call bypasses the cache.
+        """
+        use_cache = kwargs.pop('cache', None)
+        force_cache = kwargs.pop('force_cache', False)
+        if use_cache is None:
+            use_cache = self.config.ai_cache_enabled
+        if not use_cache:
+            return None
+        if not force_cache and kwargs.get('temperature') != 0:
+            self._cache_bypasses += 1
+            return None
+        model = kwargs.get('model') or self._default_model(provider)
+        return make_request_key('generate', provider, messages, **{**kwargs, 'model': model})
+
+    def _default_model(self, provider: str) -> Optional[str]:
+        """
+        Gets the model a provider uses when a call names none.
+
+        Args:
+            provider (str): The provider name.
+
+        Returns:
+            Optional[str]: The default model name, or None if the provider has none.
+        """
+        strategy = self.get_provider(provider)
+        model = getattr(strategy, 'model_name', None) or getattr(strategy, 'model', None)
+        return model if isinstance(model, str) else None
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Gets completion cache statistics.
+
+        Returns:
+            Dict[str, Any]: Hits, misses, size and eviction counters, plus calls that bypassed
+                the cache because of a non-zero temperature.
+        """
+        if self._completion_cache is None:
+            return {'enabled': self.config.ai_cache_enabled, 'bypassed': self._cache_bypasses}
+        return {'enabled': self.config.ai_cache_enabled, 'bypassed': self._cache_bypasses,
+                **self._completion_cache.get_stats()}
+
+    def is_available(self, provider: str, model: Optional[str] = None) -> bool:
+        """
+        Checks whether a provider/model is configured and its circuit is not open.
+
+        Callers use this to fail over before issuing a request.
+
+        Args:
+            provider (str): The provider name.
+            model (Optional[str]): The model name, or None for the provider default.
+
+        Returns:
+            bool: True if a call would be attempted.
+        """
+        return self.has_provider(provider) and self.breakers.get(provider, model).is_available()
+
+    def get_provider_status(self) -> Dict[str, Any]:
+        """
+        Gets the health of every provider: circuit breakers, routing and rate limits.
+
+        Returns:
+            Dict[str, Any]: The configured providers, breaker status by provider/model,
+                latency statistics and rate-limit budgets by provider.
+        """
+        return {
+            'providers': sorted(set(self._strategies) | set(self._factories)),
+            'circuit_breakers': self.breakers.get_status(),
+            'routing': get_router().get_stats(),
+            'rate_limits': self.rate_limiter.get_stats()
+        }
+
+    def _settle_rate_limit(self, provider: str, estimated: int, result: Dict[str, Any]):
+        """
+        Corrects a provider's token budget with the real usage, or pauses it after a 429.
+
+        Args:
+            provider (str): The provider name.
+            estimated (int): The tokens charged before the call; 0 skips the correction.
+            result (Dict[str, Any]): The strategy result.
+        """
+        if result.get('status_code') == 429:
+            self.rate_limiter.pause(provider, float(result.get('retry_after') or 1.0))
+        elif estimated and result.get('success'):
+            usage = result.get('metadata', {}).get('usage') or {}
+            self.rate_limiter.adjust(provider, estimated, usage.get('total_tokens'))
+
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Gets client-side rate limiting statistics.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Budgets, queue depths by priority and wait times by provider.
+        """
+        return self.rate_limiter.get_stats()
+
+    def get_coalescing_stats(self) -> Dict[str, int]:
+        """
+        Gets request coalescing counters.
+
+        Returns:
+            Dict[str, int]: Leader calls, coalesced calls (upstream calls saved) and calls in flight.
+        """
+        return self._single_flight.get_stats()
+
+    async def generate_stream(self, provider: str, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams a response from a specified provider as normalized events.
+
+        See `AIProviderStrategy.generate_stream` for the event format.
+
+        Args:
+            provider (str): The name of the provider to use (e.g., 'openai', 'ollama').
+            messages (List[Dict[str, str]]): The list of messages for the conversation.
+            **kwargs: Additional provider-specific arguments.
+
+        Yields:
+            Dict[str, Any]: The stream events.
+
+        Raises:
+            ValueError: If the specified provider is not supported or configured.
+        """
+        strategy = self.get_provider(provider)
+        if not strategy:
+            raise ValueError(f"Provider '{provider}' is not supported or configured.")
+
+        priority = kwargs.pop('priority', INTERACTIVE)
+        user_id = kwargs.pop('user_id', None)
+        breaker = self.breakers.get(provider, kwargs.get('model'))
+        if breaker.is_available():
+            await self.rate_limiter.acquire(provider, _estimate_request_tokens(messages, kwargs), priority, user_id)
+        if not breaker.allow_request():
+            yield _stream_error(_circuit_open_result(provider, breaker)['error'])
+            return
+
+        stream = strategy.generate_stream(messages, **kwargs)
+        outcome = None
+        try:
+            async for event in stream:
+                if event['type'] == 'delta':
+                    outcome = 'success'
+                elif event['type'] == 'done':
+                    outcome = 'success'
+                elif event['type'] == 'error':
+                    outcome = 'failure' if is_provider_failure({'success': False, **event}) else 'success'
+                yield event
+        finally:
+            await stream.aclose()
+            if outcome == 'success':
+                breaker.record_success()
+            elif outcome == 'failure':
+                breaker.record_failure()
+            else:
+                breaker.record_cancelled()
+
+    async def prewarm(self) -> Dict[str, bool]:
+        """
+        Loads the models listed in `ollama_prewarm_models` into the Ollama server.
+
+        Returns:
+            Dict[str, bool]: Whether each model was loaded; empty if none are configured.
+        """
+        models = [model.strip() for model in self.config.ollama_prewarm_models.split(',') if model.strip()]
+        strategy = self.get_provider('ollama')
+        if not models or not isinstance(strategy, OllamaStrategy):
+            return {}
+        return await strategy.prewarm(models)
+
+    async def aclose(self):
+        """Closes the pooled async connections of the strategies that were built, and stops rate-limit dispatchers."""
+        for strategy in list(self._strategies.values()):
+            await strategy.aclose()
+        await self.rate_limiter.aclose()
 
 # --- Singleton Client Instance ---
 _client_instance = None
@@ -393,3 +1477,19 @@ def get_client() -> UnifiedAIClient:
     if _client_instance is None:
         _client_instance = UnifiedAIClient()
     return _client_instance
+
+async def close_client():
+    """
+    Closes the pooled connections of the singleton UnifiedAIClient, if it was created.
+    """
+    if _client_instance is not None:
+        await _client_instance.aclose()
+
+async def prewarm_models() -> Dict[str, bool]:
+    """
+    Loads the configured Ollama models (`ollama_prewarm_models`) into memory.
+
+    Returns:
+        Dict[str, bool]: Whether each model was loaded.
+    """
+    return await get_client().prewarm()
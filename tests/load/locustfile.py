@@ -7,6 +7,11 @@ class RAGLoadUser(HttpUser):
     """
     Locust load test for RAG endpoint in core-services/link-ai-core.
     Simulates 50 concurrent users querying /rag endpoint with <150ms latency target.
+
+    For reproducible numbers without a live model, start the provider simulator
+    (python -m backend.mock_servers.ai_provider --port 11435 --seed 1) and run
+    the backend with OLLAMA_BASE_URL=http://localhost:11435, or enable the
+    in-process 'simulator' provider with AI_SIMULATOR_ENABLED=true.
     """
     wait_time = between(1, 3)  # Wait 1-3 seconds between tasks
     host = "http://localhost:8000"  # Assume FastAPI server port for /rag endpoint